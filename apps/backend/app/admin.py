@@ -9,6 +9,7 @@ from app.db_config import db_config
 from app.normalizer import normalize_job_data
 from app.search import search_service
 from app.analytics import analytics_tracker
+from app.http_cache import invalidate_all
 
 try:
     import psycopg2
@@ -248,6 +249,28 @@ async def get_metrics() -> dict[str, Any]:
     }
 
 
+@router.get("/metrics/aggregate")
+async def get_aggregate_metrics(
+    window_minutes: Optional[int] = Query(60, ge=1, le=1440, description="Also total counters over the last N minutes"),
+    series: bool = Query(False, description="Include per-bucket counter history"),
+) -> dict[str, Any]:
+    """
+    Dev-only crawl metrics endpoint.
+    Returns job counters, crawl stage / extraction histograms and pipeline
+    counters merged across all API and worker processes.
+    """
+    from metrics import read_aggregate
+    
+    aggregate = read_aggregate(window_minutes=window_minutes)
+    if not series:
+        aggregate.pop("series", None)
+    return {
+        "status": "ok",
+        "data": aggregate,
+        "error": None,
+    }
+
+
 def _get_db_connection():
     """Get database connection or None."""
     if not psycopg2:
@@ -616,6 +639,7 @@ async def normalize_and_reindex() -> dict[str, Any]:
         conn.commit()
         cursor.close()
         conn.close()
+        invalidate_all()
         
         # Reindex to Meilisearch
         indexed = await search_service.reindex_all()
@@ -9,7 +9,6 @@ import logging
 import time
 from typing import Any, Optional, Dict, List
 from collections import deque
-import httpx
 
 logger = logging.getLogger(__name__)
 
@@ -125,6 +124,8 @@ class AIService:
             logger.warning("[ai_service] Circuit breaker is OPEN, skipping call")
             return None
         
+        import httpx  # Imported on first call; keeps the search API's startup light
+        
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
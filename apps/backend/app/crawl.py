@@ -16,9 +16,7 @@ except ImportError:
     psycopg2 = None
 
 from app.db_config import db_config
-from crawler_v2.simple_crawler import SimpleCrawler
-from crawler_v2.rss_crawler import SimpleRSSCrawler
-from crawler_v2.api_crawler import SimpleAPICrawler
+from app.crawl_rollups import record_crawl_rollup
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -130,19 +128,25 @@ def run_crawl(request: CrawlRequest, _: None = Depends(require_dev_mode)):
                     import os
                     use_ai = bool(os.getenv('OPENROUTER_API_KEY'))
                     
+                    # Crawler stack is imported on first crawl, not at API startup
                     if source_type == 'rss':
+                        from crawler_v2.rss_crawler import SimpleRSSCrawler
                         rss_crawler = SimpleRSSCrawler(db_url)
                         # SimpleRSSCrawler doesn't have normalize_job, jobs are already normalized
-                        result = await rss_crawler.crawl_source({
-                            'id': source_id,
-                            'careers_url': careers_url,
-                            'org_name': org_name,
-                            'source_type': 'rss'
-                        })
+                        try:
+                            result = await rss_crawler.crawl_source({
+                                'id': source_id,
+                                'careers_url': careers_url,
+                                'org_name': org_name,
+                                'source_type': 'rss'
+                            })
+                        finally:
+                            await rss_crawler.aclose()
                         counts = result.get('counts', {})
                         message = result.get('message', 'Crawl completed')
                         return {'status': result.get('status', 'ok'), 'message': message, 'counts': counts}
                     elif source_type == 'api' or source_type == 'json':
+                        from crawler_v2.api_crawler import SimpleAPICrawler
                         api_crawler = SimpleAPICrawler(db_url)
                         result = await api_crawler.crawl_source({
                             'id': source_id,
@@ -155,6 +159,7 @@ def run_crawl(request: CrawlRequest, _: None = Depends(require_dev_mode)):
                         message = result.get('message', 'Crawl completed')
                         return {'status': result.get('status', 'ok'), 'message': message, 'counts': counts}
                     else:  # html (default)
+                        from crawler_v2.simple_crawler import SimpleCrawler
                         html_crawler = SimpleCrawler(db_url, use_ai=use_ai)
                         result = await html_crawler.crawl_source({
                             'id': source_id,
@@ -247,6 +252,16 @@ def run_crawl(request: CrawlRequest, _: None = Depends(require_dev_mode)):
         )
         
         log_entry = cursor.fetchone()
+        record_crawl_rollup(
+            cursor,
+            source_id,
+            log_status,
+            duration_ms,
+            found=stats['found'],
+            inserted=stats['inserted'],
+            updated=stats['updated'],
+            skipped=stats['skipped'],
+        )
         conn.commit()
         
         return {
@@ -0,0 +1,193 @@
+"""
+Daily per-source crawl rollups.
+
+crawl_log_rollups holds one row per (source, UTC day) and is updated in the
+same transaction that writes a crawl_logs row, so today's bucket is always
+current. Dashboard aggregates read the rollups instead of scanning raw logs,
+and raw crawl_logs older than the retention window are moved to
+crawl_logs_archive.
+"""
+import os
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Raw crawl_logs kept in the hot table
+CRAWL_LOG_RETENTION_DAYS = int(os.getenv("CRAWL_LOG_RETENTION_DAYS", "90"))
+
+# Rows moved per archive statement
+ARCHIVE_BATCH_SIZE = 5000
+
+_UTC_TODAY = "(NOW() AT TIME ZONE 'UTC')::date"
+
+_WINDOW_COLUMNS = """
+    COUNT(DISTINCT source_id) as total_sources,
+    COALESCE(SUM(crawl_count), 0) as total_crawls,
+    COALESCE(SUM(ok_count), 0) as successful_crawls,
+    COALESCE(SUM(fail_count), 0) as failed_crawls,
+    COALESCE(SUM(warn_count), 0) as warning_crawls,
+    SUM(duration_ms_sum)::float / NULLIF(SUM(duration_count), 0) as avg_duration_ms,
+    COALESCE(SUM(found), 0) as total_jobs_found,
+    COALESCE(SUM(inserted), 0) as total_jobs_inserted,
+    COALESCE(SUM(updated), 0) as total_jobs_updated
+"""
+
+
+def record_crawl_rollup(
+    cur,
+    source_id: Any,
+    status: Optional[str],
+    duration_ms: Optional[int],
+    found: int = 0,
+    inserted: int = 0,
+    updated: int = 0,
+    skipped: int = 0,
+):
+    """
+    Add one crawl to today's rollup bucket for a source.
+
+    Call with the cursor that inserted the crawl_logs row so both commit
+    together. A missing rollup table never fails the caller's transaction.
+    """
+    cur.execute("SAVEPOINT crawl_rollup")
+    try:
+        cur.execute(f"""
+            INSERT INTO crawl_log_rollups (
+                source_id, bucket_date, crawl_count, ok_count, fail_count, warn_count,
+                duration_ms_sum, duration_count, found, inserted, updated, skipped,
+                first_ran_at, last_ran_at
+            ) VALUES (
+                %s, {_UTC_TODAY}, 1, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW(), NOW()
+            )
+            ON CONFLICT (source_id, bucket_date) DO UPDATE SET
+                crawl_count = crawl_log_rollups.crawl_count + 1,
+                ok_count = crawl_log_rollups.ok_count + EXCLUDED.ok_count,
+                fail_count = crawl_log_rollups.fail_count + EXCLUDED.fail_count,
+                warn_count = crawl_log_rollups.warn_count + EXCLUDED.warn_count,
+                duration_ms_sum = crawl_log_rollups.duration_ms_sum + EXCLUDED.duration_ms_sum,
+                duration_count = crawl_log_rollups.duration_count + EXCLUDED.duration_count,
+                found = crawl_log_rollups.found + EXCLUDED.found,
+                inserted = crawl_log_rollups.inserted + EXCLUDED.inserted,
+                updated = crawl_log_rollups.updated + EXCLUDED.updated,
+                skipped = crawl_log_rollups.skipped + EXCLUDED.skipped,
+                last_ran_at = EXCLUDED.last_ran_at
+        """, (
+            source_id,
+            1 if status == 'ok' else 0,
+            1 if status == 'fail' else 0,
+            1 if status == 'warn' else 0,
+            duration_ms or 0,
+            1 if duration_ms is not None else 0,
+            found or 0,
+            inserted or 0,
+            updated or 0,
+            skipped or 0,
+        ))
+        cur.execute("RELEASE SAVEPOINT crawl_rollup")
+    except Exception as e:
+        cur.execute("ROLLBACK TO SAVEPOINT crawl_rollup")
+        logger.warning(f"[crawl_rollups] Failed to update rollup: {e}")
+
+
+def get_window_stats(cur, days: int) -> Dict[str, Any]:
+    """Totals over the last `days` UTC days, today included"""
+    cur.execute(f"""
+        SELECT {_WINDOW_COLUMNS}
+        FROM crawl_log_rollups
+        WHERE bucket_date > {_UTC_TODAY} - %s
+    """, (days,))
+    return cur.fetchone()
+
+
+def get_daily_trends(cur, days: int) -> List[Dict[str, Any]]:
+    cur.execute(f"""
+        SELECT
+            bucket_date as date,
+            SUM(crawl_count) as total_crawls,
+            SUM(ok_count) as successful_crawls,
+            SUM(fail_count) as failed_crawls
+        FROM crawl_log_rollups
+        WHERE bucket_date > {_UTC_TODAY} - %s
+        GROUP BY bucket_date
+        ORDER BY date DESC
+    """, (days,))
+    return cur.fetchall()
+
+
+def get_top_sources(cur, days: int, limit: int = 10) -> List[Dict[str, Any]]:
+    cur.execute(f"""
+        SELECT
+            s.id,
+            s.org_name,
+            SUM(r.crawl_count) as crawl_count,
+            SUM(r.found) as total_jobs_found,
+            SUM(r.inserted + r.updated) as total_changes,
+            SUM(r.duration_ms_sum)::float / NULLIF(SUM(r.duration_count), 0) as avg_duration_ms,
+            SUM(r.ok_count)::float / NULLIF(SUM(r.crawl_count), 0) * 100 as success_rate
+        FROM crawl_log_rollups r
+        JOIN sources s ON s.id = r.source_id
+        WHERE r.bucket_date > {_UTC_TODAY} - %s
+        GROUP BY s.id, s.org_name
+        ORDER BY total_changes DESC
+        LIMIT %s
+    """, (days, limit))
+    return cur.fetchall()
+
+
+def get_source_stats(cur, source_id: str) -> Dict[str, Any]:
+    """All-time totals for one source (survives raw log archiving)"""
+    cur.execute("""
+        SELECT
+            COALESCE(SUM(crawl_count), 0) as total_crawls,
+            COALESCE(SUM(ok_count), 0) as successful_crawls,
+            COALESCE(SUM(fail_count), 0) as failed_crawls,
+            SUM(duration_ms_sum)::float / NULLIF(SUM(duration_count), 0) as avg_duration_ms,
+            COALESCE(SUM(found), 0) as total_jobs_found,
+            COALESCE(SUM(inserted), 0) as total_jobs_inserted,
+            COALESCE(SUM(updated), 0) as total_jobs_updated,
+            MIN(first_ran_at) as first_crawl,
+            MAX(last_ran_at) as last_crawl
+        FROM crawl_log_rollups
+        WHERE source_id = %s::uuid
+    """, (source_id,))
+    return cur.fetchone()
+
+
+def archive_old_crawl_logs(conn, retention_days: int = CRAWL_LOG_RETENTION_DAYS) -> int:
+    """
+    Move raw crawl_logs older than the retention window into crawl_logs_archive.
+
+    Runs in batches, committing after each, so the hot table is never locked
+    for long. Returns the number of rows moved.
+    """
+    moved_total = 0
+    with conn.cursor() as cur:
+        while True:
+            cur.execute("""
+                WITH moved AS (
+                    DELETE FROM crawl_logs
+                    WHERE id IN (
+                        SELECT id FROM crawl_logs
+                        WHERE ran_at < NOW() - make_interval(days => %s)
+                        LIMIT %s
+                    )
+                    RETURNING id, source_id, ran_at, duration_ms, found, inserted,
+                              updated, skipped, status, message, timings
+                )
+                INSERT INTO crawl_logs_archive (
+                    id, source_id, ran_at, duration_ms, found, inserted,
+                    updated, skipped, status, message, timings
+                )
+                SELECT id, source_id, ran_at, duration_ms, found, inserted,
+                       updated, skipped, status, message, timings
+                FROM moved
+            """, (retention_days, ARCHIVE_BATCH_SIZE))
+            moved = cur.rowcount
+            conn.commit()
+            moved_total += moved
+            if moved < ARCHIVE_BATCH_SIZE:
+                break
+    if moved_total:
+        logger.info(f"[crawl_rollups] Archived {moved_total} crawl log(s) older than {retention_days} days")
+    return moved_total
@@ -13,6 +13,7 @@ from psycopg2.extras import RealDictCursor  # type: ignore
 from psycopg2 import errors as psycopg2_errors  # type: ignore
 
 from security.admin_auth import admin_required
+from app.http_cache import invalidate_all, invalidate_jobs
 from orchestrator import get_orchestrator
 
 logger = logging.getLogger(__name__)
@@ -664,6 +665,7 @@ async def get_logs(
             'message': log.get('message'),
             'ran_at': log['ran_at'].isoformat() if log.get('ran_at') else None,
             'duration_ms': log.get('duration_ms'),
+            'timings': log.get('timings'),  # Per-stage ms breakdown, None for older logs
             'actual_job_count': actual_counts.get(str(log['source_id']), 0),  # Real count from jobs table
         })
     
@@ -782,6 +784,10 @@ async def upsert_policy(host: str, policy: DomainPolicyUpdate, admin=Depends(adm
     finally:
         conn.close()
     
+    # Drop this process's cached policy and robots rules for the host
+    from core.host_cache import invalidate_host
+    invalidate_host(host)
+    
     return {
         "status": "ok",
         "message": f"Policy updated for {host}"
@@ -864,6 +870,7 @@ async def delete_jobs_by_org(
                 
                 jobs_deleted = cur.rowcount
                 conn.commit()
+                invalidate_all()
                 
                 return {
                     "status": "ok",
@@ -896,6 +903,7 @@ async def delete_jobs_by_org(
                 logger.info(f"Soft-deleted {jobs_deleted} jobs from source {source['org_name']} ({source_id})")
             
             conn.commit()
+            invalidate_all()
             
             return {
                 "status": "ok",
@@ -945,75 +953,26 @@ async def get_global_quality(admin=Depends(admin_required)):
 
 @router.get("/analytics/overview")
 async def get_crawl_analytics_overview(admin=Depends(admin_required)):
-    """Get overview of crawl analytics"""
+    """
+    Get overview of crawl analytics.
+    
+    Served from the daily crawl_log_rollups (windows are UTC calendar days,
+    today's partial bucket included) rather than scanning crawl_logs.
+    """
+    from app.crawl_rollups import get_window_stats, get_daily_trends, get_top_sources
+    
     conn = get_db_conn()
     try:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
             # Overall statistics
-            cur.execute("""
-                SELECT 
-                    COUNT(DISTINCT source_id) as total_sources,
-                    COUNT(*) as total_crawls,
-                    SUM(CASE WHEN status = 'ok' THEN 1 ELSE 0 END) as successful_crawls,
-                    SUM(CASE WHEN status = 'fail' THEN 1 ELSE 0 END) as failed_crawls,
-                    SUM(CASE WHEN status = 'warn' THEN 1 ELSE 0 END) as warning_crawls,
-                    AVG(duration_ms) as avg_duration_ms,
-                    SUM(found) as total_jobs_found,
-                    SUM(inserted) as total_jobs_inserted,
-                    SUM(updated) as total_jobs_updated
-                FROM crawl_logs
-                WHERE ran_at >= NOW() - INTERVAL '7 days'
-            """)
-            week_stats = cur.fetchone()
-            
-            cur.execute("""
-                SELECT 
-                    COUNT(DISTINCT source_id) as total_sources,
-                    COUNT(*) as total_crawls,
-                    SUM(CASE WHEN status = 'ok' THEN 1 ELSE 0 END) as successful_crawls,
-                    SUM(CASE WHEN status = 'fail' THEN 1 ELSE 0 END) as failed_crawls,
-                    SUM(CASE WHEN status = 'warn' THEN 1 ELSE 0 END) as warning_crawls,
-                    AVG(duration_ms) as avg_duration_ms,
-                    SUM(found) as total_jobs_found,
-                    SUM(inserted) as total_jobs_inserted,
-                    SUM(updated) as total_jobs_updated
-                FROM crawl_logs
-                WHERE ran_at >= NOW() - INTERVAL '30 days'
-            """)
-            month_stats = cur.fetchone()
+            week_stats = get_window_stats(cur, 7)
+            month_stats = get_window_stats(cur, 30)
             
             # Success rate trends (daily for last 7 days)
-            cur.execute("""
-                SELECT 
-                    DATE(ran_at) as date,
-                    COUNT(*) as total_crawls,
-                    SUM(CASE WHEN status = 'ok' THEN 1 ELSE 0 END) as successful_crawls,
-                    SUM(CASE WHEN status = 'fail' THEN 1 ELSE 0 END) as failed_crawls
-                FROM crawl_logs
-                WHERE ran_at >= NOW() - INTERVAL '7 days'
-                GROUP BY DATE(ran_at)
-                ORDER BY date DESC
-            """)
-            daily_trends = cur.fetchall()
+            daily_trends = get_daily_trends(cur, 7)
             
             # Top sources by activity
-            cur.execute("""
-                SELECT 
-                    s.id,
-                    s.org_name,
-                    COUNT(*) as crawl_count,
-                    SUM(l.found) as total_jobs_found,
-                    SUM(l.inserted + l.updated) as total_changes,
-                    AVG(l.duration_ms) as avg_duration_ms,
-                    SUM(CASE WHEN l.status = 'ok' THEN 1 ELSE 0 END)::float / COUNT(*) * 100 as success_rate
-                FROM crawl_logs l
-                JOIN sources s ON s.id = l.source_id
-                WHERE l.ran_at >= NOW() - INTERVAL '7 days'
-                GROUP BY s.id, s.org_name
-                ORDER BY total_changes DESC
-                LIMIT 10
-            """)
-            top_sources = cur.fetchall()
+            top_sources = get_top_sources(cur, 7, limit=10)
             
             # Safely convert week_stats and month_stats to dicts with defaults
             def safe_dict(row, defaults):
@@ -1079,6 +1038,8 @@ async def get_crawl_analytics_overview(admin=Depends(admin_required)):
 @router.get("/analytics/source/{source_id}")
 async def get_source_analytics(source_id: str, admin=Depends(admin_required)):
     """Get analytics for a specific source"""
+    from app.crawl_rollups import get_source_stats
+    
     conn = get_db_conn()
     try:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
@@ -1106,28 +1067,14 @@ async def get_source_analytics(source_id: str, admin=Depends(admin_required)):
                     ran_at, status, message, duration_ms,
                     found, inserted, updated, skipped
                 FROM crawl_logs
-                WHERE source_id::text = %s
+                WHERE source_id = %s
                 ORDER BY ran_at DESC
                 LIMIT 20
-            """, (source_id,))
+            """, (source['id'],))
             crawl_history = cur.fetchall()
             
-            # Get statistics
-            cur.execute("""
-                SELECT 
-                    COUNT(*) as total_crawls,
-                    SUM(CASE WHEN status = 'ok' THEN 1 ELSE 0 END) as successful_crawls,
-                    SUM(CASE WHEN status = 'fail' THEN 1 ELSE 0 END) as failed_crawls,
-                    AVG(duration_ms) as avg_duration_ms,
-                    SUM(found) as total_jobs_found,
-                    SUM(inserted) as total_jobs_inserted,
-                    SUM(updated) as total_jobs_updated,
-                    MIN(ran_at) as first_crawl,
-                    MAX(ran_at) as last_crawl
-                FROM crawl_logs
-                WHERE source_id::text = %s
-            """, (source_id,))
-            stats = cur.fetchone()
+            # Get statistics (all-time, from rollups)
+            stats = get_source_stats(cur, str(source['id']))
             
             return {
                 "status": "ok",
@@ -1169,6 +1116,56 @@ async def get_source_analytics(source_id: str, admin=Depends(admin_required)):
         conn.close()
 
 
+@router.get("/analytics/dedupe")
+async def get_dedupe_analytics(admin=Depends(admin_required)):
+    """Get cross-source near-duplicate rate per source"""
+    conn = get_db_conn()
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("""
+                SELECT
+                    s.id,
+                    s.org_name,
+                    s.source_type,
+                    COUNT(j.id) as active_jobs,
+                    COUNT(j.id) FILTER (WHERE j.duplicate_of IS NOT NULL) as duplicate_jobs
+                FROM sources s
+                JOIN jobs j ON j.source_id = s.id
+                WHERE j.status = 'active' AND j.deleted_at IS NULL
+                GROUP BY s.id, s.org_name, s.source_type
+                ORDER BY duplicate_jobs DESC, active_jobs DESC
+            """)
+            rows = cur.fetchall()
+
+            total_active = sum(row['active_jobs'] or 0 for row in rows)
+            total_duplicates = sum(row['duplicate_jobs'] or 0 for row in rows)
+
+            return {
+                "status": "ok",
+                "data": {
+                    "total_active_jobs": total_active,
+                    "total_duplicate_jobs": total_duplicates,
+                    "dedupe_rate": round(total_duplicates / total_active * 100, 2) if total_active else 0,
+                    "sources": [
+                        {
+                            "source_id": str(row['id']),
+                            "org_name": row['org_name'] or 'Unknown',
+                            "source_type": row['source_type'],
+                            "active_jobs": row['active_jobs'] or 0,
+                            "duplicate_jobs": row['duplicate_jobs'] or 0,
+                            "dedupe_rate": round((row['duplicate_jobs'] or 0) / row['active_jobs'] * 100, 2) if row['active_jobs'] else 0
+                        }
+                        for row in rows
+                    ]
+                }
+            }
+    except Exception as e:
+        logger.error(f"Error in get_dedupe_analytics: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to get dedupe analytics: {str(e)}")
+    finally:
+        conn.close()
+
+
 @router.post("/run-migration")
 async def run_deletion_migration(admin: str = Depends(admin_required)):
     """
@@ -1428,6 +1425,34 @@ async def get_validation_stats(
         raise HTTPException(status_code=500, detail=f"Failed to get stats: {str(e)}")
 
 
+@link_validation_router.post("/revalidate")
+async def revalidate_stale_links(
+    limit: int = Query(500, ge=1, le=5000, description="Maximum URLs to revalidate"),
+    admin=Depends(admin_required)
+):
+    """
+    Revalidate stale apply URLs in bulk and flag jobs with dead links.
+    
+    This is the same pass the scheduler runs periodically.
+    """
+    db_url = get_db_url()
+    
+    try:
+        from core.link_validator import get_link_validator
+        link_validator = get_link_validator(db_url)
+        
+        summary = await link_validator.revalidate_stale(limit=limit)
+        
+        return {
+            "status": "ok",
+            "data": summary
+        }
+        
+    except Exception as e:
+        logger.error(f"Error revalidating links: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Link revalidation failed: {str(e)}")
+
+
 @link_validation_router.post("/validate-job/{job_id}")
 async def validate_job_link(job_id: str, admin=Depends(admin_required)):
     """
@@ -1570,6 +1595,7 @@ async def sync_meilisearch(execute: bool = False, admin=Depends(admin_required))
             batch = orphaned_list[i:i+100]
             try:
                 index.delete_documents(batch)
+                invalidate_jobs(batch)
                 deleted_count += len(batch)
                 logger.info(f"Deleted batch {i//100 + 1}: {len(batch)} jobs (total: {deleted_count}/{len(orphaned_list)})")
             except Exception as e:
@@ -1612,6 +1638,87 @@ async def get_coverage_stats(
         raise HTTPException(status_code=500, detail=f"Failed to get coverage stats: {str(e)}")
 
 
+@observability_router.get("/storage")
+async def get_storage_stats(admin=Depends(admin_required)):
+    """Get raw HTML blob store dedupe and compression metrics"""
+    try:
+        from core.html_storage import get_html_storage
+        return {"status": "ok", "data": get_html_storage().stats()}
+    except Exception as e:
+        logger.error(f"Error getting storage stats: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to get storage stats: {str(e)}")
+
+
+@observability_router.get("/extraction-plans")
+async def get_extraction_plan_stats(
+    limit: int = Query(50, le=500, description="Maximum number of sources"),
+    admin=Depends(admin_required)
+):
+    """Get learned extraction plan hit rate and time saved, overall and per source"""
+    try:
+        from core.extraction_plans import get_plan_store
+        store = get_plan_store(get_db_url())
+        return {
+            "status": "ok",
+            "data": {
+                "totals": store.get_totals(),
+                "process": store.stats(),
+                "sources": store.get_source_stats(limit=limit),
+            }
+        }
+    except Exception as e:
+        logger.error(f"Error getting extraction plan stats: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to get extraction plan stats: {str(e)}")
+
+
+@observability_router.get("/extraction-executor")
+async def get_extraction_executor_stats(admin=Depends(admin_required)):
+    """Get extraction process pool load, queue wait and CPU time (this process)"""
+    try:
+        from core.extraction_executor import get_extraction_executor
+        executor = get_extraction_executor()
+        return {
+            "status": "ok",
+            "data": executor.stats() if executor else {"enabled": False}
+        }
+    except Exception as e:
+        logger.error(f"Error getting extraction executor stats: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to get extraction executor stats: {str(e)}")
+
+
+@observability_router.get("/log-writer")
+async def get_log_writer_stats(admin=Depends(admin_required)):
+    """Get buffered crawl log writer backlog, batch sizes and dropped/sampled rows (this process)"""
+    try:
+        from core.log_writer import get_log_writer
+        return {"status": "ok", "data": get_log_writer(get_db_url()).stats()}
+    except Exception as e:
+        logger.error(f"Error getting log writer stats: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to get log writer stats: {str(e)}")
+
+
+@observability_router.get("/host-cache")
+async def get_host_cache_stats(admin=Depends(admin_required)):
+    """Get robots/domain policy cache size, hits, misses and shared loads (this process)"""
+    try:
+        from core.host_cache import stats
+        return {"status": "ok", "data": stats()}
+    except Exception as e:
+        logger.error(f"Error getting host cache stats: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to get host cache stats: {str(e)}")
+
+
+@observability_router.get("/http-cache")
+async def get_http_cache_stats(admin=Depends(admin_required)):
+    """Get job detail/facets response cache policies, size, hits and misses (this process)"""
+    try:
+        from app.http_cache import stats
+        return {"status": "ok", "data": stats()}
+    except Exception as e:
+        logger.error(f"Error getting HTTP cache stats: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to get HTTP cache stats: {str(e)}")
+
+
 @observability_router.get("/coverage/sources")
 async def get_source_coverage(
     limit: int = Query(50, description="Maximum number of sources"),
@@ -10,6 +10,7 @@ from datetime import datetime
 
 from app.ai_service import get_ai_service
 from app.db_config import db_config
+from app.http_cache import invalidate_job
 from app.enrichment_review import auto_flag_job_for_review
 from app.enrichment_history import record_enrichment_change
 from app.enrichment_preprocessor import preprocess_job_for_enrichment
@@ -607,6 +608,7 @@ def save_enrichment_to_db(
         conn.commit()
         cursor.close()
         conn.close()
+        invalidate_job(job_id)
         
         # Record in history
         record_enrichment_change(
@@ -20,15 +20,35 @@ def similarity_score(str1: str, str2: str) -> float:
     return SequenceMatcher(None, str1.lower(), str2.lower()).ratio()
 
 
+# Trigram candidates fetched per lookup before the weighted re-score.
+TRIGRAM_CANDIDATE_LIMIT = 50
+
+
+def normalize_title(title: str) -> str:
+    """
+    Lowercase a title and collapse its whitespace.
+    
+    The query side of the trigram lookup: rows are matched on lower(title),
+    the idx_jobs_title_trgm expression. pg_trgm splits words on whitespace,
+    so collapsing runs of it leaves similarity scores unchanged.
+    """
+    return " ".join((title or "").lower().split())
+
+
 def find_similar_jobs(
     job_id: str,
     title: str,
     description: Optional[str] = None,
-    similarity_threshold: float = 0.85
+    similarity_threshold: float = 0.85,
+    top_k: int = 10
 ) -> List[Dict[str, Any]]:
     """
     Find jobs with similar titles/descriptions.
     
+    Uses pg_trgm similarity over the GIN index on lower(title) so the lookup
+    covers every active enriched job, not just the most recent ones. Falls back
+    to an in-Python scan if pg_trgm is unavailable.
+    
     Returns list of similar jobs with their enrichments.
     """
     conn_params = db_config.get_connection_params()
@@ -36,38 +56,57 @@ def find_similar_jobs(
         logger.error("[enrichment_consistency] Database not configured")
         return []
     
+    norm_title = normalize_title(title)
+    norm_desc = (description or "")[:200].lower()
+    
+    # combined = 0.6 * title + 0.4 * description, so a candidate can only reach
+    # the threshold if its title similarity is at least this high.
+    min_title_sim = max(0.0, (similarity_threshold - 0.4) / 0.6)
+    
     try:
         conn = psycopg2.connect(**conn_params, connect_timeout=5)
         cursor = conn.cursor(cursor_factory=RealDictCursor)
         
-        # Get all enriched jobs
-        cursor.execute("""
-            SELECT 
-                id, title, description_snippet, org_name,
-                impact_domain, functional_role, experience_level,
-                confidence_overall
-            FROM jobs
-            WHERE status = 'active'
-                AND id::text != %s
-                AND (impact_domain IS NOT NULL OR experience_level IS NOT NULL)
-            ORDER BY created_at DESC
-            LIMIT 500
-        """, (job_id,))
-        
-        all_jobs = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        try:
+            cursor.execute("SELECT set_config('pg_trgm.similarity_threshold', %s, true)",
+                           (str(min_title_sim),))
+            cursor.execute("""
+                SELECT 
+                    id, title, org_name,
+                    impact_domain, functional_role, experience_level,
+                    confidence_overall,
+                    similarity(lower(title), %(title)s) AS title_similarity,
+                    CASE
+                        WHEN %(description)s <> '' AND description_snippet IS NOT NULL
+                        THEN similarity(lower(left(description_snippet, 200)), %(description)s)
+                        ELSE 0
+                    END AS description_similarity
+                FROM jobs
+                WHERE status = 'active'
+                    AND lower(title) %% %(title)s
+                    AND id::text != %(job_id)s
+                    AND (impact_domain IS NOT NULL OR experience_level IS NOT NULL)
+                ORDER BY title_similarity DESC
+                LIMIT %(limit)s
+            """, {
+                "title": norm_title,
+                "description": norm_desc,
+                "job_id": job_id,
+                "limit": TRIGRAM_CANDIDATE_LIMIT,
+            })
+            candidates = cursor.fetchall()
+        except psycopg2.errors.UndefinedFunction:
+            conn.rollback()
+            logger.warning("[enrichment_consistency] pg_trgm not available, falling back to scan")
+            candidates = _scan_recent_jobs(cursor, job_id, title, description)
+        finally:
+            cursor.close()
+            conn.close()
         
-        # Calculate similarity
         similar_jobs = []
-        for job in all_jobs:
-            # Title similarity
-            title_sim = similarity_score(title, job.get("title", ""))
-            
-            # Description similarity (if both have descriptions)
-            desc_sim = 0.0
-            if description and job.get("description_snippet"):
-                desc_sim = similarity_score(description[:200], job.get("description_snippet", "")[:200])
+        for job in candidates:
+            title_sim = float(job.get("title_similarity") or 0.0)
+            desc_sim = float(job.get("description_similarity") or 0.0)
             
             # Combined similarity (weighted: 60% title, 40% description)
             combined_sim = (title_sim * 0.6) + (desc_sim * 0.4)
@@ -88,13 +127,46 @@ def find_similar_jobs(
         # Sort by similarity descending
         similar_jobs.sort(key=lambda x: x["similarity"], reverse=True)
         
-        return similar_jobs[:10]  # Return top 10 most similar
+        return similar_jobs[:top_k]
         
     except Exception as e:
         logger.error(f"[enrichment_consistency] Failed to find similar jobs: {e}", exc_info=True)
         return []
 
 
+def _scan_recent_jobs(
+    cursor,
+    job_id: str,
+    title: str,
+    description: Optional[str]
+) -> List[Dict[str, Any]]:
+    """Score the 500 most recent enriched jobs in Python (pre-pg_trgm behaviour)."""
+    cursor.execute("""
+        SELECT 
+            id, title, description_snippet, org_name,
+            impact_domain, functional_role, experience_level,
+            confidence_overall
+        FROM jobs
+        WHERE status = 'active'
+            AND id::text != %s
+            AND (impact_domain IS NOT NULL OR experience_level IS NOT NULL)
+        ORDER BY created_at DESC
+        LIMIT 500
+    """, (job_id,))
+    
+    scored = []
+    for job in cursor.fetchall():
+        job = dict(job)
+        job["title_similarity"] = similarity_score(title, job.get("title", ""))
+        job["description_similarity"] = 0.0
+        if description and job.get("description_snippet"):
+            job["description_similarity"] = similarity_score(
+                description[:200], job.get("description_snippet", "")[:200]
+            )
+        scored.append(job)
+    return scored
+
+
 def check_consistency(
     job_id: str,
     enrichment: Dict[str, Any]
@@ -10,6 +10,7 @@ from psycopg2.extras import RealDictCursor
 import json
 
 from app.db_config import db_config
+from app.http_cache import invalidate_job
 
 logger = logging.getLogger(__name__)
 
@@ -247,6 +248,8 @@ def update_review(
         conn.commit()
         cursor.close()
         conn.close()
+        if status == 'approved' and corrected_enrichment:
+            invalidate_job(job_id)
         
         logger.info(f"[enrichment_review] Updated review {review_id} to status {status}")
         return True
@@ -7,7 +7,6 @@ import os
 import logging
 from typing import Optional
 from urllib.parse import urlparse
-import requests
 from fastapi import APIRouter, HTTPException, Request, Depends
 from pydantic import BaseModel
 from psycopg2.extras import RealDictCursor
@@ -49,6 +48,8 @@ def detect_jobs_count(url: str) -> int:
     Light page scan to roughly estimate job count.
     Just does a HEAD/GET request and looks for basic indicators.
     """
+    import requests
+    
     try:
         response = requests.head(url, timeout=5, allow_redirects=True)
         if response.status_code != 200:
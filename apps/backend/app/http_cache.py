@@ -0,0 +1,191 @@
+"""
+HTTP caching for public read endpoints (job detail, search facets).
+
+Responses carry a strong ETag (hash of the JSON body) and a per-route
+Cache-Control policy; a matching If-None-Match is answered with 304 and no
+body. Rendered bodies (and their gzip/brotli encodings, see app.responses)
+are kept in small process-local TTL caches, so repeat fetches of the same
+job or of the facet counts skip Postgres, Meilisearch and serialization.
+
+Code that updates or deletes jobs calls invalidate_job(s)() or
+invalidate_all() after committing. Entries are per process; the TTL bounds
+staleness for writers running elsewhere.
+"""
+
+import hashlib
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from fastapi import Request, Response
+
+from app import responses
+from core.host_cache import HostTTLCache
+
+logger = logging.getLogger(__name__)
+
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "true").lower() not in ("false", "0", "no")
+
+JOB_CACHE_SIZE = 5000
+
+# Unknown job IDs are remembered briefly to absorb repeated 404s
+JOB_NOT_FOUND_TTL_SECONDS = 30
+
+FACETS_KEY = "facets"
+
+
+class CachePolicy:
+    """
+    Cache-Control policy for one route, overridable via environment:
+    HTTP_CACHE_<NAME>_MAX_AGE, HTTP_CACHE_<NAME>_SWR and HTTP_CACHE_<NAME>_TTL
+    (browser/CDN max-age, stale-while-revalidate window, in-process TTL; seconds).
+    """
+
+    def __init__(self, name: str, max_age: int, stale_while_revalidate: int, ttl_seconds: int):
+        prefix = f"HTTP_CACHE_{name.upper()}_"
+        self.name = name
+        self.max_age = int(os.getenv(prefix + "MAX_AGE", max_age))
+        self.stale_while_revalidate = int(os.getenv(prefix + "SWR", stale_while_revalidate))
+        self.ttl_seconds = int(os.getenv(prefix + "TTL", ttl_seconds))
+
+    def header(self) -> str:
+        if self.max_age <= 0:
+            return "no-cache"
+        value = f"public, max-age={self.max_age}"
+        if self.stale_while_revalidate > 0:
+            value += f", stale-while-revalidate={self.stale_while_revalidate}"
+        return value
+
+
+JOB_DETAIL_POLICY = CachePolicy("job_detail", max_age=60, stale_while_revalidate=300, ttl_seconds=60)
+FACETS_POLICY = CachePolicy("facets", max_age=300, stale_while_revalidate=600, ttl_seconds=120)
+
+
+class CachedBody:
+    """A rendered JSON body with its ETag, Cache-Control header and compressed variants"""
+
+    __slots__ = ("body", "etag", "cache_control", "_encoded")
+
+    def __init__(self, body: bytes, cache_control: str):
+        self.body = body
+        self.etag = make_etag(body)
+        self.cache_control = cache_control
+        self._encoded: Dict[str, bytes] = {}
+
+    def encoded(self, encoding: Optional[str]) -> bytes:
+        if not encoding:
+            return self.body
+        if encoding not in self._encoded:
+            self._encoded[encoding] = responses.compress(self.body, encoding)
+        return self._encoded[encoding]
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        # Each content-coding is a distinct representation with its own strong ETag
+        return self.etag[:-1] + f'-{encoding}"' if encoding else self.etag
+
+
+# Global instances (keyed by job ID, or FACETS_KEY)
+job_cache = HostTTLCache("job_detail", JOB_DETAIL_POLICY.ttl_seconds, JOB_NOT_FOUND_TTL_SECONDS,
+                         maxsize=JOB_CACHE_SIZE)
+facets_cache = HostTTLCache("facets", FACETS_POLICY.ttl_seconds, FACETS_POLICY.ttl_seconds, maxsize=1)
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag from the response body"""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for this header)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def render(payload: Any, policy: CachePolicy, cacheable: bool = True) -> CachedBody:
+    return CachedBody(responses.dumps(payload), policy.header() if cacheable else "no-store")
+
+
+def to_response(request: Request, cached: CachedBody) -> Response:
+    encoding = responses.negotiate(request, cached.body)
+    etag = cached.etag_for(encoding)
+    headers = {"ETag": etag, "Cache-Control": cached.cache_control}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        if responses.RESPONSE_COMPRESSION:
+            headers["Vary"] = "Accept-Encoding"
+        return Response(status_code=304, headers=headers)
+    return responses.encoded_response(request, cached.encoded(encoding), headers=headers,
+                                      encoding=encoding)
+
+
+async def cached_json(
+    request: Request,
+    cache: HostTTLCache,
+    key: str,
+    policy: CachePolicy,
+    loader: Callable[[], Awaitable[Any]],
+    cacheable: Callable[[Any], bool] = lambda payload: True,
+) -> Optional[Response]:
+    """
+    Serve loader()'s JSON payload through the cache with ETag/304 handling.
+
+    Returns None when the loader returned None (the caller answers 404).
+    Payloads rejected by cacheable (e.g. degraded fallbacks) are sent with
+    no-store and are not kept.
+    """
+    async def load():
+        payload = await loader()
+        if payload is None:
+            return None, None
+        if not cacheable(payload):
+            return render(payload, policy, cacheable=False), 0
+        return render(payload, policy), None
+
+    if HTTP_CACHE_ENABLED:
+        cached, _ = await cache.get_or_load(key, load)
+    else:
+        cached, _ = await load()
+    if cached is None:
+        return None
+    return to_response(request, cached)
+
+
+def job_cache_key(job_id: str, include_raw: bool = False) -> str:
+    # Dev responses include raw_metadata, so they are cached separately
+    return f"{job_id}:raw" if include_raw else job_id
+
+
+def invalidate_jobs(job_ids: Iterable[Any]):
+    """Drop cached detail responses for jobs and the facet counts"""
+    count = 0
+    for job_id in job_ids:
+        job_id = str(job_id)
+        job_cache.invalidate(job_cache_key(job_id))
+        job_cache.invalidate(job_cache_key(job_id, include_raw=True))
+        count += 1
+    if count:
+        facets_cache.clear()
+
+
+def invalidate_job(job_id: Any):
+    invalidate_jobs([job_id])
+
+
+def invalidate_all():
+    """Drop every cached response (after writes that don't return job IDs)"""
+    job_cache.clear()
+    facets_cache.clear()
+    logger.info("[http_cache] Cleared job detail and facet caches")
+
+
+def stats() -> Dict:
+    return {
+        "enabled": HTTP_CACHE_ENABLED,
+        "policies": {p.name: p.header() for p in (JOB_DETAIL_POLICY, FACETS_POLICY)},
+        "job_detail": job_cache.stats(),
+        "facets": facets_cache.stats(),
+    }
@@ -0,0 +1,469 @@
+"""
+Chunked, set-based bulk operations on jobs (soft delete, hard delete, restore).
+
+Matching jobs are processed in bounded chunks walked in primary-key order
+with typed UUID arrays, so each transaction only locks one chunk of rows.
+Every chunk commits its job updates, its job_deletion_audit rows (one bulk
+insert) and the operation checkpoint together, then removes the chunk from
+Meilisearch. Operations are persisted in job_bulk_operations and can be
+resumed from the last committed chunk after a failure or restart.
+"""
+import os
+import json
+import uuid
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import psycopg2  # type: ignore
+from psycopg2.extras import RealDictCursor, execute_values  # type: ignore
+
+from app.db_config import db_config
+from app.http_cache import invalidate_jobs
+
+logger = logging.getLogger(__name__)
+
+try:
+    import meilisearch  # type: ignore[reportMissingImports]
+    MEILISEARCH_AVAILABLE = True
+except ImportError:
+    meilisearch = None  # type: ignore[assignment]
+    MEILISEARCH_AVAILABLE = False
+
+# Rows per transaction
+BULK_CHUNK_SIZE = 1000
+
+# Requests matching more jobs than this run as background operations
+BACKGROUND_THRESHOLD = 5000
+
+# A persisted operation not running here is considered abandoned when its
+# checkpoint (updated_at) is older than this
+STALE_OPERATION_SECONDS = 300
+
+# Meilisearch delete_documents batch size
+MEILI_DELETE_BATCH_SIZE = 1000
+
+OPERATION_KINDS = {"soft_delete", "hard_delete", "restore"}
+
+
+def _get_db_conn():
+    conn_params = db_config.get_connection_params()
+    if not conn_params:
+        raise RuntimeError("Database not configured")
+    return psycopg2.connect(**conn_params, connect_timeout=5)
+
+
+def normalize_job_ids(job_ids: List[str]) -> Tuple[List[str], List[str]]:
+    """Split raw IDs into (valid UUID strings, invalid values)"""
+    valid, invalid = [], []
+    for raw in job_ids:
+        try:
+            valid.append(str(uuid.UUID(str(raw).strip())))
+        except (ValueError, AttributeError):
+            invalid.append(raw)
+    return sorted(set(valid)), invalid
+
+
+def build_filter(kind: str, params: Dict[str, Any]) -> Tuple[List[str], List[Any]]:
+    """
+    Build WHERE clauses for an operation's target set.
+
+    Only the state filter depends on the kind: soft deletes skip rows that are
+    already deleted, restores only touch deleted rows, hard deletes take both.
+    """
+    clauses: List[str] = []
+    values: List[Any] = []
+
+    if params.get("job_ids"):
+        clauses.append("id = ANY(%s::uuid[])")
+        values.append(params["job_ids"])
+    elif params.get("org_name"):
+        clauses.append("org_name ILIKE %s")
+        values.append(f"%{params['org_name']}%")
+    elif params.get("source_id"):
+        clauses.append("source_id = %s::uuid")
+        values.append(params["source_id"])
+
+    if params.get("date_from"):
+        clauses.append("created_at >= %s")
+        values.append(params["date_from"])
+    if params.get("date_to"):
+        clauses.append("created_at <= %s")
+        values.append(params["date_to"])
+
+    if kind == "soft_delete":
+        clauses.append("deleted_at IS NULL")
+    elif kind == "restore":
+        clauses.append("deleted_at IS NOT NULL")
+
+    return clauses, values
+
+
+def count_matching(cursor, kind: str, params: Dict[str, Any]) -> int:
+    clauses, values = build_filter(kind, params)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    cursor.execute(f"SELECT COUNT(*) AS count FROM jobs {where}", values)
+    row = cursor.fetchone()
+    return row["count"] if isinstance(row, dict) else row[0]
+
+
+class BulkJobOperation:
+    """State of one bulk operation; mirrors a job_bulk_operations row"""
+
+    def __init__(
+        self,
+        kind: str,
+        params: Dict[str, Any],
+        operation_id: Optional[str] = None,
+        chunk_size: int = BULK_CHUNK_SIZE,
+    ):
+        if kind not in OPERATION_KINDS:
+            raise ValueError(f"Unknown bulk operation: {kind}")
+        self.id = operation_id or str(uuid.uuid4())
+        self.kind = kind
+        self.params = params
+        self.chunk_size = chunk_size
+        self.status = "pending"
+        self.total = 0
+        self.processed = 0
+        self.affected = 0
+        self.chunks = 0
+        self.last_id: Optional[str] = None
+        self.affected_sample: List[str] = []
+        self.error: Optional[str] = None
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.updated_at: Optional[datetime] = None  # Last persisted checkpoint
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "operation_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "total": self.total,
+            "processed": self.processed,
+            "affected": self.affected,
+            "chunks": self.chunks,
+            "last_id": self.last_id,
+            "error": self.error,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "BulkJobOperation":
+        params = row["params"]
+        if isinstance(params, str):
+            params = json.loads(params)
+        op = cls(row["kind"], params, operation_id=str(row["id"]))
+        op.status = row["status"]
+        op.total = row["total"] or 0
+        op.processed = row["processed"] or 0
+        op.affected = row["affected"] or 0
+        op.chunks = row.get("chunks") or 0
+        op.last_id = str(row["last_id"]) if row.get("last_id") else None
+        op.error = row.get("error")
+        op.started_at = row.get("created_at")
+        op.finished_at = row.get("finished_at")
+        op.updated_at = row.get("updated_at")
+        return op
+
+    def is_stale(self, max_age_seconds: float = STALE_OPERATION_SECONDS) -> bool:
+        """No checkpoint persisted within max_age_seconds (or none at all)"""
+        if self.updated_at is None:
+            return True
+        updated_at = self.updated_at
+        if updated_at.tzinfo is None:
+            updated_at = updated_at.replace(tzinfo=timezone.utc)
+        return (datetime.now(timezone.utc) - updated_at).total_seconds() > max_age_seconds
+
+
+class BulkJobOperationRunner:
+    """Executes BulkJobOperations chunk by chunk"""
+
+    def __init__(self):
+        self._operations: Dict[str, BulkJobOperation] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._active: Set[str] = set()  # Operations executing in this process
+
+    def get(self, operation_id: str) -> Optional[BulkJobOperation]:
+        op = self._operations.get(operation_id)
+        if op is None:
+            op = self._load(operation_id)
+            if op is not None:
+                self._operations[operation_id] = op
+        return op
+
+    def owns(self, operation_id: str) -> bool:
+        """True while the operation is executing in this process"""
+        return operation_id in self._active
+
+    def refresh(self, operation_id: str) -> Optional[BulkJobOperation]:
+        """
+        Current state of an operation: the live object when it runs here,
+        otherwise re-read from job_bulk_operations (another worker may own it).
+        """
+        if self.owns(operation_id):
+            return self._operations.get(operation_id)
+        op = self._load(operation_id)
+        if op is None:
+            return self._operations.get(operation_id)
+        self._operations[operation_id] = op
+        return op
+
+    def create(self, kind: str, params: Dict[str, Any], total: int,
+               chunk_size: int = BULK_CHUNK_SIZE) -> BulkJobOperation:
+        op = BulkJobOperation(kind, params, chunk_size=chunk_size)
+        op.total = total
+        op.started_at = datetime.utcnow()
+        self._operations[op.id] = op
+        self._persist_new(op)
+        return op
+
+    # Persistence
+
+    def _persist_new(self, op: BulkJobOperation):
+        conn = _get_db_conn()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    INSERT INTO job_bulk_operations (id, kind, params, status, total)
+                    VALUES (%s::uuid, %s, %s::jsonb, %s, %s)
+                """, (op.id, op.kind, json.dumps(op.params), op.status, op.total))
+            conn.commit()
+        except Exception as e:
+            # Running without the table only loses resumability
+            conn.rollback()
+            logger.warning(f"[job_bulk_ops] Could not persist operation {op.id}: {e}")
+        finally:
+            conn.close()
+
+    def _load(self, operation_id: str) -> Optional[BulkJobOperation]:
+        try:
+            conn = _get_db_conn()
+        except Exception:
+            return None
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute("SELECT * FROM job_bulk_operations WHERE id = %s::uuid", (operation_id,))
+                row = cur.fetchone()
+                return BulkJobOperation.from_row(row) if row else None
+        except Exception as e:
+            logger.warning(f"[job_bulk_ops] Could not load operation {operation_id}: {e}")
+            return None
+        finally:
+            conn.close()
+
+    def _checkpoint(self, cur, op: BulkJobOperation):
+        cur.execute("SAVEPOINT bulk_op_checkpoint")
+        try:
+            cur.execute("""
+                UPDATE job_bulk_operations
+                SET status = %s, processed = %s, affected = %s, chunks = %s,
+                    last_id = %s::uuid, error = %s, updated_at = NOW(),
+                    finished_at = CASE WHEN %s THEN NOW() ELSE NULL END
+                WHERE id = %s::uuid
+            """, (op.status, op.processed, op.affected, op.chunks, op.last_id,
+                  op.error, op.done, op.id))
+        except psycopg2.Error:
+            cur.execute("ROLLBACK TO SAVEPOINT bulk_op_checkpoint")
+
+    def _finish(self, op: BulkJobOperation):
+        try:
+            conn = _get_db_conn()
+        except Exception:
+            return
+        try:
+            with conn.cursor() as cur:
+                self._checkpoint(cur, op)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.warning(f"[job_bulk_ops] Could not record final state of {op.id}: {e}")
+        finally:
+            conn.close()
+
+    # Execution
+
+    def _apply_chunk(self, cur, op: BulkJobOperation, ids: List[str]) -> List[Dict[str, Any]]:
+        if op.kind == "soft_delete":
+            cur.execute("""
+                UPDATE jobs
+                SET deleted_at = NOW(),
+                    deleted_by = 'admin',
+                    deletion_reason = %s
+                WHERE id = ANY(%s::uuid[])
+                AND deleted_at IS NULL
+                RETURNING id::text AS id, source_id::text AS source_id
+            """, (op.params.get("deletion_reason") or "Bulk deletion via admin", ids))
+        elif op.kind == "hard_delete":
+            cur.execute("""
+                DELETE FROM jobs
+                WHERE id = ANY(%s::uuid[])
+                RETURNING id::text AS id, source_id::text AS source_id
+            """, (ids,))
+        else:
+            cur.execute("""
+                UPDATE jobs
+                SET deleted_at = NULL,
+                    deleted_by = NULL,
+                    deletion_reason = NULL
+                WHERE id = ANY(%s::uuid[])
+                AND deleted_at IS NOT NULL
+                RETURNING id::text AS id, source_id::text AS source_id
+            """, (ids,))
+        return cur.fetchall()
+
+    def _write_audit(self, cur, op: BulkJobOperation, rows: List[Dict[str, Any]]):
+        """One job_deletion_audit row per source in the chunk, inserted in one statement"""
+        if op.kind == "restore" or not rows:
+            return
+        by_source: Dict[Optional[str], List[str]] = defaultdict(list)
+        for row in rows:
+            by_source[row["source_id"]].append(row["id"])
+        deletion_type = "hard" if op.kind == "hard_delete" else "soft"
+        values = [
+            (
+                source_id,
+                "admin",
+                deletion_type,
+                len(job_ids),
+                op.params.get("deletion_reason"),
+                json.dumps({"operation_id": op.id, "chunk": op.chunks, "job_ids": job_ids}),
+            )
+            for source_id, job_ids in by_source.items()
+        ]
+        cur.execute("SAVEPOINT bulk_op_audit")
+        try:
+            execute_values(cur, """
+                INSERT INTO job_deletion_audit
+                    (source_id, deleted_by, deletion_type, jobs_count, deletion_reason, metadata)
+                VALUES %s
+            """, values, template="(%s::uuid, %s, %s, %s, %s, %s::jsonb)")
+        except psycopg2.Error as e:
+            cur.execute("ROLLBACK TO SAVEPOINT bulk_op_audit")
+            logger.warning(f"[job_bulk_ops] Audit insert skipped for {op.id}: {e}")
+
+    def _next_ids(self, cur, op: BulkJobOperation) -> List[str]:
+        clauses, values = build_filter(op.kind, op.params)
+        if op.last_id:
+            clauses.append("id > %s::uuid")
+            values.append(op.last_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        cur.execute(
+            f"SELECT id::text AS id FROM jobs {where} ORDER BY id LIMIT %s",
+            values + [op.chunk_size],
+        )
+        return [row["id"] for row in cur.fetchall()]
+
+    def run_chunk(self, op: BulkJobOperation) -> bool:
+        """Process one chunk; returns False once the target set is exhausted"""
+        conn = _get_db_conn()
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                ids = self._next_ids(cur, op)
+                if not ids:
+                    return False
+                rows = self._apply_chunk(cur, op, ids)
+                op.chunks += 1
+                op.processed += len(ids)
+                op.affected += len(rows)
+                op.last_id = ids[-1]
+                if len(op.affected_sample) < 100:
+                    op.affected_sample.extend(r["id"] for r in rows[:100 - len(op.affected_sample)])
+                self._write_audit(cur, op, rows)
+                self._checkpoint(cur, op)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        invalidate_jobs(r["id"] for r in rows)
+        if op.kind != "restore":
+            remove_from_search([r["id"] for r in rows])
+        return True
+
+    def run(self, op: BulkJobOperation) -> BulkJobOperation:
+        """Run an operation to completion in the calling thread"""
+        op.status = "running"
+        self._active.add(op.id)
+        try:
+            while self.run_chunk(op):
+                pass
+            op.status = "completed"
+        except Exception as e:
+            op.status = "failed"
+            op.error = str(e)
+            logger.error(f"[job_bulk_ops] Operation {op.id} failed after {op.chunks} chunk(s): {e}")
+        finally:
+            self._active.discard(op.id)
+        op.finished_at = datetime.utcnow()
+        self._finish(op)
+        logger.info(f"[job_bulk_ops] {op.kind} {op.id}: {op.affected}/{op.processed} job(s) in {op.chunks} chunk(s)")
+        return op
+
+    async def run_async(self, op: BulkJobOperation) -> BulkJobOperation:
+        """Run an operation chunk by chunk without blocking the event loop"""
+        op.status = "running"
+        self._active.add(op.id)
+        try:
+            while await asyncio.to_thread(self.run_chunk, op):
+                pass
+            op.status = "completed"
+        except Exception as e:
+            op.status = "failed"
+            op.error = str(e)
+            logger.error(f"[job_bulk_ops] Operation {op.id} failed after {op.chunks} chunk(s): {e}")
+        finally:
+            self._active.discard(op.id)
+        op.finished_at = datetime.utcnow()
+        await asyncio.to_thread(self._finish, op)
+        logger.info(f"[job_bulk_ops] {op.kind} {op.id}: {op.affected}/{op.processed} job(s) in {op.chunks} chunk(s)")
+        return op
+
+    def start_background(self, op: BulkJobOperation) -> BulkJobOperation:
+        """Schedule an operation on the running event loop (also used to resume)"""
+        task = self._tasks.get(op.id)
+        if task and not task.done():
+            return op
+        op.status = "running"
+        op.error = None
+        op.finished_at = None
+        self._active.add(op.id)
+        self._tasks[op.id] = asyncio.create_task(self.run_async(op))
+        return op
+
+
+def remove_from_search(job_ids: List[str]):
+    """Delete a chunk of jobs from Meilisearch; failures are logged, not raised"""
+    if not job_ids or not MEILISEARCH_AVAILABLE:
+        return
+    meili_host = os.getenv("MEILISEARCH_URL") or os.getenv("MEILI_HOST")
+    meili_key = os.getenv("MEILISEARCH_KEY") or os.getenv("MEILI_API_KEY")
+    meili_index_name = os.getenv("MEILI_JOBS_INDEX", "jobs_index")
+    if not (meili_host and meili_key and meilisearch):
+        return
+    try:
+        index = meilisearch.Client(meili_host, meili_key).index(meili_index_name)  # type: ignore[union-attr]
+        for i in range(0, len(job_ids), MEILI_DELETE_BATCH_SIZE):
+            index.delete_documents(job_ids[i:i + MEILI_DELETE_BATCH_SIZE])
+    except Exception as e:
+        logger.warning(f"[job_bulk_ops] Failed to delete {len(job_ids)} job(s) from Meilisearch: {e}")
+
+
+_runner: Optional[BulkJobOperationRunner] = None
+
+
+def get_bulk_runner() -> BulkJobOperationRunner:
+    global _runner
+    if _runner is None:
+        _runner = BulkJobOperationRunner()
+    return _runner
@@ -5,18 +5,30 @@ Provides comprehensive job search, filtering, bulk operations, and deletion capa
 Works even when sources are deleted.
 """
 import os
+import io
+import csv
+import zlib
+import asyncio
 import logging
 import json
 import traceback
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, Query  # pyright: ignore[reportMissingImports]
+from fastapi.responses import StreamingResponse  # pyright: ignore[reportMissingImports]
 from pydantic import BaseModel  # type: ignore
 import psycopg2  # type: ignore
 from psycopg2.extras import RealDictCursor  # type: ignore
 
 from security.admin_auth import admin_required
 from app.db_config import db_config
+from app.job_bulk_ops import (
+    BACKGROUND_THRESHOLD,
+    build_filter,
+    count_matching,
+    get_bulk_runner,
+    normalize_job_ids,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +40,16 @@ except ImportError:
     meilisearch = None  # type: ignore[assignment]
     MEILISEARCH_AVAILABLE = False
 
+# Optional columnar export support
+try:
+    import pyarrow as pa  # type: ignore[reportMissingImports]
+    import pyarrow.parquet as pq  # type: ignore[reportMissingImports]
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None  # type: ignore[assignment]
+    pq = None  # type: ignore[assignment]
+    PYARROW_AVAILABLE = False
+
 router = APIRouter(prefix="/api/admin/jobs", tags=["job_management"])
 
 
@@ -66,6 +88,7 @@ class BulkDeleteRequest(BaseModel):
     deletion_reason: Optional[str] = None
     export_data: bool = False
     dry_run: bool = False
+    background: bool = False  # force a background operation regardless of size
 
 
 class RestoreRequest(BaseModel):
@@ -76,7 +99,245 @@ class ExportRequest(BaseModel):
     job_ids: Optional[List[str]] = None
     org_name: Optional[str] = None
     source_id: Optional[str] = None
-    format: str = "json"  # "json" or "csv"
+    format: str = "json"  # "json", "csv", "ndjson" or "parquet"
+    gzip: bool = False  # gzip csv/ndjson streams
+    # Resume cursor: created_at/id of the last row already received
+    after_created_at: Optional[str] = None
+    after_id: Optional[str] = None
+    limit: Optional[int] = None  # cap on streamed rows (None = all)
+
+
+# Streaming export settings
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_JSON_LIMIT = 10000
+EXPORT_FORMATS = {"json", "csv", "ndjson", "parquet"}
+
+EXPORT_COLUMNS = [
+    "id", "title", "org_name", "location_raw", "country_iso", "level_norm",
+    "deadline", "apply_url", "description_snippet", "status", "source_id",
+    "created_at", "fetched_at",
+]
+
+EXPORT_SELECT = """
+    SELECT 
+        id::text,
+        title,
+        org_name,
+        location_raw,
+        country_iso,
+        level_norm,
+        deadline,
+        apply_url,
+        description_snippet,
+        status,
+        source_id::text as source_id,
+        created_at,
+        fetched_at
+    FROM jobs
+"""
+
+
+def _validate_export_request(request: ExportRequest) -> ExportRequest:
+    """
+    Check job_ids and the resume cursor up front (400), since a stream cannot
+    report an error once its headers are sent. Returns a normalized copy.
+    """
+    if bool(request.after_created_at) != bool(request.after_id):
+        raise HTTPException(status_code=400, detail="after_created_at and after_id must be given together")
+    
+    update: Dict[str, Any] = {}
+    if request.job_ids:
+        valid, invalid = normalize_job_ids(request.job_ids)
+        if invalid:
+            raise HTTPException(status_code=400, detail=f"Invalid job_ids: {', '.join(map(str, invalid[:10]))}")
+        update["job_ids"] = valid
+    
+    if request.after_id:
+        valid, _ = normalize_job_ids([request.after_id])
+        if not valid:
+            raise HTTPException(status_code=400, detail=f"Invalid after_id: {request.after_id}")
+        update["after_id"] = valid[0]
+        try:
+            after_created_at = datetime.fromisoformat(request.after_created_at.strip())
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid after_created_at: {request.after_created_at}")
+        update["after_created_at"] = after_created_at.isoformat()
+    
+    return request.model_copy(update=update)
+
+
+def _build_export_query(request: ExportRequest, streaming: bool):
+    """Build the export SELECT with keyset ordering for resumable streams"""
+    where_clauses = []
+    params: List[Any] = []
+    
+    if request.job_ids:
+        where_clauses.append("id = ANY(%s::uuid[])")
+        params.append(request.job_ids)
+    elif request.org_name:
+        where_clauses.append("org_name ILIKE %s")
+        params.append(f"%{request.org_name}%")
+    elif request.source_id:
+        where_clauses.append("source_id::text = %s")
+        params.append(request.source_id)
+    
+    if request.after_created_at and request.after_id:
+        where_clauses.append("(created_at, id) < (%s::timestamptz, %s::uuid)")
+        params.extend([request.after_created_at, request.after_id])
+    
+    where_clause = f"WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
+    
+    limit = request.limit if streaming else min(request.limit or EXPORT_JSON_LIMIT, EXPORT_JSON_LIMIT)
+    limit_clause = ""
+    if limit:
+        limit_clause = "LIMIT %s"
+        params.append(limit)
+    
+    # id breaks created_at ties so the resume cursor is a total order
+    sql = f"{EXPORT_SELECT} {where_clause} ORDER BY created_at DESC, id DESC {limit_clause}"
+    return sql, params
+
+
+def _iter_export_rows(conn, sql: str, params: List[Any]) -> Iterator[List[Dict[str, Any]]]:
+    """Yield row chunks from a named (server-side) cursor, closing conn at the end"""
+    try:
+        with conn.cursor(name="jobs_export", cursor_factory=RealDictCursor) as cursor:
+            cursor.itersize = EXPORT_CHUNK_SIZE
+            cursor.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(EXPORT_CHUNK_SIZE)
+                if not rows:
+                    break
+                yield rows
+    finally:
+        conn.close()
+
+
+def _export_value(value: Any) -> Any:
+    # dates and timestamps
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def _encode_csv(chunks: Iterator[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in chunks:
+        for row in rows:
+            writer.writerow([_export_value(row[col]) for col in EXPORT_COLUMNS])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _encode_ndjson(chunks: Iterator[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    for rows in chunks:
+        yield "".join(
+            json.dumps({col: _export_value(row[col]) for col in EXPORT_COLUMNS}) + "\n"
+            for row in rows
+        ).encode("utf-8")
+
+
+class _ParquetSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back to the stream"""
+    
+    def __init__(self):
+        self._pending: List[bytes] = []
+        self._position = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._pending.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def drain(self) -> bytes:
+        data = b"".join(self._pending)
+        self._pending = []
+        return data
+
+
+def _parquet_schema():
+    return pa.schema([
+        ("id", pa.string()),
+        ("title", pa.string()),
+        ("org_name", pa.string()),
+        ("location_raw", pa.string()),
+        ("country_iso", pa.string()),
+        ("level_norm", pa.string()),
+        ("deadline", pa.date32()),
+        ("apply_url", pa.string()),
+        ("description_snippet", pa.string()),
+        ("status", pa.string()),
+        ("source_id", pa.string()),
+        ("created_at", pa.timestamp("us", tz="UTC")),
+        ("fetched_at", pa.timestamp("us", tz="UTC")),
+    ])
+
+
+def _encode_parquet(chunks: Iterator[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    """One row group per cursor chunk; the footer is written when the stream ends"""
+    schema = _parquet_schema()
+    sink = _ParquetSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for rows in chunks:
+            writer.write_table(pa.Table.from_pylist([dict(row) for row in rows], schema=schema))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def _gzip_stream(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _stream_export(conn, request: ExportRequest) -> StreamingResponse:
+    """Build a StreamingResponse for csv/ndjson/parquet exports"""
+    sql, params = _build_export_query(request, streaming=True)
+    chunks = _iter_export_rows(conn, sql, params)
+    stamp = datetime.utcnow().strftime("%Y%m%d")
+    
+    if request.format == "parquet":
+        body = _encode_parquet(chunks)
+        media_type = "application/vnd.apache.parquet"
+        filename = f"jobs-export-{stamp}.parquet"
+    else:
+        if request.format == "csv":
+            body = _encode_csv(chunks)
+            media_type = "text/csv"
+        else:
+            body = _encode_ndjson(chunks)
+            media_type = "application/x-ndjson"
+        filename = f"jobs-export-{stamp}.{request.format}"
+        if request.gzip:
+            body = _gzip_stream(body)
+            media_type = "application/gzip"
+            filename += ".gz"
+    
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 # Endpoints
@@ -353,293 +614,99 @@ async def bulk_delete_jobs(
     """
     Bulk delete jobs with comprehensive options.
     Works even when sources are deleted.
+    
+    Jobs are deleted in chunks (see app.job_bulk_ops). Requests matching more
+    than BACKGROUND_THRESHOLD jobs, or with background=true, return an
+    operation_id immediately; follow progress via /operations/{id}/progress.
     """
-    import traceback
+    logger.info(f"[bulk_delete] type={request.deletion_type}, job_ids={len(request.job_ids) if request.job_ids else 0}, org_name={request.org_name}, source_id={request.source_id}")
     
-    logger.info(f"[bulk_delete] Received deletion request: type={request.deletion_type}, job_ids={len(request.job_ids) if request.job_ids else 0}, org_name={request.org_name}, source_id={request.source_id}, admin={admin}")
+    # Validate that at least one filter is provided to prevent accidental deletion of all jobs
+    if not request.job_ids and not request.org_name and not request.source_id:
+        raise HTTPException(
+            status_code=400,
+            detail="At least one filter is required: job_ids, org_name, or source_id"
+        )
+    if not request.job_ids:
+        if request.org_name is not None and not request.org_name.strip():
+            raise HTTPException(status_code=400, detail="org_name cannot be empty")
+        if not request.org_name and request.source_id is not None:
+            if not normalize_job_ids([request.source_id])[0]:
+                raise HTTPException(status_code=400, detail="source_id must be a valid UUID")
+    if request.deletion_type not in ("soft", "hard"):
+        raise HTTPException(status_code=400, detail="deletion_type must be 'soft' or 'hard'")
+    if request.deletion_type == "hard" and not (request.deletion_reason and request.deletion_reason.strip()):
+        raise HTTPException(status_code=400, detail="Deletion reason is required for hard delete")
+    
+    kind = "hard_delete" if request.deletion_type == "hard" else "soft_delete"
+    params: Dict[str, Any] = {
+        "org_name": request.org_name,
+        "source_id": request.source_id,
+        "date_from": request.date_from,
+        "date_to": request.date_to,
+        "deletion_reason": request.deletion_reason or ("Bulk deletion via admin" if kind == "soft_delete" else None),
+    }
+    
+    def empty_result(message: str) -> Dict[str, Any]:
+        return {
+            "status": "ok",
+            "data": {
+                "deleted_count": 0,
+                "deleted_ids": [],
+                "deletion_type": request.deletion_type,
+                "exported_data": None,
+                "message": message
+            }
+        }
+    
+    if request.job_ids:
+        valid_ids, invalid_ids = normalize_job_ids(request.job_ids)
+        if invalid_ids:
+            logger.warning(f"[bulk_delete] Ignoring {len(invalid_ids)} malformed job ID(s)")
+        if not valid_ids:
+            return empty_result(f"None of the {len(request.job_ids)} requested job IDs are valid.")
+        params["job_ids"] = valid_ids
     
     conn = None
     cursor = None
     try:
         conn = get_db_conn()
         cursor = conn.cursor(cursor_factory=RealDictCursor)
-        logger.info("[bulk_delete] Database connection established")
-        
-        # Validate that at least one filter is provided to prevent accidental deletion of all jobs
-        if not request.job_ids and not request.org_name and not request.source_id:
-            raise HTTPException(
-                status_code=400,
-                detail="At least one filter is required: job_ids, org_name, or source_id"
-            )
-        
-        # Build WHERE clause
-        where_clauses = []
-        params = []
-        
-        if request.job_ids:
-            if not isinstance(request.job_ids, list) or len(request.job_ids) == 0:
-                raise HTTPException(status_code=400, detail="job_ids must be a non-empty array")
-            
-            # Validate job IDs exist and log details
-            # Ensure all IDs are strings for consistent comparison
-            job_ids_str = [str(jid).strip() for jid in request.job_ids]
-            placeholders = ','.join(['%s'] * len(job_ids_str))
-            
-            check_query = f"""
-                SELECT id::text, title, deleted_at, status
-                FROM jobs 
-                WHERE id::text = ANY(ARRAY[{placeholders}]::text[])
-            """
-            
-            logger.info(f"[bulk_delete] Checking if {len(job_ids_str)} job IDs exist in database...")
-            logger.info(f"[bulk_delete] Sample job IDs: {job_ids_str[:3]}")
-            logger.info(f"[bulk_delete] Sample job ID types: {[type(id).__name__ for id in job_ids_str[:3]]}")
-            
-            cursor.execute(check_query, job_ids_str)
-            existing_jobs = cursor.fetchall()
-            existing_ids = [row['id'] for row in existing_jobs]
-            logger.info(f"[bulk_delete] Found {len(existing_ids)} existing jobs in database")
-            already_deleted = [row['id'] for row in existing_jobs if row.get('deleted_at')]
-            
-            logger.info(f"[bulk_delete] Requested {len(request.job_ids)} job IDs")
-            logger.info(f"[bulk_delete] Found {len(existing_ids)} existing jobs in database")
-            if len(existing_ids) > 0:
-                logger.info(f"[bulk_delete] Sample existing jobs: {[{'id': r['id'], 'title': r.get('title', '')[:30], 'deleted_at': r.get('deleted_at'), 'status': r.get('status')} for r in existing_jobs[:3]]}")
-            if already_deleted:
-                if request.deletion_type == "hard":
-                    logger.info(f"[bulk_delete] {len(already_deleted)} jobs are soft-deleted but will be hard-deleted: {already_deleted[:5]}")
-                else:
-                    logger.info(f"[bulk_delete] {len(already_deleted)} jobs are already deleted and will be skipped: {already_deleted[:5]}")
-            if len(existing_ids) < len(request.job_ids):
-                missing = set(request.job_ids) - set(existing_ids)
-                logger.warning(f"[bulk_delete] {len(missing)} job IDs not found in database: {list(missing)[:5]}")
-            
-            # Only add to WHERE clause if we have existing jobs (for hard delete, include even deleted ones)
-            if len(existing_ids) == 0:
-                logger.error(f"[bulk_delete] None of the requested job IDs exist! Cannot proceed with deletion.")
-                return {
-                    "status": "ok",
-                    "data": {
-                        "deleted_count": 0,
-                        "deleted_ids": [],
-                        "deletion_type": request.deletion_type,
-                        "exported_data": None,
-                        "message": f"None of the {len(request.job_ids)} requested job IDs exist in the database."
-                    }
-                }
-            
-            # Use text array comparison - ensures consistent matching
-            # Convert all IDs to strings and use text array
-            job_ids_str = [str(jid).strip() for jid in request.job_ids]
-            placeholders = ','.join(['%s'] * len(job_ids_str))
-            where_clauses.append(f"id::text = ANY(ARRAY[{placeholders}]::text[])")
-            params.extend(job_ids_str)
-        elif request.org_name:
-            if not request.org_name.strip():
-                raise HTTPException(status_code=400, detail="org_name cannot be empty")
-            where_clauses.append("org_name ILIKE %s")
-            params.append(f"%{request.org_name}%")
-        elif request.source_id:
-            if not request.source_id.strip():
-                raise HTTPException(status_code=400, detail="source_id cannot be empty")
-            where_clauses.append("source_id::text = %s")
-            params.append(request.source_id)
         
-        if request.date_from:
-            where_clauses.append("created_at >= %s")
-            params.append(request.date_from)
-        
-        if request.date_to:
-            where_clauses.append("created_at <= %s")
-            params.append(request.date_to)
-        
-        # For soft delete, only delete non-deleted jobs
-        # For hard delete, we can delete even already soft-deleted jobs
-        if request.deletion_type == "soft":
-            where_clauses.append("deleted_at IS NULL")
-        
-        where_clause = f"WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
-        
-        logger.info(f"[bulk_delete] WHERE clause: {where_clause}")
-        logger.info(f"[bulk_delete] Params: {params}")
-        logger.info(f"[bulk_delete] Deletion type: {request.deletion_type}")
-        
-        # First, check how many jobs match the criteria (for debugging)
-        # Also check if jobs exist at all (without WHERE clause filters)
-        total_existing = 0
-        if request.job_ids:
-            job_ids_str = [str(jid).strip() for jid in request.job_ids]
-            placeholders = ','.join(['%s'] * len(job_ids_str))
-            check_all_query = f"SELECT COUNT(*) as count FROM jobs WHERE id::text = ANY(ARRAY[{placeholders}]::text[])"
-            cursor.execute(check_all_query, job_ids_str)
-            total_existing = cursor.fetchone()['count']
-            logger.info(f"[bulk_delete] Total jobs with these IDs (including deleted): {total_existing}")
-        
-        if where_clause:
-            cursor.execute(f"SELECT COUNT(*) as count FROM jobs {where_clause}", params)
-        else:
-            cursor.execute("SELECT COUNT(*) as count FROM jobs", [])
-        matching_count = cursor.fetchone()['count']
-        logger.info(f"[bulk_delete] Found {matching_count} jobs matching deletion criteria (with WHERE clause)")
-        
-        # If we have job_ids and matching_count is 0, check what's wrong
-        if request.job_ids and matching_count == 0:
-            if total_existing > 0:
-                logger.warning(f"[bulk_delete] Jobs exist but don't match WHERE clause!")
-                logger.warning(f"[bulk_delete] This suggests the WHERE clause is filtering them out")
-                # Check if they're soft-deleted
-                job_ids_str = [str(jid).strip() for jid in request.job_ids]
-                placeholders = ','.join(['%s'] * len(job_ids_str))
-                check_deleted_query = f"SELECT id::text, deleted_at FROM jobs WHERE id::text = ANY(ARRAY[{placeholders}]::text[])"
-                cursor.execute(check_deleted_query, job_ids_str)
-                job_statuses = cursor.fetchall()
-                for job in job_statuses:
-                    logger.warning(f"[bulk_delete] Job {job['id']}: deleted_at={job.get('deleted_at')}")
-            else:
-                logger.warning(f"[bulk_delete] None of the requested job IDs exist in the database!")
-                logger.warning(f"[bulk_delete] Requested IDs: {request.job_ids[:5]}...")
+        matching_count = count_matching(cursor, kind, params)
+        logger.info(f"[bulk_delete] {matching_count} job(s) match the deletion criteria")
         
         if matching_count == 0:
-            logger.warning(f"[bulk_delete] No jobs match the deletion criteria. WHERE: {where_clause}, params: {params}")
-            # Still return success but with 0 count
-            return {
-                "status": "ok",
-                "data": {
-                    "deleted_count": 0,
-                    "deleted_ids": [],
-                    "deletion_type": request.deletion_type,
-                    "exported_data": None,
-                    "message": "No jobs matched the deletion criteria. They may have already been deleted or the filters did not match any jobs."
-                }
-            }
+            return empty_result("No jobs matched the deletion criteria. They may have already been deleted or the filters did not match any jobs.")
         
         # Dry run - just count
         if request.dry_run:
-            cursor.execute(f"SELECT COUNT(*) as count FROM jobs {where_clause}", params)
-            count = cursor.fetchone()['count']
             return {
                 "status": "ok",
                 "data": {
                     "dry_run": True,
-                    "jobs_to_delete": count,
-                    "message": f"Dry run: Would delete {count} jobs"
+                    "jobs_to_delete": matching_count,
+                    "message": f"Dry run: Would delete {matching_count} jobs"
                 }
             }
         
         # Export data if requested
         exported_data = None
         if request.export_data:
+            clauses, values = build_filter(kind, params)
             cursor.execute(f"""
                 SELECT id::text, title, org_name, apply_url, location_raw, deadline, 
                        created_at, fetched_at, source_id::text as source_id
                 FROM jobs
-                {where_clause}
+                WHERE {' AND '.join(clauses)}
                 LIMIT 10000
-            """, params)
-            exported_jobs = cursor.fetchall()
-            exported_data = [dict(job) for job in exported_jobs]
-        
-        # Perform deletion
-        if request.deletion_type == "hard":
-            if not request.deletion_reason or not request.deletion_reason.strip():
-                raise HTTPException(status_code=400, detail="Deletion reason is required for hard delete")
-            
-            # Hard delete - actually remove from database
-            # Note: Hard delete can delete even already soft-deleted jobs
-            logger.info(f"[bulk_delete] Performing hard delete with WHERE: {where_clause}, params: {params}")
-            if where_clause:
-                cursor.execute(f"DELETE FROM jobs {where_clause} RETURNING id::text", params)
-            else:
-                # This should never happen due to validation, but handle it
-                raise HTTPException(status_code=400, detail="Cannot hard delete all jobs - filter required")
-            deleted_ids = [row['id'] for row in cursor.fetchall()]
-            deleted_count = len(deleted_ids)
-            logger.info(f"[bulk_delete] Hard deleted {deleted_count} jobs: {deleted_ids[:10]}")
-        else:
-            # Soft delete
-            deletion_reason = request.deletion_reason or "Bulk deletion via admin"
-            logger.info(f"[bulk_delete] Performing soft delete with WHERE: {where_clause}, reason: {deletion_reason[:50]}, params count: {len(params)}")
-            
-            # Build the full parameter list: deletion_reason first (for SET clause), then WHERE params
-            full_params = [deletion_reason] + params
-            logger.info(f"[bulk_delete] Full params: deletion_reason='{deletion_reason[:30]}...', WHERE params={params[:5] if len(params) > 5 else params}")
-            
-            # Execute soft delete
-            cursor.execute(f"""
-                UPDATE jobs
-                SET deleted_at = NOW(),
-                    deleted_by = 'admin',
-                    deletion_reason = %s
-                {where_clause}
-                RETURNING id::text
-            """, full_params)
-            deleted_ids = [row['id'] for row in cursor.fetchall()]
-            deleted_count = len(deleted_ids)
-            logger.info(f"[bulk_delete] Soft deleted {deleted_count} jobs: {deleted_ids[:10] if deleted_ids else 'none'}")
-            
-            if deleted_count == 0:
-                logger.warning(f"[bulk_delete] No jobs were deleted! WHERE clause: {where_clause}, params: {params}")
-        
-        conn.commit()
-        logger.info(f"[bulk_delete] Transaction committed. {deleted_count} jobs deleted.")
-        
-        # Small delay to ensure transaction is fully committed before Meilisearch update
-        import time
-        time.sleep(0.1)  # 100ms delay
-        
-        # Remove deleted jobs from Meilisearch index (both hard and soft deletes)
-        # Soft-deleted jobs should also be removed from search since they're filtered out
-        if deleted_ids and MEILISEARCH_AVAILABLE:
-            try:
-                meili_host = os.getenv("MEILISEARCH_URL") or os.getenv("MEILI_HOST")
-                meili_key = os.getenv("MEILISEARCH_KEY") or os.getenv("MEILI_API_KEY")
-                meili_index_name = os.getenv("MEILI_JOBS_INDEX", "jobs_index")
-                
-                if meili_host and meili_key and meilisearch:
-                    client = meilisearch.Client(meili_host, meili_key)  # type: ignore[union-attr]
-                    index = client.index(meili_index_name)
-                    
-                    # Delete in batches of 100 (Meilisearch limit)
-                    batch_size = 100
-                    for i in range(0, len(deleted_ids), batch_size):
-                        batch = deleted_ids[i:i + batch_size]
-                        try:
-                            index.delete_documents(batch)
-                            logger.info(f"Deleted {len(batch)} jobs from Meilisearch index")
-                        except Exception as e:
-                            logger.warning(f"Failed to delete some jobs from Meilisearch: {e}")
-                            # Continue with other batches even if one fails
-            except Exception as e:
-                logger.warning(f"Failed to update Meilisearch after deletion: {e}")
-                # Don't fail the entire operation if Meilisearch update fails
-        
-        logger.info(f"[bulk_delete] Bulk deleted {deleted_count} jobs (type: {request.deletion_type})")
-        
-        # If no jobs were deleted, return a warning but still success (might be expected)
-        if deleted_count == 0:
-            logger.warning(f"[bulk_delete] WARNING: No jobs were deleted. This might indicate:")
-            logger.warning(f"[bulk_delete]   - Jobs were already deleted")
-            logger.warning(f"[bulk_delete]   - WHERE clause did not match any jobs")
-            logger.warning(f"[bulk_delete]   - Jobs were filtered out by deleted_at IS NULL check")
-        
-        return {
-            "status": "ok",
-            "data": {
-                "deleted_count": deleted_count,
-                "deleted_ids": deleted_ids[:100],  # Limit to first 100 IDs
-                "deletion_type": request.deletion_type,
-                "exported_data": exported_data,
-                "message": f"Successfully {request.deletion_type}-deleted {deleted_count} jobs" if deleted_count > 0 else "No jobs were deleted (they may have already been deleted or did not match the filters)"
-            }
-        }
+            """, values)
+            exported_data = [dict(job) for job in cursor.fetchall()]
     except HTTPException:
         raise
     except psycopg2.Error as e:
-        if conn:
-            conn.rollback()
         error_msg = f"Database error: {str(e)}"
         logger.error(f"[bulk_delete] {error_msg}")
-        logger.error(traceback.format_exc())
         # Check if it's a column missing error
         if "column" in str(e).lower() and "does not exist" in str(e).lower():
             raise HTTPException(
@@ -648,8 +715,6 @@ async def bulk_delete_jobs(
             )
         raise HTTPException(status_code=500, detail=error_msg)
     except Exception as e:
-        if conn:
-            conn.rollback()
         error_msg = f"Unexpected error: {str(e)}"
         logger.error(f"[bulk_delete] {error_msg}")
         logger.error(traceback.format_exc())
@@ -659,6 +724,40 @@ async def bulk_delete_jobs(
             cursor.close()
         if conn:
             conn.close()
+    
+    runner = get_bulk_runner()
+    operation = await asyncio.to_thread(runner.create, kind, params, matching_count)
+    
+    if request.background or matching_count > BACKGROUND_THRESHOLD:
+        runner.start_background(operation)
+        return {
+            "status": "ok",
+            "data": {
+                "operation_id": operation.id,
+                "background": True,
+                "jobs_to_delete": matching_count,
+                "deletion_type": request.deletion_type,
+                "exported_data": exported_data,
+                "message": f"Deleting {matching_count} jobs in the background"
+            }
+        }
+    
+    operation = await asyncio.to_thread(runner.run, operation)
+    if operation.status == "failed":
+        raise HTTPException(status_code=500, detail=f"Database error: {operation.error}")
+    
+    deleted_count = operation.affected
+    return {
+        "status": "ok",
+        "data": {
+            "operation_id": operation.id,
+            "deleted_count": deleted_count,
+            "deleted_ids": operation.affected_sample,  # Limit to first 100 IDs
+            "deletion_type": request.deletion_type,
+            "exported_data": exported_data,
+            "message": f"Successfully {request.deletion_type}-deleted {deleted_count} jobs" if deleted_count > 0 else "No jobs were deleted (they may have already been deleted or did not match the filters)"
+        }
+    }
 
 
 @router.post("/restore")
@@ -669,47 +768,102 @@ async def restore_jobs(
     """
     Restore soft-deleted jobs.
     """
-    conn = None
-    cursor = None
-    try:
-        conn = get_db_conn()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-        
-        placeholders = ','.join(['%s'] * len(request.job_ids))
-        cursor.execute(f"""
-            UPDATE jobs
-            SET deleted_at = NULL,
-                deleted_by = NULL,
-                deletion_reason = NULL
-            WHERE id::text IN ({placeholders})
-            AND deleted_at IS NOT NULL
-            RETURNING id::text
-        """, request.job_ids)
-        
-        restored_ids = [row['id'] for row in cursor.fetchall()]
-        restored_count = len(restored_ids)
-        
-        conn.commit()
-        
+    valid_ids, _ = normalize_job_ids(request.job_ids)
+    if not valid_ids:
         return {
             "status": "ok",
             "data": {
-                "restored_count": restored_count,
-                "restored_ids": restored_ids,
-                "message": f"Successfully restored {restored_count} jobs"
+                "restored_count": 0,
+                "restored_ids": [],
+                "message": "Successfully restored 0 jobs"
             }
         }
-    except Exception as e:
-        if conn:
-            conn.rollback()
-        logger.error(f"Error restoring jobs: {e}")
-        logger.error(traceback.format_exc())
-        raise HTTPException(status_code=500, detail=f"Failed to restore jobs: {str(e)}")
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
+    
+    runner = get_bulk_runner()
+    operation = await asyncio.to_thread(runner.create, "restore", {"job_ids": valid_ids}, len(valid_ids))
+    
+    if len(valid_ids) > BACKGROUND_THRESHOLD:
+        runner.start_background(operation)
+        return {
+            "status": "ok",
+            "data": {
+                "operation_id": operation.id,
+                "background": True,
+                "message": f"Restoring up to {len(valid_ids)} jobs in the background"
+            }
+        }
+    
+    operation = await asyncio.to_thread(runner.run, operation)
+    if operation.status == "failed":
+        logger.error(f"Error restoring jobs: {operation.error}")
+        raise HTTPException(status_code=500, detail=f"Failed to restore jobs: {operation.error}")
+    
+    return {
+        "status": "ok",
+        "data": {
+            "operation_id": operation.id,
+            "restored_count": operation.affected,
+            "restored_ids": operation.affected_sample,
+            "message": f"Successfully restored {operation.affected} jobs"
+        }
+    }
+
+
+@router.get("/operations/{operation_id}")
+async def get_bulk_operation(operation_id: str, admin=Depends(admin_required)):
+    """Current state of a bulk delete/restore operation."""
+    operation = await asyncio.to_thread(get_bulk_runner().get, operation_id)
+    if operation is None:
+        raise HTTPException(status_code=404, detail="Operation not found")
+    return {"status": "ok", "data": operation.to_dict()}
+
+
+@router.get("/operations/{operation_id}/progress")
+async def stream_bulk_operation_progress(
+    operation_id: str,
+    interval: float = Query(1.0, ge=0.2, le=30.0),
+    admin=Depends(admin_required)
+):
+    """
+    Stream operation progress as NDJSON until it completes or fails.
+    
+    Operations not running in this process are re-read each tick; if no
+    checkpoint has been persisted recently the stream ends with status
+    "interrupted" (see POST /operations/{operation_id}/resume).
+    """
+    runner = get_bulk_runner()
+    operation = await asyncio.to_thread(runner.get, operation_id)
+    if operation is None:
+        raise HTTPException(status_code=404, detail="Operation not found")
+    
+    async def progress():
+        op = operation
+        while True:
+            if not runner.owns(operation_id):
+                op = await asyncio.to_thread(runner.refresh, operation_id) or op
+                if not op.done and not runner.owns(operation_id) and op.is_stale():
+                    yield json.dumps({**op.to_dict(), "status": "interrupted"}) + "\n"
+                    break
+            yield json.dumps(op.to_dict()) + "\n"
+            if op.done:
+                break
+            await asyncio.sleep(interval)
+    
+    return StreamingResponse(progress(), media_type="application/x-ndjson")
+
+
+@router.post("/operations/{operation_id}/resume")
+async def resume_bulk_operation(operation_id: str, admin=Depends(admin_required)):
+    """Resume a failed or interrupted operation from its last committed chunk."""
+    runner = get_bulk_runner()
+    operation = await asyncio.to_thread(runner.get, operation_id)
+    if operation is None:
+        raise HTTPException(status_code=404, detail="Operation not found")
+    if operation.status == "completed":
+        return {"status": "ok", "data": operation.to_dict()}
+    
+    runner.start_background(operation)
+    return {"status": "ok", "data": operation.to_dict()}
 
 
 @router.post("/export")
@@ -718,81 +872,49 @@ async def export_jobs(
     admin=Depends(admin_required)
 ):
     """
-    Export jobs to JSON or CSV format.
+    Export jobs.
+    
+    csv, ndjson and parquet are streamed from a server-side cursor in chunks
+    (csv/ndjson optionally gzipped). Large exports can be resumed by passing
+    the created_at/id of the last received row as after_created_at/after_id.
+    json returns the legacy envelope and is capped at 10,000 rows.
     """
+    if request.format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {request.format}")
+    if request.format == "parquet" and not PYARROW_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Parquet export requires pyarrow")
+    request = _validate_export_request(request)
+    
+    if request.format != "json":
+        try:
+            conn = get_db_conn()
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error exporting jobs: {e}")
+            raise HTTPException(status_code=500, detail=f"Failed to export jobs: {str(e)}")
+        # The stream owns the connection and closes it when exhausted
+        return _stream_export(conn, request)
+    
     conn = None
     cursor = None
     try:
         conn = get_db_conn()
         cursor = conn.cursor(cursor_factory=RealDictCursor)
         
-        # Build WHERE clause
-        where_clauses = []
-        params = []
-        
-        if request.job_ids:
-            placeholders = ','.join(['%s'] * len(request.job_ids))
-            where_clauses.append(f"id::text IN ({placeholders})")
-            params.extend(request.job_ids)
-        elif request.org_name:
-            where_clauses.append("org_name ILIKE %s")
-            params.append(f"%{request.org_name}%")
-        elif request.source_id:
-            where_clauses.append("source_id::text = %s")
-            params.append(request.source_id)
-        
-        where_clause = f"WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
-        
-        # Fetch jobs (limit to 10000 for performance)
-        cursor.execute(f"""
-            SELECT 
-                id::text,
-                title,
-                org_name,
-                location_raw,
-                country_iso,
-                level_norm,
-                deadline,
-                apply_url,
-                description_snippet,
-                status,
-                source_id::text as source_id,
-                created_at,
-                fetched_at
-            FROM jobs
-            {where_clause}
-            ORDER BY created_at DESC
-            LIMIT 10000
-        """, params)
+        sql, params = _build_export_query(request, streaming=False)
+        cursor.execute(sql, params)
         
         jobs = [dict(row) for row in cursor.fetchall()]
         
-        if request.format == "csv":
-            import csv
-            import io
-            output = io.StringIO()
-            if jobs:
-                writer = csv.DictWriter(output, fieldnames=jobs[0].keys())
-                writer.writeheader()
-                writer.writerows(jobs)
-            csv_content = output.getvalue()
-            return {
-                "status": "ok",
-                "data": {
-                    "format": "csv",
-                    "content": csv_content,
-                    "count": len(jobs)
-                }
-            }
-        else:
-            return {
-                "status": "ok",
-                "data": {
-                    "format": "json",
-                    "jobs": jobs,
-                    "count": len(jobs)
-                }
+        return {
+            "status": "ok",
+            "data": {
+                "format": "json",
+                "jobs": jobs,
+                "count": len(jobs)
             }
+        }
     except Exception as e:
         logger.error(f"Error exporting jobs: {e}")
         logger.error(traceback.format_exc())
@@ -8,6 +8,7 @@ from functools import lru_cache
 import time
 
 from app.ai_service import get_ai_service
+from core.keyword_matcher import KeywordMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -78,6 +79,86 @@ def parse_query(query: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
     return result
 
 
+REMOTE_TERMS = ["remote", "work from home", "wfh", "telecommute"]
+
+# Checked in order; the first tier with a matching term wins
+EXPERIENCE_TERMS = [
+    (["entry", "junior", "early", "0-2", "0 to 2"], "Early / Junior (0–2 yrs)"),
+    (["mid", "mid-level", "officer", "associate", "2-5", "2 to 5"], "Officer / Associate (2–5 yrs)"),
+    (["senior", "specialist", "advisor", "5-8", "5 to 8"], "Specialist / Advisor (5–8 yrs)"),
+    (["manager", "7-12", "7 to 12"], "Manager / Senior Manager (7–12 yrs)"),
+    (["director", "head", "10+", "10 plus"], "Head of Unit / Director (10+ yrs)"),
+    (["expert", "lead", "technical lead"], "Expert / Technical Lead (variable)"),
+]
+
+IMPACT_KEYWORDS = {
+    "wash": "Water, Sanitation & Hygiene (WASH)",
+    "water": "Water, Sanitation & Hygiene (WASH)",
+    "sanitation": "Water, Sanitation & Hygiene (WASH)",
+    "health": "Public Health & Primary Health Care",
+    "education": "Education (Access & Quality)",
+    "gender": "Gender Equality & Women's Empowerment",
+    "protection": "Child Protection & Early Childhood Development",
+    "shelter": "Shelter & CCCM",
+    "nutrition": "Food Security & Nutrition",
+    "food": "Food Security & Nutrition",
+    "climate": "Climate & Environment",
+    "disaster": "Disaster Risk Reduction & Preparedness",
+    "migration": "Migration, Refugees & Displacement",
+    "refugee": "Migration, Refugees & Displacement",
+    "humanitarian": "Humanitarian Response & Emergency Operations",
+    "meal": "Monitoring, Evaluation, Accountability & Learning (MEAL)",
+    "monitoring": "Monitoring, Evaluation, Accountability & Learning (MEAL)",
+}
+
+ROLE_KEYWORDS = {
+    "program": "Program & Field Implementation",
+    "project manager": "Project Management",
+    "pm": "Project Management",
+    "meal": "MEAL / Research / Evidence",
+    "monitoring": "Monitoring Officer / Field Monitoring",
+    "data": "Data & GIS",
+    "gis": "Data & GIS",
+    "communications": "Communications & Advocacy",
+    "grants": "Grants / Partnerships / Fundraising",
+    "finance": "Finance, Accounting & Audit",
+    "hr": "HR, Admin & Ops",
+    "admin": "HR, Admin & Ops",
+    "logistics": "Logistics, Supply Chain & Procurement",
+    "procurement": "Logistics, Supply Chain & Procurement",
+    "it": "IT / Digital / Systems",
+    "digital": "IT / Digital / Systems",
+    "security": "Security & Safety",
+    "coordinator": "Program & Field Implementation",
+    "officer": "Program & Field Implementation",
+    "specialist": "Technical Specialists",
+    "director": "Senior Leadership",
+}
+
+COMMON_COUNTRIES = ["kenya", "nepal", "bangladesh", "ethiopia", "uganda", "tanzania", "somalia", "sudan", "yemen", "syria"]
+
+_fallback_matchers: Optional[Dict[str, KeywordMatcher]] = None
+
+
+def _get_fallback_matchers() -> Dict[str, KeywordMatcher]:
+    """Vocabularies compiled on first use"""
+    global _fallback_matchers
+    if _fallback_matchers is None:
+        _fallback_matchers = {
+            "remote": KeywordMatcher(REMOTE_TERMS, boundary="auto"),
+            "experience": KeywordMatcher([t for terms, _ in EXPERIENCE_TERMS for t in terms], boundary="auto"),
+            "impact": KeywordMatcher(IMPACT_KEYWORDS, boundary="auto"),
+            "role": KeywordMatcher(ROLE_KEYWORDS, boundary="auto"),
+            "country": KeywordMatcher(COMMON_COUNTRIES, boundary="auto"),
+        }
+    return _fallback_matchers
+
+
+def _in_vocabulary_order(matcher: KeywordMatcher, text: str) -> list:
+    found = matcher.matched(text)
+    return [kw for kw in matcher.keywords if kw in found]
+
+
 def _fallback_parse(query: str) -> Dict[str, Any]:
     """
     Fallback keyword-based parsing when AI is unavailable.
@@ -93,91 +174,45 @@ def _fallback_parse(query: str) -> Dict[str, Any]:
         "free_text": query,
     }
     
+    # One scan of the query per vocabulary; 'auto' boundaries keep short
+    # terms ("it", "hr", "pm", "wfh") from matching inside other words
+    # ("with", "three", "development") while still allowing plurals
+    matchers = _get_fallback_matchers()
+    
     # Check for remote
-    if any(term in query_lower for term in ["remote", "work from home", "wfh", "telecommute"]):
+    if matchers["remote"].search(query_lower):
         result["is_remote"] = True
         result["free_text"] = query_lower.replace("remote", "").replace("work from home", "").replace("wfh", "").strip()
     
-    # Check for experience levels
-    if any(term in query_lower for term in ["entry", "junior", "early", "0-2", "0 to 2"]):
-        result["experience_level"] = "Early / Junior (0–2 yrs)"
-    elif any(term in query_lower for term in ["mid", "mid-level", "officer", "associate", "2-5", "2 to 5"]):
-        result["experience_level"] = "Officer / Associate (2–5 yrs)"
-    elif any(term in query_lower for term in ["senior", "specialist", "advisor", "5-8", "5 to 8"]):
-        result["experience_level"] = "Specialist / Advisor (5–8 yrs)"
-    elif any(term in query_lower for term in ["manager", "7-12", "7 to 12"]):
-        result["experience_level"] = "Manager / Senior Manager (7–12 yrs)"
-    elif any(term in query_lower for term in ["director", "head", "10+", "10 plus"]):
-        result["experience_level"] = "Head of Unit / Director (10+ yrs)"
-    elif any(term in query_lower for term in ["expert", "lead", "technical lead"]):
-        result["experience_level"] = "Expert / Technical Lead (variable)"
+    # Check for experience levels (first tier wins)
+    found_levels = matchers["experience"].matched(query_lower)
+    for terms, level in EXPERIENCE_TERMS:
+        if found_levels.intersection(terms):
+            result["experience_level"] = level
+            break
     
     # Check for common impact domains (keyword matching)
-    impact_keywords = {
-        "wash": "Water, Sanitation & Hygiene (WASH)",
-        "water": "Water, Sanitation & Hygiene (WASH)",
-        "sanitation": "Water, Sanitation & Hygiene (WASH)",
-        "health": "Public Health & Primary Health Care",
-        "education": "Education (Access & Quality)",
-        "gender": "Gender Equality & Women's Empowerment",
-        "protection": "Child Protection & Early Childhood Development",
-        "shelter": "Shelter & CCCM",
-        "nutrition": "Food Security & Nutrition",
-        "food": "Food Security & Nutrition",
-        "climate": "Climate & Environment",
-        "disaster": "Disaster Risk Reduction & Preparedness",
-        "migration": "Migration, Refugees & Displacement",
-        "refugee": "Migration, Refugees & Displacement",
-        "humanitarian": "Humanitarian Response & Emergency Operations",
-        "meal": "Monitoring, Evaluation, Accountability & Learning (MEAL)",
-        "monitoring": "Monitoring, Evaluation, Accountability & Learning (MEAL)",
-    }
-    
-    for keyword, domain in impact_keywords.items():
-        if keyword in query_lower and domain not in result["impact_domain"]:
+    for keyword in _in_vocabulary_order(matchers["impact"], query_lower):
+        domain = IMPACT_KEYWORDS[keyword]
+        if domain not in result["impact_domain"]:
             result["impact_domain"].append(domain)
             if len(result["impact_domain"]) >= 2:
                 break
     
     # Check for common functional roles
-    role_keywords = {
-        "program": "Program & Field Implementation",
-        "project manager": "Project Management",
-        "pm": "Project Management",
-        "meal": "MEAL / Research / Evidence",
-        "monitoring": "Monitoring Officer / Field Monitoring",
-        "data": "Data & GIS",
-        "gis": "Data & GIS",
-        "communications": "Communications & Advocacy",
-        "grants": "Grants / Partnerships / Fundraising",
-        "finance": "Finance, Accounting & Audit",
-        "hr": "HR, Admin & Ops",
-        "admin": "HR, Admin & Ops",
-        "logistics": "Logistics, Supply Chain & Procurement",
-        "procurement": "Logistics, Supply Chain & Procurement",
-        "it": "IT / Digital / Systems",
-        "digital": "IT / Digital / Systems",
-        "security": "Security & Safety",
-        "coordinator": "Program & Field Implementation",
-        "officer": "Program & Field Implementation",
-        "specialist": "Technical Specialists",
-        "director": "Senior Leadership",
-    }
-    
-    for keyword, role in role_keywords.items():
-        if keyword in query_lower and role not in result["functional_role"]:
+    for keyword in _in_vocabulary_order(matchers["role"], query_lower):
+        role = ROLE_KEYWORDS[keyword]
+        if role not in result["functional_role"]:
             result["functional_role"].append(role)
             if len(result["functional_role"]) >= 2:
                 break
     
     # Extract location (simple: look for country names or common city patterns)
     # This is very basic - AI parser is much better
-    common_countries = ["kenya", "nepal", "bangladesh", "ethiopia", "uganda", "tanzania", "somalia", "sudan", "yemen", "syria"]
-    for country in common_countries:
-        if country in query_lower:
-            result["location"] = country.title()
-            result["free_text"] = result["free_text"].replace(country, "").strip()
-            break
+    country = matchers["country"].first(query_lower)
+    if country:
+        result["location"] = country.title()
+        result["free_text"] = result["free_text"].replace(country, "").strip()
     
     return result
 
@@ -0,0 +1,117 @@
+"""
+JSON responses for the search routes: orjson serialization and gzip/brotli
+compression negotiated from Accept-Encoding.
+
+orjson and brotli are optional; without them the stdlib json module and
+gzip are used. RESPONSE_COMPRESSION=false turns compression off, and bodies
+under RESPONSE_COMPRESSION_MIN_BYTES are sent as is.
+"""
+
+import gzip
+import json
+import os
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+
+try:
+    import orjson  # type: ignore[import-not-found]
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+    ORJSON_AVAILABLE = False
+
+try:
+    import brotli  # type: ignore[import-not-found]
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None  # type: ignore[assignment]
+    BROTLI_AVAILABLE = False
+
+RESPONSE_COMPRESSION = os.getenv("RESPONSE_COMPRESSION", "true").lower() not in ("false", "0", "no")
+COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", 1024))
+
+# Favour speed: these levels get most of the size reduction for JSON
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(payload: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick br (when available) or gzip from an Accept-Encoding header"""
+    if not accept_encoding:
+        return None
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    for encoding in (("br",) if BROTLI_AVAILABLE else ()) + ("gzip",):
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def negotiate(request: Request, body: bytes) -> Optional[str]:
+    """Content-Encoding to use for this request and body, or None"""
+    if not RESPONSE_COMPRESSION or len(body) < COMPRESSION_MIN_BYTES:
+        return None
+    return choose_encoding(request.headers.get("accept-encoding"))
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def encoded_response(request: Request, body: bytes, status_code: int = 200,
+                     headers: Optional[Dict[str, str]] = None,
+                     encoding: Optional[str] = None) -> Response:
+    """
+    Response for an already serialized JSON body. Pass the encoding chosen by
+    negotiate() (body already compressed) or leave it None to negotiate here.
+    """
+    headers = dict(headers or {})
+    if encoding is None:
+        encoding = negotiate(request, body)
+        if encoding:
+            body = compress(body, encoding)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    if RESPONSE_COMPRESSION:
+        headers["Vary"] = "Accept-Encoding"
+    return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
+
+
+def json_response(request: Request, payload: Any, status_code: int = 200,
+                  headers: Optional[Dict[str, str]] = None) -> Response:
+    """Serialize payload with dumps() and compress it when the client accepts it"""
+    return encoded_response(request, dumps(payload), status_code, headers)
@@ -1,3 +1,4 @@
+import importlib.util
 import os
 import uuid
 import logging
@@ -25,17 +26,65 @@ else:
         psycopg2 = None  # type: ignore[assignment]
         RealDictCursor = None  # type: ignore[assignment,misc]
 
-    try:
-        import meilisearch
-    except ImportError:
-        meilisearch = None  # type: ignore[assignment]
+    # meilisearch (and its requests stack) is imported when the client is first needed
+    meilisearch = None  # type: ignore[assignment]
 
 logger = logging.getLogger(__name__)
 
 
+MEILISEARCH_AVAILABLE = importlib.util.find_spec("meilisearch") is not None
+
+# Columns returned by a search without a fields= projection
+SEARCH_RESULT_COLUMNS = (
+    "id", "org_name", "title", "location_raw", "country_iso",
+    "level_norm", "deadline", "apply_url", "last_seen_at",
+    "mission_tags", "international_eligible", "org_type",
+    "impact_domain", "functional_role", "experience_level", "sdgs",
+    "matched_keywords", "confidence_overall", "low_confidence",
+    "quality_score", "quality_grade", "quality_issues", "needs_review",
+    "latitude", "longitude", "is_remote", "geocoding_source",
+)
+
+# Fields a fields= projection may name (all are jobs columns, so safe to select)
+PROJECTABLE_FIELDS = frozenset(SEARCH_RESULT_COLUMNS) | {
+    "country", "city", "career_type", "work_modality", "description_snippet",
+}
+
+# fields=compact: what the result list renders
+COMPACT_FIELDS = (
+    "id", "title", "org_name", "location_raw", "country_iso",
+    "level_norm", "deadline", "apply_url",
+)
+
+# Read by _compute_reasons, so always fetched when projecting
+REASON_FIELDS = ("mission_tags", "level_norm", "international_eligible", "org_type")
+
+
+def parse_fields(fields: Optional[str]) -> Optional[list[str]]:
+    """
+    Parse a fields= parameter ("compact" or a comma-separated list) into a
+    projection that always starts with id. Returns None for no projection.
+    Raises ValueError on unknown field names.
+    """
+    if not fields or not fields.strip():
+        return None
+    if fields.strip().lower() == "compact":
+        return list(COMPACT_FIELDS)
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = sorted(set(requested) - PROJECTABLE_FIELDS - {"reasons"})
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    projection = ["id"]
+    for field in requested:
+        if field not in projection and field != "reasons":
+            projection.append(field)
+    return projection
+
+
 class SearchService:
     def __init__(self):
-        self.meili_client = None
+        self._meili_client = None
+        self._meili_init_attempted = False
         self.meili_index_name = os.getenv("MEILI_JOBS_INDEX", "jobs_index")
         self.meili_enabled = self._is_meili_enabled()
         self.db_enabled = self._is_db_enabled()
@@ -46,11 +95,22 @@ class SearchService:
         self._last_health_check = None
         self._health_check_interval = 60  # Check health every 60 seconds
         
-        if self.meili_enabled:
+        # Meilisearch is connected on first use (see meili_client), not at import
+
+    @property
+    def meili_client(self):
+        """Meilisearch client, initialized on first access when search is enabled."""
+        if self._meili_client is None and self.meili_enabled and not self._meili_init_attempted:
+            self._meili_init_attempted = True
             self._init_meilisearch()
+        return self._meili_client
+
+    @meili_client.setter
+    def meili_client(self, client) -> None:
+        self._meili_client = client
 
     def _is_meili_enabled(self) -> bool:
-        if not meilisearch:
+        if not MEILISEARCH_AVAILABLE:
             return False
         enabled = os.getenv("AIDJOBS_ENABLE_SEARCH", "true").lower() == "true"
         has_config = bool(self._get_meili_config()[0] and self._get_meili_config()[1])
@@ -104,6 +164,10 @@ class SearchService:
             if not meili_host or not meili_key:
                 raise ValueError("Meilisearch host and key must be configured")
             
+            global meilisearch
+            if meilisearch is None:
+                import meilisearch
+            
             # Create client with timeout settings for better reliability
             self.meili_client = meilisearch.Client(meili_host, meili_key)
             
@@ -226,6 +290,18 @@ class SearchService:
             self.meili_client = None
             self.meili_error = str(e)
 
+    @staticmethod
+    def _fetch_fields(fields: list[str]) -> list[str]:
+        """Projection plus the fields _compute_reasons reads (unknown names dropped)"""
+        fetch = [f for f in fields if f in PROJECTABLE_FIELDS]
+        return fetch + [f for f in REASON_FIELDS if f not in fetch]
+
+    @staticmethod
+    def _project(item: dict[str, Any], fields: list[str]) -> dict[str, Any]:
+        projected = {f: item[f] for f in fields if f in item}
+        projected["reasons"] = item.get("reasons", [])
+        return projected
+
     def _compute_reasons(
         self,
         item: dict[str, Any],
@@ -415,7 +491,9 @@ class SearchService:
         impact_domain: Optional[list[str]] = None,
         functional_role: Optional[list[str]] = None,
         experience_level: Optional[str] = None,
+        fields: Optional[list[str]] = None,
     ) -> dict[str, Any]:
+        """Search jobs; fields (see parse_fields) limits the keys of each item, plus reasons."""
         start_time = time.time()
         request_id = str(uuid.uuid4())
 
@@ -463,12 +541,12 @@ class SearchService:
         result = None
         
         if self.meili_enabled:
-            result = await self._search_meilisearch(q, page, size, normalized_filters, sort)
+            result = await self._search_meilisearch(q, page, size, normalized_filters, sort, fields)
             if result is not None:
                 result["source"] = "meili"
         
         if result is None and self.db_enabled:
-            result = await self._search_database(q, page, size, normalized_filters, sort)
+            result = await self._search_database(q, page, size, normalized_filters, sort, fields)
             result["source"] = "db"
         
         if result is None:
@@ -513,6 +591,7 @@ class SearchService:
         size: int,
         filters: dict[str, Any],
         sort: Optional[str] = None,
+        fields: Optional[list[str]] = None,
     ) -> Optional[dict[str, Any]]:
         """Search using Meilisearch with filters and pagination. Returns None on failure.
         Includes retry logic and auto-reconnection."""
@@ -659,6 +738,9 @@ class SearchService:
                 elif sort == "closing_soon":
                     search_params["sort"] = ["deadline:asc"]
                 
+                if fields:
+                    search_params["attributesToRetrieve"] = self._fetch_fields(fields)
+                
                 results = index.search(q or "", search_params)
                 
                 # Attach reasons to each result and filter out deleted jobs
@@ -707,6 +789,9 @@ class SearchService:
                         hit['reasons'] = self._compute_reasons(hit, q, filters)
                         items.append(hit)
                 
+                if fields:
+                    items = [self._project(item, fields) for item in items]
+                
                 # Success - reset retry count
                 self._connection_retry_count = 0
                 
@@ -745,6 +830,7 @@ class SearchService:
         size: int,
         filters: dict[str, Any],
         sort: Optional[str] = None,
+        fields: Optional[list[str]] = None,
     ) -> dict[str, Any]:
         if not psycopg2:
             return {
@@ -869,15 +955,10 @@ class SearchService:
             elif sort == "closing_soon":
                 order_by = "deadline ASC NULLS LAST"
             
+            # Projected columns are restricted to PROJECTABLE_FIELDS
+            columns = self._fetch_fields(fields) if fields else SEARCH_RESULT_COLUMNS
             select_query = f"""
-                SELECT 
-                    id, org_name, title, location_raw, country_iso, 
-                    level_norm, deadline, apply_url, last_seen_at,
-                    mission_tags, international_eligible, org_type,
-                    impact_domain, functional_role, experience_level, sdgs,
-                    matched_keywords, confidence_overall, low_confidence,
-                    quality_score, quality_grade, quality_issues, needs_review,
-                    latitude, longitude, is_remote, geocoding_source
+                SELECT {', '.join(columns)}
                 FROM jobs 
                 WHERE {where_clause}
                 ORDER BY {order_by}
@@ -915,7 +996,7 @@ class SearchService:
                 if item.get('matched_keywords') is None:
                     item['matched_keywords'] = []
                 
-                items.append(item)
+                items.append(self._project(item, fields) if fields else item)
 
             return {
                 "items": items,
@@ -1448,6 +1529,7 @@ class SearchService:
                 FROM jobs
                 WHERE status = 'active'
                 AND deleted_at IS NULL
+                AND duplicate_of IS NULL
                 AND (deadline IS NULL OR deadline >= CURRENT_DATE)
                 ORDER BY created_at DESC
             """)
@@ -20,6 +20,7 @@ except ImportError:
     httpx = None
 
 from app.db_config import db_config
+from app.http_cache import invalidate_all
 from security.admin_auth import admin_required
 
 logger = logging.getLogger(__name__)
@@ -443,6 +444,8 @@ def delete_source(
         logger.info(f"[sources] Soft-deleted {jobs_deleted} jobs for source {source_id}")
         
         conn.commit()
+        if jobs_deleted:
+            invalidate_all()
         
         return {
             "status": "ok",
@@ -618,15 +621,8 @@ async def test_source(
                         raise HTTPException(status_code=500, detail="Database not configured")
                     
                     api_crawler = SimpleAPICrawler(db_url)
-                    # Temporarily limit to 1 page for testing
-                    test_schema = dict(schema)
-                    if "pagination" in test_schema:
-                        test_schema["pagination"] = {**test_schema["pagination"], "max_pages": 1}
-                    else:
-                        test_schema["pagination"] = {"max_pages": 1}
-                    
                     # Test fetch (first page only)
-                    jobs = await api_crawler.fetch_api(url, json.dumps(test_schema), last_success_at=None)
+                    jobs = await api_crawler.fetch_jobs(schema, url, max_pages=1)
                     
                     return {
                         "ok": True,
@@ -956,7 +952,10 @@ async def simulate_extract(
             if not db_url:
                 raise HTTPException(status_code=500, detail="Database not configured")
             rss_crawler = SimpleRSSCrawler(db_url)
-            feed = await rss_crawler.fetch_feed(source['careers_url'])
+            try:
+                feed = await rss_crawler.fetch_feed(source['careers_url'])
+            finally:
+                await rss_crawler.aclose()
             if feed:
                 jobs = rss_crawler.extract_jobs_from_feed(feed, source['careers_url'])
             else:
@@ -968,12 +967,20 @@ async def simulate_extract(
             if not db_url:
                 raise HTTPException(status_code=500, detail="Database not configured")
             api_crawler = SimpleAPICrawler(db_url)
-            # For simulate, fetch API and extract jobs
-            data = await api_crawler.fetch_api(source['careers_url'])
-            if data:
-                jobs = api_crawler.extract_jobs_from_json(data, source['careers_url'])
+            # For simulate, fetch API and extract jobs (first page of a configured API)
+            from crawler_v2.api_config import compile_api_config
+            try:
+                configured = compile_api_config(source.get('parser_hint'), source['careers_url']) is not None
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"Invalid API config: {str(e)}")
+            if configured:
+                jobs = await api_crawler.fetch_jobs(source['parser_hint'], source['careers_url'], max_pages=1)
             else:
-                jobs = []
+                data = await api_crawler.fetch_api(source['careers_url'])
+                if data:
+                    jobs = api_crawler.extract_jobs_from_json(data, source['careers_url'])
+                else:
+                    jobs = []
         else:
             raise HTTPException(
                 status_code=400, 
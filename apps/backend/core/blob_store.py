@@ -0,0 +1,230 @@
+"""
+Content-addressed blob store for raw HTML.
+
+Blobs are keyed by the sha256 of their uncompressed bytes and stored once as
+a compressed frame (zstd when the `zstandard` package is installed, gzip
+otherwise) under objects/<2-char prefix>/<key>. Storing bytes that are
+already present only refreshes the blob's mtime, so an unchanged page costs
+nothing on disk beyond the caller's metadata row.
+
+Retention is mtime-based: every put touches the blob, and gc() removes blobs
+that have not been written or re-seen within the retention window. Callers
+expire their own metadata with the same window, and a blob is always at
+least as fresh as the newest metadata that references it.
+"""
+
+import os
+import gzip
+import time
+import asyncio
+import hashlib
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard  # type: ignore[reportMissingImports]
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None  # type: ignore[assignment]
+    ZSTD_AVAILABLE = False
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Blobs not touched for this long are garbage collected
+BLOB_RETENTION_DAYS = int(os.getenv("BLOB_RETENTION_DAYS", "30"))
+
+KEY_PREFIX = "sha256:"
+
+
+def content_key(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class BlobStore:
+    """Filesystem content-addressed store with compression and dedupe"""
+
+    def __init__(self, base_path: str, codec: Optional[str] = None, level: Optional[int] = None):
+        self.base_path = Path(base_path)
+        self.objects_path = self.base_path / "objects"
+        self.objects_path.mkdir(parents=True, exist_ok=True)
+        if codec is None:
+            codec = "zstd" if ZSTD_AVAILABLE else "gzip"
+        if codec == "zstd" and not ZSTD_AVAILABLE:
+            logger.warning("[blob_store] zstandard not installed, falling back to gzip")
+            codec = "gzip"
+        if codec not in ("zstd", "gzip"):
+            raise ValueError(f"Unknown codec: {codec}")
+        self.codec = codec
+        self.level = level if level is not None else (10 if codec == "zstd" else 6)
+        self._lock = threading.Lock()
+        self._counters = {
+            "puts": 0,
+            "dedupe_hits": 0,
+            "bytes_in": 0,
+            "dedupe_bytes": 0,
+            "bytes_stored": 0,
+            "gc_removed": 0,
+        }
+
+    # Layout
+
+    def _path(self, key: str) -> Path:
+        return self.objects_path / key[:2] / key
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.codec == "zstd":
+            return zstandard.ZstdCompressor(level=self.level).compress(data)  # type: ignore[union-attr]
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    @staticmethod
+    def _decompress(frame: bytes) -> bytes:
+        # Decide by magic so stores written with either codec stay readable
+        if frame.startswith(ZSTD_MAGIC):
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError("Blob is zstd-compressed but zstandard is not installed")
+            return zstandard.ZstdDecompressor().decompress(frame)  # type: ignore[union-attr]
+        if frame.startswith(GZIP_MAGIC):
+            return gzip.decompress(frame)
+        return frame
+
+    # Operations
+
+    def put(self, data: bytes) -> Tuple[str, bool]:
+        """
+        Store bytes; returns (key, created).
+
+        created is False when identical content was already stored, in which
+        case only the blob's mtime is refreshed.
+        """
+        key = content_key(data)
+        path = self._path(key)
+
+        if path.exists():
+            try:
+                os.utime(path, None)
+            except OSError:
+                pass
+            self._count(puts=1, dedupe_hits=1, bytes_in=len(data), dedupe_bytes=len(data))
+            return key, False
+
+        frame = self._compress(data)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so readers never observe a partial frame
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(frame)
+            os.replace(tmp_name, path)
+        except Exception:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+
+        self._count(puts=1, bytes_in=len(data), bytes_stored=len(frame))
+        return key, True
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                return self._decompress(f.read())
+        except FileNotFoundError:
+            return None
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def delete(self, key: str) -> bool:
+        try:
+            self._path(key).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    async def put_async(self, data: bytes) -> Tuple[str, bool]:
+        return await asyncio.to_thread(self.put, data)
+
+    async def get_async(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self.get, key)
+
+    def iter_keys(self) -> Iterator[Tuple[str, os.stat_result]]:
+        for prefix_dir in self.objects_path.iterdir():
+            if not prefix_dir.is_dir():
+                continue
+            for entry in os.scandir(prefix_dir):
+                if entry.is_file() and not entry.name.startswith(".tmp-"):
+                    yield entry.name, entry.stat()
+
+    def gc(self, retention_days: int = BLOB_RETENTION_DAYS) -> Dict[str, int]:
+        """Remove blobs not written or re-seen within the retention window"""
+        cutoff = time.time() - retention_days * 86400
+        removed = 0
+        freed = 0
+        kept = 0
+        for key, st in list(self.iter_keys()):
+            if st.st_mtime < cutoff:
+                if self.delete(key):
+                    removed += 1
+                    freed += st.st_size
+            else:
+                kept += 1
+        self._count(gc_removed=removed)
+        if removed:
+            logger.info(f"[blob_store] GC removed {removed} blob(s), freed {freed} bytes")
+        return {"removed": removed, "freed_bytes": freed, "kept": kept}
+
+    # Metrics
+
+    def _count(self, **deltas: int):
+        with self._lock:
+            for name, delta in deltas.items():
+                self._counters[name] += delta
+
+    def stats(self) -> Dict[str, float]:
+        """Dedupe and compression ratios since process start"""
+        with self._lock:
+            c = dict(self._counters)
+        # Compression is measured over newly written blobs only
+        written_in = c["bytes_in"] - c["dedupe_bytes"]
+        return {
+            **c,
+            "codec": self.codec,
+            "dedupe_ratio": round(c["dedupe_hits"] / c["puts"], 4) if c["puts"] else 0.0,
+            "compression_ratio": round(written_in / c["bytes_stored"], 2) if c["bytes_stored"] else 0.0,
+            "storage_savings": round(1 - c["bytes_stored"] / c["bytes_in"], 4) if c["bytes_in"] else 0.0,
+        }
+
+
+def is_blob_ref(storage_path: Optional[str]) -> bool:
+    return bool(storage_path) and storage_path.startswith(KEY_PREFIX)
+
+
+def blob_ref(key: str) -> str:
+    return f"{KEY_PREFIX}{key}"
+
+
+def ref_key(storage_path: str) -> str:
+    return storage_path[len(KEY_PREFIX):]
+
+
+# Global instance (lazy initialization)
+_blob_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    """Shared store used by HTMLStorage and SnapshotManager"""
+    global _blob_store
+    if _blob_store is None:
+        _blob_store = BlobStore(
+            os.getenv("BLOB_STORE_PATH", "blob-store"),
+            codec=os.getenv("BLOB_STORE_CODEC") or None,
+        )
+    return _blob_store
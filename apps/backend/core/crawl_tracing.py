@@ -0,0 +1,74 @@
+"""
+Per-stage crawl tracing.
+
+A CrawlTrace is created for each crawl_source call and wraps every stage
+(fetch, render, parse, AI extraction, enrichment, normalization, geocoding,
+quality scoring, save) in a span. Each span is observed into the
+aidjobs_crawl_stage_seconds histogram labelled by source type and stage, and
+the per-crawl breakdown is returned in the crawl result as `timings` so the
+orchestrator can persist it into crawl_logs.
+"""
+import time
+import logging
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from metrics import observe_crawl_stage
+
+logger = logging.getLogger(__name__)
+
+# Stage names in pipeline order; breakdown() keeps this order
+CRAWL_STAGES = (
+    'fetch',
+    'render',
+    'store_raw',
+    'parse',
+    'ai_extract',
+    'enrich',
+    'normalize',
+    'geocode',
+    'quality',
+    'save',
+)
+
+
+class CrawlTrace:
+    """Accumulates span durations for one crawl of one source"""
+
+    def __init__(self, source_type: Optional[str]):
+        self.source_type = source_type or 'unknown'
+        self.stages: Dict[str, float] = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        """Time a stage; failures still record the time spent"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def add(self, stage: str, seconds: float):
+        # A stage may run more than once per crawl (e.g. parse after AI fallback)
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+        try:
+            observe_crawl_stage(self.source_type, stage, seconds)
+        except Exception as e:
+            logger.debug(f"[crawl_tracing] Failed to observe {stage}: {e}")
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._started
+
+    def breakdown(self) -> Dict[str, int]:
+        """
+        Stage durations in milliseconds, plus `other` (time outside any span)
+        and `total`.
+        """
+        ordered = [s for s in CRAWL_STAGES if s in self.stages]
+        ordered += sorted(s for s in self.stages if s not in CRAWL_STAGES)
+        result = {stage: int(round(self.stages[stage] * 1000)) for stage in ordered}
+        total_ms = int(round(self.elapsed() * 1000))
+        result['other'] = max(0, total_ms - sum(result.values()))
+        result['total'] = total_ms
+        return result
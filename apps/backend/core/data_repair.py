@@ -17,6 +17,8 @@ from datetime import datetime, date, timedelta
 from dateutil import parser as date_parser
 from urllib.parse import urlparse
 
+from core.date_parsing import parse_date
+
 logger = logging.getLogger(__name__)
 
 
@@ -348,12 +350,9 @@ class DataRepairEngine:
             for pattern in deadline_patterns:
                 match = re.search(pattern, desc, re.IGNORECASE)
                 if match:
-                    try:
-                        parsed = date_parser.parse(match.group(1), fuzzy=True)
-                        if parsed.date() > date.today():
-                            return parsed.date()
-                    except:
-                        continue
+                    parsed = parse_date(match.group(1), fallback=False)
+                    if parsed and parsed > date.today():
+                        return parsed
         
         # Strategy 2: Default heuristic (30 days)
         # Only use if we have a valid job (title + URL)
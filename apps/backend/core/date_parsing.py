@@ -0,0 +1,188 @@
+"""
+Deterministic date parsing for deadlines and posting dates.
+
+Job listings use a small set of date shapes (ISO, 12-DEC-2025, 10 Dec 2025,
+December 10, 2025, DD/MM/YYYY). These are matched with precompiled patterns
+first; only strings none of them recognise go to dateparser, restricted to a
+fixed language list so it skips locale detection. Results are memoized per
+raw string (and per day, so relative phrases like "in 2 weeks" stay correct).
+
+    parse_date("Closing date: 12-DEC-2025")    -> date(2025, 12, 12)
+    parse_date_str("10/12/2025")               -> "2025-12-10"
+    normalize_dates(["10 Dec 2025", "n/a"])    -> ["2025-12-10", None]
+"""
+
+import importlib.util
+import re
+import logging
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# dateparser loads its locale and timezone data on import (~0.3s), so it is
+# imported on the first fallback parse rather than with this module
+DATEPARSER_AVAILABLE = importlib.util.find_spec('dateparser') is not None
+dateparser = None
+
+# Languages the fallback parser may try, in order (no auto-detection)
+FALLBACK_LANGUAGES = ['en', 'fr', 'es']
+
+PARSE_CACHE_SIZE = 8192
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'sept': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+    'january': 1, 'february': 2, 'march': 3, 'april': 4, 'june': 6, 'july': 7,
+    'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12,
+}
+
+EMPTY_VALUES = {'', 'n/a', 'na', '-', '—', 'none', 'null', 'tbd', 'tba'}
+
+_LABEL_RE = re.compile(
+    r'^(?:closing date|application deadline|deadline|apply by|due date|due|by|valid through|expires|expiry date|closes)\s*[:\-]?\s*',
+    re.I,
+)
+_WEEKDAY_RE = re.compile(r'^(?:mon|tue|wed|thu|fri|sat|sun)[a-z]*\.?,?\s+', re.I)
+_ORDINAL_RE = re.compile(r'(\d{1,2})(?:st|nd|rd|th)\b', re.I)
+
+_MONTH = r'([A-Za-z]{3,9})\.?'
+# (pattern, field order); tried with fullmatch, then search for embedded dates
+_FORMATS: List[Tuple[re.Pattern, str]] = [
+    (re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})(?:[T ][\d:.]+(?:Z|[+-]\d{2}:?\d{2})?)?'), 'ymd'),
+    (re.compile(r'(\d{4})/(\d{1,2})/(\d{1,2})'), 'ymd'),
+    (re.compile(r'(\d{1,2})[-/ ]' + _MONTH + r'[-/ ,]+(\d{2,4})'), 'dMy'),
+    (re.compile(_MONTH + r' (\d{1,2}),? (\d{4})'), 'Mdy'),
+    (re.compile(r'(\d{1,2})[/.-](\d{1,2})[/.-](\d{2,4})'), 'numeric'),
+]
+
+
+def _clean(text: str) -> str:
+    text = ' '.join(text.split())
+    text = _LABEL_RE.sub('', text)
+    text = _WEEKDAY_RE.sub('', text)
+    text = _ORDINAL_RE.sub(r'\1', text)
+    return text.replace(' of ', ' ').strip(' .;')
+
+
+def _year(value: str) -> int:
+    year = int(value)
+    if year < 100:
+        year += 2000 if year < 50 else 1900
+    return year
+
+
+def _build(match: re.Match, order: str, day_first: bool) -> Optional[date]:
+    a, b, c = match.groups()
+    try:
+        if order == 'ymd':
+            return date(int(a), int(b), int(c))
+        if order == 'dMy':
+            month = MONTHS.get(b.lower())
+            return date(_year(c), month, int(a)) if month else None
+        if order == 'Mdy':
+            month = MONTHS.get(a.lower())
+            return date(_year(c), month, int(b)) if month else None
+        # numeric: honour day_first unless only one reading is a valid month
+        first, second = int(a), int(b)
+        if first > 12 or (day_first and second <= 12):
+            day, month = first, second
+        else:
+            day, month = second, first
+        return date(_year(c), month, day)
+    except ValueError:
+        return None
+
+
+def _parse_fast(text: str, day_first: bool) -> Optional[date]:
+    for pattern, order in _FORMATS:
+        match = pattern.fullmatch(text)
+        if match:
+            return _build(match, order, day_first)
+    for pattern, order in _FORMATS:
+        match = pattern.search(text)
+        if match:
+            parsed = _build(match, order, day_first)
+            if parsed:
+                return parsed
+    return None
+
+
+def _get_dateparser():
+    global dateparser
+    if dateparser is None:
+        import dateparser as module  # type: ignore[reportMissingImports]
+        dateparser = module
+    return dateparser
+
+
+def _parse_fallback(text: str, day_first: bool, today: date) -> Optional[date]:
+    if not DATEPARSER_AVAILABLE:
+        return None
+    try:
+        parsed = _get_dateparser().parse(
+            text,
+            languages=FALLBACK_LANGUAGES,
+            settings={
+                'PREFER_DAY_OF_MONTH': 'first',
+                'RELATIVE_BASE': datetime.combine(today, datetime.min.time()),
+                'DATE_ORDER': 'DMY' if day_first else 'MDY',
+                'PREFER_DATES_FROM': 'future',
+            },
+        )
+        return parsed.date() if parsed else None
+    except Exception as e:
+        logger.debug(f"[date_parsing] dateparser failed for '{text}': {e}")
+        return None
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_cached(raw: str, day_first: bool, fallback: bool, today: date) -> Optional[date]:
+    text = _clean(raw)
+    if text.lower() in EMPTY_VALUES:
+        return None
+    parsed = _parse_fast(text, day_first)
+    if parsed is None and fallback:
+        parsed = _parse_fallback(text, day_first, today)
+    return parsed
+
+
+def parse_date(text: Optional[str], day_first: bool = True, fallback: bool = True) -> Optional[date]:
+    """
+    Parse a date string.
+
+    Args:
+        text: Raw date text; labels like "Deadline:" and weekday names are ignored
+        day_first: Read ambiguous numeric dates (03/04/2025) as DD/MM
+        fallback: Use dateparser for strings the compiled formats don't match
+    """
+    if not text or not isinstance(text, str):
+        return None
+    return _parse_cached(text.strip(), day_first, fallback, date.today())
+
+
+def parse_date_str(text: Optional[str], day_first: bool = True, fallback: bool = True) -> Optional[str]:
+    """parse_date formatted as YYYY-MM-DD"""
+    parsed = parse_date(text, day_first=day_first, fallback=fallback)
+    return parsed.isoformat() if parsed else None
+
+
+def parse_dates(values: Iterable[Optional[str]], day_first: bool = True, fallback: bool = True) -> List[Optional[date]]:
+    """Parse a column of date strings; each distinct string is parsed once"""
+    values = list(values)
+    unique: Dict[Optional[str], Optional[date]] = {}
+    for value in values:
+        if value not in unique:
+            unique[value] = parse_date(value, day_first=day_first, fallback=fallback)
+    return [unique[value] for value in values]
+
+
+def normalize_dates(values: Iterable[Optional[str]], day_first: bool = True, fallback: bool = True) -> List[Optional[str]]:
+    """parse_dates formatted as YYYY-MM-DD"""
+    return [d.isoformat() if d else None for d in parse_dates(values, day_first=day_first, fallback=fallback)]
+
+
+def cache_stats() -> Dict[str, int]:
+    info = _parse_cached.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize or 0}
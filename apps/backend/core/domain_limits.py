@@ -1,16 +1,46 @@
 """
 Per-domain rate limiting using token bucket algorithm
+
+Buckets are shared by all processes through the domain_rate_limits table
+(SharedTokenBucket): each process leases a few tokens at a time and only
+goes back to Postgres once its local tokens are spent. Leases and policy
+reads run in a worker thread, never on the event loop. If the table is
+unreachable every bucket falls back to a process-local TokenBucket.
+
+The crawlers' HTTP clients wait for a slot before each request through
+get_domain_limiter(db_url).on_request, so the API process, the scheduler
+and manual crawl runs draw from one per-host budget.
 """
+import os
 import time
 import logging
 import asyncio
-from typing import Dict, Optional
+import threading
+from typing import Dict, Optional, Tuple
 from collections import defaultdict
+import httpx
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
+from core.host_cache import policy_cache
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_POLICY = {
+    'max_concurrency': 1,
+    'min_request_interval_ms': 3000,
+    'max_pages': 10,
+    'max_kb_per_page': 1024,
+    'allow_js': False
+}
+
+# Tokens taken from the shared bucket per round trip (capped at the bucket capacity)
+LEASE_TOKENS = int(os.getenv('DOMAIN_LIMIT_LEASE_TOKENS', '2'))
+# Leased tokens not used within this window are discarded, so a lease cannot become a late burst
+LEASE_TTL_SECONDS = float(os.getenv('DOMAIN_LIMIT_LEASE_TTL_SECONDS', '2.0'))
+# After a shared store error, use local buckets for this long before retrying
+STORE_RETRY_SECONDS = 30.0
+
 
 class TokenBucket:
     """Simple token bucket for rate limiting"""
@@ -50,23 +80,204 @@ class TokenBucket:
         return needed / self.refill_rate
 
 
+class SharedBucketStore:
+    """Atomic token bucket rows in domain_rate_limits (one per host)"""
+    
+    def __init__(self, db_url: str):
+        self.db_url = db_url
+        self._conn = None
+        self._lock = threading.Lock()
+        # After an error every bucket on this store uses local limits until then
+        self.down_until = 0.0
+    
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.down_until
+    
+    def mark_down(self, error: Exception):
+        if self.available:
+            logger.warning(f"[domain_limits] Shared bucket unavailable, using local limits for {STORE_RETRY_SECONDS:.0f}s: {error}")
+        self.down_until = time.monotonic() + STORE_RETRY_SECONDS
+    
+    def _get_conn(self):
+        if self._conn is None or self._conn.closed:
+            self._conn = psycopg2.connect(self.db_url, connect_timeout=5)
+        return self._conn
+    
+    def lease(self, host: str, capacity: float, refill_rate: float, want: int) -> Tuple[int, float]:
+        """
+        Refill the host's bucket and take up to `want` whole tokens.
+        
+        Returns:
+            (granted, wait_seconds) - wait_seconds until one token is available when nothing was granted
+        """
+        with self._lock:
+            conn = self._get_conn()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("""
+                        INSERT INTO domain_rate_limits (host, tokens, capacity, refill_rate)
+                        VALUES (%s, %s, %s, %s)
+                        ON CONFLICT (host) DO NOTHING
+                    """, (host, capacity, capacity, refill_rate))
+                    cur.execute("""
+                        WITH current AS (
+                            SELECT host,
+                                   LEAST(%(capacity)s::float8, tokens + GREATEST(0,
+                                       EXTRACT(EPOCH FROM clock_timestamp() - updated_at))::float8 * %(rate)s) AS available
+                            FROM domain_rate_limits
+                            WHERE host = %(host)s
+                            FOR UPDATE
+                        )
+                        UPDATE domain_rate_limits d
+                        SET tokens = current.available - LEAST(FLOOR(current.available), %(want)s),
+                            capacity = %(capacity)s,
+                            refill_rate = %(rate)s,
+                            updated_at = clock_timestamp()
+                        FROM current
+                        WHERE d.host = current.host
+                        RETURNING LEAST(FLOOR(current.available), %(want)s)::int, current.available
+                    """, {'host': host, 'capacity': capacity, 'rate': refill_rate, 'want': want})
+                    granted, available = cur.fetchone()
+                conn.commit()
+            except Exception:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+                self._conn = None
+                raise
+        
+        if granted > 0:
+            return granted, 0.0
+        return 0, max(0.0, 1.0 - available) / refill_rate
+    
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class SharedTokenBucket:
+    """
+    Token bucket for one host shared across processes.
+    
+    Like TokenBucket, except that wait_time is a coroutine: local leased
+    tokens are the fast path, and the shared store is consulted (in a worker
+    thread) only when they run out.
+    """
+    
+    def __init__(self, store: SharedBucketStore, host: str, tokens: float, refill_rate: float,
+                 lease_tokens: int = LEASE_TOKENS):
+        self.store = store
+        self.host = host
+        self.capacity = tokens
+        self.refill_rate = refill_rate
+        self.lease_tokens = max(1, min(int(tokens), lease_tokens))
+        self.tokens = 0
+        self.lease_expires = 0.0
+        # Used while the shared store is unavailable
+        self._local = TokenBucket(tokens, refill_rate)
+    
+    @property
+    def shared(self) -> bool:
+        """False while falling back to the process-local bucket"""
+        return self.store.available
+    
+    def _local_tokens(self) -> int:
+        if time.monotonic() >= self.lease_expires:
+            self.tokens = 0
+        return self.tokens
+    
+    async def wait_time(self, tokens: float = 1.0) -> float:
+        """Wait time until a token is available (leases from the shared store if needed)"""
+        if self._local_tokens() >= tokens:
+            return 0.0
+        if not self.shared:
+            return self._local.wait_time(tokens)
+        
+        try:
+            granted, wait = await asyncio.to_thread(
+                self.store.lease, self.host, self.capacity, self.refill_rate, self.lease_tokens
+            )
+        except Exception as e:
+            self.store.mark_down(e)
+            return self._local.wait_time(tokens)
+        
+        if granted:
+            self.tokens = granted
+            self.lease_expires = time.monotonic() + LEASE_TTL_SECONDS
+            return 0.0
+        return wait
+    
+    def consume(self, tokens: float = 1.0) -> bool:
+        """Try to consume tokens. Returns True if successful."""
+        if self._local_tokens() >= tokens:
+            self.tokens -= int(tokens)
+            return True
+        if not self.shared:
+            return self._local.consume(tokens)
+        return False
+
+
+async def acquire_token(bucket, host: str, record: bool = True) -> float:
+    """
+    Wait for and consume one token from a TokenBucket or SharedTokenBucket.
+    
+    Returns:
+        Seconds waited (recorded as a per-host metric unless record=False)
+    """
+    waited = 0.0
+    wait_time = await _wait_time(bucket)
+    while wait_time > 0:
+        logger.debug(f"[domain_limits] Waiting {wait_time:.2f}s for token bucket - {host}")
+        await asyncio.sleep(wait_time)
+        waited += wait_time
+        wait_time = await _wait_time(bucket)
+    bucket.consume(1.0)
+    
+    if record:
+        _record_wait(bucket, host, waited)
+    return waited
+
+
+async def _wait_time(bucket) -> float:
+    if isinstance(bucket, SharedTokenBucket):
+        return await bucket.wait_time(1.0)
+    return bucket.wait_time(1.0)
+
+
+def _record_wait(bucket, host: str, seconds: float):
+    try:
+        from metrics import observe_domain_wait
+        observe_domain_wait(host, seconds, 'shared' if getattr(bucket, 'shared', False) else 'local')
+    except Exception as e:
+        logger.debug(f"[domain_limits] Failed to record wait metric: {e}")
+
+
 class DomainLimiter:
     """Per-domain rate limiting with token buckets"""
     
-    def __init__(self, db_url: str):
+    def __init__(self, db_url: str, shared: Optional[bool] = None):
         self.db_url = db_url
-        # Host -> TokenBucket
+        if shared is None:
+            shared = os.getenv('DOMAIN_LIMITS_SHARED', 'true').lower() == 'true'
+        # Shared through domain_rate_limits unless disabled (or no database is configured)
+        self.store = get_bucket_store(db_url) if shared and db_url else None
+        # Host -> TokenBucket / SharedTokenBucket
         self.buckets: Dict[str, TokenBucket] = {}
         # Host -> last request time (for min interval enforcement)
         self.last_request: Dict[str, float] = defaultdict(float)
-        self._lock = asyncio.Lock()
+        # (event loop id, host) -> lock; requests to different hosts never wait on each other
+        self._locks: Dict[Tuple[int, str], asyncio.Lock] = {}
     
     def _get_db_conn(self):
         """Get database connection"""
         return psycopg2.connect(self.db_url)
     
-    async def get_policy(self, host: str) -> Dict:
-        """Get domain policy from database or use defaults"""
+    def _read_policy(self, host: str) -> Optional[Dict]:
+        """Domain policy row for host, or None"""
         conn = self._get_db_conn()
         try:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
@@ -78,21 +289,29 @@ class DomainLimiter:
                 """, (host,))
                 
                 policy = cur.fetchone()
-                
-                if policy:
-                    return dict(policy)
-                else:
-                    # Return defaults
-                    return {
-                        'max_concurrency': 1,
-                        'min_request_interval_ms': 3000,
-                        'max_pages': 10,
-                        'max_kb_per_page': 1024,
-                        'allow_js': False
-                    }
+                return dict(policy) if policy else None
         finally:
             conn.close()
     
+    async def get_policy(self, host: str) -> Dict:
+        """Get domain policy (cached per host, misses included) or use defaults"""
+        async def load():
+            if not self.db_url:
+                return None, None
+            try:
+                return await asyncio.to_thread(self._read_policy, host), None
+            except Exception as e:
+                logger.warning(f"[domain_limits] Could not read policy for {host}, using defaults: {e}")
+                return None, None
+        
+        policy, _ = await policy_cache.get_or_load(host, load)
+        
+        if policy:
+            return dict(policy)
+        else:
+            # Return defaults
+            return dict(DEFAULT_POLICY)
+    
     async def ensure_bucket(self, host: str, crawl_delay_ms: Optional[int] = None):
         """Ensure token bucket exists for host"""
         if host not in self.buckets:
@@ -110,12 +329,22 @@ class DomainLimiter:
             # Allow burst of max_concurrency requests
             capacity = float(policy['max_concurrency'])
             
-            self.buckets[host] = TokenBucket(capacity, refill_rate)
+            if self.store is not None:
+                self.buckets[host] = SharedTokenBucket(self.store, host, capacity, refill_rate)
+            else:
+                self.buckets[host] = TokenBucket(capacity, refill_rate)
             logger.debug(f"[domain_limits] Created bucket for {host}: capacity={capacity}, rate={refill_rate}/s")
     
+    def _host_lock(self, host: str) -> asyncio.Lock:
+        key = (id(asyncio.get_running_loop()), host)
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+    
     async def wait_for_slot(self, host: str, crawl_delay_ms: Optional[int] = None):
         """Wait until we can make a request to this host"""
-        async with self._lock:
+        async with self._host_lock(host):
             await self.ensure_bucket(host, crawl_delay_ms)
             
             bucket = self.buckets[host]
@@ -125,14 +354,8 @@ class DomainLimiter:
             if crawl_delay_ms:
                 min_interval_ms = max(min_interval_ms, crawl_delay_ms)
             
-            # Check token bucket
-            wait_time = bucket.wait_time(1.0)
-            if wait_time > 0:
-                logger.debug(f"[domain_limits] Waiting {wait_time:.2f}s for token bucket - {host}")
-                await asyncio.sleep(wait_time)
-                bucket.consume(1.0)
-            else:
-                bucket.consume(1.0)
+            # Check token bucket (shared across processes when enabled)
+            waited = await acquire_token(bucket, host, record=False)
             
             # Also enforce minimum interval since last request
             last_req = self.last_request[host]
@@ -142,5 +365,37 @@ class DomainLimiter:
                     wait_ms = min_interval_ms - elapsed_ms
                     logger.debug(f"[domain_limits] Waiting {wait_ms:.0f}ms for min interval - {host}")
                     await asyncio.sleep(wait_ms / 1000.0)
+                    waited += wait_ms / 1000.0
             
             self.last_request[host] = time.time()
+            _record_wait(bucket, host, waited)
+    
+    async def on_request(self, request: httpx.Request):
+        """httpx request event hook: wait for a slot on the request's host (redirects included)"""
+        if request.url.host:
+            await self.wait_for_slot(request.url.host.lower())
+
+
+# Global instances (lazy initialization)
+_stores: Dict[str, SharedBucketStore] = {}
+_limiters: Dict[str, DomainLimiter] = {}
+_stores_lock = threading.Lock()
+_limiters_lock = threading.Lock()
+
+
+def get_bucket_store(db_url: str) -> SharedBucketStore:
+    """Get or create the shared bucket store for a database"""
+    with _stores_lock:
+        store = _stores.get(db_url)
+        if store is None:
+            store = _stores[db_url] = SharedBucketStore(db_url)
+        return store
+
+
+def get_domain_limiter(db_url: str) -> DomainLimiter:
+    """Get or create the limiter all crawlers of this process share for a database"""
+    with _limiters_lock:
+        limiter = _limiters.get(db_url)
+        if limiter is None:
+            limiter = _limiters[db_url] = DomainLimiter(db_url)
+        return limiter
@@ -0,0 +1,248 @@
+"""
+Process pool for CPU-bound HTML extraction.
+
+BeautifulSoup parsing and strategy extraction of a multi-megabyte listing
+page holds the GIL for hundreds of milliseconds, which stalls every other
+coroutine on the event loop (concurrent crawls and, in-process, API
+requests). ExtractionExecutor ships (html, base_url, plan) to worker
+processes and awaits the plain-dict result instead.
+
+- At most EXTRACTION_WORKERS tasks run at once; up to EXTRACTION_MAX_QUEUE
+  more wait for a slot and further submissions raise ExtractionQueueFull.
+- A task running longer than EXTRACTION_TASK_TIMEOUT raises
+  ExtractionTimeout. A process cannot be interrupted mid-task, so the pool
+  is torn down and replaced; other tasks on it fail with BrokenProcessPool.
+- Workers are replaced after EXTRACTION_MAX_TASKS_PER_WORKER tasks so memory
+  held by parsed documents does not grow without bound.
+- Queue wait and worker CPU time are observed per task into the metrics
+  histograms (metrics.observe_extraction_task) and summarized by stats().
+
+Callers fall back to in-process extraction on these errors (EXECUTOR_ERRORS);
+exceptions raised by the task itself propagate as if it ran in-process.
+Set EXTRACTION_WORKERS=0 to disable the pool.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from metrics import observe_extraction_task
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", str(min(4, os.cpu_count() or 1))))
+EXTRACTION_MAX_QUEUE = int(os.getenv("EXTRACTION_MAX_QUEUE", "32"))
+EXTRACTION_TASK_TIMEOUT = float(os.getenv("EXTRACTION_TASK_TIMEOUT", "60"))
+EXTRACTION_MAX_TASKS_PER_WORKER = int(os.getenv("EXTRACTION_MAX_TASKS_PER_WORKER", "200"))
+
+
+class ExtractionQueueFull(RuntimeError):
+    """All workers are busy and the wait queue is at capacity"""
+
+
+class ExtractionTimeout(TimeoutError):
+    """A task exceeded the per-task timeout"""
+
+
+# Errors after which callers should extract in-process instead
+EXECUTOR_ERRORS = (ExtractionQueueFull, ExtractionTimeout, BrokenProcessPool)
+
+
+def _run_timed(fn: Callable, args: tuple, kwargs: dict) -> Tuple[Any, float, float]:
+    """Runs in the worker: (result, wall-clock start, CPU seconds used)"""
+    started = time.time()
+    cpu_start = time.process_time()
+    result = fn(*args, **kwargs)
+    return result, started, time.process_time() - cpu_start
+
+
+class ExtractionExecutor:
+    """Bounded, timed process pool shared by all crawlers in the process"""
+
+    def __init__(
+        self,
+        max_workers: int = EXTRACTION_WORKERS,
+        max_queue: int = EXTRACTION_MAX_QUEUE,
+        task_timeout: float = EXTRACTION_TASK_TIMEOUT,
+        max_tasks_per_worker: int = EXTRACTION_MAX_TASKS_PER_WORKER,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.task_timeout = task_timeout
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        # Slots are handed between event loops (crawls may run in several), so
+        # this is a small thread-safe semaphore rather than asyncio.Semaphore
+        self._running = 0
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._counters = {
+            "tasks": 0,
+            "rejected": 0,
+            "timeouts": 0,
+            "errors": 0,
+            "pool_restarts": 0,
+            "queue_wait_s": 0.0,
+            "cpu_s": 0.0,
+        }
+
+    # Pool lifecycle
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # max_tasks_per_child requires a non-fork start method
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    max_tasks_per_child=self.max_tasks_per_worker or None,
+                )
+            return self._pool
+
+    def _retire_pool(self, pool: ProcessPoolExecutor):
+        with self._lock:
+            if self._pool is not pool:
+                return
+            self._pool = None
+            self._counters["pool_restarts"] += 1
+        processes = list((getattr(pool, "_processes", None) or {}).values())
+        pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        logger.warning(f"[extraction_executor] Restarted worker pool ({len(processes)} worker(s) terminated)")
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    # Slots
+
+    async def _acquire(self):
+        with self._lock:
+            if self._running < self.max_workers:
+                self._running += 1
+                return
+            if len(self._waiters) >= self.max_queue:
+                self._counters["rejected"] += 1
+                raise ExtractionQueueFull(f"{self._running} running, {len(self._waiters)} queued")
+            loop = asyncio.get_running_loop()
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    raise
+            # The slot was already handed to us; pass it on
+            if waiter[1].done() and not waiter[1].cancelled():
+                self._release()
+            raise
+
+    def _release(self):
+        with self._lock:
+            if self._waiters:
+                loop, future = self._waiters.popleft()
+                loop.call_soon_threadsafe(self._hand_over, future)
+            else:
+                self._running -= 1
+
+    def _hand_over(self, future: asyncio.Future):
+        # Runs on the waiter's loop; a waiter cancelled meanwhile passes the slot on
+        if future.cancelled():
+            self._release()
+        else:
+            future.set_result(None)
+
+    # Tasks
+
+    async def run(self, task: str, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs) in a worker process.
+
+        fn and its arguments must be picklable (module-level functions, plain
+        data). task labels the metrics.
+        """
+        queued_at = time.time()
+        await self._acquire()
+        try:
+            pool = self._get_pool()
+            try:
+                future = pool.submit(_run_timed, fn, args, kwargs)
+                result, started, cpu_s = await asyncio.wait_for(
+                    asyncio.wrap_future(future), timeout=self.task_timeout
+                )
+            except asyncio.TimeoutError:
+                self._count(timeouts=1)
+                self._retire_pool(pool)
+                raise ExtractionTimeout(f"{task} exceeded {self.task_timeout}s")
+            except BrokenProcessPool:
+                self._count(errors=1)
+                self._retire_pool(pool)
+                raise
+            except Exception:
+                self._count(errors=1)
+                raise
+        finally:
+            self._release()
+
+        queue_wait = max(0.0, started - queued_at)
+        self._count(tasks=1, queue_wait_s=queue_wait, cpu_s=cpu_s)
+        try:
+            observe_extraction_task(task, queue_wait, cpu_s)
+        except Exception as e:
+            logger.debug(f"[extraction_executor] Failed to observe {task}: {e}")
+        return result
+
+    # Metrics
+
+    def _count(self, **deltas: float):
+        with self._lock:
+            for name, delta in deltas.items():
+                self._counters[name] += delta
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            c = dict(self._counters)
+            running, queued = self._running, len(self._waiters)
+        return {
+            **c,
+            "workers": self.max_workers,
+            "running": running,
+            "queued": queued,
+            "avg_queue_wait_ms": round(c["queue_wait_s"] / c["tasks"] * 1000, 1) if c["tasks"] else 0.0,
+            "avg_cpu_ms": round(c["cpu_s"] / c["tasks"] * 1000, 1) if c["tasks"] else 0.0,
+        }
+
+
+# Global instance (lazy initialization)
+_executor: Optional[ExtractionExecutor] = None
+
+
+def get_extraction_executor() -> Optional[ExtractionExecutor]:
+    """Shared executor, or None when EXTRACTION_WORKERS is 0"""
+    global _executor
+    if EXTRACTION_WORKERS <= 0:
+        return None
+    if _executor is None:
+        _executor = ExtractionExecutor()
+    return _executor
+
+
+def shutdown_extraction_executor():
+    """Stop the shared executor's worker processes, if it was started"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
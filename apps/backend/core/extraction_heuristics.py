@@ -8,6 +8,8 @@ from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse, urlunparse, parse_qs, urlencode
 from bs4 import BeautifulSoup, Tag
 
+from core.keyword_matcher import KeywordMatcher
+
 logger = logging.getLogger(__name__)
 
 # Global blocklist for non-job links
@@ -30,6 +32,15 @@ JOB_KEYWORDS = [
 TRACKING_PARAMS = ['utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 
                    'utm_content', 'fbclid', 'gclid', '_ga', 'ref', 'source']
 
+DETAIL_PATTERNS = ['/view/', '/job/', '/detail/', '/position/', '/id=', '?id=']
+JOB_SECTION_KEYWORDS = ['job', 'position', 'vacancy', 'listing']
+
+# Compiled once; score_link runs for every anchor on every crawled page
+_BLOCKLIST_MATCHER = KeywordMatcher(GLOBAL_BLOCKLIST)
+_JOB_KEYWORD_MATCHER = KeywordMatcher(JOB_KEYWORDS)
+_DETAIL_MATCHER = KeywordMatcher(DETAIL_PATTERNS)
+_JOB_SECTION_MATCHER = KeywordMatcher(JOB_SECTION_KEYWORDS)
+
 
 def normalize_url(url: str) -> str:
     """
@@ -79,18 +90,9 @@ def is_mailto_link(href: str) -> bool:
 def is_blocklisted(link_text: str, href: str) -> bool:
     """Check if link matches global blocklist."""
     text_lower = link_text.lower().strip()
-    href_lower = href.lower()
     
-    # Check exact matches
-    if text_lower in [b.lower() for b in GLOBAL_BLOCKLIST]:
-        return True
-    
-    # Check if text starts with blocklisted phrase
-    for blocked in GLOBAL_BLOCKLIST:
-        if text_lower.startswith(blocked.lower()):
-            return True
-    
-    return False
+    # Exact matches are covered too: a phrase is a prefix of itself
+    return _BLOCKLIST_MATCHER.match_prefix(text_lower) is not None
 
 
 def score_link(link: Tag, base_url: str, source_id: Optional[str] = None) -> Tuple[float, Dict[str, any]]:
@@ -128,19 +130,17 @@ def score_link(link: Tag, base_url: str, source_id: Optional[str] = None) -> Tup
     link_text_lower = link_text.lower()
     href_lower = href.lower()
     
-    # Score based on job keywords in URL
-    for keyword in JOB_KEYWORDS:
-        if keyword in href_lower:
-            score += 2.0
-            reasons.append(f'url_has_{keyword}')
-            break
+    # Score based on job keywords in URL (first keyword in JOB_KEYWORDS order)
+    keyword = _JOB_KEYWORD_MATCHER.first(href_lower)
+    if keyword:
+        score += 2.0
+        reasons.append(f'url_has_{keyword}')
     
     # Score based on job keywords in text
-    for keyword in JOB_KEYWORDS:
-        if keyword in link_text_lower:
-            score += 1.5
-            reasons.append(f'text_has_{keyword}')
-            break
+    keyword = _JOB_KEYWORD_MATCHER.first(link_text_lower)
+    if keyword:
+        score += 1.5
+        reasons.append(f'text_has_{keyword}')
     
     # Score based on text length (longer = more likely to be a job title)
     if len(link_text) >= 4:
@@ -162,8 +162,7 @@ def score_link(link: Tag, base_url: str, source_id: Optional[str] = None) -> Tup
         reasons.append('looks_like_email')
     
     # Check if it's a detail page (higher score)
-    detail_patterns = ['/view/', '/job/', '/detail/', '/position/', '/id=', '?id=']
-    if any(pattern in href_lower for pattern in detail_patterns):
+    if _DETAIL_MATCHER.search(href_lower):
         score += 1.5
         reasons.append('detail_page_pattern')
     
@@ -172,7 +171,7 @@ def score_link(link: Tag, base_url: str, source_id: Optional[str] = None) -> Tup
     if parent:
         parent_class = str(parent.get('class', [])).lower()
         parent_id = str(parent.get('id', '')).lower()
-        if any(kw in parent_class or kw in parent_id for kw in ['job', 'position', 'vacancy', 'listing']):
+        if _JOB_SECTION_MATCHER.search(parent_class) or _JOB_SECTION_MATCHER.search(parent_id):
             score += 1.0
             reasons.append('job_section_context')
     
@@ -1,6 +1,11 @@
 """
 Extraction Logger Module
 Logs every extraction attempt with status and extracted fields for monitoring.
+
+Writes go through the shared buffered LogWriter (core/log_writer.py): log
+methods return the new row's id immediately and rows are inserted in
+batches. Routine OK extraction logs may be sampled when the database falls
+behind.
 """
 
 import logging
@@ -9,25 +14,83 @@ from typing import Dict, List, Optional
 from datetime import datetime
 import json
 
+from core.log_writer import LogWriter, flush_log_writers, get_log_writer
+
 logger = logging.getLogger(__name__)
 
 
 class ExtractionLogger:
     """Logs extraction attempts and results"""
     
-    def __init__(self, db_url: str):
+    def __init__(self, db_url: str, writer: Optional[LogWriter] = None):
         """
         Initialize extraction logger.
         
         Args:
             db_url: PostgreSQL connection string
+            writer: Buffered writer (defaults to the shared one for db_url)
         """
         self.db_url = db_url
+        self._writer = writer
+    
+    @property
+    def writer(self) -> LogWriter:
+        if self._writer is None:
+            self._writer = get_log_writer(self.db_url)
+        return self._writer
     
     def _get_db_conn(self):
         """Get database connection"""
         return psycopg2.connect(self.db_url)
     
+    def _read_conn(self):
+        """Connection for reads, after writing buffered rows so they are visible"""
+        if self._writer is not None:
+            self._writer.flush()
+        else:
+            flush_log_writers()
+        return self._get_db_conn()
+    
+    @staticmethod
+    def _limited_json(data: Optional[Dict]) -> Optional[str]:
+        """JSON with long strings truncated, to avoid huge JSONB"""
+        if not data:
+            return None
+        limited = {}
+        for key, value in data.items():
+            if isinstance(value, str) and len(value) > 500:
+                limited[key] = value[:500] + "..."
+            else:
+                limited[key] = value
+        return json.dumps(limited)
+    
+    def log_raw_page(
+        self,
+        url: str,
+        status: int,
+        storage_path: Optional[str] = None,
+        content_length: Optional[int] = None,
+        source_id: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Record a fetched page stored in HTML storage.
+        
+        Returns:
+            raw_pages ID (usable as raw_page_id right away), None if dropped
+        """
+        try:
+            return self.writer.add(
+                'raw_pages',
+                url=url,
+                status=status,
+                storage_path=storage_path,
+                content_length=content_length,
+                source_id=source_id
+            )
+        except Exception as e:
+            logger.error(f"Error logging raw page: {e}")
+            return None
+    
     def log_extraction(
         self,
         url: str,
@@ -51,55 +114,26 @@ class ExtractionLogger:
             job_count: Number of jobs extracted
             
         Returns:
-            Log entry ID if successful, None otherwise
+            Log entry ID if buffered, None otherwise (sampled out or dropped)
         """
-        conn = None
         try:
-            conn = self._get_db_conn()
-            with conn.cursor() as cur:
-                # Prepare extracted_fields JSONB
-                fields_json = None
-                if extracted_fields:
-                    # Limit size of extracted_fields to avoid huge JSONB
-                    limited_fields = {}
-                    for key, value in extracted_fields.items():
-                        if isinstance(value, str) and len(value) > 500:
-                            limited_fields[key] = value[:500] + "..."
-                        else:
-                            limited_fields[key] = value
-                    fields_json = json.dumps(limited_fields)
-                
-                # Insert log entry
-                cur.execute("""
-                    INSERT INTO extraction_logs (
-                        url, raw_page_id, status, reason,
-                        extracted_fields, source_id, created_at
-                    )
-                    VALUES (%s, %s, %s, %s, %s::JSONB, %s, NOW())
-                    RETURNING id
-                """, (
-                    url,
-                    raw_page_id,
-                    status,
-                    reason,
-                    fields_json,
-                    source_id
-                ))
-                
-                log_id = cur.fetchone()[0]
-                conn.commit()
-                
+            log_id = self.writer.add(
+                'extraction_logs',
+                sampleable=(status == 'OK'),
+                url=url,
+                raw_page_id=raw_page_id,
+                status=status,
+                reason=reason,
+                extracted_fields=self._limited_json(extracted_fields),
+                source_id=source_id
+            )
+            if log_id:
                 logger.debug(f"Logged extraction: {status} for {url[:50]}...")
-                return str(log_id)
+            return log_id
         
         except Exception as e:
             logger.error(f"Error logging extraction: {e}")
-            if conn:
-                conn.rollback()
             return None
-        finally:
-            if conn:
-                conn.close()
     
     def log_failed_insert(
         self,
@@ -122,55 +156,25 @@ class ExtractionLogger:
             operation: Operation type (insert, update, process)
             
         Returns:
-            Log entry ID if successful, None otherwise
+            Log entry ID if buffered, None otherwise
         """
-        conn = None
         try:
-            conn = self._get_db_conn()
-            with conn.cursor() as cur:
-                # Prepare payload JSONB
-                payload_json = None
-                if payload:
-                    # Limit size of payload to avoid huge JSONB
-                    limited_payload = {}
-                    for key, value in payload.items():
-                        if isinstance(value, str) and len(value) > 500:
-                            limited_payload[key] = value[:500] + "..."
-                        else:
-                            limited_payload[key] = value
-                    payload_json = json.dumps(limited_payload)
-                
-                # Insert failed insert log
-                cur.execute("""
-                    INSERT INTO failed_inserts (
-                        source_url, error, payload, raw_page_id,
-                        source_id, attempt_at, operation
-                    )
-                    VALUES (%s, %s, %s::JSONB, %s, %s, NOW(), %s)
-                    RETURNING id
-                """, (
-                    source_url,
-                    error,
-                    payload_json,
-                    raw_page_id,
-                    source_id,
-                    operation
-                ))
-                
-                log_id = cur.fetchone()[0]
-                conn.commit()
-                
+            log_id = self.writer.add(
+                'failed_inserts',
+                source_url=source_url,
+                error=error,
+                payload=self._limited_json(payload),
+                raw_page_id=raw_page_id,
+                source_id=source_id,
+                operation=operation
+            )
+            if log_id:
                 logger.debug(f"Logged failed insert: {error[:50]}... for {source_url[:50]}...")
-                return str(log_id)
+            return log_id
         
         except Exception as e:
             logger.error(f"Error logging failed insert: {e}")
-            if conn:
-                conn.rollback()
             return None
-        finally:
-            if conn:
-                conn.close()
     
     def get_extraction_stats(
         self,
@@ -189,7 +193,7 @@ class ExtractionLogger:
         """
         conn = None
         try:
-            conn = self._get_db_conn()
+            conn = self._read_conn()
             with conn.cursor() as cur:
                 # Build query
                 if source_id:
@@ -258,7 +262,7 @@ class ExtractionLogger:
         """
         conn = None
         try:
-            conn = self._get_db_conn()
+            conn = self._read_conn()
             with conn.cursor() as cur:
                 # Build query
                 query = """
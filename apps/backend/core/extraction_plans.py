@@ -0,0 +1,209 @@
+"""
+Learned per-source extraction plans.
+
+After a crawl where StrategySelector ran its full analysis and found jobs, the
+winning strategy (plus the container selector, table column-to-field mapping
+or plugin name that produced it) is stored as the source's plan. Later crawls
+execute the plan directly and only fall back to full analysis when the plan's
+job count or validation rate deviates from what it produced when learned.
+
+Plans live in extraction_plans (one row per source) with hit/miss counters
+and the time saved by skipping analysis, and are cached in memory.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+import psycopg2
+from psycopg2.extras import Json, RealDictCursor
+
+logger = logging.getLogger(__name__)
+
+PLAN_FIELDS = (
+    'strategy', 'plugin_name', 'container_selector', 'column_map',
+    'expected_jobs', 'validation_rate', 'full_ms',
+)
+
+# Sentinel for sources known to have no plan (avoids a DB read per crawl)
+_NO_PLAN: Dict[str, Any] = {}
+
+
+class ExtractionPlanStore:
+    """Persists extraction plans and their hit/miss statistics"""
+
+    def __init__(self, db_url: Optional[str]):
+        self.db_url = db_url
+        self._plans: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "learned": 0, "time_saved_ms": 0.0}
+
+    def _get_db_conn(self):
+        return psycopg2.connect(self.db_url, connect_timeout=5)
+
+    def get(self, source_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        if not source_id:
+            return None
+        with self._lock:
+            cached = self._plans.get(source_id)
+        if cached is not None:
+            return cached or None
+
+        plan = None
+        if self.db_url:
+            try:
+                conn = self._get_db_conn()
+                try:
+                    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                        cur.execute(f"""
+                            SELECT {', '.join(PLAN_FIELDS)}
+                            FROM extraction_plans
+                            WHERE source_id = %s::uuid
+                        """, (source_id,))
+                        row = cur.fetchone()
+                        plan = dict(row) if row else None
+                finally:
+                    conn.close()
+            except Exception as e:
+                # Not cached, so the next crawl retries the read
+                logger.debug(f"[extraction_plans] Failed to load plan for {source_id}: {e}")
+                return None
+
+        with self._lock:
+            self._plans[source_id] = plan or _NO_PLAN
+        return plan
+
+    def learn(self, source_id: Optional[str], plan: Dict[str, Any]):
+        """Store (or replace) the plan for a source"""
+        if not source_id:
+            return
+        plan = {k: plan.get(k) for k in PLAN_FIELDS}
+        with self._lock:
+            self._plans[source_id] = plan
+            self._counters["learned"] += 1
+        self._execute("""
+            INSERT INTO extraction_plans (
+                source_id, strategy, plugin_name, container_selector, column_map,
+                expected_jobs, validation_rate, full_ms, learned_at, updated_at
+            ) VALUES (%s::uuid, %s, %s, %s, %s, %s, %s, %s, NOW(), NOW())
+            ON CONFLICT (source_id) DO UPDATE SET
+                strategy = EXCLUDED.strategy,
+                plugin_name = EXCLUDED.plugin_name,
+                container_selector = EXCLUDED.container_selector,
+                column_map = EXCLUDED.column_map,
+                expected_jobs = EXCLUDED.expected_jobs,
+                validation_rate = EXCLUDED.validation_rate,
+                full_ms = EXCLUDED.full_ms,
+                learned_at = NOW(),
+                updated_at = NOW()
+        """, (
+            source_id, plan['strategy'], plan['plugin_name'], plan['container_selector'],
+            Json(plan['column_map']) if plan['column_map'] else None,
+            plan['expected_jobs'], plan['validation_rate'], plan['full_ms'],
+        ))
+
+    def record_hit(self, source_id: str, time_saved_ms: float):
+        time_saved_ms = max(0.0, time_saved_ms)
+        with self._lock:
+            self._counters["hits"] += 1
+            self._counters["time_saved_ms"] += time_saved_ms
+        logger.info(f"[extraction_plans] Plan hit for {source_id}, saved {time_saved_ms:.0f}ms")
+        self._execute("""
+            UPDATE extraction_plans
+            SET hits = hits + 1,
+                time_saved_ms = time_saved_ms + %s,
+                last_hit_at = NOW()
+            WHERE source_id = %s::uuid
+        """, (int(time_saved_ms), source_id))
+
+    def record_miss(self, source_id: str, reason: Optional[str]):
+        with self._lock:
+            self._counters["misses"] += 1
+        logger.info(f"[extraction_plans] Plan miss for {source_id}: {reason}")
+        self._execute("""
+            UPDATE extraction_plans
+            SET misses = misses + 1,
+                last_miss_reason = %s,
+                updated_at = NOW()
+            WHERE source_id = %s::uuid
+        """, (reason, source_id))
+
+    def _execute(self, sql: str, params: tuple):
+        # Plan bookkeeping must never fail a crawl
+        if not self.db_url:
+            return
+        try:
+            conn = self._get_db_conn()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(sql, params)
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.debug(f"[extraction_plans] Failed to persist plan update: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """In-process counters since start"""
+        with self._lock:
+            c = dict(self._counters)
+        attempts = c["hits"] + c["misses"]
+        return {
+            **c,
+            "hit_rate": round(c["hits"] / attempts, 4) if attempts else 0.0,
+            "avg_time_saved_ms": round(c["time_saved_ms"] / c["hits"], 1) if c["hits"] else 0.0,
+        }
+
+    def get_totals(self) -> Dict[str, Any]:
+        """Persisted plan statistics across all sources and processes"""
+        conn = self._get_db_conn()
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute("""
+                    SELECT
+                        COUNT(*) as plans,
+                        COALESCE(SUM(hits), 0) as hits,
+                        COALESCE(SUM(misses), 0) as misses,
+                        COALESCE(SUM(time_saved_ms), 0) as time_saved_ms,
+                        SUM(hits)::float / NULLIF(SUM(hits + misses), 0) as hit_rate,
+                        SUM(time_saved_ms)::float / NULLIF(SUM(hits), 0) as avg_time_saved_ms
+                    FROM extraction_plans
+                """)
+                return cur.fetchone()
+        finally:
+            conn.close()
+
+    def get_source_stats(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Persisted per-source plan statistics, busiest first"""
+        conn = self._get_db_conn()
+        try:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute("""
+                    SELECT
+                        p.source_id, s.org_name, p.strategy, p.plugin_name,
+                        p.expected_jobs, p.hits, p.misses, p.time_saved_ms,
+                        p.hits::float / NULLIF(p.hits + p.misses, 0) as hit_rate,
+                        p.time_saved_ms::float / NULLIF(p.hits, 0) as avg_time_saved_ms,
+                        p.last_miss_reason, p.learned_at, p.last_hit_at
+                    FROM extraction_plans p
+                    LEFT JOIN sources s ON s.id = p.source_id
+                    ORDER BY p.hits + p.misses DESC
+                    LIMIT %s
+                """, (limit,))
+                return cur.fetchall()
+        finally:
+            conn.close()
+
+
+# Global instance (lazy initialization)
+_plan_store: Optional[ExtractionPlanStore] = None
+
+
+def get_plan_store(db_url: Optional[str]) -> ExtractionPlanStore:
+    """Shared store so every crawler in the process sees the same plan cache"""
+    global _plan_store
+    if _plan_store is None:
+        _plan_store = ExtractionPlanStore(db_url)
+    elif not _plan_store.db_url and db_url:
+        _plan_store.db_url = db_url
+    return _plan_store
@@ -9,7 +9,8 @@ import re
 import logging
 from typing import Dict, Optional, List
 from datetime import datetime, date
-from dateutil import parser as date_parser
+
+from core.date_parsing import parse_date
 
 logger = logging.getLogger(__name__)
 
@@ -146,36 +147,17 @@ class FieldExtractor:
         """
         Parse deadline text to date object.
         
-        Supports multiple date formats commonly used in job listings.
+        Supports multiple date formats commonly used in job listings
+        (DD-MM-YYYY, DD MMM YYYY, MMM DD, YYYY, DD-MMM-YY) via
+        core.date_parsing, with dateparser for anything else.
         """
         if not deadline_text or deadline_text.lower() in ['n/a', 'na', '-', '—', '']:
             return None
         
-        # Common date formats
-        date_formats = [
-            r'(\d{1,2})[-/](\d{1,2})[-/](\d{2,4})',  # DD-MM-YYYY or DD/MM/YYYY
-            r'(\d{1,2})\s+([A-Za-z]{3,9})\s+(\d{2,4})',  # DD MMM YYYY
-            r'([A-Za-z]{3,9})\s+(\d{1,2}),?\s+(\d{2,4})',  # MMM DD, YYYY
-            r'(\d{1,2})-([A-Za-z]{3,9})-(\d{2,4})',  # DD-MMM-YY
-        ]
-        
-        # Try regex patterns first
-        for pattern in date_formats:
-            match = re.search(pattern, deadline_text)
-            if match:
-                try:
-                    parsed = date_parser.parse(deadline_text, fuzzy=True)
-                    return parsed.date()
-                except:
-                    continue
-        
-        # Fallback to dateutil fuzzy parsing
-        try:
-            parsed = date_parser.parse(deadline_text, fuzzy=True)
-            return parsed.date()
-        except:
+        parsed = parse_date(deadline_text)
+        if parsed is None:
             logger.warning(f"Failed to parse deadline: '{deadline_text}'")
-            return None
+        return parsed
     
     @staticmethod
     def parse_table_header(header_row) -> Dict[str, int]:
@@ -34,6 +34,15 @@ class Geocoder:
         self._last_nominatim_request = 0
         self._nominatim_delay = 1.0  # 1 second between requests
         
+        # The 1 req/s limit applies to all our processes, so share it through the database when configured
+        self._nominatim_bucket = None
+        db_url = os.getenv('SUPABASE_DB_URL') or os.getenv('DATABASE_URL')
+        if db_url and os.getenv('DOMAIN_LIMITS_SHARED', 'true').lower() == 'true':
+            from core.domain_limits import SharedTokenBucket, get_bucket_store
+            self._nominatim_bucket = SharedTokenBucket(
+                get_bucket_store(db_url), 'nominatim.openstreetmap.org', 1.0, 1.0 / self._nominatim_delay
+            )
+        
         # Cache for geocoding results (in-memory, simple dict)
         self._cache: Dict[str, Dict] = {}
         self._cache_max_size = 1000
@@ -62,10 +71,14 @@ class Geocoder:
         Returns:
             Dict with geocoding data or None
         """
-        # Rate limiting: wait if needed
-        time_since_last = time.time() - self._last_nominatim_request
-        if time_since_last < self._nominatim_delay:
-            await asyncio.sleep(self._nominatim_delay - time_since_last)
+        # Rate limiting: the shared bucket when configured, else this process's last request time
+        if self._nominatim_bucket is not None:
+            from core.domain_limits import acquire_token
+            await acquire_token(self._nominatim_bucket, 'nominatim.openstreetmap.org')
+        else:
+            time_since_last = time.time() - self._last_nominatim_request
+            if time_since_last < self._nominatim_delay:
+                await asyncio.sleep(self._nominatim_delay - time_since_last)
         
         try:
             async with httpx.AsyncClient(timeout=10.0) as client:
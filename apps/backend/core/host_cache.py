@@ -0,0 +1,147 @@
+"""
+Process-local, host-keyed TTL caches for robots.txt rules and domain policies.
+
+Sits in front of the robots_cache and domain_policies tables so detail-page
+fan-out on one host costs a single lookup. Misses (no policy row, robots.txt
+unreachable) are cached too, for a shorter TTL. Concurrent loads of the same
+host share one in-flight fetch.
+
+Entries are per process; POST /api/admin/domain_policies/{host} invalidates
+the local entry and the TTL bounds staleness elsewhere.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+HOST_CACHE_SIZE = 10000
+
+# Domain policies change rarely and are invalidated on admin update
+POLICY_CACHE_TTL_SECONDS = 300
+POLICY_NEGATIVE_TTL_SECONDS = 300
+
+# Matches ROBOTS_CACHE_HOURS in core.robots; failures retry sooner
+ROBOTS_MEMORY_TTL_SECONDS = 12 * 3600
+ROBOTS_NEGATIVE_TTL_SECONDS = 300
+
+# Loader result: (value, ttl_seconds or None for the cache default)
+Loader = Callable[[], Awaitable[Tuple[Any, Optional[float]]]]
+
+
+class HostTTLCache:
+    """Thread-safe TTL-bounded LRU keyed by host, with single-flight loading"""
+
+    def __init__(self, name: str, ttl_seconds: float, negative_ttl_seconds: float,
+                 maxsize: int = HOST_CACHE_SIZE):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Tuple[int, str], asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "loads": 0, "shared_loads": 0, "invalidations": 0}
+
+    def _count(self, **deltas: int):
+        with self._lock:
+            for key, delta in deltas.items():
+                self._counters[key] += delta
+
+    def get(self, host: str) -> Tuple[bool, Any]:
+        """Return (hit, value); value may be None for a cached miss"""
+        host = host.lower()
+        with self._lock:
+            entry = self._data.get(host)
+            if entry is not None:
+                expires_at, value = entry
+                if time.monotonic() < expires_at:
+                    self._data.move_to_end(host)
+                    self._counters["hits"] += 1
+                    return True, value
+                del self._data[host]
+            self._counters["misses"] += 1
+        return False, None
+
+    def put(self, host: str, value: Any, ttl_seconds: Optional[float] = None):
+        """Store a value; None is cached as a miss with the negative TTL"""
+        if ttl_seconds is None:
+            ttl_seconds = self.negative_ttl_seconds if value is None else self.ttl_seconds
+        host = host.lower()
+        with self._lock:
+            self._data[host] = (time.monotonic() + ttl_seconds, value)
+            self._data.move_to_end(host)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    async def get_or_load(self, host: str, loader: Loader) -> Tuple[Any, bool]:
+        """
+        Return (value, loaded) for host, calling loader on a miss.
+
+        Concurrent callers for the same host on the same event loop await a
+        single loader call; loaded is True only for the caller that ran it.
+        """
+        hit, value = self.get(host)
+        if hit:
+            return value, False
+
+        key = (id(asyncio.get_running_loop()), host.lower())
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self._count(shared_loads=1)
+            return await asyncio.shield(pending), False
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value, ttl_seconds = await loader()
+            self.put(host, value, ttl_seconds)
+            self._count(loads=1)
+            future.set_result(value)
+            return value, True
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else is waiting
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate(self, host: str):
+        with self._lock:
+            if self._data.pop(host.lower(), None) is not None:
+                self._counters["invalidations"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"name": self.name, "size": len(self._data), **self._counters}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Global instances
+robots_cache = HostTTLCache("robots", ROBOTS_MEMORY_TTL_SECONDS, ROBOTS_NEGATIVE_TTL_SECONDS)
+policy_cache = HostTTLCache("domain_policies", POLICY_CACHE_TTL_SECONDS, POLICY_NEGATIVE_TTL_SECONDS)
+
+
+def invalidate_host(host: str):
+    """Drop cached robots rules and domain policy for a host (after an admin update)"""
+    robots_cache.invalidate(host)
+    policy_cache.invalidate(host)
+    logger.info(f"[host_cache] Invalidated cached policy and robots rules for {host}")
+
+
+def stats() -> Dict:
+    """Counters for both caches"""
+    return {"robots": robots_cache.stats(), "domain_policies": policy_cache.stats()}
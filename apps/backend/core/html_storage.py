@@ -4,33 +4,47 @@ Stores raw HTML content for debugging and re-extraction.
 
 Supports two backends:
 1. Supabase Storage (for production/cloud)
-2. Filesystem (for local development)
+2. Filesystem (for local development), backed by the content-addressed
+   blob store in core.blob_store. Identical pages are stored once and
+   store() returns a "sha256:<key>" reference.
 """
 
 import os
+import time
+import asyncio
 import logging
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Dict
 from pathlib import Path
 from datetime import datetime
 import hashlib
 from urllib.parse import urlparse
 
+from core.blob_store import BlobStore, get_blob_store, is_blob_ref, blob_ref, ref_key, BLOB_RETENTION_DAYS
+
 logger = logging.getLogger(__name__)
 
 
 class HTMLStorage:
     """Storage backend for raw HTML content"""
     
-    def __init__(self, storage_type: str = "filesystem", storage_path: Optional[str] = None):
+    def __init__(
+        self,
+        storage_type: str = "filesystem",
+        storage_path: Optional[str] = None,
+        blob_store: Optional[BlobStore] = None
+    ):
         """
         Initialize HTML storage.
         
         Args:
             storage_type: "supabase" or "filesystem"
-            storage_path: For filesystem, the base directory. For Supabase, the bucket name.
+            storage_path: For filesystem, the base directory of legacy
+                (pre-blob-store) pages. For Supabase, the bucket name.
+            blob_store: Blob store for filesystem pages (default: shared store)
         """
         self.storage_type = storage_type.lower()
         self.storage_path = storage_path or "raw-html"
+        self.blob_store = blob_store or get_blob_store()
         
         if self.storage_type == "filesystem":
             # Create storage directory if it doesn't exist
@@ -100,20 +114,17 @@ class HTMLStorage:
             Storage path if successful, None otherwise
         """
         try:
-            storage_path = self._generate_path(url, source_id)
-            
             if self.storage_type == "filesystem":
-                # Store in filesystem
-                file_path = self.base_path / storage_path
-                file_path.parent.mkdir(parents=True, exist_ok=True)
-                
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(html_content)
-                
-                logger.debug(f"Stored HTML to filesystem: {file_path}")
-                return str(storage_path)
+                key, created = self.blob_store.put(html_content.encode('utf-8'))
+                if created:
+                    logger.debug(f"Stored HTML blob {key[:12]} for {url}")
+                else:
+                    logger.debug(f"HTML unchanged for {url}, reusing blob {key[:12]}")
+                return blob_ref(key)
             
-            elif self.storage_type == "supabase":
+            storage_path = self._generate_path(url, source_id)
+            
+            if self.storage_type == "supabase":
                 # Store in Supabase Storage
                 try:
                     # Upload to Supabase Storage
@@ -148,6 +159,13 @@ class HTMLStorage:
             HTML content if found, None otherwise
         """
         try:
+            if is_blob_ref(storage_path):
+                data = self.blob_store.get(ref_key(storage_path))
+                if data is None:
+                    logger.warning(f"HTML blob not found: {storage_path}")
+                    return None
+                return data.decode('utf-8')
+            
             if self.storage_type == "filesystem":
                 file_path = self.base_path / storage_path
                 if file_path.exists():
@@ -184,6 +202,11 @@ class HTMLStorage:
             True if deleted, False otherwise
         """
         try:
+            if is_blob_ref(storage_path):
+                # Blobs may be shared by several pages; unreferenced blobs
+                # are reclaimed by gc() once they age out
+                return True
+            
             if self.storage_type == "filesystem":
                 file_path = self.base_path / storage_path
                 if file_path.exists():
@@ -205,6 +228,39 @@ class HTMLStorage:
             logger.error(f"Error deleting HTML: {e}")
             return False
 
+    
+    async def store_async(self, url: str, html_content: str, source_id: Optional[str] = None) -> Optional[str]:
+        """store() without blocking the event loop on compression and disk I/O"""
+        return await asyncio.to_thread(self.store, url, html_content, source_id)
+    
+    def gc(self, retention_days: int = BLOB_RETENTION_DAYS) -> Dict[str, int]:
+        """
+        Apply retention to stored HTML.
+        
+        Removes blobs not re-seen within the window and legacy per-day
+        files older than it. raw_pages rows are expired by the caller.
+        """
+        result = {"removed": 0, "freed_bytes": 0, "kept": 0, "legacy_removed": 0}
+        if self.storage_type != "filesystem":
+            return result
+        
+        result.update(self.blob_store.gc(retention_days))
+        
+        cutoff = time.time() - retention_days * 86400
+        if self.base_path.exists():
+            for file_path in self.base_path.rglob("*.html"):
+                try:
+                    if file_path.stat().st_mtime < cutoff:
+                        file_path.unlink()
+                        result["legacy_removed"] += 1
+                except OSError:
+                    continue
+        return result
+    
+    def stats(self) -> Dict:
+        """Dedupe and compression metrics of the underlying blob store"""
+        return self.blob_store.stats()
+
 
 # Global instance (lazy initialization)
 _html_storage: Optional[HTMLStorage] = None
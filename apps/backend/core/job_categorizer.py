@@ -13,6 +13,8 @@ import logging
 from typing import Optional, Dict, List, Tuple
 from enum import Enum
 
+from core.keyword_matcher import KeywordMatcher
+
 logger = logging.getLogger(__name__)
 
 
@@ -113,6 +115,10 @@ class JobCategorizer:
         'entry': -1,
     }
     
+    # Modifiers that promote an 'officer' match to a higher level or demote it
+    OFFICER_SENIOR_MODIFIERS = ['senior', 'chief', 'head', 'director', 'manager']
+    OFFICER_JUNIOR_MODIFIERS = ['junior', 'entry', 'assistant', 'associate']
+    
     @staticmethod
     def _map_un_p_level(p_number: int) -> JobLevel:
         """Map UN P-level to standardized level"""
@@ -222,35 +228,38 @@ class JobCategorizer:
                 logger.debug(f"[categorizer] UN ASG/USG match -> {JobLevel.EXECUTIVE_CHIEF.value}")
                 return JobLevel.EXECUTIVE_CHIEF.value
         
-        # Context-aware keyword matching
+        # Context-aware keyword matching; the title is scanned once for all
+        # level keywords (word boundaries) and once for all modifiers (substring)
+        keyword_matcher, modifier_matcher = _get_matchers()
+        title_keywords = keyword_matcher.matched(title_lower)
+        title_modifiers = modifier_matcher.matched(title_lower)
+        
         best_match = None
         best_score = -1
         
         for level, keywords, required_modifiers, excluded_modifiers in JobCategorizer.LEVEL_PATTERNS:
             # Check if any excluded modifiers are present (skip this level if so)
             if excluded_modifiers:
-                if any(mod in title_lower for mod in excluded_modifiers):
+                if title_modifiers.intersection(excluded_modifiers):
                     continue
             
             # Check for required modifiers (if any)
             if required_modifiers:
-                if not any(mod in title_lower for mod in required_modifiers):
+                if not title_modifiers.intersection(required_modifiers):
                     continue
             
-            # Check for keywords with word boundary detection
+            # First keyword of this level (in list order) found as a whole word
             score = 0
             matched_keyword = None
             
             for keyword in keywords:
-                # Use word boundary regex for exact matching
-                pattern = r'\b' + re.escape(keyword) + r'\b'
-                if re.search(pattern, title_lower, re.IGNORECASE):
+                if keyword in title_keywords:
                     score = 10  # Base score for keyword match
                     matched_keyword = keyword
                     
                     # Check for seniority modifiers that affect the level
                     for modifier, elevation in JobCategorizer.SENIORITY_MODIFIERS.items():
-                        if modifier in title_lower:
+                        if modifier in title_modifiers:
                             # Check if modifier is near the keyword (within 3 words)
                             title_words = title_lower.split()
                             keyword_idx = -1
@@ -278,12 +287,12 @@ class JobCategorizer:
             # Special handling for "officer" - needs extra context
             if matched_keyword == 'officer':
                 # Check for seniority indicators
-                if any(mod in title_lower for mod in ['senior', 'chief', 'head', 'director', 'manager']):
+                if title_modifiers.intersection(JobCategorizer.OFFICER_SENIOR_MODIFIERS):
                     # Skip officer level, let higher level patterns match
                     continue
                 
                 # Check for junior indicators
-                if any(mod in title_lower for mod in ['junior', 'entry', 'assistant', 'associate']):
+                if title_modifiers.intersection(JobCategorizer.OFFICER_JUNIOR_MODIFIERS):
                     score = 5  # Lower score, might be junior level
                     # Don't break, continue to check other patterns
             
@@ -345,3 +354,24 @@ class JobCategorizer:
         
         return None
 
+
+# Compiled lazily from JobCategorizer's tables
+_keyword_matcher: Optional[KeywordMatcher] = None
+_modifier_matcher: Optional[KeywordMatcher] = None
+
+
+def _get_matchers() -> Tuple[KeywordMatcher, KeywordMatcher]:
+    global _keyword_matcher, _modifier_matcher
+    if _keyword_matcher is None or _modifier_matcher is None:
+        patterns = JobCategorizer.LEVEL_PATTERNS
+        _keyword_matcher = KeywordMatcher(
+            [kw for _, keywords, _, _ in patterns for kw in keywords],
+            boundary='word',
+        )
+        _modifier_matcher = KeywordMatcher(
+            [mod for _, _, required, excluded in patterns for mod in required + excluded]
+            + list(JobCategorizer.SENIORITY_MODIFIERS)
+            + JobCategorizer.OFFICER_SENIOR_MODIFIERS
+            + JobCategorizer.OFFICER_JUNIOR_MODIFIERS
+        )
+    return _keyword_matcher, _modifier_matcher
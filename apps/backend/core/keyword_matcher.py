@@ -0,0 +1,140 @@
+"""
+Compiled multi-keyword matcher.
+
+Heuristics across the crawler and search (link scoring, job level
+categorization, strategy analysis, fallback query parsing) check text against
+keyword vocabularies. KeywordMatcher compiles a vocabulary once into a single
+trie-shaped regex so one scan of the text finds every keyword occurrence,
+instead of one substring scan per keyword.
+
+Boundary modes:
+    'none'    plain substring match (same as `kw in text`)
+    'word'    whole words only (same as r'\\b' + kw + r'\\b')
+    'prefix'  keyword must start a word but may continue (plurals, -ing, ...)
+    'auto'    'word' for keywords of 3 characters or fewer, else 'prefix'
+
+Boundaries apply only at keyword edges that are word characters, so
+keywords like '/job/' or '10+' still match where they appear.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+BOUNDARY_MODES = ('none', 'word', 'prefix', 'auto')
+
+# Keywords this short match whole words only in 'auto' mode ('it', 'hr', 'pm')
+AUTO_WORD_MAX_LEN = 3
+
+
+class KeywordMatcher:
+    """Matches a fixed keyword vocabulary in one pass over the text"""
+
+    def __init__(self, keywords: Iterable[str], boundary: str = 'none'):
+        if boundary not in BOUNDARY_MODES:
+            raise ValueError(f"Unknown boundary mode: {boundary}")
+        self.boundary = boundary
+        # Vocabulary order is kept for first(); duplicates collapse
+        self.keywords: List[str] = list(dict.fromkeys(k.lower() for k in keywords if k))
+        self._order: Dict[str, int] = {k: i for i, k in enumerate(self.keywords)}
+        # Shorter keywords that are prefixes of a longer one share its start
+        # position, so the regex reports only the longest; derive the rest
+        self._prefixes: Dict[str, List[str]] = {
+            k: [p for p in self.keywords if p != k and k.startswith(p)]
+            for k in self.keywords
+        }
+        # Prefix hits need the text position only when they carry a right boundary
+        self._positional_prefixes = any(
+            self._right_bounded(p) for prefixes in self._prefixes.values() for p in prefixes
+        )
+        # Matching is case-insensitive by lowercasing the text; re.IGNORECASE
+        # is several times slower on the alternation
+        self._pattern = re.compile(f"(?=({self._build_regex()}))") if self.keywords else None
+
+    def _right_bounded(self, keyword: str) -> bool:
+        if not re.match(r'\w', keyword[-1]):
+            return False
+        if self.boundary == 'word':
+            return True
+        if self.boundary == 'auto':
+            return len(keyword) <= AUTO_WORD_MAX_LEN
+        return False
+
+    def _build_regex(self) -> str:
+        # Trie of keywords; each terminal remembers whether it needs (?!\w)
+        trie: Dict = {}
+        for keyword in self.keywords:
+            node = trie
+            for ch in keyword:
+                node = node.setdefault(ch, {})
+            node[''] = self._right_bounded(keyword)
+
+        def render(node: Dict) -> str:
+            branches = [re.escape(ch) + render(child) for ch, child in sorted(node.items()) if ch]
+            if '' in node:
+                # Terminal last so longer keywords win at the same position
+                branches.append(r'(?!\w)' if node[''] else '')
+            if len(branches) == 1:
+                return branches[0]
+            return '(?:' + '|'.join(branches) + ')'
+
+        roots = []
+        for ch, child in sorted(trie.items()):
+            lead = r'(?<!\w)' if self.boundary != 'none' and re.match(r'\w', ch) else ''
+            roots.append(lead + re.escape(ch) + render(child))
+        return '|'.join(roots)
+
+    def _right_ok(self, text: str, keyword: str, start: int) -> bool:
+        if not self._right_bounded(keyword):
+            return True
+        end = start + len(keyword)
+        return end >= len(text) or not (text[end].isalnum() or text[end] == '_')
+
+    def find_all(self, text: Optional[str]) -> List[Tuple[str, int]]:
+        """
+        Every (keyword, start) occurrence, including overlapping ones.
+        Positions index into text.lower().
+        """
+        if not text or self._pattern is None:
+            return []
+        text = text.lower()
+        hits = []
+        for m in self._pattern.finditer(text):
+            keyword = m.group(1)
+            start = m.start()
+            hits.append((keyword, start))
+            for prefix in self._prefixes.get(keyword, ()):
+                if self._right_ok(text, prefix, start):
+                    hits.append((prefix, start))
+        return hits
+
+    def matched(self, text: Optional[str]) -> Set[str]:
+        """Distinct keywords present in the text"""
+        if not text or self._pattern is None:
+            return set()
+        if self._positional_prefixes:
+            return {keyword for keyword, _ in self.find_all(text)}
+        # findall stays in C; prefixes without a right boundary always match
+        found = set(self._pattern.findall(text.lower()))
+        for keyword in list(found):
+            found.update(self._prefixes.get(keyword, ()))
+        return found
+
+    def search(self, text: Optional[str]) -> bool:
+        """True if any keyword is present (same as any(kw in text ...))"""
+        return bool(text) and self._pattern is not None and self._pattern.search(text.lower()) is not None
+
+    def first(self, text: Optional[str]) -> Optional[str]:
+        """The earliest keyword in vocabulary order that is present"""
+        found = self.matched(text)
+        return min(found, key=self._order.__getitem__) if found else None
+
+    def count(self, text: Optional[str]) -> int:
+        """Number of distinct keywords present"""
+        return len(self.matched(text))
+
+    def match_prefix(self, text: Optional[str]) -> Optional[str]:
+        """Keyword the text starts with (the longest one), if any"""
+        if not text or self._pattern is None:
+            return None
+        m = self._pattern.match(text.lower())
+        return m.group(1) if m else None
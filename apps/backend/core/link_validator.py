@@ -3,16 +3,20 @@ Link validation service for verifying apply URLs.
 
 Validates that job apply URLs are accessible and working.
 Uses HTTP HEAD requests to minimize bandwidth, follows redirects,
-and caches results in database for 24 hours.
+and caches results in database for 24 hours. A small process-local
+LRU sits in front of the link_validations table for hot lookups.
 """
 
 import logging
 import asyncio
+import threading
+import time
+from collections import OrderedDict, defaultdict
 from typing import Dict, Optional, Tuple, Any, List
 from datetime import datetime, timedelta
 from urllib.parse import urlparse
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 from core.net import HTTPClient
 
 logger = logging.getLogger(__name__)
@@ -26,6 +30,84 @@ VALID_STATUS_CODES = {200, 201, 202, 301, 302, 303, 307, 308}
 # Maximum redirect hops to follow
 MAX_REDIRECT_HOPS = 3
 
+# Process-local LRU in front of link_validations
+MEMORY_CACHE_SIZE = 5000
+MEMORY_CACHE_TTL_SECONDS = 3600
+
+# Concurrent HEAD requests against a single host
+PER_HOST_CONCURRENCY = 2
+
+# Background revalidation
+REVALIDATION_BATCH_SIZE = 500
+
+# Status codes that mean the posting is gone (anything else that fails is
+# treated as transient and does not flag the job)
+DEAD_STATUS_CODES = {404, 410}
+
+
+class ValidationLRU:
+    """Thread-safe TTL-bounded LRU of validation results keyed by URL"""
+
+    def __init__(self, maxsize: int = MEMORY_CACHE_SIZE, ttl_seconds: int = MEMORY_CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._data.get(url)
+            if entry is None:
+                return None
+            stored_at, result = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._data[url]
+                return None
+            self._data.move_to_end(url)
+            return result
+
+    def put(self, url: str, result: Dict):
+        with self._lock:
+            self._data[url] = (time.monotonic(), result)
+            self._data.move_to_end(url)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, url: str):
+        with self._lock:
+            self._data.pop(url, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def _host_of(url: str) -> str:
+    try:
+        return (urlparse(url).hostname or '').lower()
+    except Exception:
+        return ''
+
+
+def is_dead_link(result: Dict) -> Optional[bool]:
+    """
+    Decide whether a validation result means the apply link is dead.
+
+    Returns True/False for a definitive answer and None when the failure
+    looks transient (timeouts, 5xx, rate limiting) and should not change
+    the job's link status.
+    """
+    if result.get('valid'):
+        return False
+    if result.get('status_code') in DEAD_STATUS_CODES:
+        return True
+    if result.get('error') == 'Invalid URL format':
+        return True
+    return None
+
 
 class LinkValidator:
     """
@@ -35,13 +117,15 @@ class LinkValidator:
     - HTTP HEAD requests (lightweight)
     - Redirect following (up to 3 hops)
     - Status code validation
-    - Database caching (24h TTL)
-    - Batch validation support
+    - Database caching (24h TTL) with an in-memory LRU tier
+    - Batch validation with per-host concurrency and bulk cache I/O
+    - Background revalidation that flags jobs with dead links
     """
     
     def __init__(self, db_url: str):
         self.db_url = db_url
         self.http_client = HTTPClient()
+        self.memory_cache = ValidationLRU()
     
     def _get_db_conn(self):
         """Get database connection"""
@@ -86,18 +170,30 @@ class LinkValidator:
         
         url = url.strip()
         
-        # Check cache first
+        # Check cache first (memory, then database)
         if use_cache:
-            cached_result = self._get_cached_validation(url)
+            cached_result = self.memory_cache.get(url)
+            if cached_result is None:
+                cached_result = self._get_cached_validations([url]).get(url)
             if cached_result:
                 logger.debug(f"[link_validator] Using cached validation for {url}")
                 return cached_result
         
+        result = await self._perform_validation(url, follow_redirects=follow_redirects)
+        self._cache_validations({url: result})
+        return result
+    
+    async def _perform_validation(
+        self,
+        url: str,
+        follow_redirects: bool = True
+    ) -> Dict[str, Any]:
+        """Validate a single URL over the network without touching the cache"""
         # Validate URL format
         try:
             parsed = urlparse(url)
             if not parsed.scheme or not parsed.netloc:
-                result = {
+                return {
                     'valid': False,
                     'status_code': None,
                     'final_url': url,
@@ -106,10 +202,8 @@ class LinkValidator:
                     'cached': False,
                     'validated_at': datetime.utcnow()
                 }
-                self._cache_validation(url, result)
-                return result
         except Exception as e:
-            result = {
+            return {
                 'valid': False,
                 'status_code': None,
                 'final_url': url,
@@ -118,8 +212,6 @@ class LinkValidator:
                 'cached': False,
                 'validated_at': datetime.utcnow()
             }
-            self._cache_validation(url, result)
-            return result
         
         # Perform HTTP HEAD request
         try:
@@ -130,7 +222,12 @@ class LinkValidator:
             
             is_valid = status_code in VALID_STATUS_CODES
             
-            result = {
+            if is_valid:
+                logger.debug(f"[link_validator] ✓ Valid: {url} -> {final_url} ({status_code})")
+            else:
+                logger.warning(f"[link_validator] ✗ Invalid: {url} ({status_code})")
+            
+            return {
                 'valid': is_valid,
                 'status_code': status_code,
                 'final_url': final_url or url,
@@ -140,19 +237,10 @@ class LinkValidator:
                 'validated_at': datetime.utcnow()
             }
             
-            # Cache result
-            self._cache_validation(url, result)
-            
-            if is_valid:
-                logger.debug(f"[link_validator] ✓ Valid: {url} -> {final_url} ({status_code})")
-            else:
-                logger.warning(f"[link_validator] ✗ Invalid: {url} ({status_code})")
-            
-            return result
-            
         except Exception as e:
             error_msg = str(e)
-            result = {
+            logger.error(f"[link_validator] Error validating {url}: {error_msg}")
+            return {
                 'valid': False,
                 'status_code': None,
                 'final_url': url,
@@ -161,12 +249,6 @@ class LinkValidator:
                 'cached': False,
                 'validated_at': datetime.utcnow()
             }
-            
-            # Cache error result (shorter TTL for errors)
-            self._cache_validation(url, result, ttl_hours=1)
-            
-            logger.error(f"[link_validator] Error validating {url}: {error_msg}")
-            return result
     
     async def _check_url(
         self,
@@ -251,13 +333,18 @@ class LinkValidator:
             # If we get here, we hit max redirects
             raise Exception(f"Too many redirects (>{max_hops})")
     
-    def _get_cached_validation(self, url: str) -> Optional[Dict]:
-        """Get cached validation result if still valid"""
+    def _get_cached_validations(self, urls: List[str]) -> Dict[str, Dict]:
+        """Fetch fresh cached results for a batch of URLs in one query"""
+        if not urls:
+            return {}
+        
+        cached = {}
         conn = self._get_db_conn()
         try:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute("""
                     SELECT 
+                        url,
                         is_valid,
                         status_code,
                         final_url,
@@ -265,15 +352,12 @@ class LinkValidator:
                         error_message,
                         validated_at
                     FROM link_validations
-                    WHERE url = %s
-                    AND validated_at > NOW() - INTERVAL '%s hours'
-                    ORDER BY validated_at DESC
-                    LIMIT 1
-                """, (url, VALIDATION_CACHE_TTL_HOURS))
+                    WHERE url = ANY(%s)
+                    AND validated_at > NOW() - make_interval(hours => %s)
+                """, (list(urls), VALIDATION_CACHE_TTL_HOURS))
                 
-                row = cur.fetchone()
-                if row:
-                    return {
+                for row in cur.fetchall():
+                    result = {
                         'valid': row['is_valid'],
                         'status_code': row['status_code'],
                         'final_url': row['final_url'],
@@ -282,26 +366,44 @@ class LinkValidator:
                         'cached': True,
                         'validated_at': row['validated_at']
                     }
+                    cached[row['url']] = result
+                    self.memory_cache.put(row['url'], result)
         except Exception as e:
             logger.warning(f"[link_validator] Error reading cache: {e}")
         finally:
             conn.close()
         
-        return None
+        return cached
     
-    def _cache_validation(self, url: str, result: Dict, ttl_hours: int = VALIDATION_CACHE_TTL_HOURS):
-        """Cache validation result in database"""
+    def _cache_validations(self, results: Dict[str, Dict]):
+        """Upsert a batch of validation results and refresh the memory tier"""
+        if not results:
+            return
+        
+        for url, result in results.items():
+            self.memory_cache.put(url, {**result, 'cached': True})
+        
+        rows = [
+            (
+                url,
+                result['valid'],
+                result['status_code'],
+                result['final_url'],
+                result['redirect_count'],
+                result.get('error'),
+                result['validated_at']
+            )
+            for url, result in results.items()
+        ]
+        
         conn = self._get_db_conn()
         try:
             with conn.cursor() as cur:
-                # Upsert validation result
-                cur.execute("""
+                execute_values(cur, """
                     INSERT INTO link_validations (
                         url, is_valid, status_code, final_url,
                         redirect_count, error_message, validated_at
-                    ) VALUES (
-                        %s, %s, %s, %s, %s, %s, %s
-                    )
+                    ) VALUES %s
                     ON CONFLICT (url) DO UPDATE SET
                         is_valid = EXCLUDED.is_valid,
                         status_code = EXCLUDED.status_code,
@@ -309,18 +411,10 @@ class LinkValidator:
                         redirect_count = EXCLUDED.redirect_count,
                         error_message = EXCLUDED.error_message,
                         validated_at = EXCLUDED.validated_at
-                """, (
-                    url,
-                    result['valid'],
-                    result['status_code'],
-                    result['final_url'],
-                    result['redirect_count'],
-                    result.get('error'),
-                    result['validated_at']
-                ))
+                """, rows, page_size=500)
                 conn.commit()
         except Exception as e:
-            logger.warning(f"[link_validator] Error caching validation: {e}")
+            logger.warning(f"[link_validator] Error caching validations: {e}")
             conn.rollback()
         finally:
             conn.close()
@@ -329,39 +423,169 @@ class LinkValidator:
         self,
         urls: List[str],
         use_cache: bool = True,
-        max_concurrent: int = 10
+        max_concurrent: int = 10,
+        per_host_concurrent: int = PER_HOST_CONCURRENCY
     ) -> Dict[str, Dict]:
         """
         Validate multiple URLs concurrently.
         
+        Cache state for the whole batch is fetched with a single query and
+        fresh results are written back with a single upsert. Requests are
+        bounded globally and per host so one slow ATS cannot starve the rest.
+        
         Args:
             urls: List of URLs to validate
             use_cache: Whether to use cached results
             max_concurrent: Maximum concurrent validations
+            per_host_concurrent: Maximum concurrent validations per host
         
         Returns:
             Dictionary mapping URL -> validation result
         """
+        results: Dict[str, Dict] = {}
+        pending: List[str] = []
+        
+        for url in dict.fromkeys(u.strip() for u in urls if u and u.strip()):
+            cached = self.memory_cache.get(url) if use_cache else None
+            if cached is not None:
+                results[url] = cached
+            else:
+                pending.append(url)
+        
+        if use_cache and pending:
+            db_cached = self._get_cached_validations(pending)
+            results.update(db_cached)
+            pending = [url for url in pending if url not in db_cached]
+        
+        if not pending:
+            return results
+        
         semaphore = asyncio.Semaphore(max_concurrent)
-        results = {}
+        host_semaphores: Dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(per_host_concurrent)
+        )
         
         async def validate_with_semaphore(url: str):
-            async with semaphore:
-                return url, await self.validate_url(url, use_cache=use_cache)
+            async with host_semaphores[_host_of(url)]:
+                async with semaphore:
+                    return url, await self._perform_validation(url)
         
-        tasks = [validate_with_semaphore(url) for url in urls]
+        tasks = [validate_with_semaphore(url) for url in pending]
         completed = await asyncio.gather(*tasks, return_exceptions=True)
         
+        fresh: Dict[str, Dict] = {}
         for item in completed:
             if isinstance(item, Exception):
                 logger.error(f"[link_validator] Batch validation error: {item}")
                 continue
             
             url, result = item
-            results[url] = result
+            fresh[url] = result
+        
+        self._cache_validations(fresh)
+        results.update(fresh)
         
         return results
     
+    def _select_revalidation_urls(self, limit: int) -> List[str]:
+        """Apply URLs of active jobs whose validation is missing or stale"""
+        conn = self._get_db_conn()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT j.apply_url
+                    FROM jobs j
+                    LEFT JOIN link_validations lv ON lv.url = j.apply_url
+                    WHERE j.status = 'active'
+                    AND j.deleted_at IS NULL
+                    AND j.apply_url IS NOT NULL
+                    AND (lv.url IS NULL OR lv.validated_at < NOW() - make_interval(hours => %s))
+                    GROUP BY j.apply_url, lv.validated_at
+                    ORDER BY lv.validated_at ASC NULLS FIRST
+                    LIMIT %s
+                """, (VALIDATION_CACHE_TTL_HOURS, limit))
+                return [row[0] for row in cur.fetchall()]
+        finally:
+            conn.close()
+    
+    def _mark_jobs(self, results: Dict[str, Dict]) -> Dict[str, int]:
+        """Record link status on jobs for definitive results"""
+        dead = [url for url, r in results.items() if is_dead_link(r) is True]
+        alive = [url for url, r in results.items() if is_dead_link(r) is False]
+        counts = {'marked_dead': 0, 'marked_alive': 0}
+        if not dead and not alive:
+            return counts
+        
+        conn = self._get_db_conn()
+        try:
+            with conn.cursor() as cur:
+                if dead:
+                    cur.execute("""
+                        UPDATE jobs
+                        SET apply_url_valid = FALSE,
+                            apply_url_checked_at = NOW()
+                        WHERE apply_url = ANY(%s)
+                        AND deleted_at IS NULL
+                        AND apply_url_valid IS DISTINCT FROM FALSE
+                    """, (dead,))
+                    counts['marked_dead'] = cur.rowcount
+                if alive:
+                    cur.execute("""
+                        UPDATE jobs
+                        SET apply_url_valid = TRUE,
+                            apply_url_checked_at = NOW()
+                        WHERE apply_url = ANY(%s)
+                        AND deleted_at IS NULL
+                    """, (alive,))
+                    counts['marked_alive'] = cur.rowcount
+                conn.commit()
+        except Exception as e:
+            logger.error(f"[link_validator] Error marking job link status: {e}")
+            conn.rollback()
+        finally:
+            conn.close()
+        
+        return counts
+    
+    async def revalidate_stale(
+        self,
+        limit: int = REVALIDATION_BATCH_SIZE,
+        max_concurrent: int = 10
+    ) -> Dict[str, int]:
+        """
+        Revalidate stale or never-checked apply URLs of active jobs.
+        
+        Jobs whose apply link is definitively gone (404/410, malformed URL)
+        are flagged with apply_url_valid = FALSE.
+        
+        Returns:
+            {'checked', 'valid', 'invalid', 'marked_dead', 'marked_alive'}
+        """
+        try:
+            urls = self._select_revalidation_urls(limit)
+        except Exception as e:
+            logger.error(f"[link_validator] Error selecting stale links: {e}")
+            return {'checked': 0, 'valid': 0, 'invalid': 0, 'marked_dead': 0, 'marked_alive': 0}
+        
+        if not urls:
+            return {'checked': 0, 'valid': 0, 'invalid': 0, 'marked_dead': 0, 'marked_alive': 0}
+        
+        results = await self.validate_batch(urls, use_cache=False, max_concurrent=max_concurrent)
+        counts = self._mark_jobs(results)
+        valid_count = sum(1 for r in results.values() if r.get('valid'))
+        
+        summary = {
+            'checked': len(results),
+            'valid': valid_count,
+            'invalid': len(results) - valid_count,
+            **counts,
+        }
+        logger.info(
+            f"[link_validator] Revalidated {summary['checked']} link(s): "
+            f"{summary['invalid']} invalid, {summary['marked_dead']} job(s) marked dead"
+        )
+        return summary
+    
     def get_validation_stats(self, job_ids: Optional[List[str]] = None) -> Dict:
         """
         Get validation statistics for jobs.
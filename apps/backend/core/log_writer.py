@@ -0,0 +1,358 @@
+"""
+Buffered, batched writer for crawl log tables.
+
+raw_pages, extraction_logs and failed_inserts rows used to be written one
+INSERT (and one connection) at a time on the crawl path. LogWriter buffers
+them in memory and a background thread writes multi-row INSERTs:
+
+- A flush happens when LOG_BATCH_SIZE rows are buffered or every
+  LOG_FLUSH_INTERVAL_MS, and on shutdown (close(), also registered atexit).
+  Tables are written parent-first in one transaction, so an extraction log
+  may reference a raw page buffered in the same batch.
+- Row ids are uuid4s generated here, so callers get the id (e.g.
+  raw_page_id) immediately, before the row is written.
+- The buffer holds at most LOG_MAX_BUFFERED rows. When the database falls
+  behind and the buffer is over half full, sampleable rows (routine
+  extraction logs) are kept 1 in LOG_SAMPLE_EVERY; when it is full they are
+  dropped, and other rows block the caller for up to
+  LOG_BACKPRESSURE_TIMEOUT seconds before being dropped. Callers on an
+  event loop thread are never blocked; their rows are dropped at once.
+- A batch rejected by a constraint or bad value (IntegrityError/DataError)
+  is retried per table, then per row, under savepoints; rows that still fail
+  are dropped and counted as rejected. Other failed flushes (connection,
+  operational errors) put their rows back, within the bound, for the next
+  attempt.
+"""
+
+import os
+import time
+import uuid
+import atexit
+import asyncio
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+logger = logging.getLogger(__name__)
+
+LOG_BATCH_SIZE = int(os.getenv("LOG_BATCH_SIZE", "200"))
+LOG_FLUSH_INTERVAL_MS = int(os.getenv("LOG_FLUSH_INTERVAL_MS", "500"))
+LOG_MAX_BUFFERED = int(os.getenv("LOG_MAX_BUFFERED", "5000"))
+LOG_SAMPLE_EVERY = int(os.getenv("LOG_SAMPLE_EVERY", "10"))
+LOG_BACKPRESSURE_TIMEOUT = float(os.getenv("LOG_BACKPRESSURE_TIMEOUT", "2.0"))
+
+# Table -> columns, in flush order (parents first)
+TABLES: Dict[str, Tuple[str, ...]] = {
+    "raw_pages": ("id", "url", "status", "storage_path", "content_length", "source_id", "fetched_at"),
+    "extraction_logs": ("id", "url", "raw_page_id", "status", "reason", "extracted_fields", "source_id", "created_at"),
+    "failed_inserts": ("id", "source_url", "error", "payload", "raw_page_id", "source_id", "attempt_at", "operation"),
+}
+TIMESTAMP_COLUMNS = {"raw_pages": "fetched_at", "extraction_logs": "created_at", "failed_inserts": "attempt_at"}
+# Placeholders where a column needs a cast
+_TEMPLATES = {
+    table: "(" + ", ".join("%s::JSONB" if col in ("extracted_fields", "payload") else "%s" for col in cols) + ")"
+    for table, cols in TABLES.items()
+}
+
+
+class LogWriter:
+    """Bounded in-memory buffer flushed to Postgres by a background thread"""
+
+    def __init__(
+        self,
+        db_url: str,
+        batch_size: int = LOG_BATCH_SIZE,
+        flush_interval_ms: int = LOG_FLUSH_INTERVAL_MS,
+        max_buffered: int = LOG_MAX_BUFFERED,
+        sample_every: int = LOG_SAMPLE_EVERY,
+        backpressure_timeout: float = LOG_BACKPRESSURE_TIMEOUT,
+    ):
+        self.db_url = db_url
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(1, flush_interval_ms) / 1000.0
+        self.max_buffered = max(self.batch_size, max_buffered)
+        self.sample_every = max(1, sample_every)
+        self.backpressure_timeout = backpressure_timeout
+
+        self._buffer: Deque[Tuple[str, tuple]] = deque()
+        self._inflight = 0  # Rows taken by a flush that is still writing
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()  # One flush (thread or caller) at a time
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._sample_seq = 0
+        # Raw pages dropped under pressure; children must not reference them
+        self._dropped_raw_pages: Set[str] = set()
+        self._counters = {
+            "rows_added": 0, "rows_written": 0, "batches": 0, "flush_errors": 0,
+            "sampled_out": 0, "dropped": 0, "rejected": 0, "blocked_s": 0.0, "flush_s": 0.0,
+        }
+
+    def add(self, table: str, sampleable: bool = False, **values: Any) -> Optional[str]:
+        """
+        Buffer one row; returns its id (generated unless given), or None if
+        the row was sampled out or dropped.
+        """
+        columns = TABLES[table]
+        row_id = str(values.get("id") or uuid.uuid4())
+        values["id"] = row_id
+        values.setdefault(TIMESTAMP_COLUMNS[table], datetime.now(timezone.utc))
+        row = tuple(values.get(col) for col in columns)
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("LogWriter is closed")
+            self._ensure_thread()
+
+            pending = self._pending()
+            if sampleable and pending >= self.max_buffered // 2:
+                self._sample_seq += 1
+                if pending >= self.max_buffered or self._sample_seq % self.sample_every:
+                    self._counters["sampled_out"] += 1
+                    return None
+
+            if pending >= self.max_buffered:
+                # Backpressure: wait for the flusher to make room (never on an event loop)
+                self._cond.notify_all()
+                if not _on_event_loop():
+                    started = time.monotonic()
+                    self._cond.wait_for(
+                        lambda: self._pending() < self.max_buffered or self._closed,
+                        timeout=self.backpressure_timeout,
+                    )
+                    self._counters["blocked_s"] += time.monotonic() - started
+                if self._pending() >= self.max_buffered or self._closed:
+                    self._counters["dropped"] += 1
+                    if table == "raw_pages":
+                        self._forget_raw_page(row_id)
+                    logger.warning(f"[log_writer] Buffer full, dropped {table} row")
+                    return None
+
+            self._buffer.append((table, row))
+            self._counters["rows_added"] += 1
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify_all()
+        return row_id
+
+    def _pending(self) -> int:
+        """Rows not yet written, including a batch being written (caller holds _cond)"""
+        return len(self._buffer) + self._inflight
+
+    def _ensure_thread(self):
+        """Start the flusher on first use (caller holds _cond)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._closed or len(self._buffer) >= self.batch_size,
+                    timeout=self.flush_interval,
+                )
+                if self._closed:
+                    return
+            if not self.flush():
+                # Database unavailable: back off instead of retrying a full buffer at once
+                with self._cond:
+                    self._cond.wait_for(lambda: self._closed, timeout=self.flush_interval)
+
+    def flush(self) -> bool:
+        """Write everything buffered now; False if a write failed (rows are kept)"""
+        with self._flush_lock:
+            while True:
+                with self._cond:
+                    batch = list(self._buffer)
+                    self._buffer.clear()
+                    self._inflight = len(batch)
+                    dropped_parents = set(self._dropped_raw_pages)
+                if not batch:
+                    return True
+                started = time.perf_counter()
+                rejected = 0
+                try:
+                    try:
+                        self._write(batch, dropped_parents)
+                    except (psycopg2.IntegrityError, psycopg2.DataError) as e:
+                        logger.warning(f"[log_writer] Batch of {len(batch)} log rows rejected ({e}); isolating bad rows")
+                        rejected = self._write(batch, dropped_parents, isolate=True)
+                except Exception as e:
+                    self._requeue(batch)
+                    logger.error(f"[log_writer] Failed to write {len(batch)} log rows: {e}")
+                    return False
+                with self._cond:
+                    self._inflight = 0
+                    self._cond.notify_all()  # Room for blocked callers
+                self._count(rows_written=len(batch) - rejected, rejected=rejected, batches=1,
+                            flush_s=time.perf_counter() - started)
+
+    def _write(self, batch: List[Tuple[str, tuple]], dropped_parents: Set[str], isolate: bool = False) -> int:
+        """
+        Write a batch in one transaction. With isolate, each table (and each row
+        of a table that fails) is written under a savepoint, and rows that still
+        violate a constraint are skipped; returns the number skipped.
+        """
+        by_table: Dict[str, List[tuple]] = {table: [] for table in TABLES}
+        for table, row in batch:
+            by_table[table].append(row)
+        missing_parents = set(dropped_parents)
+        rejected = 0
+
+        conn = psycopg2.connect(self.db_url)
+        try:
+            with conn.cursor() as cur:
+                for table, rows in by_table.items():
+                    if not rows:
+                        continue
+                    columns = TABLES[table]
+                    if missing_parents and "raw_page_id" in columns:
+                        idx = columns.index("raw_page_id")
+                        rows = [
+                            row[:idx] + (None,) + row[idx + 1:] if row[idx] in missing_parents else row
+                            for row in rows
+                        ]
+                    if not isolate:
+                        self._insert(cur, table, rows)
+                        continue
+                    if self._insert_isolated(cur, table, rows):
+                        continue
+                    for row in rows:
+                        if not self._insert_isolated(cur, table, [row]):
+                            rejected += 1
+                            if table == "raw_pages":
+                                missing_parents.add(row[0])  # Children keep their row, unlinked
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        return rejected
+
+    def _insert(self, cur, table: str, rows: List[tuple]):
+        columns = TABLES[table]
+        execute_values(
+            cur,
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s ON CONFLICT (id) DO NOTHING",
+            rows,
+            template=_TEMPLATES[table],
+            page_size=self.batch_size,
+        )
+
+    def _insert_isolated(self, cur, table: str, rows: List[tuple]) -> bool:
+        """Insert under a savepoint; False (rolled back) on a constraint or data error"""
+        cur.execute("SAVEPOINT log_writer_rows")
+        try:
+            self._insert(cur, table, rows)
+        except (psycopg2.IntegrityError, psycopg2.DataError) as e:
+            cur.execute("ROLLBACK TO SAVEPOINT log_writer_rows")
+            if len(rows) == 1:
+                logger.warning(f"[log_writer] Dropped {table} row {rows[0][0]}: {e}")
+            return False
+        cur.execute("RELEASE SAVEPOINT log_writer_rows")
+        return True
+
+    def _requeue(self, batch: List[Tuple[str, tuple]]):
+        """Put a failed batch back in front, oldest rows dropped past the bound"""
+        with self._cond:
+            self._inflight = 0
+            room = max(0, self.max_buffered - len(self._buffer))
+            kept = batch[len(batch) - room:] if room < len(batch) else batch
+            self._buffer.extendleft(reversed(kept))
+            self._counters["flush_errors"] += 1
+            self._counters["dropped"] += len(batch) - len(kept)
+            for table, row in batch[:len(batch) - len(kept)]:
+                if table == "raw_pages":
+                    self._forget_raw_page(row[0])
+
+    def _forget_raw_page(self, row_id: str):
+        """Record a dropped raw page (caller holds _cond)"""
+        if len(self._dropped_raw_pages) >= self.max_buffered:
+            self._dropped_raw_pages.clear()
+        self._dropped_raw_pages.add(row_id)
+
+    def close(self, timeout: float = 10.0):
+        """Stop the flusher and write what is buffered"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self.flush()
+        with self._cond:
+            if self._buffer:
+                logger.warning(f"[log_writer] {len(self._buffer)} log rows not written at shutdown")
+
+    # Metrics
+
+    def _count(self, **deltas: float):
+        with self._cond:
+            for name, delta in deltas.items():
+                self._counters[name] += delta
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            c = dict(self._counters)
+            buffered, inflight = len(self._buffer), self._inflight
+        return {
+            **c,
+            "buffered": buffered,
+            "in_flight": inflight,
+            "max_buffered": self.max_buffered,
+            "avg_batch_rows": round(c["rows_written"] / c["batches"], 1) if c["batches"] else 0.0,
+            "avg_flush_ms": round(c["flush_s"] / c["batches"] * 1000, 1) if c["batches"] else 0.0,
+        }
+
+
+def _on_event_loop() -> bool:
+    """True when called from a thread running an asyncio event loop"""
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+# Global instances (lazy initialization), one per database
+_writers: Dict[str, LogWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_log_writer(db_url: str) -> LogWriter:
+    with _writers_lock:
+        writer = _writers.get(db_url)
+        if writer is None:
+            writer = _writers[db_url] = LogWriter(db_url)
+        return writer
+
+
+def flush_log_writers():
+    """Write buffered rows now (e.g. before reading the log tables back)"""
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.flush()
+
+
+def shutdown_log_writers():
+    """Flush and stop every writer; safe to call more than once"""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        try:
+            writer.close()
+        except Exception as e:
+            logger.warning(f"[log_writer] Failed to flush on shutdown: {e}")
+
+
+atexit.register(shutdown_log_writers)
@@ -0,0 +1,437 @@
+"""
+Cross-source near-duplicate job detection.
+
+The same vacancy is often published on the organization's own site and again
+on aggregator/RSS sources with a slightly different title, URL and reference,
+so exact canonical_hash matching misses it. This module fingerprints jobs on
+title + org + location + deadline, finds near-duplicates with a MinHash-LSH
+index and links them into clusters via jobs.duplicate_of.
+
+Rows with duplicate_of set are non-canonical: they are skipped by enrichment
+and Meilisearch indexing.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import meilisearch  # type: ignore[reportMissingImports]
+except ImportError:
+    meilisearch = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# MinHash / LSH parameters: 16 bands x 4 rows puts the LSH S-curve midpoint at
+# a Jaccard similarity of ~0.5, so candidates are cheap to over-generate and the
+# exact threshold is applied on the estimated similarity afterwards.
+NUM_PERM = 64
+NUM_BANDS = 16
+ROWS_PER_BAND = NUM_PERM // NUM_BANDS
+SHINGLE_SIZE = 3
+DEFAULT_THRESHOLD = 0.8
+
+# Reload the in-memory index from the database after this many seconds so
+# jobs saved by other processes are picked up.
+INDEX_REFRESH_SECONDS = 3600
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_NON_WORD_RE = re.compile(r'[^a-z0-9]+')
+_ISO_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}')
+_STOPWORDS = {'the', 'of', 'and', 'for', 'in', 'a', 'an', 'to', 'on', 'at'}
+
+
+def _make_permutations(num_perm: int) -> List[Tuple[int, int]]:
+    """Deterministic (a, b) coefficients so signatures are stable across processes."""
+    perms = []
+    for i in range(num_perm):
+        digest = hashlib.blake2b(f"aidjobs-minhash-{i}".encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], 'big') % (_MERSENNE_PRIME - 1) + 1
+        b = int.from_bytes(digest[8:], 'big') % _MERSENNE_PRIME
+        perms.append((a, b))
+    return perms
+
+
+_PERMUTATIONS = _make_permutations(NUM_PERM)
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Lowercase, strip punctuation and collapse whitespace."""
+    if not text:
+        return ''
+    return _NON_WORD_RE.sub(' ', str(text).lower()).strip()
+
+
+def _tokens(text: Optional[str]) -> set:
+    return {t for t in normalize_text(text).split() if t not in _STOPWORDS}
+
+
+def _initials(text: Optional[str]) -> str:
+    return ''.join(t[0] for t in normalize_text(text).split() if t not in _STOPWORDS)
+
+
+def title_shingles(title: Optional[str], k: int = SHINGLE_SIZE) -> set:
+    """Character k-gram shingles of the normalized title."""
+    norm = normalize_text(title)
+    if not norm:
+        return set()
+    if len(norm) <= k:
+        return {norm}
+    return {norm[i:i + k] for i in range(len(norm) - k + 1)}
+
+
+def minhash_signature(shingles: Iterable[str]) -> Tuple[int, ...]:
+    """Compute a NUM_PERM-slot MinHash signature for a set of shingles."""
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), 'big')
+        for s in shingles
+    ]
+    if not hashes:
+        return tuple([_MAX_HASH] * NUM_PERM)
+    return tuple(
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def estimate_jaccard(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+    """Estimate Jaccard similarity from two MinHash signatures."""
+    if not sig_a or not sig_b:
+        return 0.0
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+def build_fingerprint(job: Dict) -> Dict:
+    """
+    Build the dedupe fingerprint for a job.
+
+    The title drives the MinHash signature; org, location and deadline are kept
+    as normalized attributes and used to veto candidate matches.
+    """
+    deadline = job.get('deadline')
+    if deadline is not None and not isinstance(deadline, str):
+        deadline = deadline.isoformat()
+    if deadline and not _ISO_DATE_RE.match(deadline):
+        # Only normalized dates are comparable across sources
+        deadline = None
+    return {
+        'signature': minhash_signature(title_shingles(job.get('title'))),
+        'org_tokens': _tokens(job.get('org_name')),
+        'org_initials': _initials(job.get('org_name')),
+        'location_tokens': _tokens(job.get('location_raw')),
+        'deadline': (deadline or '')[:10] or None,
+    }
+
+
+def _orgs_compatible(fp_a: Dict, fp_b: Dict) -> bool:
+    if not fp_a['org_tokens'] or not fp_b['org_tokens']:
+        return True
+    if fp_a['org_tokens'] & fp_b['org_tokens']:
+        return True
+    # "UNDP" vs "United Nations Development Programme"
+    return (fp_a['org_initials'] in fp_b['org_tokens']
+            or fp_b['org_initials'] in fp_a['org_tokens'])
+
+
+def fingerprints_compatible(fp_a: Dict, fp_b: Dict) -> bool:
+    """Check that org, location and deadline don't contradict each other."""
+    if fp_a['deadline'] and fp_b['deadline'] and fp_a['deadline'] != fp_b['deadline']:
+        return False
+    if (fp_a['location_tokens'] and fp_b['location_tokens']
+            and not fp_a['location_tokens'] & fp_b['location_tokens']):
+        return False
+    return _orgs_compatible(fp_a, fp_b)
+
+
+class NearDuplicateIndex:
+    """
+    In-memory MinHash-LSH index over job fingerprints.
+
+    Entries are keyed by job id and carry the job's source_id, quality score and
+    the id of its cluster's canonical job.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self._entries: Dict[str, Dict] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], set] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._entries
+
+    @staticmethod
+    def _band_keys(signature: Tuple[int, ...]):
+        for band in range(NUM_BANDS):
+            start = band * ROWS_PER_BAND
+            yield (band, signature[start:start + ROWS_PER_BAND])
+
+    def add(self, job_id: str, fingerprint: Dict, source_id: Optional[str] = None,
+            quality_score: Optional[float] = None, canonical_id: Optional[str] = None):
+        """Add (or replace) a job in the index."""
+        if job_id in self._entries:
+            self.remove(job_id)
+        self._entries[job_id] = {
+            'fingerprint': fingerprint,
+            'source_id': source_id,
+            'quality_score': quality_score,
+            'canonical_id': canonical_id or job_id,
+        }
+        for key in self._band_keys(fingerprint['signature']):
+            self._buckets.setdefault(key, set()).add(job_id)
+
+    def remove(self, job_id: str):
+        entry = self._entries.pop(job_id, None)
+        if not entry:
+            return
+        for key in self._band_keys(entry['fingerprint']['signature']):
+            bucket = self._buckets.get(key)
+            if bucket:
+                bucket.discard(job_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        return self._entries.get(job_id)
+
+    def set_canonical(self, job_ids: Iterable[str], canonical_id: str):
+        for job_id in job_ids:
+            if job_id in self._entries:
+                self._entries[job_id]['canonical_id'] = canonical_id
+
+    def cluster_members(self, canonical_id: str) -> List[str]:
+        return [jid for jid, e in self._entries.items() if e['canonical_id'] == canonical_id]
+
+    def query(self, fingerprint: Dict, exclude_source: Optional[str] = None,
+              exclude_id: Optional[str] = None) -> List[Tuple[str, float]]:
+        """
+        Find near-duplicates of a fingerprint.
+
+        Returns (job_id, estimated_similarity) pairs at or above the threshold,
+        most similar first. Jobs from exclude_source are ignored so listings that
+        legitimately repeat within one source are never merged.
+        """
+        candidates = set()
+        for key in self._band_keys(fingerprint['signature']):
+            candidates.update(self._buckets.get(key, ()))
+
+        matches = []
+        for job_id in candidates:
+            if job_id == exclude_id:
+                continue
+            entry = self._entries[job_id]
+            if exclude_source and entry['source_id'] == exclude_source:
+                continue
+            score = estimate_jaccard(fingerprint['signature'], entry['fingerprint']['signature'])
+            if score >= self.threshold and fingerprints_compatible(fingerprint, entry['fingerprint']):
+                matches.append((job_id, score))
+
+        matches.sort(key=lambda m: m[1], reverse=True)
+        return matches
+
+
+def choose_canonical(members: List[Dict]) -> str:
+    """
+    Pick the canonical job of a cluster.
+
+    Highest quality_score wins; ties go to the current canonical so a cluster
+    does not flip between equivalent rows on every crawl.
+    """
+    def rank(member):
+        return (member.get('quality_score') or 0.0, 1 if member.get('is_current') else 0)
+    return max(members, key=rank)['id']
+
+
+class NearDuplicateDetector:
+    """
+    Ingest-time dedupe stage.
+
+    Keeps a process-wide NearDuplicateIndex built from all active jobs and
+    updated incrementally as crawlers save jobs.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.index = NearDuplicateIndex(threshold)
+        self._loaded_at: Optional[float] = None
+
+    def _ensure_loaded(self, cur):
+        if self._loaded_at and time.time() - self._loaded_at < INDEX_REFRESH_SECONDS:
+            return
+
+        cur.execute("""
+            SELECT id::text, source_id::text, title, org_name, location_raw,
+                   deadline, quality_score, duplicate_of::text
+            FROM jobs
+            WHERE status = 'active' AND deleted_at IS NULL
+        """)
+        index = NearDuplicateIndex(self.threshold)
+        for row in cur.fetchall():
+            job_id, source_id, title, org_name, location_raw, deadline, quality_score, duplicate_of = row
+            fingerprint = build_fingerprint({
+                'title': title, 'org_name': org_name,
+                'location_raw': location_raw, 'deadline': deadline,
+            })
+            index.add(job_id, fingerprint, source_id=source_id,
+                      quality_score=float(quality_score) if quality_score is not None else None,
+                      canonical_id=duplicate_of or job_id)
+        self.index = index
+        self._loaded_at = time.time()
+        logger.info(f"[near_dedupe] Loaded dedupe index with {len(index)} active jobs")
+
+    def process_saved_jobs(self, conn, saved_jobs: List[Dict]) -> Dict:
+        """
+        Link freshly saved jobs to near-duplicates from other sources.
+
+        Args:
+            conn: Open psycopg2 connection (committed by this method)
+            saved_jobs: Dicts with id, source_id, title, org_name, location_raw,
+                deadline and quality_score of the rows just inserted/updated
+
+        Returns:
+            Dict with duplicate_ids (saved jobs that are non-canonical) and
+            demoted_ids (previously canonical jobs that lost that status)
+        """
+        duplicate_ids: List[str] = []
+        demoted_ids: List[str] = []
+
+        with conn.cursor() as cur:
+            self._ensure_loaded(cur)
+
+            for job in saved_jobs:
+                job_id = str(job['id'])
+                source_id = str(job['source_id']) if job.get('source_id') else None
+                quality_score = job.get('quality_score')
+                fingerprint = build_fingerprint(job)
+
+                matches = self.index.query(fingerprint, exclude_source=source_id, exclude_id=job_id)
+                if not matches:
+                    # No longer similar to anything: a former duplicate leaves its cluster
+                    previous = self.index.get(job_id)
+                    self.index.add(job_id, fingerprint, source_id=source_id,
+                                   quality_score=quality_score, canonical_id=job_id)
+                    if previous and previous['canonical_id'] != job_id:
+                        cur.execute("""
+                            UPDATE jobs SET duplicate_of = NULL, dedupe_similarity = NULL
+                            WHERE id = %s::uuid
+                        """, (job_id,))
+                    continue
+
+                match_id, score = matches[0]
+                current_canonical = self.index.get(match_id)['canonical_id']
+                if current_canonical == job_id:
+                    # Already the canonical of this cluster
+                    self.index.add(job_id, fingerprint, source_id=source_id,
+                                   quality_score=quality_score, canonical_id=job_id)
+                    continue
+                canonical_entry = self.index.get(current_canonical) or {}
+                new_canonical = choose_canonical([
+                    {'id': current_canonical, 'quality_score': canonical_entry.get('quality_score'),
+                     'is_current': True},
+                    {'id': job_id, 'quality_score': quality_score},
+                ])
+
+                self.index.add(job_id, fingerprint, source_id=source_id,
+                               quality_score=quality_score, canonical_id=new_canonical)
+
+                if new_canonical == job_id:
+                    # New row outranks the cluster's canonical: re-point the cluster
+                    members = [m for m in self.index.cluster_members(current_canonical) if m != job_id]
+                    self.index.set_canonical(members, job_id)
+                    # Each member's own similarity to its new canonical
+                    similarities = [
+                        estimate_jaccard(fingerprint['signature'],
+                                         self.index.get(m)['fingerprint']['signature'])
+                        for m in members
+                    ]
+                    cur.execute("""
+                        UPDATE jobs SET duplicate_of = %s::uuid, dedupe_similarity = s.similarity
+                        FROM unnest(%s::uuid[], %s::real[]) AS s(id, similarity)
+                        WHERE jobs.id = s.id
+                    """, (job_id, members, similarities))
+                    cur.execute("""
+                        UPDATE jobs SET duplicate_of = NULL, dedupe_similarity = NULL
+                        WHERE id = %s::uuid
+                    """, (job_id,))
+                    demoted_ids.append(current_canonical)
+                else:
+                    cur.execute("""
+                        UPDATE jobs SET duplicate_of = %s::uuid, dedupe_similarity = %s
+                        WHERE id = %s::uuid
+                    """, (new_canonical, score, job_id))
+                    duplicate_ids.append(job_id)
+
+        conn.commit()
+
+        if duplicate_ids or demoted_ids:
+            logger.info(
+                f"[near_dedupe] Linked {len(duplicate_ids)} near-duplicate(s), "
+                f"{len(demoted_ids)} canonical change(s)"
+            )
+        return {'duplicate_ids': duplicate_ids, 'demoted_ids': demoted_ids}
+
+
+def remove_from_search_index(job_ids: List[str]):
+    """Remove non-canonical jobs from Meilisearch (best effort)."""
+    if not job_ids or not meilisearch:
+        return
+    meili_host = os.getenv("MEILISEARCH_URL") or os.getenv("MEILI_HOST")
+    meili_key = os.getenv("MEILISEARCH_KEY") or os.getenv("MEILI_API_KEY")
+    meili_index_name = os.getenv("MEILI_JOBS_INDEX", "jobs_index")
+    if not meili_host or not meili_key:
+        return
+    try:
+        index = meilisearch.Client(meili_host, meili_key).index(meili_index_name)
+        for i in range(0, len(job_ids), 100):
+            index.delete_documents(job_ids[i:i + 100])
+    except Exception as e:
+        logger.warning(f"[near_dedupe] Failed to remove duplicates from Meilisearch: {e}")
+
+
+# Global instance
+_detector: Optional[NearDuplicateDetector] = None
+
+
+def get_near_dedupe_detector() -> Optional[NearDuplicateDetector]:
+    """Get or create the global detector (None when disabled via NEAR_DEDUPE_ENABLED)."""
+    global _detector
+
+    if os.getenv('NEAR_DEDUPE_ENABLED', 'true').lower() != 'true':
+        return None
+
+    if _detector is None:
+        threshold = float(os.getenv('NEAR_DEDUPE_THRESHOLD', str(DEFAULT_THRESHOLD)))
+        _detector = NearDuplicateDetector(threshold)
+
+    return _detector
+
+
+def link_near_duplicates(conn, saved_jobs: List[Dict]) -> int:
+    """
+    Run the dedupe stage for jobs a crawler just saved.
+
+    Never raises: dedupe failures must not fail a crawl. Returns the number of
+    saved jobs that were linked as non-canonical duplicates.
+    """
+    detector = get_near_dedupe_detector()
+    if not detector or not saved_jobs:
+        return 0
+    try:
+        result = detector.process_saved_jobs(conn, saved_jobs)
+    except Exception as e:
+        logger.warning(f"[near_dedupe] Dedupe stage failed: {e}")
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        return 0
+
+    remove_from_search_index(result['duplicate_ids'] + result['demoted_ids'])
+    return len(result['duplicate_ids'])
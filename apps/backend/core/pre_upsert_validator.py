@@ -7,6 +7,11 @@ Validations:
 - Missing required fields
 - URL format validation
 - Data type validation
+
+Existing jobs for a batch are fetched in a single query (see
+PreUpsertValidator.prefetch_existing); the resulting ExistenceMap is
+returned with the validation result so the upsert stage can classify
+insert vs update without querying again.
 """
 
 import logging
@@ -17,6 +22,52 @@ from urllib.parse import urlparse
 logger = logging.getLogger(__name__)
 
 
+class ExistenceMap:
+    """
+    Existing jobs for one batch, keyed by canonical_hash and (source_id, apply_url).
+    
+    Each entry is a dict with id, source_id, apply_url, canonical_hash,
+    status and deleted_at.
+    """
+    
+    def __init__(self, rows: Optional[List[Dict]] = None):
+        self.by_hash: Dict[str, Dict] = {}
+        self.by_url: Dict[Tuple[Optional[str], str], Dict] = {}
+        for row in rows or []:
+            self.add(row)
+    
+    def add(self, row: Dict):
+        """Add or replace an entry (e.g. after inserting or restoring a job)"""
+        if row.get('canonical_hash'):
+            self.by_hash[row['canonical_hash']] = row
+        if row.get('apply_url'):
+            source_id = str(row['source_id']) if row.get('source_id') else None
+            self.by_url[(source_id, row['apply_url'])] = row
+    
+    def get(self, canonical_hash: str) -> Optional[Dict]:
+        """Existing job with this canonical hash, if any"""
+        return self.by_hash.get(canonical_hash)
+    
+    def get_by_url(self, apply_url: str, source_id: Optional[str]) -> Optional[Dict]:
+        """Existing job with this apply_url for the source, if any"""
+        return self.by_url.get((str(source_id) if source_id else None, apply_url))
+    
+    def classify(self, canonical_hash: str) -> str:
+        """
+        Classify the upsert for a canonical hash.
+        
+        Returns:
+            'insert' (new job), 'restore' (soft-deleted job) or 'update'
+        """
+        existing = self.by_hash.get(canonical_hash)
+        if existing is None:
+            return 'insert'
+        return 'restore' if existing.get('deleted_at') is not None else 'update'
+    
+    def __len__(self) -> int:
+        return len(self.by_hash)
+
+
 class PreUpsertValidator:
     """
     Validates jobs before database insertion.
@@ -43,13 +94,15 @@ class PreUpsertValidator:
         """
         self.db_connection = db_connection
     
-    def validate_job(self, job: Dict, source_id: Optional[str] = None) -> Tuple[bool, Optional[str], List[str]]:
+    def validate_job(self, job: Dict, source_id: Optional[str] = None,
+                     existing: Optional[ExistenceMap] = None) -> Tuple[bool, Optional[str], List[str]]:
         """
         Validate a single job.
         
         Args:
             job: Job dictionary to validate
             source_id: Source ID for duplicate checking
+            existing: Prefetched existing jobs for the batch (duplicate check runs in memory)
             
         Returns:
             Tuple of (is_valid, error_message, warnings)
@@ -83,6 +136,11 @@ class PreUpsertValidator:
         #     is_duplicate, duplicate_error = self._check_duplicate_url(apply_url, source_id)
         #     if is_duplicate:
         #         return False, duplicate_error, warnings
+        # With a prefetched existence map the check costs no query
+        if existing is not None and source_id:
+            is_duplicate, duplicate_error = self._check_duplicate_url(apply_url, source_id, existing)
+            if is_duplicate:
+                return False, duplicate_error, warnings
         
         # Validate deadline format if present
         deadline = job.get('deadline')
@@ -158,70 +216,120 @@ class PreUpsertValidator:
         
         return True, None
     
-    def _check_duplicate_url(self, apply_url: str, source_id: str) -> Tuple[bool, Optional[str]]:
+    def prefetch_existing(self, jobs: List[Dict], source_id: Optional[str] = None,
+                          canonical_hashes: Optional[List[str]] = None) -> Optional[ExistenceMap]:
         """
-        Check if URL already exists for this source.
+        Fetch existing jobs for a whole batch in one query.
+        
+        Matches on canonical_hash (unique index) and on apply_url for the
+        source (idx_jobs_apply_url). source_id is compared as uuid so the
+        index stays usable.
         
         Args:
-            apply_url: URL to check
-            source_id: Source ID
+            jobs: Job dictionaries in the batch
+            source_id: Source ID for apply_url matching
+            canonical_hashes: Canonical hashes for the batch (defaults to job['canonical_hash'])
             
         Returns:
-            Tuple of (is_duplicate, error_message)
+            ExistenceMap, or None if there is no connection or the lookup failed
         """
         if not self.db_connection:
-            return False, None
+            return None
+        
+        if canonical_hashes is None:
+            canonical_hashes = [job.get('canonical_hash') for job in jobs]
+        hashes = sorted({h for h in canonical_hashes if h})
+        urls = sorted({(job.get('apply_url') or '').strip() for job in jobs} - {''}) if source_id else []
+        
+        if not hashes and not urls:
+            return ExistenceMap()
+        
+        conditions = []
+        params: List = []
+        if hashes:
+            conditions.append("canonical_hash = ANY(%s)")
+            params.append(hashes)
+        if urls:
+            conditions.append("(source_id = %s::uuid AND apply_url = ANY(%s))")
+            params.extend([source_id, urls])
         
         try:
             with self.db_connection.cursor() as cur:
-                # Check for existing job with same URL and source
-                cur.execute("""
-                    SELECT id, title, status, deleted_at
+                cur.execute(f"""
+                    SELECT id, source_id, apply_url, canonical_hash, status, deleted_at
                     FROM jobs
-                    WHERE apply_url = %s AND source_id::text = %s
-                    LIMIT 1
-                """, (apply_url, source_id))
-                
-                existing = cur.fetchone()
-                
-                if existing:
-                    # Job exists - this is expected for updates
-                    # Only error if it's a different active job (shouldn't happen with canonical_hash)
-                    if existing[2] == 'active' and existing[3] is None:
-                        # This is fine - will be updated via canonical_hash
-                        return False, None
-                    else:
-                        # Deleted job - will be restored
-                        return False, None
-                
-                return False, None
-                
+                    WHERE {' OR '.join(conditions)}
+                """, params)
+                rows = cur.fetchall()
         except Exception as e:
-            logger.error(f"Error checking duplicate URL: {e}")
-            # Don't block on DB errors - let it through and handle at insert time
-            return False, None
+            logger.error(f"Error prefetching existing jobs: {e}")
+            try:
+                self.db_connection.rollback()
+            except Exception:
+                pass
+            return None
+        
+        columns = ('id', 'source_id', 'apply_url', 'canonical_hash', 'status', 'deleted_at')
+        return ExistenceMap([
+            dict(row) if isinstance(row, dict) else dict(zip(columns, row))
+            for row in rows
+        ])
+    
+    def _check_duplicate_url(self, apply_url: str, source_id: str,
+                             existing: Optional[ExistenceMap] = None) -> Tuple[bool, Optional[str]]:
+        """
+        Check if URL already exists for this source.
+        
+        Args:
+            apply_url: URL to check
+            source_id: Source ID
+            existing: Prefetched existing jobs (skips the query)
+            
+        Returns:
+            Tuple of (is_duplicate, error_message)
+        """
+        if existing is None:
+            existing = self.prefetch_existing([{'apply_url': apply_url}], source_id, [])
+            if existing is None:
+                # Don't block on DB errors - let it through and handle at insert time
+                return False, None
+        
+        match = existing.get_by_url(apply_url, source_id)
+        if match:
+            # Job exists - this is expected for updates (active jobs are updated
+            # and deleted jobs restored via canonical_hash), so it never blocks
+            logger.debug(f"Existing job for URL {apply_url[:80]}: status={match.get('status')}")
+        
+        return False, None
     
-    def validate_batch(self, jobs: List[Dict], source_id: Optional[str] = None) -> Dict:
+    def validate_batch(self, jobs: List[Dict], source_id: Optional[str] = None,
+                       canonical_hashes: Optional[List[str]] = None) -> Dict:
         """
         Validate multiple jobs.
         
         Args:
             jobs: List of job dictionaries
             source_id: Source ID for duplicate checking
+            canonical_hashes: Canonical hashes for the batch (defaults to job['canonical_hash'])
             
         Returns:
             Dict with:
             - valid_jobs: List of valid jobs
             - invalid_jobs: List of (job, error) tuples
             - warnings: List of warnings
+            - existing: ExistenceMap for the batch (None without a DB connection),
+              reusable by the upsert stage
             - stats: Validation statistics
         """
         valid_jobs = []
         invalid_jobs = []
         all_warnings = []
         
+        # One lookup for the whole batch instead of one per job
+        existing = self.prefetch_existing(jobs, source_id, canonical_hashes)
+        
         for job in jobs:
-            is_valid, error, warnings = self.validate_job(job, source_id)
+            is_valid, error, warnings = self.validate_job(job, source_id, existing)
             
             if is_valid:
                 valid_jobs.append(job)
@@ -236,11 +344,13 @@ class PreUpsertValidator:
             'valid_jobs': valid_jobs,
             'invalid_jobs': invalid_jobs,
             'warnings': all_warnings,
+            'existing': existing,
             'stats': {
                 'total': len(jobs),
                 'valid': len(valid_jobs),
                 'invalid': len(invalid_jobs),
-                'warnings_count': len(all_warnings)
+                'warnings_count': len(all_warnings),
+                'existing': len(existing) if existing is not None else 0
             }
         }
 
@@ -2,6 +2,7 @@
 Robots.txt fetching, caching, and parsing
 """
 import os
+import re
 import logging
 import json
 from typing import Optional, Dict, List, Tuple
@@ -9,6 +10,7 @@ from urllib.parse import urlparse, urljoin
 from datetime import datetime, timedelta
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from core.host_cache import ROBOTS_NEGATIVE_TTL_SECONDS, robots_cache
 from core.net import HTTPClient
 
 logger = logging.getLogger(__name__)
@@ -16,6 +18,31 @@ logger = logging.getLogger(__name__)
 ROBOTS_CACHE_HOURS = 12
 
 
+class RobotsRules:
+    """Disallow rules for one host, compiled once into a path matcher"""
+    
+    def __init__(self, disallow_paths: List[str], crawl_delay_ms: Optional[int] = None, source: str = 'fetch'):
+        self.disallow_paths = tuple(disallow_paths)
+        self.crawl_delay_ms = crawl_delay_ms
+        self.source = source
+        
+        # Plain prefixes go through str.startswith(tuple); '*' and '$' patterns into one regex
+        self._prefixes = tuple(p for p in self.disallow_paths if '*' not in p and not p.endswith('$'))
+        patterns = [
+            re.escape(p.rstrip('$')).replace(r'\*', '.*') + ('$' if p.endswith('$') else '')
+            for p in self.disallow_paths if '*' in p or p.endswith('$')
+        ]
+        self._pattern = re.compile('|'.join(f'(?:{p})' for p in patterns)) if patterns else None
+    
+    def allows(self, path: str) -> bool:
+        """True if the path is not disallowed"""
+        if self._prefixes and path.startswith(self._prefixes):
+            return False
+        if self._pattern is not None and self._pattern.match(path):
+            return False
+        return True
+
+
 class RobotsChecker:
     """Handles robots.txt fetching, caching, and checking"""
     
@@ -76,24 +103,8 @@ class RobotsChecker:
         
         return disallow_paths, crawl_delay
     
-    async def get_robots_info(self, url: str) -> Dict:
-        """
-        Get robots.txt info for a URL (cached or fresh).
-        
-        Returns:
-            {
-                'allowed': bool,
-                'crawl_delay_ms': int or None,
-                'cached': bool,
-                'disallow_paths': list
-            }
-        """
-        parsed = urlparse(url)
-        host = parsed.netloc
-        robots_url = f"{parsed.scheme}://{host}/robots.txt"
-        path = parsed.path or '/'
-        
-        # Check cache first
+    def _read_cached(self, host: str) -> Optional[Dict]:
+        """Fresh robots_cache row for host, if any"""
         conn = self._get_db_conn()
         try:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
@@ -104,24 +115,26 @@ class RobotsChecker:
                     AND fetched_at > %s
                 """, (host, datetime.utcnow() - timedelta(hours=ROBOTS_CACHE_HOURS)))
                 
-                cached = cur.fetchone()
-                
-                if cached:
-                    # Use cached data
-                    disallow_paths = cached['disallow'] if cached['disallow'] else []
-                    allowed = not any(path.startswith(p) for p in disallow_paths)
-                    
-                    logger.debug(f"[robots] Using cached robots.txt for {host}")
-                    return {
-                        'allowed': allowed,
-                        'crawl_delay_ms': cached['crawl_delay_ms'],
-                        'cached': True,
-                        'disallow_paths': disallow_paths
-                    }
+                return cur.fetchone()
         finally:
             conn.close()
+    
+    async def _load_rules(self, scheme: str, host: str) -> Tuple[RobotsRules, Optional[float]]:
+        """
+        Load rules for a host from robots_cache, or fetch robots.txt.
+        
+        Returns:
+            (rules, memory TTL in seconds or None for the default)
+        """
+        # Check cache first
+        cached = self._read_cached(host)
+        if cached:
+            # Use cached data
+            logger.debug(f"[robots] Using cached robots.txt for {host}")
+            return RobotsRules(cached['disallow'] or [], cached['crawl_delay_ms'], source='db'), None
         
         # Fetch fresh robots.txt
+        robots_url = f"{scheme}://{host}/robots.txt"
         logger.info(f"[robots] Fetching {robots_url}")
         
         try:
@@ -159,21 +172,37 @@ class RobotsChecker:
             finally:
                 conn.close()
             
-            allowed = not any(path.startswith(p) for p in disallow_paths)
-            
-            return {
-                'allowed': allowed,
-                'crawl_delay_ms': crawl_delay_ms,
-                'cached': False,
-                'disallow_paths': disallow_paths
-            }
+            return RobotsRules(disallow_paths, crawl_delay_ms, source='fetch'), None
         
         except Exception as e:
             logger.error(f"[robots] Error fetching robots.txt for {host}: {e}")
-            # On error, assume allowed but be cautious
-            return {
-                'allowed': True,
-                'crawl_delay_ms': 2000,  # Conservative 2s delay on errors
-                'cached': False,
-                'disallow_paths': []
+            # On error, assume allowed but be cautious; retry after the negative TTL
+            return RobotsRules([], 2000, source='error'), ROBOTS_NEGATIVE_TTL_SECONDS  # Conservative 2s delay
+    
+    async def get_robots_info(self, url: str) -> Dict:
+        """
+        Get robots.txt info for a URL (cached or fresh).
+        
+        Rules are cached per host in memory (core.host_cache) in front of
+        robots_cache; concurrent lookups for a host share one fetch.
+        
+        Returns:
+            {
+                'allowed': bool,
+                'crawl_delay_ms': int or None,
+                'cached': bool,
+                'disallow_paths': list
             }
+        """
+        parsed = urlparse(url)
+        host = parsed.netloc
+        path = parsed.path or '/'
+        
+        rules, loaded = await robots_cache.get_or_load(host, lambda: self._load_rules(parsed.scheme, host))
+        
+        return {
+            'allowed': rules.allows(path),
+            'crawl_delay_ms': rules.crawl_delay_ms,
+            'cached': not loaded or rules.source == 'db',
+            'disallow_paths': list(rules.disallow_paths)
+        }
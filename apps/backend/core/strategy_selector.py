@@ -11,8 +11,40 @@ from typing import Dict, List, Optional, Any, Tuple
 from bs4 import BeautifulSoup
 import os
 
+from core.keyword_matcher import KeywordMatcher
+
 logger = logging.getLogger(__name__)
 
+# A learned plan is trusted while it finds at least this share of the jobs it
+# found when learned, and its validation rate drops by no more than this much
+PLAN_MIN_JOB_RATIO = float(os.getenv('EXTRACTION_PLAN_MIN_JOB_RATIO', '0.5'))
+PLAN_MAX_VALIDATION_DROP = float(os.getenv('EXTRACTION_PLAN_MAX_VALIDATION_DROP', '0.2'))
+
+# Keyword vocabularies (substring matches), compiled once into matchers
+TABLE_HEADER_KEYWORDS = ['title', 'position', 'location', 'deadline', 'apply']
+JOB_LINK_KEYWORDS = ['position', 'job', 'vacancy', 'career', 'opening']
+NAV_KEYWORDS = [
+    'home', 'about', 'contact', 'login', 'register', 'privacy', 'terms',
+    'cookie', 'sitemap', 'search', 'menu', 'skip', 'read more', 'view all',
+    'subscribe', 'newsletter', 'donate', 'support', 'volunteer', 'careers',
+    'our work', 'what we do', 'who we are', 'news', 'blog', 'press', 'media'
+]
+LOCATION_JOB_WORDS = ['manager', 'officer', 'coordinator', 'specialist', 'advisor',
+                      'director', 'assistant', 'analyst', 'engineer', 'consultant']
+TITLE_JOB_KEYWORDS = [
+    'manager', 'officer', 'coordinator', 'specialist', 'advisor', 'director',
+    'assistant', 'analyst', 'engineer', 'consultant', 'expert', 'lead',
+    'senior', 'junior', 'intern', 'volunteer', 'position', 'role', 'vacancy'
+]
+URL_JOB_INDICATORS = ['job', 'position', 'vacancy', 'career', 'opportunity',
+                      'apply', 'application', 'posting', 'listing']
+
+_TABLE_HEADER_MATCHER = KeywordMatcher(TABLE_HEADER_KEYWORDS)
+_JOB_LINK_MATCHER = KeywordMatcher(JOB_LINK_KEYWORDS)
+_NAV_MATCHER = KeywordMatcher(NAV_KEYWORDS)
+_TITLE_JOB_MATCHER = KeywordMatcher(TITLE_JOB_KEYWORDS)
+_URL_JOB_MATCHER = KeywordMatcher(URL_JOB_INDICATORS)
+
 
 class StrategySelector:
     """
@@ -50,6 +82,7 @@ class StrategySelector:
         tables = soup.find_all('table')
         table_count = len(tables)
         has_table_headers = False
+        column_map = {}
         if tables:
             for table in tables[:3]:
                 rows = table.find_all('tr')
@@ -57,28 +90,34 @@ class StrategySelector:
                     first_row = rows[0]
                     cells = first_row.find_all(['th', 'td'])
                     cell_texts = [c.get_text().strip().lower() for c in cells]
-                    job_keywords = ['title', 'position', 'location', 'deadline', 'apply']
-                    if any(kw in ' '.join(cell_texts) for kw in job_keywords):
+                    if _TABLE_HEADER_MATCHER.search(' '.join(cell_texts)):
                         has_table_headers = True
+                        column_map = self._map_table_columns(cell_texts)
                         break
         
         indicators['tables'] = {
             'count': table_count,
             'has_headers': has_table_headers,
+            'column_map': column_map,
             'score': table_count * (2 if has_table_headers else 1)
         }
         
         # Indicator 2: Check for div/list containers
         job_containers = []
+        best_selector = None
+        best_count = 0
         for selector in [
             'div[class*="job"]', 'div[class*="position"]', 'div[class*="vacancy"]',
             'li[class*="job"]', 'li[class*="position"]', 'article[class*="job"]'
         ]:
             containers = soup.select(selector)
             job_containers.extend(containers[:10])
+            if len(containers) > best_count:
+                best_selector, best_count = selector, len(containers)
         
         indicators['divs'] = {
             'container_count': len(job_containers),
+            'best_selector': best_selector,
             'score': len(job_containers)
         }
         
@@ -95,12 +134,11 @@ class StrategySelector:
         # Indicator 4: Check for job-like links
         all_links = soup.find_all('a', href=True)
         job_links = []
-        job_keywords = ['position', 'job', 'vacancy', 'career', 'opening']
         for link in all_links[:100]:
             link_text = link.get_text().strip().lower()
             href = link.get('href', '').lower()
             if len(link_text) >= 10:
-                if any(kw in link_text or kw in href for kw in job_keywords):
+                if _JOB_LINK_MATCHER.search(link_text) or _JOB_LINK_MATCHER.search(href):
                     job_links.append(link)
         
         indicators['links'] = {
@@ -146,6 +184,19 @@ class StrategySelector:
             'scores': scores
         }
     
+    @staticmethod
+    def _map_table_columns(header_texts: List[str]) -> Dict[str, str]:
+        """Header column index -> job field, matching SimpleCrawler's table extraction"""
+        column_map = {}
+        for idx, text in enumerate(header_texts):
+            if 'title' in text or 'position' in text or 'job' in text:
+                column_map[str(idx)] = 'title'
+            elif 'location' in text or 'duty' in text or 'station' in text:
+                column_map[str(idx)] = 'location'
+            elif 'deadline' in text or 'closing' in text or 'apply by' in text:
+                column_map[str(idx)] = 'deadline'
+        return column_map
+    
     def validate_extracted_jobs(self, jobs: List[Dict], source_url: str) -> Tuple[List[Dict], List[str]]:
         """
         Validate extracted jobs for consistency and quality with AI-powered detection.
@@ -179,22 +230,17 @@ class StrategySelector:
             # Validation 2: Enhanced false positive detection
             title_lower = title.lower()
             
-            # Navigation/menu keywords (expanded list)
-            nav_keywords = [
-                'home', 'about', 'contact', 'login', 'register', 'privacy', 'terms',
-                'cookie', 'sitemap', 'search', 'menu', 'skip', 'read more', 'view all',
-                'subscribe', 'newsletter', 'donate', 'support', 'volunteer', 'careers',
-                'our work', 'what we do', 'who we are', 'news', 'blog', 'press', 'media'
-            ]
-            
             # Check if title is clearly navigation
-            if any(nav in title_lower for nav in nav_keywords):
+            nav_count = _NAV_MATCHER.count(title_lower)
+            if nav_count:
                 # Only reject if it's short (likely nav) or contains multiple nav keywords
-                nav_count = sum(1 for nav in nav_keywords if nav in title_lower)
                 if len(title) < 25 or nav_count >= 2:
                     warnings.append(f"Navigation link detected: {title[:50]}")
                     continue
             
+            # Job keywords in the title, used by validations 4, 6 and 8
+            title_job_keywords = _TITLE_JOB_MATCHER.matched(title_lower)
+            
             # Validation 3: Check for date-only titles (common extraction error)
             date_patterns = [
                 r'^\d{1,2}[-/]\d{1,2}[-/]\d{2,4}$',
@@ -214,9 +260,7 @@ class StrategySelector:
                 if (len(parts[0].strip()) < 20 and len(parts[1].strip()) < 20 and
                     parts[0].strip()[0].isupper() and parts[1].strip()[0].isupper()):
                     # Check if it doesn't contain job-related words
-                    job_words = ['manager', 'officer', 'coordinator', 'specialist', 'advisor', 
-                                'director', 'assistant', 'analyst', 'engineer', 'consultant']
-                    if not any(word in title_lower for word in job_words):
+                    if not title_job_keywords.intersection(LOCATION_JOB_WORDS):
                         warnings.append(f"Title appears to be location: {title[:50]}")
                         continue
             
@@ -227,16 +271,10 @@ class StrategySelector:
             
             # Validation 6: Check if title looks like a job title (not just random text)
             # Job titles typically contain job-related keywords or are substantial
-            job_keywords = [
-                'manager', 'officer', 'coordinator', 'specialist', 'advisor', 'director',
-                'assistant', 'analyst', 'engineer', 'consultant', 'expert', 'lead',
-                'senior', 'junior', 'intern', 'volunteer', 'position', 'role', 'vacancy'
-            ]
-            
             # Check if title is too generic or doesn't look like a job
             is_generic = title_lower in ['job', 'position', 'vacancy', 'career', 'opportunity', 
                                         'apply', 'application', 'hiring', 'recruitment']
-            has_job_keyword = any(kw in title_lower for kw in job_keywords)
+            has_job_keyword = bool(title_job_keywords)
             is_substantial = len(title) >= 15
             
             # Reject if it's generic AND doesn't have job keywords AND is short
@@ -263,11 +301,9 @@ class StrategySelector:
             
             # Validation 8: Check URL patterns (job URLs often contain job-related terms)
             url_lower = apply_url.lower()
-            url_job_indicators = ['job', 'position', 'vacancy', 'career', 'opportunity', 
-                                 'apply', 'application', 'posting', 'listing']
             
             # If URL doesn't look job-related AND title is short, be suspicious
-            url_looks_like_job = any(indicator in url_lower for indicator in url_job_indicators)
+            url_looks_like_job = _URL_JOB_MATCHER.search(url_lower)
             if not url_looks_like_job and len(title) < 15:
                 # Still allow if title has job keywords
                 if not has_job_keyword:
@@ -406,8 +442,75 @@ class StrategySelector:
             'strategy_used': strategy_used,
             'original_count': len(jobs),
             'validated_count': len(valid_jobs),
-            'warnings': warnings
+            'warnings': warnings,
+            'plan': self._build_plan(strategy_used, analysis, len(jobs), len(valid_jobs)) if valid_jobs else None
+        }
+        
+        return valid_jobs, metadata
+    
+    @staticmethod
+    def _build_plan(strategy: Optional[str], analysis: Dict[str, Any],
+                    original_count: int, validated_count: int) -> Optional[Dict[str, Any]]:
+        """Describe the winning strategy so later crawls can skip analysis"""
+        if not strategy:
+            return None
+        indicators = analysis.get('indicators', {})
+        return {
+            'strategy': strategy,
+            'container_selector': indicators.get('divs', {}).get('best_selector') if strategy == 'divs' else None,
+            'column_map': indicators.get('tables', {}).get('column_map') if strategy == 'tables' else None,
+            'expected_jobs': validated_count,
+            'validation_rate': round(validated_count / original_count, 4) if original_count else 0.0,
         }
+    
+    def execute_plan(
+        self,
+        html: str,
+        base_url: str,
+        extraction_strategies: Dict[str, callable],
+        plan: Dict[str, Any]
+    ) -> Tuple[Optional[List[Dict]], Dict[str, Any]]:
+        """
+        Run a learned plan's strategy directly, without structure analysis.
+        
+        Returns (jobs, metadata). jobs is None when the plan no longer fits the
+        page (job count or validation rate deviates), in which case the caller
+        should fall back to select_and_validate; metadata['plan_miss_reason']
+        says why.
+        """
+        strategy = plan.get('strategy')
+        metadata: Dict[str, Any] = {'plan_hit': False, 'strategy_used': strategy}
+        
+        extract_func = extraction_strategies.get(strategy)
+        if not extract_func:
+            metadata['plan_miss_reason'] = f'unknown strategy {strategy}'
+            return None, metadata
+        
+        try:
+            jobs = extract_func(html, base_url)
+        except Exception as e:
+            metadata['plan_miss_reason'] = f'strategy error: {e}'
+            return None, metadata
+        
+        normalized_jobs = [self.normalize_job_data(job) for job in jobs]
+        valid_jobs, warnings = self.validate_extracted_jobs(normalized_jobs, base_url)
+        validation_rate = len(valid_jobs) / len(jobs) if jobs else 0.0
+        metadata.update({
+            'original_count': len(jobs),
+            'validated_count': len(valid_jobs),
+            'warnings': warnings,
+        })
+        
+        expected = plan.get('expected_jobs') or 0
+        if not valid_jobs or len(valid_jobs) < expected * PLAN_MIN_JOB_RATIO:
+            metadata['plan_miss_reason'] = f'job count {len(valid_jobs)} vs expected {expected}'
+            return None, metadata
+        
+        learned_rate = plan.get('validation_rate') or 0.0
+        if validation_rate < learned_rate - PLAN_MAX_VALIDATION_DROP:
+            metadata['plan_miss_reason'] = f'validation rate {validation_rate:.2f} vs {learned_rate:.2f}'
+            return None, metadata
         
+        metadata['plan_hit'] = True
         return valid_jobs, metadata
 
@@ -100,6 +100,7 @@ class PluginRegistry:
         
         try:
             result = plugin.extract(html, base_url, config)
+            result.metadata.setdefault('plugin', plugin.name)
             logger.info(f"Plugin {plugin.name} extracted {len(result.jobs)} jobs (confidence={result.confidence:.2f})")
             return result
         except Exception as e:
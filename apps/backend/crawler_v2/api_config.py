@@ -0,0 +1,307 @@
+"""
+Compiled configuration for v1 API sources (sources.parser_hint).
+
+A v1 hint declares the request, how results are paginated and how each
+result maps onto job fields (see app/presets.py for complete examples):
+
+    {
+        "v": 1,
+        "base_url": "https://api.example.org", "path": "/jobs", "method": "GET",
+        "auth": {"type": "none" | "bearer" | "header" | "query", ...},
+        "headers": {...}, "query": {...}, "body": {...},
+        "pagination": {"type": "offset" | "page" | "cursor" | "next_link", ...},
+        "data_path": "data",
+        "map": {"title": "fields.title", "apply_url": "fields.url", ...},
+        "transforms": {"location_raw": {"join": ", "}, "country": {"first": true}},
+        "success_codes": [200],
+        "retry": {"max_retries": 2, "backoff_ms": 1000}
+    }
+
+Paths are compiled with jsonpath-ng once per distinct hint. A plain dotted
+path ("fields.country.name") fans out through lists on the way, so it
+matches every country's name; anything else ("$..title", "items[0].id") is
+parsed as a full JSONPath expression.
+
+Pagination:
+- offset: offset_param/limit_param (default offset/limit), page_size
+- page: page_param (default page), start_page (default 1), optional
+  limit_param for the page size
+- cursor: cursor_param is sent with the value found at cursor_path
+- next_link: follows the URL at next_path, else the Link: rel="next" header
+
+All styles stop after max_pages or on an empty page; offset/page also stop
+on a short page unless until_empty is set. Offset and page requests are
+known up front, so up to "concurrency" pages are fetched at once.
+"""
+
+import json
+import logging
+from dataclasses import dataclass, field
+from functools import lru_cache, reduce
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import urljoin
+
+from jsonpath_ng import parse as parse_jsonpath
+from jsonpath_ng.jsonpath import Child, Fields, Slice
+
+from core.secrets import resolve_secrets
+
+logger = logging.getLogger(__name__)
+
+PAGINATION_TYPES = {'none', 'offset', 'page', 'cursor', 'next_link'}
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_MAX_PAGES = 10
+DEFAULT_CONCURRENCY = 4
+MAX_CONCURRENCY = 16
+
+# Keys probed when data_path is the root and the root is an object
+COMMON_ARRAY_KEYS = ('jobs', 'results', 'items', 'data', 'positions', 'vacancies')
+
+
+def compile_path(path: str):
+    """Compile a mapping path once; dotted paths fan out through lists"""
+    path = (path or '').strip()
+    if not path or path == '$':
+        return None  # The datum itself
+    if all(part and part.replace('_', '').replace('-', '').isalnum() for part in path.split('.')):
+        parts = path.split('.')
+        # Slice() after a step iterates lists and passes objects through.
+        # The last step has none: it would drop falsy leaves such as 0.
+        steps = []
+        for part in parts[:-1]:
+            steps += [Fields(part), Slice()]
+        steps.append(Fields(parts[-1]))
+        return reduce(Child, steps)
+    return parse_jsonpath(path)
+
+
+def find_values(expr, data: Any) -> List[Any]:
+    """All values matched by a compiled path (lists at the leaf are flattened)"""
+    if expr is None:
+        return [data]
+    values = []
+    for match in expr.find(data):
+        if isinstance(match.value, list):
+            values.extend(match.value)
+        elif match.value is not None:
+            values.append(match.value)
+    return values
+
+
+def _positive_int(value: Any, default: int, name: str) -> int:
+    try:
+        value = int(value if value is not None else default)
+    except (TypeError, ValueError):
+        raise ValueError(f"pagination.{name} must be an integer")
+    if value < 1:
+        raise ValueError(f"pagination.{name} must be at least 1")
+    return value
+
+
+@dataclass
+class ApiSourceConfig:
+    """A v1 API hint with its request parts resolved and paths compiled"""
+    url: str
+    method: str = 'GET'
+    headers: Dict[str, str] = field(default_factory=dict)
+    query: Dict[str, Any] = field(default_factory=dict)
+    body: Optional[Dict[str, Any]] = None
+    pagination: str = 'none'
+    page_size: int = DEFAULT_PAGE_SIZE
+    max_pages: int = DEFAULT_MAX_PAGES
+    concurrency: int = DEFAULT_CONCURRENCY
+    until_empty: bool = False
+    offset_param: str = 'offset'
+    limit_param: Optional[str] = 'limit'
+    page_param: str = 'page'
+    start: int = 0  # First offset or page number
+    cursor_param: str = 'cursor'
+    cursor_path: Any = None
+    next_path: Any = None
+    data_path: Any = None
+    fields: Dict[str, Any] = field(default_factory=dict)
+    transforms: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    success_codes: Tuple[int, ...] = (200,)
+    max_retries: int = 0
+    backoff_s: float = 1.0
+
+    @property
+    def parallel(self) -> bool:
+        """Page requests do not depend on previous responses"""
+        return self.pagination in ('offset', 'page')
+
+    # Requests
+
+    def _page_params(self, index: int) -> Dict[str, Any]:
+        if self.pagination == 'offset':
+            params = {self.offset_param: self.start + index * self.page_size}
+        elif self.pagination == 'page':
+            params = {self.page_param: self.start + index}
+        else:
+            return {}
+        if self.limit_param:
+            params[self.limit_param] = self.page_size
+        return params
+
+    def request(self, index: int = 0, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """httpx.request keyword arguments for page index (or a cursor)"""
+        params = dict(self.query)
+        body = dict(self.body) if self.body is not None else None
+        paging = self._page_params(index)
+        if cursor is not None:
+            paging = {self.cursor_param: cursor}
+        # Paging parameters go where the API reads them: the JSON body for POST APIs
+        if body is not None and self.method != 'GET':
+            body.update(paging)
+        else:
+            params.update(paging)
+        request = {'method': self.method, 'url': self.url, 'headers': dict(self.headers), 'params': params}
+        if body is not None and self.method != 'GET':
+            request['json'] = body
+        return request
+
+    def next_cursor(self, data: Any) -> Optional[str]:
+        values = find_values(self.cursor_path, data) if self.cursor_path is not None else []
+        return str(values[0]) if values and values[0] not in ('', None) else None
+
+    def next_url(self, data: Any, link_header: Optional[str], current_url: str) -> Optional[str]:
+        if self.next_path is not None:
+            values = find_values(self.next_path, data)
+            return urljoin(current_url, str(values[0])) if values and values[0] else None
+        # RFC 8288: <https://...?page=2>; rel="next"
+        for part in (link_header or '').split(','):
+            if 'rel="next"' in part or "rel=next" in part:
+                url = part.split(';', 1)[0].strip().strip('<>')
+                return urljoin(current_url, url) if url else None
+        return None
+
+    # Responses
+
+    def items(self, data: Any) -> List[Dict]:
+        """The result objects of one page"""
+        if self.data_path is None and isinstance(data, dict):
+            for key in COMMON_ARRAY_KEYS:
+                if isinstance(data.get(key), list):
+                    return [item for item in data[key] if isinstance(item, dict)]
+            return []
+        values = find_values(self.data_path, data)
+        return [item for item in values if isinstance(item, dict)]
+
+    def map_item(self, item: Dict, base_url: str) -> Dict[str, Any]:
+        """Apply the field mapping and transforms to one result object"""
+        job = {}
+        for name, expr in self.fields.items():
+            values = [v for v in find_values(expr, item) if not isinstance(v, (dict, list))]
+            if not values:
+                continue
+            transform = self.transforms.get(name) or {}
+            if 'join' in transform:
+                value = str(transform['join']).join(str(v).strip() for v in values if str(v).strip())
+            else:
+                value = values[0]
+            job[name] = value.strip() if isinstance(value, str) else str(value)
+        if job.get('description_snippet'):
+            job['description_snippet'] = job['description_snippet'][:500]
+
+        if job.get('apply_url'):
+            job['apply_url'] = urljoin(base_url, job['apply_url'])
+        elif job.get('id') and base_url:
+            job['apply_url'] = f"{base_url.rstrip('/')}/{job['id']}"
+        return job
+
+
+def _build_config(hint: Dict[str, Any], fallback_url: Optional[str]) -> ApiSourceConfig:
+    hint = resolve_secrets(hint)
+
+    url = fallback_url
+    if hint.get('base_url'):
+        url = hint['base_url'].rstrip('/')
+        if hint.get('path'):
+            url += '/' + str(hint['path']).lstrip('/')
+    if not url:
+        raise ValueError("API config needs base_url (or a careers_url)")
+
+    method = str(hint.get('method') or 'GET').upper()
+    headers = {str(k): str(v) for k, v in (hint.get('headers') or {}).items()}
+    query = dict(hint.get('query') or {})
+
+    auth = hint.get('auth') or {}
+    auth_type = auth.get('type', 'none')
+    if auth_type == 'bearer':
+        headers['Authorization'] = f"Bearer {auth.get('token', '')}"
+    elif auth_type == 'header':
+        headers[auth.get('header_name', 'Authorization')] = str(auth.get('token', ''))
+    elif auth_type == 'query':
+        query[auth.get('query_name', 'api_key')] = auth.get('token', '')
+    elif auth_type != 'none':
+        raise ValueError(f"Unsupported auth type: {auth_type}")
+
+    paging = hint.get('pagination') or {}
+    pagination = paging.get('type') or ('offset' if paging.get('offset_param') else 'none')
+    if pagination not in PAGINATION_TYPES:
+        raise ValueError(f"Unsupported pagination type: {pagination}")
+    if pagination == 'cursor' and not paging.get('cursor_path'):
+        raise ValueError("pagination.cursor_path is required for cursor pagination")
+
+    body = hint.get('body')
+    if body is not None and not isinstance(body, dict):
+        raise ValueError("body must be a JSON object")
+
+    config = ApiSourceConfig(url=url, method=method, headers=headers, query=query, body=body)
+    config.pagination = pagination
+    config.page_size = _positive_int(paging.get('page_size'), DEFAULT_PAGE_SIZE, 'page_size')
+    config.max_pages = _positive_int(paging.get('max_pages'), DEFAULT_MAX_PAGES, 'max_pages')
+    config.concurrency = min(MAX_CONCURRENCY, _positive_int(paging.get('concurrency'), DEFAULT_CONCURRENCY, 'concurrency'))
+    config.until_empty = bool(paging.get('until_empty', False))
+    config.offset_param = paging.get('offset_param', 'offset')
+    config.limit_param = paging.get('limit_param', 'limit' if pagination == 'offset' else None)
+    config.page_param = paging.get('page_param', 'page')
+    config.cursor_param = paging.get('cursor_param', 'cursor')
+    if pagination == 'page':
+        config.start = int(paging.get('start_page', 1))
+    elif pagination == 'offset':
+        config.start = int(paging.get('start_offset', 0))
+
+    try:
+        config.cursor_path = compile_path(paging['cursor_path']) if paging.get('cursor_path') else None
+        config.next_path = compile_path(paging['next_path']) if paging.get('next_path') else None
+        config.data_path = compile_path(hint.get('data_path') or '$')
+        config.fields = {name: compile_path(path) for name, path in (hint.get('map') or {}).items() if path}
+    except Exception as e:
+        raise ValueError(f"Invalid JSONPath in API config: {e}")
+    if 'title' not in config.fields:
+        raise ValueError("map.title is required")
+
+    config.transforms = dict(hint.get('transforms') or {})
+    config.success_codes = tuple(int(code) for code in (hint.get('success_codes') or [200]))
+    retry = hint.get('retry') or {}
+    config.max_retries = max(0, int(retry.get('max_retries', 0)))
+    config.backoff_s = max(0.0, float(retry.get('backoff_ms', 1000)) / 1000)
+    return config
+
+
+@lru_cache(maxsize=256)
+def _compile_cached(hint_json: str, fallback_url: Optional[str]) -> Optional[ApiSourceConfig]:
+    hint = json.loads(hint_json)
+    if not isinstance(hint, dict) or hint.get('v') != 1:
+        return None
+    return _build_config(hint, fallback_url)
+
+
+def compile_api_config(parser_hint: Union[str, Dict, None],
+                       fallback_url: Optional[str] = None) -> Optional[ApiSourceConfig]:
+    """
+    Compile a source's parser_hint, or None if it is not a v1 API hint.
+
+    Compiled configs are cached per distinct hint, so repeated crawls of a
+    source reuse the parsed JSONPath expressions. Raises ValueError for a v1
+    hint that cannot be used.
+    """
+    if not parser_hint:
+        return None
+    if isinstance(parser_hint, dict):
+        parser_hint = json.dumps(parser_hint, sort_keys=True)
+    try:
+        return _compile_cached(parser_hint, fallback_url)
+    except json.JSONDecodeError:
+        return None  # Free-text hints are used by the HTML crawler
@@ -1,13 +1,25 @@
 """
 Simple API crawler - extracts jobs from JSON APIs.
+
+Sources with a v1 parser_hint (see crawler_v2/api_config.py) are crawled
+page by page: each page is mapped and saved before the next ones are
+fetched, so memory stays flat however many results the API returns. Other
+sources fall back to a single fetch with common-key probing.
 """
 
+import asyncio
+import dataclasses
+import hashlib
 import logging
 import json
-from typing import Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 import httpx
 import psycopg2
 
+from core.crawl_tracing import CrawlTrace
+from core.domain_limits import get_domain_limiter
+from .api_config import ApiSourceConfig, compile_api_config
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,11 +30,129 @@ class SimpleAPICrawler:
         self.db_url = db_url
         self.timeout = httpx.Timeout(30.0)
         self.user_agent = "Mozilla/5.0 (compatible; AidJobs/1.0; +https://aidjobs.app)"
+        self._extractor = None
+        self._extractor_loaded = False
+        # Per-host politeness budget shared with every other crawler and process
+        self.domain_limiter = get_domain_limiter(db_url)
     
     def _get_db_conn(self):
         """Get database connection"""
         return psycopg2.connect(self.db_url)
     
+    def _get_extractor(self):
+        """Pipeline extractor, built once per crawler (None if unavailable)"""
+        # Its extract_* coroutines are driven with asyncio.run, which is
+        # unavailable inside a running loop
+        try:
+            asyncio.get_running_loop()
+            return None
+        except RuntimeError:
+            pass
+        if not self._extractor_loaded:
+            self._extractor_loaded = True
+            try:
+                from pipeline.extractor import Extractor
+                self._extractor = Extractor(enable_ai=False, enable_snapshots=False, shadow_mode=True)
+            except ImportError:
+                self._extractor = None
+        return self._extractor
+    
+    # Configured (v1) APIs
+    
+    async def _request_page(self, client: httpx.AsyncClient, config: ApiSourceConfig,
+                            request: Dict[str, Any]) -> Tuple[Any, Optional[str]]:
+        """One page request with the config's retries; (JSON body, Link header)"""
+        attempt = 0
+        while True:
+            try:
+                response = await client.request(**request)
+                if response.status_code in config.success_codes:
+                    return response.json(), response.headers.get('link')
+                error = f"HTTP {response.status_code}"
+                retryable = response.status_code == 429 or response.status_code >= 500
+            except httpx.TransportError as e:
+                error = str(e) or type(e).__name__
+                retryable = True
+            if not retryable or attempt >= config.max_retries:
+                raise RuntimeError(f"API request failed: {error}")
+            attempt += 1
+            await asyncio.sleep(config.backoff_s * attempt)
+    
+    def _last_page(self, config: ApiSourceConfig, items: List[Dict]) -> bool:
+        if not items:
+            return True
+        return config.parallel and not config.until_empty and len(items) < config.page_size
+    
+    async def iter_pages(self, config: ApiSourceConfig,
+                         client: httpx.AsyncClient) -> AsyncIterator[List[Dict]]:
+        """
+        Yield the result objects of each page, in page order.
+        
+        Offset/page requests are fetched up to config.concurrency at a time
+        (the first page alone, in case it is the only one); cursor and
+        next-link pages depend on the previous response and are sequential.
+        """
+        if config.parallel:
+            index, window = 0, 1
+            while index < config.max_pages:
+                indexes = range(index, min(index + window, config.max_pages))
+                pages = await asyncio.gather(
+                    *(self._request_page(client, config, config.request(i)) for i in indexes),
+                    return_exceptions=True
+                )
+                for page in pages:
+                    if isinstance(page, BaseException):
+                        raise page
+                    items = config.items(page[0])
+                    if items:
+                        yield items
+                    if self._last_page(config, items):
+                        return
+                index += len(indexes)
+                window = config.concurrency
+            return
+        
+        request = config.request(0)
+        for _ in range(config.max_pages):
+            data, link = await self._request_page(client, config, request)
+            items = config.items(data)
+            if items:
+                yield items
+            if self._last_page(config, items):
+                return
+            if config.pagination == 'cursor':
+                cursor = config.next_cursor(data)
+                if not cursor:
+                    return
+                request = config.request(cursor=cursor)
+            elif config.pagination == 'next_link':
+                next_url = config.next_url(data, link, request['url'])
+                if not next_url or next_url == request['url']:
+                    return
+                # The link carries its own query string
+                request = {**config.request(0), 'url': next_url, 'params': {}}
+            else:
+                return
+    
+    async def fetch_jobs(self, parser_hint: Union[str, Dict], base_url: str,
+                         max_pages: Optional[int] = None) -> List[Dict]:
+        """Fetch and map every page of a configured API (used to test a source)"""
+        config = compile_api_config(parser_hint, base_url)
+        if config is None:
+            raise ValueError("parser_hint is not a v1 API config")
+        if max_pages:
+            config = dataclasses.replace(config, max_pages=max_pages)
+        
+        jobs = []
+        async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True,
+                                     headers={"User-Agent": self.user_agent},
+                                     event_hooks={'request': [self.domain_limiter.on_request]}) as client:
+            async for items in self.iter_pages(config, client):
+                jobs.extend(job for job in (config.map_item(item, base_url) for item in items) if job.get('title'))
+        return jobs
+    
+    # Unconfigured APIs
+    
     async def fetch_api(self, url: str, headers: Optional[Dict] = None) -> Optional[Dict]:
         """Fetch JSON from API"""
         try:
@@ -30,7 +160,8 @@ class SimpleAPICrawler:
             if headers:
                 request_headers.update(headers)
             
-            async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True) as client:
+            async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True,
+                                         event_hooks={'request': [self.domain_limiter.on_request]}) as client:
                 response = await client.get(url, headers=request_headers)
                 
                 if response.status_code != 200:
@@ -77,11 +208,7 @@ class SimpleAPICrawler:
             return []
         
         # Use pipeline extractor for unified schema
-        try:
-            from pipeline.extractor import Extractor
-            extractor = Extractor(enable_ai=False, enable_snapshots=False, shadow_mode=True)
-        except ImportError:
-            extractor = None
+        extractor = self._get_extractor()
         
         # Extract jobs from array
         for item in job_array:
@@ -90,7 +217,6 @@ class SimpleAPICrawler:
             
             # Use pipeline if available
             if extractor:
-                import asyncio
                 try:
                     result = asyncio.run(extractor.extract_from_json(item, base_url))
                     result_dict = result.to_dict()
@@ -189,6 +315,8 @@ class SimpleAPICrawler:
         inserted = 0
         updated = 0
         skipped = 0
+        duplicates = 0
+        saved_rows = []  # Rows written this batch, for the near-duplicate stage
         
         try:
             with conn.cursor() as cur:
@@ -202,7 +330,6 @@ class SimpleAPICrawler:
                         continue
                     
                     # Create canonical hash
-                    import hashlib
                     canonical_text = f"{title}|{apply_url}".lower()
                     canonical_hash = hashlib.md5(canonical_text.encode()).hexdigest()
                     
@@ -225,6 +352,7 @@ class SimpleAPICrawler:
                             WHERE canonical_hash = %s
                         """, (title, apply_url, location, canonical_hash))
                         updated += 1
+                        job_id = existing[0]
                     else:
                         # Insert
                         cur.execute("""
@@ -234,10 +362,28 @@ class SimpleAPICrawler:
                                 status, fetched_at, last_seen_at
                             )
                             VALUES (%s, %s, %s, %s, %s, %s, 'active', NOW(), NOW())
+                            RETURNING id
                         """, (source_id, org_name, title, apply_url, location, canonical_hash))
                         inserted += 1
+                        job_id = cur.fetchone()[0]
+                    
+                    saved_rows.append({
+                        'id': job_id, 'source_id': source_id, 'title': title,
+                        'org_name': org_name, 'location_raw': location,
+                        'deadline': job.get('deadline')
+                    })
                 
                 conn.commit()
+                
+                from app.http_cache import invalidate_jobs
+                invalidate_jobs(row['id'] for row in saved_rows)
+            
+            # Link cross-source near-duplicates (non-canonical rows skip enrichment/indexing)
+            try:
+                from core.near_dedupe import link_near_duplicates
+                duplicates = link_near_duplicates(conn, saved_rows)
+            except ImportError:
+                pass
         
         except Exception as e:
             logger.error(f"Error saving jobs: {e}")
@@ -245,7 +391,7 @@ class SimpleAPICrawler:
         finally:
             conn.close()
         
-        return {'inserted': inserted, 'updated': updated, 'skipped': skipped}
+        return {'inserted': inserted, 'updated': updated, 'skipped': skipped, 'duplicates': duplicates}
     
     async def crawl_source(self, source: Dict) -> Dict:
         """Crawl API source"""
@@ -253,24 +399,43 @@ class SimpleAPICrawler:
         org_name = source.get('org_name', 'Unknown')
         careers_url = source['careers_url']
         
+        trace = CrawlTrace(source.get('source_type', 'api'))
+        
         logger.info(f"Crawling API {org_name}: {careers_url}")
         
+        try:
+            config = compile_api_config(source.get('parser_hint'), careers_url)
+        except ValueError as e:
+            logger.error(f"Invalid API config for {org_name}: {e}")
+            return {
+                'status': 'failed',
+                'message': f'Invalid API config: {e}'[:200],
+                'counts': {'found': 0, 'inserted': 0, 'updated': 0, 'skipped': 0},
+                'timings': trace.breakdown()
+            }
+        if config is not None:
+            return await self._crawl_configured(source, config, trace)
+        
         try:
             # Fetch JSON
-            data = await self.fetch_api(careers_url)
+            with trace.span('fetch'):
+                data = await self.fetch_api(careers_url)
             
             if not data:
                 return {
                     'status': 'failed',
                     'message': 'Failed to fetch API',
-                    'counts': {'found': 0, 'inserted': 0, 'updated': 0, 'skipped': 0}
+                    'counts': {'found': 0, 'inserted': 0, 'updated': 0, 'skipped': 0},
+                    'timings': trace.breakdown()
                 }
             
             # Extract jobs
-            jobs = self.extract_jobs_from_json(data, careers_url)
+            with trace.span('parse'):
+                jobs = self.extract_jobs_from_json(data, careers_url)
             
             # Save to database
-            counts = self.save_jobs(jobs, source_id, org_name, base_url=careers_url)
+            with trace.span('save'):
+                counts = self.save_jobs(jobs, source_id, org_name, base_url=careers_url)
             
             return {
                 'status': 'ok' if jobs else 'warn',
@@ -279,8 +444,10 @@ class SimpleAPICrawler:
                     'found': len(jobs),
                     'inserted': counts['inserted'],
                     'updated': counts['updated'],
-                    'skipped': counts['skipped']
-                }
+                    'skipped': counts['skipped'],
+                    'duplicates': counts.get('duplicates', 0)
+                },
+                'timings': trace.breakdown()
             }
         
         except Exception as e:
@@ -288,6 +455,60 @@ class SimpleAPICrawler:
             return {
                 'status': 'failed',
                 'message': str(e)[:200],
-                'counts': {'found': 0, 'inserted': 0, 'updated': 0, 'skipped': 0}
+                'counts': {'found': 0, 'inserted': 0, 'updated': 0, 'skipped': 0},
+                'timings': trace.breakdown()
             }
-
+    
+    async def _crawl_configured(self, source: Dict, config: ApiSourceConfig, trace: CrawlTrace) -> Dict:
+        """Crawl a v1 API source, mapping and saving one page at a time"""
+        source_id = str(source['id'])
+        org_name = source.get('org_name', 'Unknown')
+        careers_url = source['careers_url']
+        
+        found = pages = 0
+        totals = {'inserted': 0, 'updated': 0, 'skipped': 0, 'duplicates': 0}
+        error = None
+        
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True,
+                                         headers={"User-Agent": self.user_agent},
+                                         event_hooks={'request': [self.domain_limiter.on_request]}) as client:
+                page_iter = self.iter_pages(config, client)
+                try:
+                    while True:
+                        with trace.span('fetch'):
+                            try:
+                                items = await page_iter.__anext__()
+                            except StopAsyncIteration:
+                                break
+                        pages += 1
+                        
+                        with trace.span('parse'):
+                            jobs = [job for job in (config.map_item(item, careers_url) for item in items) if job.get('title')]
+                        found += len(jobs)
+                        
+                        with trace.span('save'):
+                            counts = self.save_jobs(jobs, source_id, org_name, base_url=careers_url)
+                        for key in totals:
+                            totals[key] += counts.get(key, 0)
+                finally:
+                    await page_iter.aclose()
+        except Exception as e:
+            logger.error(f"Error crawling API {org_name} (page {pages + 1}): {e}", exc_info=True)
+            error = str(e)
+        
+        if error and not pages:
+            status, message = 'failed', error[:200]
+        elif error:
+            status, message = 'warn', f'Found {found} jobs in {pages} page(s), then failed: {error}'[:200]
+        elif found:
+            status, message = 'ok', f'Found {found} jobs in {pages} page(s)'
+        else:
+            status, message = 'warn', 'No jobs found'
+        
+        return {
+            'status': status,
+            'message': message,
+            'counts': {'found': found, **totals, 'pages': pages},
+            'timings': trace.breakdown()
+        }
@@ -2,6 +2,7 @@
 Simple orchestrator - coordinates crawling of multiple sources.
 """
 
+import json
 import logging
 import asyncio
 from typing import Dict, List, Optional
@@ -12,6 +13,7 @@ from psycopg2.extras import RealDictCursor
 from .simple_crawler import SimpleCrawler
 from .rss_crawler import SimpleRSSCrawler
 from .api_crawler import SimpleAPICrawler
+from app.crawl_rollups import record_crawl_rollup
 
 logger = logging.getLogger(__name__)
 
@@ -78,17 +80,18 @@ class SimpleOrchestrator:
         finally:
             conn.close()
     
-    def log_crawl(self, source_id: str, status: str, message: str, counts: Dict, duration_ms: int):
-        """Log crawl result"""
+    def log_crawl(self, source_id: str, status: str, message: str, counts: Dict, duration_ms: int,
+                  timings: Optional[Dict] = None):
+        """Log crawl result with the optional per-stage timing breakdown"""
         conn = self._get_db_conn()
         try:
             with conn.cursor() as cur:
                 cur.execute("""
                     INSERT INTO crawl_logs (
                         source_id, status, message, duration_ms,
-                        found, inserted, updated, skipped, ran_at
+                        found, inserted, updated, skipped, timings, ran_at
                     )
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, NOW())
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s::jsonb, NOW())
                 """, (
                     source_id,
                     status,
@@ -97,8 +100,19 @@ class SimpleOrchestrator:
                     counts.get('found', 0),
                     counts.get('inserted', 0),
                     counts.get('updated', 0),
-                    counts.get('skipped', 0)
+                    counts.get('skipped', 0),
+                    json.dumps(timings) if timings else None
                 ))
+                record_crawl_rollup(
+                    cur,
+                    source_id,
+                    status,
+                    duration_ms,
+                    found=counts.get('found', 0),
+                    inserted=counts.get('inserted', 0),
+                    updated=counts.get('updated', 0),
+                    skipped=counts.get('skipped', 0),
+                )
                 conn.commit()
         except Exception as e:
             logger.error(f"Error logging crawl: {e}")
@@ -145,7 +159,8 @@ class SimpleOrchestrator:
                 result['status'],
                 result['message'],
                 result['counts'],
-                duration_ms
+                duration_ms,
+                result.get('timings')
             )
             
             return result
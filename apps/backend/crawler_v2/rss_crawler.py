@@ -1,19 +1,53 @@
 """
 Simple RSS crawler - extracts jobs from RSS feeds.
+
+Crawls are incremental: the feed is fetched with the ETag/Last-Modified
+validators from the previous crawl (a 304 skips parsing entirely), and each
+entry's GUID and content hash are remembered in rss_seen_entries so only new
+or changed entries are extracted and saved. Unchanged entries get one bulk
+last_seen_at touch.
 """
 
+import asyncio
+import hashlib
 import logging
 import re
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 from urllib.parse import urlparse, urljoin
 import httpx
 import feedparser
 import psycopg2
+from psycopg2.extras import execute_values
+
+from core.crawl_tracing import CrawlTrace
+from core.domain_limits import get_domain_limiter
 
 logger = logging.getLogger(__name__)
 
 
+def entry_key(entry: Any) -> Optional[str]:
+    """Stable identity of a feed entry: GUID, else link, else a hash of the title"""
+    key = entry.get('id') or entry.get('guid') or entry.get('link')
+    if key:
+        return str(key).strip()[:1000]
+    title = (entry.get('title') or '').strip()
+    if title:
+        return 'title:' + hashlib.sha256(title.lower().encode()).hexdigest()
+    return None
+
+
+def entry_content_hash(entry: Any) -> str:
+    """Hash of the entry fields extraction reads; changes mean re-extract"""
+    parts = (
+        entry.get('title') or '',
+        entry.get('link') or '',
+        entry.get('description') or entry.get('summary') or '',
+        entry.get('updated') or entry.get('published') or '',
+    )
+    return hashlib.sha256('\x1f'.join(str(p) for p in parts).encode()).hexdigest()
+
+
 class SimpleRSSCrawler:
     """Simple RSS feed crawler"""
     
@@ -21,145 +55,190 @@ class SimpleRSSCrawler:
         self.db_url = db_url
         self.timeout = httpx.Timeout(30.0)
         self.user_agent = "Mozilla/5.0 (compatible; AidJobs/1.0; +https://aidjobs.app)"
+        # One client per event loop, reused across feeds (keep-alive, TLS reuse)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Per-host politeness budget shared with every other crawler and process
+        self.domain_limiter = get_domain_limiter(db_url)
     
     def _get_db_conn(self):
         """Get database connection"""
         return psycopg2.connect(self.db_url)
     
+    def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.timeout, follow_redirects=True,
+                                             event_hooks={'request': [self.domain_limiter.on_request]})
+            self._client_loop = loop
+        return self._client
+    
+    async def aclose(self):
+        """Close the shared HTTP client (one-off crawlers; orchestrators keep theirs)"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+    
+    async def _fetch(self, url: str, etag: Optional[str] = None,
+                     last_modified: Optional[str] = None) -> Tuple[int, Optional[bytes], Dict[str, str]]:
+        """GET the feed, conditionally when validators are given; (status, body, headers)"""
+        headers = {"User-Agent": self.user_agent}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        response = await self._get_client().get(url, headers=headers)
+        body = response.content if response.status_code == 200 else None
+        return response.status_code, body, {
+            'etag': response.headers.get('etag'),
+            'last_modified': response.headers.get('last-modified'),
+        }
+    
+    @staticmethod
+    async def _parse(body: bytes) -> feedparser.FeedParserDict:
+        # feedparser is pure Python; large feeds would stall the event loop
+        return await asyncio.to_thread(feedparser.parse, body)
+    
     async def fetch_feed(self, url: str) -> feedparser.FeedParserDict:
         """Fetch and parse RSS feed"""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True) as client:
-                response = await client.get(
-                    url,
-                    headers={"User-Agent": self.user_agent}
-                )
-                
-                if response.status_code != 200:
-                    logger.error(f"RSS fetch failed: HTTP {response.status_code}")
-                    return None
-                
-                # Parse feed
-                feed = feedparser.parse(response.text)
-                return feed
+            status, body, _ = await self._fetch(url)
+            if status != 200:
+                logger.error(f"RSS fetch failed: HTTP {status}")
+                return None
+            return await self._parse(body)
         except Exception as e:
             logger.error(f"Error fetching RSS feed {url}: {e}")
             return None
     
+    @staticmethod
+    def _get_extractor():
+        # Use pipeline extractor for unified schema. Its extract_* coroutines
+        # are driven with asyncio.run, which is unavailable inside a running loop.
+        try:
+            asyncio.get_running_loop()
+            return None
+        except RuntimeError:
+            pass
+        try:
+            from pipeline.extractor import Extractor
+            return Extractor(enable_ai=False, enable_snapshots=False, shadow_mode=True)
+        except ImportError:
+            # Fallback to simple extraction if pipeline not available
+            return None
+    
     def extract_jobs_from_feed(self, feed: feedparser.FeedParserDict, base_url: str) -> List[Dict]:
         """Extract jobs from RSS feed using unified pipeline."""
         if not feed or not feed.entries:
             return []
         
+        extractor = self._get_extractor()
         jobs = []
-        
-        # Use pipeline extractor for unified schema
-        try:
-            from pipeline.extractor import Extractor
-            extractor = Extractor(enable_ai=False, enable_snapshots=False, shadow_mode=True)
-        except ImportError:
-            # Fallback to simple extraction if pipeline not available
-            extractor = None
-        
         for entry in feed.entries:
-            # Build entry dict for pipeline
-            entry_dict = {}
-            if hasattr(entry, 'title'):
-                entry_dict['title'] = entry.title.strip()
-            if hasattr(entry, 'link'):
-                entry_dict['link'] = entry.link
-            if hasattr(entry, 'description'):
-                entry_dict['description'] = entry.description
-            elif hasattr(entry, 'summary'):
-                entry_dict['description'] = entry.summary
-            
-            # Use pipeline if available
-            if extractor:
-                import asyncio
-                try:
-                    result = asyncio.run(extractor.extract_from_rss(entry_dict, entry_dict.get('link', base_url)))
-                    result_dict = result.to_dict()
-                    
-                    # Convert to existing format
-                    job = {}
-                    if result_dict['fields']['title']['value']:
-                        job['title'] = result_dict['fields']['title']['value']
-                    if result_dict['fields']['application_url']['value']:
-                        job['apply_url'] = result_dict['fields']['application_url']['value']
-                    elif entry_dict.get('link'):
-                        job['apply_url'] = entry_dict['link']
-                    if result_dict['fields']['description']['value']:
-                        job['description_snippet'] = result_dict['fields']['description']['value'][:500]
-                    if result_dict['fields']['location']['value']:
-                        job['location_raw'] = result_dict['fields']['location']['value']
-                    if result_dict['fields']['deadline']['value']:
-                        job['deadline'] = result_dict['fields']['deadline']['value']
-                    
-                    if job.get('title'):
-                        jobs.append(job)
-                    continue
-                except Exception as e:
-                    logger.debug(f"Pipeline extraction failed, using fallback: {e}")
-            
-            # Fallback to simple extraction
-            job = {}
-            
-            # Title
-            if hasattr(entry, 'title'):
-                job['title'] = entry.title.strip()
-            
-            # Link
-            if hasattr(entry, 'link'):
-                job['apply_url'] = entry.link
-            
-            # Description/summary for location and deadline
-            description = ""
-            if hasattr(entry, 'description'):
-                description = entry.description
-            elif hasattr(entry, 'summary'):
-                description = entry.summary
-            
-            # Try to extract location from description
-            # Common patterns: "Location: Paris, France" or "Duty Station: Kabul"
-            location_patterns = [
-                r'[Ll]ocation[:\s]+([A-Z][a-zA-Z\s,]+(?:,\s*[A-Z][a-zA-Z\s]+)?)',
-                r'[Dd]uty\s+[Ss]tation[:\s]+([A-Z][a-zA-Z\s,]+(?:,\s*[A-Z][a-zA-Z\s]+)?)',
-            ]
-            
-            for pattern in location_patterns:
-                match = re.search(pattern, description)
-                if match:
-                    job['location_raw'] = match.group(1).strip()
-                    break
-            
-            # Try to extract deadline from description
-            deadline_patterns = [
-                r'[Dd]eadline[:\s]+(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})',
-                r'[Cc]losing\s+[Dd]ate[:\s]+(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})',
-                r'[Aa]pply\s+[Bb]y[:\s]+(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})',
-            ]
-            
-            for pattern in deadline_patterns:
-                match = re.search(pattern, description)
-                if match:
-                    job['deadline'] = match.group(1).strip()
-                    break
-            
-            # Published date as fallback
-            if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                try:
-                    pub_date = datetime(*entry.published_parsed[:6])
-                    job['published_at'] = pub_date
-                except:
-                    pass
-            
-            # Only add if we have title and URL
-            if job.get('title') and job.get('apply_url'):
+            job = self._extract_job_from_entry(entry, base_url, extractor)
+            if job:
                 jobs.append(job)
         
         logger.info(f"Extracted {len(jobs)} jobs from RSS feed")
         return jobs
     
+    def _extract_job_from_entry(self, entry: Any, base_url: str, extractor) -> Optional[Dict]:
+        """Extract one job from a feed entry; None if it lacks a title or URL"""
+        # Build entry dict for pipeline
+        entry_dict = {}
+        if hasattr(entry, 'title'):
+            entry_dict['title'] = entry.title.strip()
+        if hasattr(entry, 'link'):
+            entry_dict['link'] = entry.link
+        if hasattr(entry, 'description'):
+            entry_dict['description'] = entry.description
+        elif hasattr(entry, 'summary'):
+            entry_dict['description'] = entry.summary
+        
+        # Use pipeline if available
+        if extractor:
+            try:
+                result = asyncio.run(extractor.extract_from_rss(entry_dict, entry_dict.get('link', base_url)))
+                result_dict = result.to_dict()
+                
+                # Convert to existing format
+                job = {}
+                if result_dict['fields']['title']['value']:
+                    job['title'] = result_dict['fields']['title']['value']
+                if result_dict['fields']['application_url']['value']:
+                    job['apply_url'] = result_dict['fields']['application_url']['value']
+                elif entry_dict.get('link'):
+                    job['apply_url'] = entry_dict['link']
+                if result_dict['fields']['description']['value']:
+                    job['description_snippet'] = result_dict['fields']['description']['value'][:500]
+                if result_dict['fields']['location']['value']:
+                    job['location_raw'] = result_dict['fields']['location']['value']
+                if result_dict['fields']['deadline']['value']:
+                    job['deadline'] = result_dict['fields']['deadline']['value']
+                
+                if job.get('title'):
+                    return job
+                return None
+            except Exception as e:
+                logger.debug(f"Pipeline extraction failed, using fallback: {e}")
+        
+        # Fallback to simple extraction
+        job = {}
+        
+        # Title
+        if hasattr(entry, 'title'):
+            job['title'] = entry.title.strip()
+        
+        # Link
+        if hasattr(entry, 'link'):
+            job['apply_url'] = entry.link
+        
+        # Description/summary for location and deadline
+        description = ""
+        if hasattr(entry, 'description'):
+            description = entry.description
+        elif hasattr(entry, 'summary'):
+            description = entry.summary
+        
+        # Try to extract location from description
+        # Common patterns: "Location: Paris, France" or "Duty Station: Kabul"
+        location_patterns = [
+            r'[Ll]ocation[:\s]+([A-Z][a-zA-Z\s,]+(?:,\s*[A-Z][a-zA-Z\s]+)?)',
+            r'[Dd]uty\s+[Ss]tation[:\s]+([A-Z][a-zA-Z\s,]+(?:,\s*[A-Z][a-zA-Z\s]+)?)',
+        ]
+        
+        for pattern in location_patterns:
+            match = re.search(pattern, description)
+            if match:
+                job['location_raw'] = match.group(1).strip()
+                break
+        
+        # Try to extract deadline from description
+        deadline_patterns = [
+            r'[Dd]eadline[:\s]+(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})',
+            r'[Cc]losing\s+[Dd]ate[:\s]+(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})',
+            r'[Aa]pply\s+[Bb]y[:\s]+(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})',
+        ]
+        
+        for pattern in deadline_patterns:
+            match = re.search(pattern, description)
+            if match:
+                job['deadline'] = match.group(1).strip()
+                break
+        
+        # Published date as fallback
+        if hasattr(entry, 'published_parsed') and entry.published_parsed:
+            try:
+                pub_date = datetime(*entry.published_parsed[:6])
+                job['published_at'] = pub_date
+            except:
+                pass
+        
+        # Only add if we have title and URL
+        if job.get('title') and job.get('apply_url'):
+            return job
+        return None
+    
     def save_jobs(self, jobs: List[Dict], source_id: str, org_name: str, base_url: Optional[str] = None) -> Dict:
         """Save jobs to database (same logic as HTML crawler)"""
         if not jobs:
@@ -183,6 +262,10 @@ class SimpleRSSCrawler:
         inserted = 0
         updated = 0
         skipped = 0
+        duplicates = 0
+        error = None
+        saved_rows = []  # Rows written this batch, for the near-duplicate stage
+        seen_rows = []  # (source_id, entry_key, content_hash, job_id) for incremental crawls
         
         try:
             with conn.cursor() as cur:
@@ -196,7 +279,6 @@ class SimpleRSSCrawler:
                         continue
                     
                     # Create canonical hash
-                    import hashlib
                     canonical_text = f"{title}|{apply_url}".lower()
                     canonical_hash = hashlib.md5(canonical_text.encode()).hexdigest()
                     
@@ -219,6 +301,7 @@ class SimpleRSSCrawler:
                             WHERE canonical_hash = %s
                         """, (title, apply_url, location, canonical_hash))
                         updated += 1
+                        job_id = existing[0]
                     else:
                         # Insert
                         cur.execute("""
@@ -228,53 +311,237 @@ class SimpleRSSCrawler:
                                 status, fetched_at, last_seen_at
                             )
                             VALUES (%s, %s, %s, %s, %s, %s, 'active', NOW(), NOW())
+                            RETURNING id
                         """, (source_id, org_name, title, apply_url, location, canonical_hash))
                         inserted += 1
+                        job_id = cur.fetchone()[0]
+                    
+                    saved_rows.append({
+                        'id': job_id, 'source_id': source_id, 'title': title,
+                        'org_name': org_name, 'location_raw': location,
+                        'deadline': job.get('deadline')
+                    })
+                    if job.get('_entry_key'):
+                        seen_rows.append((source_id, job['_entry_key'], job['_content_hash'], job_id))
+                
+                if seen_rows:
+                    execute_values(cur, """
+                        INSERT INTO rss_seen_entries (source_id, entry_key, content_hash, job_id)
+                        VALUES %s
+                        ON CONFLICT (source_id, entry_key) DO UPDATE
+                        SET content_hash = EXCLUDED.content_hash,
+                            job_id = EXCLUDED.job_id,
+                            in_feed = TRUE,
+                            last_seen_at = NOW()
+                    """, seen_rows, template="(%s::uuid, %s, %s, %s::uuid)")
                 
                 conn.commit()
+                
+                from app.http_cache import invalidate_jobs
+                invalidate_jobs(row['id'] for row in saved_rows)
+            
+            # Link cross-source near-duplicates (non-canonical rows skip enrichment/indexing)
+            try:
+                from core.near_dedupe import link_near_duplicates
+                duplicates = link_near_duplicates(conn, saved_rows)
+            except ImportError:
+                pass
         
         except Exception as e:
             logger.error(f"Error saving jobs: {e}")
             conn.rollback()
+            error = str(e)
         finally:
             conn.close()
         
-        return {'inserted': inserted, 'updated': updated, 'skipped': skipped}
+        counts = {'inserted': inserted, 'updated': updated, 'skipped': skipped, 'duplicates': duplicates}
+        if error:
+            counts['error'] = error[:200]
+        return counts
+    
+    # Incremental state
+    
+    def _load_feed_state(self, source_id: str, keys: Optional[List[str]] = None) -> Dict:
+        """Stored feed validators, plus content hashes of the given entry keys"""
+        state = {'etag': None, 'last_modified': None, 'seen': {}}
+        conn = self._get_db_conn()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT feed_etag, feed_last_modified FROM sources WHERE id = %s::uuid
+                """, (source_id,))
+                row = cur.fetchone()
+                if row:
+                    state['etag'], state['last_modified'] = row[0], row[1]
+                if keys:
+                    cur.execute("""
+                        SELECT entry_key, content_hash FROM rss_seen_entries
+                        WHERE source_id = %s::uuid AND entry_key = ANY(%s)
+                    """, (source_id, keys))
+                    state['seen'] = dict(cur.fetchall())
+        finally:
+            conn.close()
+        return state
+    
+    def _record_feed(self, source_id: str, validators: Optional[Dict[str, str]],
+                     feed_keys: Optional[List[str]], unchanged_keys: Optional[List[str]]) -> int:
+        """
+        Touch unchanged entries and their jobs, mark which entries are in the
+        feed, and store the validators for the next conditional GET.
+        
+        feed_keys=None (a 304) touches every entry from the last full fetch.
+        Returns the number of entries touched.
+        """
+        conn = self._get_db_conn()
+        try:
+            with conn.cursor() as cur:
+                if feed_keys is None:
+                    where, params = "in_feed", (source_id,)
+                else:
+                    where, params = "entry_key = ANY(%s)", (source_id, unchanged_keys or [])
+                # One statement for all unchanged entries instead of an upsert per job
+                cur.execute(f"""
+                    WITH touched AS (
+                        UPDATE rss_seen_entries SET last_seen_at = NOW()
+                        WHERE source_id = %s::uuid AND {where}
+                        RETURNING job_id
+                    ), touched_jobs AS (
+                        UPDATE jobs SET last_seen_at = NOW()
+                        WHERE id IN (SELECT job_id FROM touched WHERE job_id IS NOT NULL)
+                    )
+                    SELECT COUNT(*) FROM touched
+                """, params)
+                touched = cur.fetchone()[0]
+                if feed_keys is not None:
+                    cur.execute("""
+                        UPDATE rss_seen_entries SET in_feed = (entry_key = ANY(%s))
+                        WHERE source_id = %s::uuid AND (in_feed OR entry_key = ANY(%s))
+                    """, (feed_keys, source_id, feed_keys))
+                if validators is not None:
+                    cur.execute("""
+                        UPDATE sources SET feed_etag = %s, feed_last_modified = %s
+                        WHERE id = %s::uuid
+                    """, (validators.get('etag'), validators.get('last_modified'), source_id))
+                conn.commit()
+            return touched
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
     
     async def crawl_source(self, source: Dict) -> Dict:
-        """Crawl RSS source"""
+        """Crawl RSS source, processing only new or changed entries"""
         source_id = str(source['id'])
         org_name = source.get('org_name', 'Unknown')
         careers_url = source['careers_url']
         
+        trace = CrawlTrace('rss')
+        
         logger.info(f"Crawling RSS {org_name}: {careers_url}")
         
         try:
-            # Fetch feed
-            feed = await self.fetch_feed(careers_url)
+            # Incremental state is best-effort: without it this is a full crawl
+            try:
+                state = self._load_feed_state(source_id)
+                incremental = True
+            except Exception as e:
+                logger.warning(f"RSS incremental state unavailable for {org_name}, doing a full crawl: {e}")
+                state = {'etag': None, 'last_modified': None, 'seen': {}}
+                incremental = False
             
-            if not feed:
+            # Fetch feed (conditional GET)
+            with trace.span('fetch'):
+                try:
+                    status, body, validators = await self._fetch(
+                        careers_url, state['etag'], state['last_modified']
+                    )
+                except Exception as e:
+                    logger.error(f"Error fetching RSS feed {careers_url}: {e}")
+                    status, body, validators = None, None, {}
+            
+            if status == 304 and incremental:
+                with trace.span('save'):
+                    touched = self._record_feed(source_id, None, None, None)
+                return {
+                    'status': 'ok',
+                    'message': f'Feed not modified ({touched} entries unchanged)',
+                    'counts': {'found': 0, 'inserted': 0, 'updated': 0, 'skipped': 0,
+                               'unchanged': touched, 'not_modified': True},
+                    'timings': trace.breakdown()
+                }
+            
+            if status != 200:
+                if status is not None:
+                    logger.error(f"RSS fetch failed: HTTP {status}")
                 return {
                     'status': 'failed',
                     'message': 'Failed to fetch RSS feed',
-                    'counts': {'found': 0, 'inserted': 0, 'updated': 0, 'skipped': 0}
+                    'counts': {'found': 0, 'inserted': 0, 'updated': 0, 'skipped': 0},
+                    'timings': trace.breakdown()
                 }
             
-            # Extract jobs
-            jobs = self.extract_jobs_from_feed(feed, careers_url)
+            # Parse off the event loop, then keep only new or changed entries
+            with trace.span('parse'):
+                feed = await self._parse(body)
+                entries = {}
+                for entry in feed.entries:
+                    key = entry_key(entry)
+                    if key and key not in entries:
+                        entries[key] = entry
+                feed_keys = list(entries)
+                if incremental and feed_keys:
+                    try:
+                        state['seen'] = self._load_feed_state(source_id, feed_keys)['seen']
+                    except Exception as e:
+                        logger.warning(f"RSS seen entries unavailable for {org_name}: {e}")
+                        incremental = False
+                
+                extractor = self._get_extractor() if entries else None
+                jobs = []
+                unchanged_keys = []
+                for key, entry in entries.items():
+                    content_hash = entry_content_hash(entry)
+                    if state['seen'].get(key) == content_hash:
+                        unchanged_keys.append(key)
+                        continue
+                    job = self._extract_job_from_entry(entry, careers_url, extractor)
+                    if job:
+                        if incremental:
+                            job['_entry_key'] = key
+                            job['_content_hash'] = content_hash
+                        jobs.append(job)
+            
+            # Save new/changed jobs, then touch the unchanged ones in bulk
+            with trace.span('save'):
+                counts = self.save_jobs(jobs, source_id, org_name, base_url=careers_url)
+                unchanged = len(unchanged_keys)
+                if incremental and 'error' not in counts:
+                    try:
+                        self._record_feed(source_id, validators, feed_keys, unchanged_keys)
+                    except Exception as e:
+                        logger.warning(f"Failed to record RSS feed state for {org_name}: {e}")
             
-            # Save to database
-            counts = self.save_jobs(jobs, source_id, org_name, base_url=careers_url)
+            found = len(jobs) + unchanged
+            if jobs:
+                message = f'Found {found} jobs ({unchanged} unchanged)' if unchanged else f'Found {found} jobs'
+            elif unchanged:
+                message = f'No new or changed jobs ({unchanged} unchanged)'
+            else:
+                message = 'No jobs found'
             
             return {
-                'status': 'ok' if jobs else 'warn',
-                'message': f'Found {len(jobs)} jobs' if jobs else 'No jobs found',
+                'status': 'ok' if found else 'warn',
+                'message': message,
                 'counts': {
-                    'found': len(jobs),
+                    'found': found,
                     'inserted': counts['inserted'],
                     'updated': counts['updated'],
-                    'skipped': counts['skipped']
-                }
+                    'skipped': counts['skipped'],
+                    'duplicates': counts.get('duplicates', 0),
+                    'unchanged': unchanged
+                },
+                'timings': trace.breakdown()
             }
         
         except Exception as e:
@@ -282,6 +549,6 @@ class SimpleRSSCrawler:
             return {
                 'status': 'failed',
                 'message': str(e)[:200],
-                'counts': {'found': 0, 'inserted': 0, 'updated': 0, 'skipped': 0}
+                'counts': {'found': 0, 'inserted': 0, 'updated': 0, 'skipped': 0},
+                'timings': trace.breakdown()
             }
-
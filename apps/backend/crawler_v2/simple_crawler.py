@@ -11,6 +11,7 @@ Design principles:
 import logging
 import asyncio
 import re
+import time
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from urllib.parse import urlparse, urljoin
@@ -19,6 +20,12 @@ from bs4 import BeautifulSoup
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
+from core.crawl_tracing import CrawlTrace
+from core.date_parsing import normalize_dates, parse_date_str
+from core.domain_limits import get_domain_limiter
+from core.extraction_executor import EXECUTOR_ERRORS, get_extraction_executor
+from core.pre_upsert_validator import PreUpsertValidator
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,6 +43,8 @@ class SimpleCrawler:
         self.user_agent = "Mozilla/5.0 (compatible; AidJobs/1.0; +https://aidjobs.app)"
         self.use_ai = use_ai
         self.shadow_mode = shadow_mode
+        # Per-host politeness budget shared with every other crawler and process
+        self.domain_limiter = get_domain_limiter(db_url)
         
         # Check if global heuristics are enabled
         import os
@@ -126,6 +135,14 @@ class SimpleCrawler:
             logger.info("Quality scorer initialized")
         except Exception as e:
             logger.warning(f"Quality scorer not available: {e}")
+        
+        # Learned per-source extraction plans
+        self.plan_store = None
+        try:
+            from core.extraction_plans import get_plan_store
+            self.plan_store = get_plan_store(db_url)
+        except Exception as e:
+            logger.warning(f"Extraction plan store not available: {e}")
     
     def _get_db_conn(self):
         """Get database connection"""
@@ -147,6 +164,7 @@ class SimpleCrawler:
         if use_browser:
             try:
                 from crawler.browser_crawler import BrowserCrawler
+                await self.domain_limiter.wait_for_slot(urlparse(url).netloc.lower())
                 browser_crawler = BrowserCrawler()
                 html = await browser_crawler.fetch_html(url, timeout=30000)
                 if html:
@@ -159,7 +177,8 @@ class SimpleCrawler:
                 logger.warning(f"Browser rendering failed: {e}, falling back to HTTP")
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True) as client:
+            async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=True,
+                                         event_hooks={'request': [self.domain_limiter.on_request]}) as client:
                 # Use more realistic headers to avoid 403 blocks
                 headers = {
                     "User-Agent": self.user_agent,
@@ -200,18 +219,121 @@ class SimpleCrawler:
             logger.error(f"Error fetching {url}: {e}")
             return 0, ""
     
-    def extract_jobs_from_html(self, html: str, base_url: str) -> List[Dict]:
+    def _strategy_functions(self) -> Dict[str, callable]:
+        return {
+            'tables': lambda h, b: self._extract_from_tables(BeautifulSoup(h, 'html.parser'), b),
+            'divs': lambda h, b: self._extract_from_divs_lists(BeautifulSoup(h, 'html.parser'), b),
+            'links': lambda h, b: self._extract_from_links(BeautifulSoup(h, 'html.parser'), b),
+            'structured': lambda h, b: self._extract_from_structured_data(BeautifulSoup(h, 'html.parser'), b),
+            'generic': lambda h, b: self._extract_generic_fallback(BeautifulSoup(h, 'html.parser'), b)
+        }
+    
+    def _get_plan(self, source_id: Optional[str]) -> Optional[Dict]:
+        if not (self.plan_store and source_id):
+            return None
+        return self.plan_store.get(source_id)
+    
+    def _run_plan(self, html: str, base_url: str, plan: Optional[Dict], outcome: Dict) -> Optional[List[Dict]]:
+        """
+        Run a learned extraction plan.
+        
+        Returns None when there is no usable plan or the plan deviated, so the
+        caller runs the full analysis (which re-learns the plan).
+        """
+        strategies = self._strategy_functions()
+        if not (self.strategy_selector and plan) or plan.get('strategy') not in strategies:
+            return None
+        
+        start = time.perf_counter()
+        jobs, metadata = self.strategy_selector.execute_plan(html, base_url, strategies, plan)
+        if jobs is None:
+            outcome['plan_miss_reason'] = metadata.get('plan_miss_reason')
+            return None
+        
+        outcome['plan_hit'] = True
+        outcome['plan_ms'] = (time.perf_counter() - start) * 1000
+        logger.info(f"Extraction plan '{plan['strategy']}' extracted {len(jobs)} jobs "
+                    f"(validated from {metadata.get('original_count', 0)})")
+        return jobs
+    
+    def _record_plan_outcome(self, source_id: Optional[str], plan: Optional[Dict], outcome: Dict):
+        """Persist what extract_jobs_with_plan observed about the source's plan"""
+        if not (self.plan_store and source_id):
+            return
+        if outcome.get('plan_hit'):
+            self.plan_store.record_hit(source_id, (plan.get('full_ms') or 0) - outcome['plan_ms'])
+        elif plan and 'plan_miss_reason' in outcome:
+            self.plan_store.record_miss(source_id, outcome['plan_miss_reason'])
+        if outcome.get('learned_plan'):
+            self.plan_store.learn(source_id, outcome['learned_plan'])
+    
+    def extract_jobs_from_html(self, html: str, base_url: str, source_id: Optional[str] = None) -> List[Dict]:
         """
         Extract jobs from HTML using AI-powered strategy selection.
         
+        When source_id is given, the source's learned plan is tried first and
+        a successful full analysis is recorded as its plan for the next crawl.
+        """
+        plan = self._get_plan(source_id)
+        jobs, outcome = self.extract_jobs_with_plan(html, base_url, plan)
+        self._record_plan_outcome(source_id, plan, outcome)
+        return jobs
+    
+    async def extract_jobs_offloaded(self, html: str, base_url: str, source_id: Optional[str] = None) -> List[Dict]:
+        """
+        extract_jobs_from_html on the extraction process pool, keeping the
+        event loop free while a large page is parsed. Runs in-process when the
+        pool is disabled, full, timed out or broken.
+        """
+        executor = get_extraction_executor()
+        if executor is None:
+            return self.extract_jobs_from_html(html, base_url, source_id)
+        
+        plan = self._get_plan(source_id)
+        try:
+            jobs, outcome = await executor.run('simple_crawler', extract_jobs_in_worker, html, base_url, plan)
+        except EXECUTOR_ERRORS as e:
+            logger.warning(f"Extraction worker unavailable ({type(e).__name__}: {e}), extracting in-process")
+            jobs, outcome = self.extract_jobs_with_plan(html, base_url, plan)
+        self._record_plan_outcome(source_id, plan, outcome)
+        return jobs
+    
+    async def _extract_with_plugins(self, html: str, base_url: str, preferred_plugin: Optional[str]) -> Dict:
+        """Plugin extraction on the extraction process pool (in-process if unavailable)"""
+        executor = get_extraction_executor()
+        if executor is not None:
+            try:
+                return await executor.run('plugins', extract_plugins_in_worker, html, base_url, preferred_plugin)
+            except EXECUTOR_ERRORS as e:
+                logger.warning(f"Extraction worker unavailable ({type(e).__name__}: {e}), running plugins in-process")
+        return extract_plugins_in_worker(html, base_url, preferred_plugin)
+    
+    def extract_jobs_with_plan(self, html: str, base_url: str, plan: Optional[Dict] = None) -> Tuple[List[Dict], Dict]:
+        """
+        Extract jobs without touching the database; safe to run in a worker
+        process.
+        
         Uses intelligent strategy selection that:
-        1. Tries JSON-LD structured data FIRST (most reliable)
-        2. Analyzes HTML structure to choose the best strategy
-        3. Tries recommended strategy
-        4. Falls back to other strategies if needed
-        5. Validates and normalizes results for consistency
-        6. Maintains quality across all sources
+        1. Runs the given learned extraction plan, if any (skips analysis)
+        2. Tries JSON-LD structured data FIRST (most reliable)
+        3. Analyzes HTML structure to choose the best strategy
+        4. Tries recommended strategy
+        5. Falls back to other strategies if needed
+        6. Validates and normalizes results for consistency
+        7. Maintains quality across all sources
+        
+        Returns (jobs, outcome) where outcome reports plan_hit/plan_ms,
+        plan_miss_reason and learned_plan for _record_plan_outcome.
         """
+        outcome: Dict = {}
+        jobs = self._run_plan(html, base_url, plan, outcome)
+        if jobs is None:
+            jobs = self._extract_jobs_full(html, base_url, outcome)
+        return jobs, outcome
+    
+    def _extract_jobs_full(self, html: str, base_url: str, outcome: Dict) -> List[Dict]:
+        """Full analysis; the winning strategy is reported as outcome['learned_plan']"""
+        full_start = time.perf_counter()
         soup = BeautifulSoup(html, 'html.parser')
         
         # PRIORITY 1: Try JSON-LD structured data FIRST (most reliable source)
@@ -225,17 +347,17 @@ class SimpleCrawler:
         if self.strategy_selector:
             try:
                 # Prepare strategy functions
-                strategies = {
-                    'tables': lambda h, b: self._extract_from_tables(BeautifulSoup(h, 'html.parser'), b),
-                    'divs': lambda h, b: self._extract_from_divs_lists(BeautifulSoup(h, 'html.parser'), b),
-                    'links': lambda h, b: self._extract_from_links(BeautifulSoup(h, 'html.parser'), b),
-                    'structured': lambda h, b: self._extract_from_structured_data(BeautifulSoup(h, 'html.parser'), b),
-                    'generic': lambda h, b: self._extract_generic_fallback(BeautifulSoup(h, 'html.parser'), b)
-                }
+                strategies = self._strategy_functions()
                 
                 # Use strategy selector (now sync method)
                 jobs, metadata = self.strategy_selector.select_and_validate(html, base_url, strategies)
                 
+                if metadata.get('plan'):
+                    outcome['learned_plan'] = {
+                        **metadata['plan'],
+                        'full_ms': int((time.perf_counter() - full_start) * 1000),
+                    }
+                
                 logger.info(f"Strategy selector: {metadata.get('strategy_used', 'unknown')} "
                           f"extracted {len(jobs)} jobs (validated from {metadata.get('original_count', 0)})")
                 
@@ -1049,120 +1171,27 @@ class SimpleCrawler:
     
     def _parse_deadline(self, text: str) -> Optional[str]:
         """
-        Parse deadline text into YYYY-MM-DD format using dateparser.
+        Parse deadline text into YYYY-MM-DD format.
         
         Handles formats like:
         - "12-DEC-2025"
         - "10/12/2025"
         - "December 10, 2025"
         - "10 December 2025"
-        - "31 Dec" (assumes current year if year missing)
+        - "31 Dec" (assumes the next such date if year missing)
         - ISO 8601 formats
+        
+        Common formats are parsed by core.date_parsing's compiled patterns;
+        anything else falls back to dateparser (memoized per string).
         """
         if not text:
             return None
         
-        text = text.strip()
-        
-        # Remove common prefixes
-        prefixes = ['closing date:', 'deadline:', 'apply by:', 'due:', 'by:', 'valid through:', 'expires:']
-        for prefix in prefixes:
-            if text.lower().startswith(prefix):
-                text = text[len(prefix):].strip()
-        
-        # Remove time components if present (e.g., "2025-12-31T23:59:59Z" -> "2025-12-31")
-        if 'T' in text:
-            text = text.split('T')[0]
-        
-        # Try dateparser first (handles many formats automatically)
-        try:
-            import dateparser
-            from datetime import datetime
-            
-            # Parse with dateparser (handles many locales and formats)
-            parsed_date = dateparser.parse(
-                text,
-                settings={
-                    'PREFER_DAY_OF_MONTH': 'first',
-                    'RELATIVE_BASE': datetime.now(),
-                    'DATE_ORDER': 'DMY',  # Day-Month-Year (common in international formats)
-                    'PREFER_DATES_FROM': 'future'  # Prefer future dates for deadlines
-                }
-            )
-            
-            if parsed_date:
-                return parsed_date.strftime('%Y-%m-%d')
-        except ImportError:
-            logger.warning("dateparser not available, falling back to regex parsing")
-        except Exception as e:
-            logger.debug(f"dateparser failed for '{text}': {e}")
-        
-        # Fallback: Try regex patterns for common formats
-        import re
-        from datetime import datetime
-        
-        # Format: DD-MMM-YYYY or DD/MMM/YYYY (e.g., "12-DEC-2025")
-        mmm_pattern = r'(\d{1,2})[-/]([A-Z]{3,})[-/](\d{2,4})'
-        match = re.search(mmm_pattern, text.upper())
-        if match:
-            day, month_str, year = match.groups()
-            month_map = {
-                'JAN': 1, 'FEB': 2, 'MAR': 3, 'APR': 4, 'MAY': 5, 'JUN': 6,
-                'JUL': 7, 'AUG': 8, 'SEP': 9, 'OCT': 10, 'NOV': 11, 'DEC': 12
-            }
-            if month_str in month_map:
-                try:
-                    year_int = int(year)
-                    if year_int < 100:
-                        year_int += 2000 if year_int < 50 else 1900
-                    date_obj = datetime(year_int, month_map[month_str], int(day))
-                    return date_obj.strftime('%Y-%m-%d')
-                except:
-                    pass
-        
-        # Format: DD/MM/YYYY or DD-MM-YYYY
-        numeric_pattern = r'(\d{1,2})[-/](\d{1,2})[-/](\d{2,4})'
-        match = re.search(numeric_pattern, text)
-        if match:
-            day, month, year = match.groups()
-            try:
-                year_int = int(year)
-                if year_int < 100:
-                    year_int += 2000 if year_int < 50 else 1900
-                date_obj = datetime(year_int, int(month), int(day))
-                return date_obj.strftime('%Y-%m-%d')
-            except:
-                pass
-        
-        # Format: DD Month YYYY (e.g., "10 December 2025")
-        month_names = [
-            'january', 'february', 'march', 'april', 'may', 'june',
-            'july', 'august', 'september', 'october', 'november', 'december'
-        ]
-        month_abbrevs = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
-        
-        for i, month_name in enumerate(month_names + month_abbrevs, 1):
-            pattern = rf'(\d{{1,2}})\s+{month_name}\s+(\d{{2,4}})'
-            match = re.search(pattern, text.lower())
-            if match:
-                day, year = match.groups()
-                try:
-                    year_int = int(year)
-                    if year_int < 100:
-                        year_int += 2000 if year_int < 50 else 1900
-                    month_num = (i - 1) % 12 + 1
-                    date_obj = datetime(year_int, month_num, int(day))
-                    return date_obj.strftime('%Y-%m-%d')
-                except:
-                    pass
-        
-        # If already in YYYY-MM-DD format, return as-is
-        if re.match(r'^\d{4}-\d{2}-\d{2}$', text):
-            return text
-        
-        # If we can't parse it, return None (don't save unparseable dates)
-        logger.debug(f"Could not parse deadline: {text}")
-        return None
+        parsed = parse_date_str(text)
+        if not parsed:
+            # If we can't parse it, return None (don't save unparseable dates)
+            logger.debug(f"Could not parse deadline: {text}")
+        return parsed
     
     def _validate_sql_construction(self, fields: List[str], values: List, placeholders: List[str], sql_values: List, operation: str = "INSERT") -> None:
         """
@@ -1193,6 +1222,18 @@ class SimpleCrawler:
             if placeholder == "NOW()" and val != "NOW()":
                 raise ValueError(f"{operation} NOW() placeholder at index {i} doesn't match value '{val}'")
     
+    def _canonical_hash_for(self, job: Dict) -> str:
+        """Create canonical hash (normalized if using global heuristics)"""
+        import hashlib
+        title = job.get('title', '').strip()
+        apply_url = job.get('apply_url', '').strip()
+        if self.use_global_heuristics:
+            # Normalize URL before hashing
+            normalized_url = self._normalize_url(apply_url)
+            return self._get_canonical_hash(title, normalized_url, job.get('reference'))
+        canonical_text = f"{title}|{apply_url}".lower()
+        return hashlib.md5(canonical_text.encode()).hexdigest()
+    
     def save_jobs(self, jobs: List[Dict], source_id: str, org_name: str, base_url: Optional[str] = None) -> Dict:
         """
         Save jobs to database with comprehensive error logging and pre-upsert validation.
@@ -1288,14 +1329,22 @@ class SimpleCrawler:
         skipped = validation_skipped
         failed = 0
         failed_inserts = []  # Track failed inserts for logging
+        saved_rows = []  # Rows written this batch, for the near-duplicate stage
+        duplicates = 0
         
         logger.info(f"Saving {len(jobs)} jobs to database for source {source_id} ({org_name})")
         
+        # Parse the batch's deadlines in one pass (repeated strings parse once)
+        parsed_deadlines = normalize_dates([(job.get('deadline') or '').strip() for job in jobs])
+        canonical_hashes = [self._canonical_hash_for(job) for job in jobs]
+        
         conn = None
         try:
             conn = self._get_db_conn()
+            # Existing jobs for the whole batch in one query (None -> per-job lookup)
+            existence = PreUpsertValidator(db_connection=conn).prefetch_existing(jobs, source_id, canonical_hashes)
             with conn.cursor() as cur:
-                for job in jobs:
+                for job, parsed_deadline, canonical_hash in zip(jobs, parsed_deadlines, canonical_hashes):
                     try:
                         title = job.get('title', '').strip()
                         apply_url = job.get('apply_url', '').strip()
@@ -1358,42 +1407,25 @@ class SimpleCrawler:
                             })
                             continue
                         
-                        # Parse deadline if present
-                        deadline_date = None
-                        if deadline_str:
-                            # If already in YYYY-MM-DD format, use it
-                            if re.match(r'^\d{4}-\d{2}-\d{2}$', deadline_str):
-                                deadline_date = deadline_str
-                            else:
-                                # Try to parse it
-                                deadline_date = self._parse_deadline(deadline_str)
-                                # Only use if it's in YYYY-MM-DD format
-                                if deadline_date and not re.match(r'^\d{4}-\d{2}-\d{2}$', deadline_date):
-                                    deadline_date = None  # Don't save unparseable dates
-                        
-                        # Create canonical hash (normalized if using global heuristics)
-                        import hashlib
-                        if self.use_global_heuristics:
-                            # Normalize URL before hashing
-                            normalized_url = self._normalize_url(apply_url)
-                            canonical_hash = self._get_canonical_hash(title, normalized_url, job.get('reference'))
-                        else:
-                            canonical_text = f"{title}|{apply_url}".lower()
-                            canonical_hash = hashlib.md5(canonical_text.encode()).hexdigest()
+                        # Deadline parsed above (YYYY-MM-DD, None if unparseable)
+                        deadline_date = parsed_deadline if deadline_str else None
                         
                         # DEBUG: Log canonical hash for dedupe diagnosis
                         logger.debug(f"DEBUG: canonical_hash={canonical_hash} title={title[:80]} apply_url={apply_url[:120]}")
                         
                         # Check if exists (including deleted jobs)
-                        cur.execute("""
-                            SELECT id, deleted_at FROM jobs WHERE canonical_hash = %s
-                        """, (canonical_hash,))
-                        
-                        existing = cur.fetchone()
+                        if existence is not None:
+                            existing = existence.get(canonical_hash)
+                        else:
+                            cur.execute("""
+                                SELECT id, deleted_at FROM jobs WHERE canonical_hash = %s
+                            """, (canonical_hash,))
+                            row = cur.fetchone()
+                            existing = {'id': row[0], 'deleted_at': row[1]} if row else None
                         
                         if existing:
                             # Check if job was deleted
-                            is_deleted = existing[1] is not None
+                            is_deleted = existing['deleted_at'] is not None
                             
                             # Update (and restore if deleted)
                             try:
@@ -1471,6 +1503,13 @@ class SimpleCrawler:
                                     inserted += 1  # Count restored jobs as inserted
                                 else:
                                     updated += 1
+                                if existence is not None:
+                                    existence.add({**existing, 'apply_url': apply_url, 'status': 'active', 'deleted_at': None})
+                                saved_rows.append({
+                                    'id': existing['id'], 'source_id': source_id, 'title': title,
+                                    'org_name': org_name, 'location_raw': location,
+                                    'deadline': deadline_date, 'quality_score': quality_score
+                                })
                             except Exception as e:
                                 error_msg = f"DB update error: {str(e)}"
                                 logger.error(f"Failed to update job '{title[:50]}...': {error_msg}")
@@ -1587,8 +1626,21 @@ class SimpleCrawler:
                                 cur.execute(f"""
                                     INSERT INTO jobs ({', '.join(insert_fields)})
                                     VALUES ({', '.join(placeholders)})
+                                    RETURNING id
                                 """, sql_values)
                                 inserted += 1
+                                job_id = cur.fetchone()[0]
+                                if existence is not None:
+                                    # Later duplicates in this batch become updates
+                                    existence.add({
+                                        'id': job_id, 'source_id': source_id, 'apply_url': apply_url,
+                                        'canonical_hash': canonical_hash, 'status': 'active', 'deleted_at': None
+                                    })
+                                saved_rows.append({
+                                    'id': job_id, 'source_id': source_id, 'title': title,
+                                    'org_name': org_name, 'location_raw': location,
+                                    'deadline': deadline_date, 'quality_score': quality_score
+                                })
                                 logger.debug(f"Inserted job: {title[:50]}...")
                             except Exception as e:
                                 error_msg = f"DB insert error: {str(e)}"
@@ -1621,6 +1673,16 @@ class SimpleCrawler:
                 
                 conn.commit()
                 logger.info(f"Successfully saved jobs: {inserted} inserted, {updated} updated, {skipped} skipped, {failed} failed")
+                
+                from app.http_cache import invalidate_jobs
+                invalidate_jobs(row['id'] for row in saved_rows)
+            
+            # Link cross-source near-duplicates (non-canonical rows skip enrichment/indexing)
+            try:
+                from core.near_dedupe import link_near_duplicates
+                duplicates = link_near_duplicates(conn, saved_rows)
+            except ImportError:
+                pass
         
         except Exception as e:
             logger.error(f"Error saving jobs (batch): {e}", exc_info=True)
@@ -1667,6 +1729,7 @@ class SimpleCrawler:
             'updated': updated, 
             'skipped': skipped, 
             'failed': failed,
+            'duplicates': duplicates,
             'validated': len(jobs) if 'jobs' in locals() else 0
         }
     
@@ -1929,6 +1992,7 @@ class SimpleCrawler:
         
         # Store source_id for heuristics logging
         self._current_source_id = source_id
+        trace = CrawlTrace(source_type)
         
         logger.info(f"Crawling {org_name} ({source_type}): {careers_url}")
         
@@ -1940,35 +2004,27 @@ class SimpleCrawler:
                 ])
                 
                 # Fetch HTML
-                status, html = await self.fetch_html(careers_url, use_browser=needs_browser)
+                with trace.span('render' if needs_browser else 'fetch'):
+                    status, html = await self.fetch_html(careers_url, use_browser=needs_browser)
                 
                 # Store raw HTML (Phase 2)
                 raw_page_id = None
                 storage_path = None
-                if self.html_storage and html:
-                    try:
-                        storage_path = self.html_storage.store(careers_url, html, source_id)
-                        if storage_path:
-                            # Save raw_page record to database
-                            conn = self._get_db_conn()
-                            try:
-                                with conn.cursor() as cur:
-                                    cur.execute("""
-                                        INSERT INTO raw_pages (
-                                            url, status, storage_path, content_length, source_id, fetched_at
-                                        )
-                                        VALUES (%s, %s, %s, %s, %s, NOW())
-                                        RETURNING id
-                                    """, (careers_url, status, storage_path, len(html), source_id))
-                                    raw_page_id = str(cur.fetchone()[0])
-                                    conn.commit()
-                            except Exception as e:
-                                logger.warning(f"Error saving raw_page record: {e}")
-                                conn.rollback()
-                            finally:
-                                conn.close()
-                    except Exception as e:
-                        logger.warning(f"Error storing HTML: {e}")
+                with trace.span('store_raw'):
+                    if self.html_storage and html:
+                        try:
+                            storage_path = await self.html_storage.store_async(careers_url, html, source_id)
+                            if storage_path and self.extraction_logger:
+                                # Buffered raw_page record; the id is usable before the row is written
+                                raw_page_id = self.extraction_logger.log_raw_page(
+                                    url=careers_url,
+                                    status=status,
+                                    storage_path=storage_path,
+                                    content_length=len(html),
+                                    source_id=source_id
+                                )
+                        except Exception as e:
+                            logger.warning(f"Error storing HTML: {e}")
                 
                 # Accept any 2xx status as success (some sites use 202, 204, etc.)
                 if status < 200 or status >= 300:
@@ -1985,7 +2041,8 @@ class SimpleCrawler:
                     return {
                         'status': 'failed',
                         'message': f'HTTP {status}',
-                        'counts': {'found': 0, 'inserted': 0, 'updated': 0, 'skipped': 0, 'failed': 0}
+                        'counts': {'found': 0, 'inserted': 0, 'updated': 0, 'skipped': 0, 'failed': 0},
+                        'timings': trace.breakdown()
                     }
                 
                 # Extract jobs from listing page
@@ -2013,7 +2070,8 @@ class SimpleCrawler:
                             enable_ai=self.use_ai,
                             shadow_mode=rollout_config.is_shadow_mode()
                         )
-                        jobs = await pipeline_adapter.extract_jobs_from_html(html, careers_url)
+                        with trace.span('parse'):
+                            jobs = await pipeline_adapter.extract_jobs_from_html(html, careers_url)
                         logger.info(f"New pipeline extractor found {len(jobs)} jobs for {org_name}")
                     except Exception as e:
                         logger.error(f"New pipeline extractor failed: {e}, falling back to default", exc_info=True)
@@ -2025,36 +2083,52 @@ class SimpleCrawler:
                         try:
                             logger.info(f"Attempting AI extraction for {org_name}...")
                             # Use asyncio.wait_for to add overall timeout (2 minutes max)
-                            jobs = await asyncio.wait_for(
-                                self.ai_extractor.extract_jobs_from_html(html, careers_url, max_jobs=100),
-                                timeout=120.0  # 2 minute overall timeout
-                            )
+                            with trace.span('ai_extract'):
+                                jobs = await asyncio.wait_for(
+                                    self.ai_extractor.extract_jobs_from_html(html, careers_url, max_jobs=100),
+                                    timeout=120.0  # 2 minute overall timeout
+                                )
                             if jobs:
                                 logger.info(f"AI extraction successful: {len(jobs)} jobs found")
                             else:
                                 logger.info("AI extraction returned no jobs, falling back to rule-based")
-                                jobs = self.extract_jobs_from_html(html, careers_url)
+                                with trace.span('parse'):
+                                    jobs = await self.extract_jobs_offloaded(html, careers_url, source_id)
                         except asyncio.TimeoutError:
                             logger.warning("AI extraction timed out (2 minutes), falling back to rule-based")
-                            jobs = self.extract_jobs_from_html(html, careers_url)
+                            with trace.span('parse'):
+                                jobs = await self.extract_jobs_offloaded(html, careers_url, source_id)
                         except Exception as e:
                             logger.warning(f"AI extraction failed: {e}, falling back to rule-based")
-                            jobs = self.extract_jobs_from_html(html, careers_url)
+                            with trace.span('parse'):
+                                jobs = await self.extract_jobs_offloaded(html, careers_url, source_id)
                     else:
                         # Try plugin system first, then fall back to rule-based extraction
-                        try:
-                            from crawler.plugins import get_plugin_registry
-                            registry = get_plugin_registry()
-                            plugin_result = registry.extract(html, careers_url, config=None, preferred_plugin=None)
-                            if plugin_result.is_success() and plugin_result.jobs:
-                                logger.info(f"Plugin extraction successful: {len(plugin_result.jobs)} jobs found")
-                                jobs = plugin_result.jobs
-                            else:
-                                logger.info(f"Plugin extraction returned no jobs, falling back to rule-based")
-                                jobs = self.extract_jobs_from_html(html, careers_url)
-                        except Exception as e:
-                            logger.warning(f"Plugin system error: {e}, falling back to rule-based")
-                            jobs = self.extract_jobs_from_html(html, careers_url)
+                        with trace.span('parse'):
+                            try:
+                                # A learned plan names the plugin that handled this source last time
+                                plan = self.plan_store.get(source_id) if self.plan_store else None
+                                preferred_plugin = plan.get('plugin_name') if plan else None
+                                plugin_result = await self._extract_with_plugins(html, careers_url, preferred_plugin)
+                                if plugin_result['success'] and plugin_result['jobs']:
+                                    logger.info(f"Plugin extraction successful: {len(plugin_result['jobs'])} jobs found")
+                                    jobs = plugin_result['jobs']
+                                    plugin_name = plugin_result['plugin']
+                                    if self.plan_store and plugin_name:
+                                        if plugin_name == preferred_plugin:
+                                            self.plan_store.record_hit(source_id, 0)
+                                        else:
+                                            self.plan_store.learn(source_id, {
+                                                'strategy': 'plugin',
+                                                'plugin_name': plugin_name,
+                                                'expected_jobs': len(jobs),
+                                            })
+                                else:
+                                    logger.info(f"Plugin extraction returned no jobs, falling back to rule-based")
+                                    jobs = await self.extract_jobs_offloaded(html, careers_url, source_id)
+                            except Exception as e:
+                                logger.warning(f"Plugin system error: {e}, falling back to rule-based")
+                                jobs = await self.extract_jobs_offloaded(html, careers_url, source_id)
                 
                 logger.info(f"Job extraction complete: {len(jobs)} jobs extracted from listing page")
                 
@@ -2079,19 +2153,20 @@ class SimpleCrawler:
                         logger.info(f"Enriching {len(jobs)} jobs from detail pages...")
                     
                     enriched_jobs = []
-                    for i, job in enumerate(jobs):
-                        if job.get('apply_url'):
-                            try:
-                                enriched_job = await self.enrich_job_from_detail_page(job, careers_url)
-                                enriched_jobs.append(enriched_job)
-                                # Small delay to avoid overwhelming servers (0.3s between requests)
-                                if i < len(jobs) - 1:  # Don't delay after last job
-                                    await asyncio.sleep(0.3)
-                            except Exception as e:
-                                logger.warning(f"Error enriching job {job.get('title', 'unknown')}: {e}")
-                                enriched_jobs.append(job)  # Use original job if enrichment fails
-                        else:
-                            enriched_jobs.append(job)
+                    with trace.span('enrich'):
+                        for i, job in enumerate(jobs):
+                            if job.get('apply_url'):
+                                try:
+                                    enriched_job = await self.enrich_job_from_detail_page(job, careers_url)
+                                    enriched_jobs.append(enriched_job)
+                                    # Small delay to avoid overwhelming servers (0.3s between requests)
+                                    if i < len(jobs) - 1:  # Don't delay after last job
+                                        await asyncio.sleep(0.3)
+                                except Exception as e:
+                                    logger.warning(f"Error enriching job {job.get('title', 'unknown')}: {e}")
+                                    enriched_jobs.append(job)  # Use original job if enrichment fails
+                            else:
+                                enriched_jobs.append(job)
                     jobs = enriched_jobs
                 else:
                     if len(jobs) > 50 and not needs_enrichment:
@@ -2101,51 +2176,52 @@ class SimpleCrawler:
                 # Normalize ambiguous fields using AI (Phase 3) - only when heuristics fail
                 if self.ai_normalizer and jobs:
                     normalized_count = 0
-                    for job in jobs:
-                        try:
-                            # Check if normalization is needed
-                            needs_normalization = False
+                    with trace.span('normalize'):
+                        for job in jobs:
+                            try:
+                                # Check if normalization is needed
+                                needs_normalization = False
                             
-                            # Check deadline: normalize if not in YYYY-MM-DD format
-                            if job.get('deadline'):
-                                deadline_str = str(job['deadline'])
-                                if not (len(deadline_str) == 10 and deadline_str.count('-') == 2):
-                                    needs_normalization = True
+                                # Check deadline: normalize if not in YYYY-MM-DD format
+                                if job.get('deadline'):
+                                    deadline_str = str(job['deadline'])
+                                    if not (len(deadline_str) == 10 and deadline_str.count('-') == 2):
+                                        needs_normalization = True
                             
-                            # Check location: normalize if ambiguous (contains /, ;, or multiple parts)
-                            if job.get('location_raw') and not job.get('location_normalized'):
-                                location = job['location_raw']
-                                if '/' in location or ';' in location or location.count(',') > 1:
-                                    needs_normalization = True
+                                # Check location: normalize if ambiguous (contains /, ;, or multiple parts)
+                                if job.get('location_raw') and not job.get('location_normalized'):
+                                    location = job['location_raw']
+                                    if '/' in location or ';' in location or location.count(',') > 1:
+                                        needs_normalization = True
                             
-                            # Check salary: normalize if present but not structured
-                            if job.get('salary_raw') and not job.get('salary_normalized'):
-                                needs_normalization = True
+                                # Check salary: normalize if present but not structured
+                                if job.get('salary_raw') and not job.get('salary_normalized'):
+                                    needs_normalization = True
                             
-                            # Only normalize if needed (cost control)
-                            if needs_normalization:
-                                normalized_job = await self.ai_normalizer.normalize_job_fields(
-                                    job,
-                                    use_ai_for_deadline=bool(job.get('deadline') and not re.match(r'^\d{4}-\d{2}-\d{2}$', str(job.get('deadline', '')))),
-                                    use_ai_for_location=bool(job.get('location_raw') and not job.get('location_normalized')),
-                                    use_ai_for_salary=bool(job.get('salary_raw') and not job.get('salary_normalized'))
-                                )
+                                # Only normalize if needed (cost control)
+                                if needs_normalization:
+                                    normalized_job = await self.ai_normalizer.normalize_job_fields(
+                                        job,
+                                        use_ai_for_deadline=bool(job.get('deadline') and not re.match(r'^\d{4}-\d{2}-\d{2}$', str(job.get('deadline', '')))),
+                                        use_ai_for_location=bool(job.get('location_raw') and not job.get('location_normalized')),
+                                        use_ai_for_salary=bool(job.get('salary_raw') and not job.get('salary_normalized'))
+                                    )
                                 
-                                # Update job with normalized fields
-                                if normalized_job.get('deadline') and normalized_job.get('deadline') != job.get('deadline'):
-                                    job['deadline'] = normalized_job['deadline']
-                                    normalized_count += 1
+                                    # Update job with normalized fields
+                                    if normalized_job.get('deadline') and normalized_job.get('deadline') != job.get('deadline'):
+                                        job['deadline'] = normalized_job['deadline']
+                                        normalized_count += 1
                                 
-                                if normalized_job.get('location_normalized'):
-                                    job['location_normalized'] = normalized_job['location_normalized']
-                                    normalized_count += 1
+                                    if normalized_job.get('location_normalized'):
+                                        job['location_normalized'] = normalized_job['location_normalized']
+                                        normalized_count += 1
                                 
-                                if normalized_job.get('salary_normalized'):
-                                    job['salary_normalized'] = normalized_job['salary_normalized']
-                                    normalized_count += 1
-                        except Exception as e:
-                            logger.debug(f"Error normalizing job {job.get('title', 'unknown')[:50]}: {e}")
-                            # Continue with original job if normalization fails
+                                    if normalized_job.get('salary_normalized'):
+                                        job['salary_normalized'] = normalized_job['salary_normalized']
+                                        normalized_count += 1
+                            except Exception as e:
+                                logger.debug(f"Error normalizing job {job.get('title', 'unknown')[:50]}: {e}")
+                                # Continue with original job if normalization fails
                     
                     if normalized_count > 0:
                         logger.info(f"AI normalized {normalized_count} field(s) across {len(jobs)} jobs")
@@ -2153,37 +2229,38 @@ class SimpleCrawler:
                 # Geocode locations (Phase 4) - only for jobs with location but no coordinates
                 if self.geocoder and jobs:
                     geocoded_count = 0
-                    for job in jobs:
-                        try:
-                            location = job.get('location_raw') or (job.get('location_normalized', {}).get('label') if isinstance(job.get('location_normalized'), dict) else None)
+                    with trace.span('geocode'):
+                        for job in jobs:
+                            try:
+                                location = job.get('location_raw') or (job.get('location_normalized', {}).get('label') if isinstance(job.get('location_normalized'), dict) else None)
                             
-                            # Only geocode if we have location but no coordinates
-                            if location and not job.get('latitude') and not job.get('is_remote'):
-                                # Check if already marked as remote
-                                if isinstance(job.get('location_normalized'), dict) and job.get('location_normalized', {}).get('type') == 'remote':
-                                    job['is_remote'] = True
-                                    geocoded_count += 1
-                                else:
-                                    # Geocode the location
-                                    geocoded = await self.geocoder.geocode(location, use_google=False)
-                                    if geocoded:
-                                        job['latitude'] = geocoded.get('latitude')
-                                        job['longitude'] = geocoded.get('longitude')
-                                        job['geocoding_source'] = geocoded.get('source', 'nominatim')
-                                        job['is_remote'] = geocoded.get('is_remote', False)
+                                # Only geocode if we have location but no coordinates
+                                if location and not job.get('latitude') and not job.get('is_remote'):
+                                    # Check if already marked as remote
+                                    if isinstance(job.get('location_normalized'), dict) and job.get('location_normalized', {}).get('type') == 'remote':
+                                        job['is_remote'] = True
+                                        geocoded_count += 1
+                                    else:
+                                        # Geocode the location
+                                        geocoded = await self.geocoder.geocode(location, use_google=False)
+                                        if geocoded:
+                                            job['latitude'] = geocoded.get('latitude')
+                                            job['longitude'] = geocoded.get('longitude')
+                                            job['geocoding_source'] = geocoded.get('source', 'nominatim')
+                                            job['is_remote'] = geocoded.get('is_remote', False)
                                         
-                                        # Update country/city if geocoding provided better data
-                                        if geocoded.get('country') and not job.get('country'):
-                                            job['country'] = geocoded.get('country')
-                                        if geocoded.get('country_code') and not job.get('country_iso'):
-                                            job['country_iso'] = geocoded.get('country_code')
-                                        if geocoded.get('city') and not job.get('city'):
-                                            job['city'] = geocoded.get('city')
+                                            # Update country/city if geocoding provided better data
+                                            if geocoded.get('country') and not job.get('country'):
+                                                job['country'] = geocoded.get('country')
+                                            if geocoded.get('country_code') and not job.get('country_iso'):
+                                                job['country_iso'] = geocoded.get('country_code')
+                                            if geocoded.get('city') and not job.get('city'):
+                                                job['city'] = geocoded.get('city')
                                         
-                                        geocoded_count += 1
-                        except Exception as e:
-                            logger.debug(f"Error geocoding job {job.get('title', 'unknown')[:50]}: {e}")
-                            # Continue with original job if geocoding fails
+                                            geocoded_count += 1
+                            except Exception as e:
+                                logger.debug(f"Error geocoding job {job.get('title', 'unknown')[:50]}: {e}")
+                                # Continue with original job if geocoding fails
                     
                     if geocoded_count > 0:
                         logger.info(f"Geocoded {geocoded_count} location(s) across {len(jobs)} jobs")
@@ -2191,23 +2268,25 @@ class SimpleCrawler:
                 # Score data quality (Phase 4)
                 if self.quality_scorer and jobs:
                     scored_count = 0
-                    for job in jobs:
-                        try:
-                            quality_result = self.quality_scorer.score_job(job)
-                            job['quality_score'] = quality_result['score']
-                            job['quality_grade'] = quality_result['grade']
-                            job['quality_factors'] = quality_result['factors']
-                            job['quality_issues'] = quality_result['issues']
-                            job['needs_review'] = quality_result['needs_review']
-                            scored_count += 1
-                        except Exception as e:
-                            logger.debug(f"Error scoring job {job.get('title', 'unknown')[:50]}: {e}")
+                    with trace.span('quality'):
+                        for job in jobs:
+                            try:
+                                quality_result = self.quality_scorer.score_job(job)
+                                job['quality_score'] = quality_result['score']
+                                job['quality_grade'] = quality_result['grade']
+                                job['quality_factors'] = quality_result['factors']
+                                job['quality_issues'] = quality_result['issues']
+                                job['needs_review'] = quality_result['needs_review']
+                                scored_count += 1
+                            except Exception as e:
+                                logger.debug(f"Error scoring job {job.get('title', 'unknown')[:50]}: {e}")
                     
                     if scored_count > 0:
                         logger.info(f"Scored quality for {scored_count} job(s)")
                 
                 # Save to database
-                counts = self.save_jobs(jobs, source_id, org_name, base_url=careers_url)
+                with trace.span('save'):
+                    counts = self.save_jobs(jobs, source_id, org_name, base_url=careers_url)
                 
                 # Log extraction result (Phase 2)
                 if self.extraction_logger:
@@ -2263,8 +2342,10 @@ class SimpleCrawler:
                         'inserted': counts['inserted'],
                         'updated': counts['updated'],
                         'skipped': counts['skipped'],
-                        'failed': counts.get('failed', 0)
-                    }
+                        'failed': counts.get('failed', 0),
+                        'duplicates': counts.get('duplicates', 0)
+                    },
+                    'timings': trace.breakdown()
                 }
             
             elif source_type == 'rss':
@@ -2295,6 +2376,32 @@ class SimpleCrawler:
             return {
                 'status': 'failed',
                 'message': str(e)[:200],
-                'counts': {'found': 0, 'inserted': 0, 'updated': 0, 'skipped': 0}
+                'counts': {'found': 0, 'inserted': 0, 'updated': 0, 'skipped': 0},
+                'timings': trace.breakdown()
             }
 
+
+# Extraction process pool entry points. Each worker process builds one
+# DB-less crawler and reuses it; results are plain dicts.
+_worker_crawler: Optional[SimpleCrawler] = None
+
+
+def _get_worker_crawler() -> SimpleCrawler:
+    global _worker_crawler
+    if _worker_crawler is None:
+        _worker_crawler = SimpleCrawler("", use_ai=False)
+    return _worker_crawler
+
+
+def extract_jobs_in_worker(html: str, base_url: str, plan: Optional[Dict]) -> Tuple[List[Dict], Dict]:
+    return _get_worker_crawler().extract_jobs_with_plan(html, base_url, plan)
+
+
+def extract_plugins_in_worker(html: str, base_url: str, preferred_plugin: Optional[str]) -> Dict:
+    from crawler.plugins import get_plugin_registry
+    result = get_plugin_registry().extract(html, base_url, config=None, preferred_plugin=preferred_plugin)
+    return {
+        'success': result.is_success(),
+        'jobs': result.jobs or [],
+        'plugin': result.metadata.get('plugin'),
+    }
@@ -4,23 +4,23 @@ from fastapi.responses import JSONResponse
 from dotenv import load_dotenv
 from typing import Optional
 from contextlib import asynccontextmanager
+import asyncio
 import os
 import logging
+import time
 import traceback
 from pydantic import BaseModel
 
 from app.config import Capabilities, get_env_presence
-from app.search import search_service
+from app.search import search_service, parse_fields
+from app import http_cache
+from app.responses import json_response
 from app.normalizer import normalize_job_data
 from app.validator import validator
-from app.admin import router as admin_router
-from app.sources import router as sources_router
-from app.crawl import router as crawl_router
 from app.shortlist import router as shortlist_router
 from app.find_earn import router as find_earn_router
 from app.analytics import analytics_tracker
 from app.admin_auth_routes import router as admin_auth_router
-from app.presets import router as presets_router
 from app.rate_limit import limiter, RATE_LIMIT_SEARCH, RATE_LIMIT_SUBMIT
 from slowapi.errors import RateLimitExceeded
 from slowapi import _rate_limit_exceeded_handler
@@ -41,6 +41,14 @@ class LoginRequest(BaseModel):
     password: str
 
 
+def _preload_classifier():
+    try:
+        from pipeline.classifier import get_classifier_model
+        get_classifier_model()
+    except Exception as e:
+        logger.warning(f"[classifier] Failed to load model: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Handle application lifecycle events."""
@@ -57,6 +65,10 @@ async def lifespan(app: FastAPI):
     else:
         logger.info(f"[aidjobs] env: AIDJOBS_ENV={aidjobs_env} (admin routes disabled)")
     
+    # Load the job page classifier model once, before the first crawl needs it
+    # (in a worker thread so startup doesn't wait on numpy and the model file)
+    asyncio.get_running_loop().run_in_executor(None, _preload_classifier)
+    
     # Start crawler orchestrator
     try:
         from orchestrator import start_scheduler, stop_scheduler
@@ -76,6 +88,20 @@ async def lifespan(app: FastAPI):
         await stop_scheduler()
     except:
         pass
+    
+    # Stop extraction worker processes (only exist if a crawl ran)
+    try:
+        from core.extraction_executor import shutdown_extraction_executor
+        shutdown_extraction_executor()
+    except Exception as e:
+        logger.warning(f"[extraction_executor] Failed to shut down worker pool: {e}")
+    
+    # Write buffered crawl log rows (raw_pages, extraction_logs, failed_inserts)
+    try:
+        from core.log_writer import shutdown_log_writers
+        shutdown_log_writers()
+    except Exception as e:
+        logger.warning(f"[log_writer] Failed to flush log rows: {e}")
 
 
 app = FastAPI(title="AidJobs API", version="0.1.0", lifespan=lifespan)
@@ -142,78 +168,152 @@ app.add_middleware(
 )
 
 app.include_router(admin_auth_router)
-app.include_router(admin_router)
-app.include_router(sources_router)
-app.include_router(presets_router)
-app.include_router(crawl_router)
 app.include_router(shortlist_router)
 app.include_router(find_earn_router)
 
-# Add new crawler admin routes
-try:
-    from app.crawler_admin import router as crawler_admin_router, robots_router, policies_router, quality_router, link_validation_router, meilisearch_router, observability_router
-    app.include_router(crawler_admin_router)
-    app.include_router(robots_router)
-    app.include_router(policies_router)
-    app.include_router(quality_router)
-    app.include_router(link_validation_router)
-    app.include_router(meilisearch_router)
+
+# Admin and crawler routers pull in the crawler stack (dateparser, bs4,
+# feedparser, httpx, meilisearch...). They are imported and mounted on the
+# first request under their prefixes instead of at startup, so a fresh
+# process serves /api/healthz sooner. AIDJOBS_LAZY_ROUTERS=false mounts
+# them at import as before.
+LAZY_ROUTERS = os.getenv("AIDJOBS_LAZY_ROUTERS", "true").lower() == "true"
+
+
+def _mount_admin_routers():
+    """Dev admin, sources, presets and job management routes"""
+    from app.admin import router as admin_router
+    from app.sources import router as sources_router
+    from app.presets import router as presets_router
+    app.include_router(admin_router)
+    app.include_router(sources_router)
+    app.include_router(presets_router)
     
-    # Explicitly verify observability_router before including
-    if observability_router:
-        app.include_router(observability_router)
-        logger.info(f"[main] Successfully loaded observability_router with {len(observability_router.routes)} routes")
-        for route in observability_router.routes:
-            if hasattr(route, 'path'):
-                logger.info(f"[main] Observability route: {route.path} {getattr(route, 'methods', [])}")
-    else:
-        logger.error("[main] observability_router is None!")
+    # Add job management routes
+    try:
+        from app.job_management import router as job_management_router
+        app.include_router(job_management_router)
+    except ImportError as e:
+        logger.warning(f"[main] Could not import job_management routes: {e}")
+
+
+def _mount_crawler_routers():
+    """Crawl run, crawler admin, observability, crawler v2 and pipeline routes"""
+    from app.crawl import router as crawl_router
+    app.include_router(crawl_router)
+    
+    # Add new crawler admin routes
+    try:
+        from app.crawler_admin import router as crawler_admin_router, robots_router, policies_router, quality_router, link_validation_router, meilisearch_router, observability_router
+        app.include_router(crawler_admin_router)
+        app.include_router(robots_router)
+        app.include_router(policies_router)
+        app.include_router(quality_router)
+        app.include_router(link_validation_router)
+        app.include_router(meilisearch_router)
+        
+        # Explicitly verify observability_router before including
+        if observability_router:
+            app.include_router(observability_router)
+            logger.info(f"[main] Successfully loaded observability_router with {len(observability_router.routes)} routes")
+        else:
+            logger.error("[main] observability_router is None!")
+        
+        logger.info("[main] Successfully loaded all crawler admin routers")
+    except ImportError as e:
+        logger.warning(f"[main] Some admin routers not available: {e}", exc_info=True)
+    except Exception as e:
+        logger.error(f"[main] Error loading crawler admin routers: {e}", exc_info=True)
     
-    logger.info("[main] Successfully loaded all crawler admin routers")
-except ImportError as e:
-    logger.warning(f"[main] Some admin routers not available: {e}", exc_info=True)
-except Exception as e:
-    logger.error(f"[main] Error loading crawler admin routers: {e}", exc_info=True)
-
-# Add job management routes
-try:
-    from app.job_management import router as job_management_router
-    app.include_router(job_management_router)
-except ImportError:
-    logger.warning("Job management router not available")
-
-# Add data quality logs routes
-try:
-    from app.data_quality_logs import router as data_quality_logs_router
-    app.include_router(data_quality_logs_router, prefix="/api/admin/data-quality", tags=["data_quality_logs"])
-except ImportError:
-    logger.warning("Data quality logs router not available")
-
-# Add new simple crawler routes
-try:
-    from app.crawler_v2_routes import router as crawler_v2_router
-    app.include_router(crawler_v2_router)
-except ImportError:
-    logger.warning("Crawler v2 router not available")
-    app.include_router(policies_router)
-    app.include_router(quality_router)
-except ImportError as e:
-    logger.warning(f"[main] Could not import crawler_admin routes: {e}")
-
-# Add job management routes
-try:
-    from app.job_management import router as job_management_router
-    app.include_router(job_management_router)
-except ImportError as e:
-    logger.warning(f"[main] Could not import job_management routes: {e}")
-
-# Add pipeline API routes (read-only, internal)
-try:
-    from app.pipeline_api import router as pipeline_api_router
-    app.include_router(pipeline_api_router)
-    logger.info("[main] Pipeline API router loaded")
-except ImportError as e:
-    logger.warning(f"[main] Pipeline API router not available: {e}")
+    # Add data quality logs routes
+    try:
+        from app.data_quality_logs import router as data_quality_logs_router
+        app.include_router(data_quality_logs_router, prefix="/api/admin/data-quality", tags=["data_quality_logs"])
+    except ImportError:
+        logger.warning("Data quality logs router not available")
+    
+    # Add new simple crawler routes
+    try:
+        from app.crawler_v2_routes import router as crawler_v2_router
+        app.include_router(crawler_v2_router)
+    except ImportError:
+        logger.warning("Crawler v2 router not available")
+    
+    # Add pipeline API routes (read-only, internal)
+    try:
+        from app.pipeline_api import router as pipeline_api_router
+        app.include_router(pipeline_api_router)
+        logger.info("[main] Pipeline API router loaded")
+    except ImportError as e:
+        logger.warning(f"[main] Pipeline API router not available: {e}")
+
+
+# Group -> (path prefixes that trigger mounting, mount function)
+ROUTER_GROUPS = {
+    "crawler": (
+        ("/admin/crawl", "/api/admin/crawl", "/api/admin/robots", "/api/admin/domain_policies",
+         "/api/admin/data-quality", "/api/admin/link-validation", "/api/admin/meilisearch",
+         "/api/admin/observability", "/_internal"),
+        _mount_crawler_routers,
+    ),
+    "admin": (("/admin/", "/api/admin/jobs"), _mount_admin_routers),
+}
+
+# Paths that need every route registered (route listing, OpenAPI docs)
+ALL_ROUTES_PATHS = ("/api/debug/routes", "/openapi.json", "/docs", "/redoc")
+
+_mounted_router_groups: set = set()
+# Mounted routes go here so they keep precedence over the routes defined below, as at import
+_router_insert_at = len(app.router.routes)
+
+
+def _route_key(route) -> tuple:
+    return route.path, tuple(sorted(getattr(route, 'methods', None) or ()))
+
+
+def mount_router_group(name: str):
+    """Import and mount a router group once (retried on the next call if it fails)"""
+    global _router_insert_at
+    if name in _mounted_router_groups:
+        return
+    
+    started = time.perf_counter()
+    before = len(app.router.routes)
+    try:
+        ROUTER_GROUPS[name][1]()
+        _mounted_router_groups.add(name)
+    finally:
+        # Routes included before a failure keep their precedence too; a retry skips them
+        added = app.router.routes[before:]
+        del app.router.routes[before:]
+        mounted = {_route_key(route) for route in app.router.routes[:_router_insert_at]}
+        added = [route for route in added if _route_key(route) not in mounted]
+        app.router.routes[_router_insert_at:_router_insert_at] = added
+        _router_insert_at += len(added)
+        app.openapi_schema = None  # Rebuilt with the new routes
+    logger.info(f"[main] Mounted {name} routers ({len(added)} routes) in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+
+def mount_all_router_groups():
+    for name in ROUTER_GROUPS:
+        mount_router_group(name)
+
+
+if LAZY_ROUTERS:
+    @app.middleware("http")
+    async def lazy_router_middleware(request: Request, call_next):
+        """Mount router groups on the first request under their prefixes."""
+        if len(_mounted_router_groups) < len(ROUTER_GROUPS):
+            path = request.url.path
+            if path in ALL_ROUTES_PATHS:
+                mount_all_router_groups()
+            else:
+                for name, (prefixes, _) in ROUTER_GROUPS.items():
+                    if path.startswith(prefixes):
+                        mount_router_group(name)
+        return await call_next(request)
+else:
+    mount_all_router_groups()
 
 
 
@@ -239,6 +339,18 @@ async def healthz():
         }
 
 
+# Prometheus scrape endpoint (crawl stage histograms, insert counters)
+if os.getenv("ENABLE_PROMETHEUS"):
+    try:
+        from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+        @app.get("/metrics", include_in_schema=False)
+        async def prometheus_metrics():
+            return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+    except ImportError:
+        logger.warning("[main] ENABLE_PROMETHEUS set but prometheus_client is not installed")
+
+
 @app.get("/api/debug/routes")
 async def debug_routes(admin: str = Depends(admin_required)):
     """Debug endpoint to list all registered routes (admin only)"""
@@ -320,8 +432,13 @@ async def search_query(
     impact_domain: Optional[list[str]] = Query(None, description="Filter by impact domain"),
     functional_role: Optional[list[str]] = Query(None, description="Filter by functional role"),
     experience_level: Optional[str] = Query(None, description="Filter by experience level"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return per item, or 'compact'"),
 ):
-    return await search_service.search_query(
+    try:
+        projection = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    result = await search_service.search_query(
         q=q,
         page=page,
         size=size,
@@ -342,12 +459,21 @@ async def search_query(
         impact_domain=impact_domain,
         functional_role=functional_role,
         experience_level=experience_level,
+        fields=projection,
     )
+    return json_response(request, result)
 
 
 @app.get("/api/search/facets")
-async def search_facets():
-    return await search_service.get_facets()
+async def search_facets(request: Request):
+    return await http_cache.cached_json(
+        request,
+        http_cache.facets_cache,
+        http_cache.FACETS_KEY,
+        http_cache.FACETS_POLICY,
+        search_service.get_facets,
+        cacheable=lambda facets: facets.get("enabled") and "error" not in facets,
+    )
 
 
 @app.post("/api/search/parse")
@@ -426,12 +552,19 @@ async def autocomplete_suggestions(
 
 
 @app.get("/api/jobs/{job_id}")
-async def get_job_by_id(job_id: str):
+async def get_job_by_id(job_id: str, request: Request):
     """Get a single job by ID from database (preferred) or Meilisearch fallback."""
-    result = await search_service.get_job_by_id(job_id)
-    if result is None:
+    is_dev = os.getenv("AIDJOBS_ENV", "production").lower() == "dev"
+    response = await http_cache.cached_json(
+        request,
+        http_cache.job_cache,
+        http_cache.job_cache_key(job_id, include_raw=is_dev),
+        http_cache.JOB_DETAIL_POLICY,
+        lambda: search_service.get_job_by_id(job_id),
+    )
+    if response is None:
         raise HTTPException(status_code=404, detail="Job not found")
-    return result
+    return response
 
 
 @app.get("/admin/db/status")
@@ -711,6 +844,7 @@ async def get_unenriched_count(
             FROM jobs
             WHERE status = 'active'
             AND deleted_at IS NULL
+            AND duplicate_of IS NULL
             AND (deadline IS NULL OR deadline >= CURRENT_DATE)
             AND (impact_domain IS NULL OR impact_domain = '[]'::jsonb)
         """)
@@ -753,6 +887,7 @@ async def get_unenriched_jobs(
             FROM jobs
             WHERE status = 'active'
             AND deleted_at IS NULL
+            AND duplicate_of IS NULL
             AND (deadline IS NULL OR deadline >= CURRENT_DATE)
             AND (impact_domain IS NULL OR impact_domain = '[]'::jsonb)
             ORDER BY created_at DESC
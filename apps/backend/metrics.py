@@ -1,26 +1,61 @@
 """
 Lightweight metrics helper for job insertion monitoring.
-Supports Prometheus if available, falls back to JSON file metrics.
+Supports Prometheus if available; always aggregates in memory.
+
+In-memory backend (independent of Prometheus):
+- Counters and histograms are recorded into a per-thread shard, so the hot
+  path takes no lock; readers merge the shards.
+- Counters are also bucketed per METRICS_BUCKET_SECONDS in a ring of
+  METRICS_RING_BUCKETS buckets (24h of minutes by default) for windowed
+  rates and the alerting script's history.
+- A background thread writes this process's snapshot every
+  METRICS_FLUSH_INTERVAL seconds to METRICS_DIR/<host>-<pid>.json,
+  write-temp-then-rename so readers never see a partial file. The file is
+  removed at exit. read_aggregate() merges every process's file, so API and
+  worker processes are reported together, and deletes files left behind by
+  processes that died without cleaning up once they fall out of the ring
+  window.
+
+Record with incr(name, n, **labels) and observe(name, value, **labels);
+incr_inserted() etc. and observe_crawl_stage() are thin wrappers.
 """
 import os
 import json
+import time
+import atexit
+import socket
 import logging
+import tempfile
+import threading
 from pathlib import Path
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
 
 logger = logging.getLogger(__name__)
 
 # Try to import Prometheus client
 try:
-    from prometheus_client import Counter
+    from prometheus_client import Counter, Histogram
     PROMETHEUS_AVAILABLE = True
 except ImportError:
     PROMETHEUS_AVAILABLE = False
     Counter = None
+    Histogram = None
+
+# Per-process snapshot files, merged by read_aggregate()
+METRICS_DIR = Path(os.getenv("AIDJOBS_METRICS_DIR", "/tmp/aidjobs_metrics"))
+METRICS_FLUSH_INTERVAL = float(os.getenv("AIDJOBS_METRICS_FLUSH_INTERVAL", "10"))
+METRICS_BUCKET_SECONDS = int(os.getenv("AIDJOBS_METRICS_BUCKET_SECONDS", "60"))
+METRICS_RING_BUCKETS = int(os.getenv("AIDJOBS_METRICS_RING_BUCKETS", "1440"))
 
-# Metrics file path (fallback mode)
-METRICS_FILE = Path(os.getenv("AIDJOBS_METRICS_FILE", "/tmp/aidjobs_metrics.json"))
+JOB_COUNTERS = ('inserted', 'updated', 'skipped', 'failed')
+HISTORY_LIMIT = 1000
+
+CRAWL_STAGE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+QUEUE_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+CPU_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+DOMAIN_WAIT_BUCKETS = (0, 0.1, 0.5, 1, 2, 5, 10, 30, 60)
+DEFAULT_BUCKETS = CRAWL_STAGE_BUCKETS
 
 # Prometheus counters (if available)
 if PROMETHEUS_AVAILABLE:
@@ -28,144 +63,384 @@ if PROMETHEUS_AVAILABLE:
     jobs_updated = Counter('aidjobs_jobs_updated_total', 'Total jobs updated')
     jobs_skipped = Counter('aidjobs_jobs_skipped_total', 'Total jobs skipped')
     jobs_failed = Counter('aidjobs_jobs_failed_total', 'Total jobs failed')
+    crawl_stage_seconds = Histogram(
+        'aidjobs_crawl_stage_seconds',
+        'Time spent in each crawl stage',
+        ['source_type', 'stage'],
+        buckets=CRAWL_STAGE_BUCKETS,
+    )
+    extraction_queue_wait_seconds = Histogram(
+        'aidjobs_extraction_queue_wait_seconds',
+        'Time extraction tasks wait for a worker process',
+        ['task'],
+        buckets=QUEUE_WAIT_BUCKETS,
+    )
+    extraction_cpu_seconds = Histogram(
+        'aidjobs_extraction_cpu_seconds',
+        'CPU time spent by extraction tasks in worker processes',
+        ['task'],
+        buckets=CPU_BUCKETS,
+    )
+    domain_wait_seconds = Histogram(
+        'aidjobs_domain_wait_seconds',
+        'Time spent waiting for a per-host rate limit slot',
+        ['host', 'scope'],
+        buckets=DOMAIN_WAIT_BUCKETS,
+    )
 else:
     jobs_inserted = None
     jobs_updated = None
     jobs_skipped = None
     jobs_failed = None
+    crawl_stage_seconds = None
+    extraction_queue_wait_seconds = None
+    extraction_cpu_seconds = None
+    domain_wait_seconds = None
+
 
+def _key(name: str, labels: Dict[str, str]) -> str:
+    """Prometheus-style series key: name{a=x,b=y}"""
+    if not labels:
+        return name
+    return name + '{' + ','.join(f"{k}={labels[k]}" for k in sorted(labels)) + '}'
 
-def _load_json_metrics() -> dict:
-    """Load metrics from JSON file."""
-    if not METRICS_FILE.exists():
-        return {
-            'inserted': 0,
-            'updated': 0,
-            'skipped': 0,
-            'failed': 0,
-            'history': []
-        }
+
+def _bucket_start(now: float) -> int:
+    return int(now // METRICS_BUCKET_SECONDS) * METRICS_BUCKET_SECONDS
+
+
+class _Shard:
+    """One thread's metrics; only that thread writes to it"""
     
-    try:
-        with open(METRICS_FILE, 'r') as f:
-            data = json.load(f)
-            # Ensure all keys exist
-            for key in ['inserted', 'updated', 'skipped', 'failed', 'history']:
-                if key not in data:
-                    data[key] = 0 if key != 'history' else []
-            return data
-    except Exception as e:
-        logger.warning(f"Error loading metrics file: {e}, starting fresh")
-        return {
-            'inserted': 0,
-            'updated': 0,
-            'skipped': 0,
-            'failed': 0,
-            'history': []
-        }
-
-
-def _save_json_metrics(data: dict):
-    """Save metrics to JSON file."""
-    try:
-        # Ensure directory exists
-        METRICS_FILE.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(METRICS_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
-    except Exception as e:
-        logger.error(f"Error saving metrics file: {e}")
+    __slots__ = ('counters', 'buckets', 'histograms')
+    
+    def __init__(self):
+        self.counters: Dict[str, float] = {}
+        self.buckets: Dict[int, Dict[str, float]] = {}
+        self.histograms: Dict[str, list] = {}  # key -> [bounds, counts, sum, count]
 
 
-def _add_to_history(data: dict, metric_type: str, count: int):
-    """Add a timestamped entry to history (keep last 1000 entries)."""
-    if 'history' not in data:
-        data['history'] = []
+class _MetricsStore:
+    """Per-thread shards merged on read, flushed to METRICS_DIR periodically"""
+    
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._register_lock = threading.Lock()  # Taken once per thread, not per record
+        self._flusher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+    
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._register_lock:
+                self._shards.append(shard)
+                self._ensure_flusher()
+        return shard
+    
+    def incr(self, key: str, n: float):
+        shard = self._shard()
+        shard.counters[key] = shard.counters.get(key, 0) + n
+        start = _bucket_start(time.time())
+        bucket = shard.buckets.get(start)
+        if bucket is None:
+            bucket = shard.buckets[start] = {}
+            oldest = start - METRICS_BUCKET_SECONDS * METRICS_RING_BUCKETS
+            for old in [b for b in shard.buckets if b <= oldest]:
+                del shard.buckets[old]
+        bucket[key] = bucket.get(key, 0) + n
+    
+    def observe(self, key: str, value: float, bounds: Sequence[float]):
+        shard = self._shard()
+        hist = shard.histograms.get(key)
+        if hist is None:
+            hist = shard.histograms[key] = [tuple(bounds), [0] * (len(bounds) + 1), 0.0, 0]
+        counts = hist[1]
+        for i, bound in enumerate(hist[0]):
+            if value <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+        hist[2] += value
+        hist[3] += 1
+    
+    def snapshot(self) -> dict:
+        """Merged view of this process (shallow copies are atomic under the GIL)"""
+        with self._register_lock:
+            shards = list(self._shards)
+        merged = {'counters': {}, 'buckets': {}, 'histograms': {}}
+        for shard in shards:
+            _merge_into(merged, {
+                'counters': shard.counters.copy(),
+                'buckets': {str(ts): b.copy() for ts, b in shard.buckets.copy().items()},
+                'histograms': {
+                    key: {'bounds': list(h[0]), 'counts': list(h[1]), 'sum': h[2], 'count': h[3]}
+                    for key, h in shard.histograms.copy().items()
+                },
+            })
+        return merged
     
-    data['history'].append({
-        'timestamp': datetime.utcnow().isoformat() + 'Z',
-        'type': metric_type,
-        'count': count
-    })
+    def after_fork(self):
+        """A forked child starts empty instead of re-reporting the parent's counts"""
+        self._local = threading.local()
+        self._shards = []
+        self._register_lock = threading.Lock()
+        self._flusher = None
     
-    # Keep only last 1000 entries
-    if len(data['history']) > 1000:
-        data['history'] = data['history'][-1000:]
+    def reset(self):
+        with self._register_lock:
+            for shard in self._shards:
+                shard.counters.clear()
+                shard.buckets.clear()
+                shard.histograms.clear()
+    
+    def _ensure_flusher(self):
+        """Start the periodic flush thread (caller holds _register_lock)"""
+        if self._flusher is None or not self._flusher.is_alive():
+            self._flusher = threading.Thread(target=self._run, name="metrics-flush", daemon=True)
+            self._flusher.start()
+    
+    def _run(self):
+        while not self._stop.wait(METRICS_FLUSH_INTERVAL):
+            flush_metrics()
+    
+    def stop(self):
+        """Stop the flush thread, waiting briefly for an in-flight flush"""
+        self._stop.set()
+        flusher = self._flusher
+        if flusher is not None and flusher.is_alive():
+            flusher.join(timeout=1)
 
 
-def incr_inserted(n: int = 1):
-    """Increment inserted jobs counter."""
+def _merge_into(total: dict, part: dict):
+    """Add one snapshot's counters, ring buckets and histograms into another"""
+    counters = total['counters']
+    for key, value in part.get('counters', {}).items():
+        counters[key] = counters.get(key, 0) + value
+    buckets = total['buckets']
+    for ts, bucket in part.get('buckets', {}).items():
+        target = buckets.setdefault(str(ts), {})
+        for key, value in bucket.items():
+            target[key] = target.get(key, 0) + value
+    histograms = total['histograms']
+    for key, hist in part.get('histograms', {}).items():
+        target = histograms.get(key)
+        if target is None:
+            histograms[key] = {**hist, 'counts': list(hist['counts'])}
+        elif target['bounds'] == hist['bounds']:
+            target['counts'] = [a + b for a, b in zip(target['counts'], hist['counts'])]
+            target['sum'] += hist['sum']
+            target['count'] += hist['count']
+
+
+_store = _MetricsStore()
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_store.after_fork)
+
+
+def _process_file() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}.json"
+
+
+def incr(name: str, n: float = 1, **labels: str):
+    """Increment an in-memory counter (per-process, no lock on the hot path)."""
+    _store.incr(_key(name, labels), n)
+
+
+def observe(name: str, value: float, buckets: Sequence[float] = DEFAULT_BUCKETS, **labels: str):
+    """Record one observation into an in-memory histogram."""
+    _store.observe(_key(name, labels), value, buckets)
+
+
+def _record_job_count(metric_type: str, n: int, prom_counter):
     if n <= 0:
         return
     
-    if PROMETHEUS_AVAILABLE and jobs_inserted:
-        jobs_inserted.inc(n)
-    else:
-        data = _load_json_metrics()
-        data['inserted'] = data.get('inserted', 0) + n
-        _add_to_history(data, 'inserted', n)
-        _save_json_metrics(data)
+    if PROMETHEUS_AVAILABLE and prom_counter:
+        prom_counter.inc(n)
+    incr(f"jobs_{metric_type}", n)
+
+
+def incr_inserted(n: int = 1):
+    """Increment inserted jobs counter."""
+    _record_job_count('inserted', n, jobs_inserted)
 
 
 def incr_updated(n: int = 1):
     """Increment updated jobs counter."""
-    if n <= 0:
-        return
-    
-    if PROMETHEUS_AVAILABLE and jobs_updated:
-        jobs_updated.inc(n)
-    else:
-        data = _load_json_metrics()
-        data['updated'] = data.get('updated', 0) + n
-        _add_to_history(data, 'updated', n)
-        _save_json_metrics(data)
+    _record_job_count('updated', n, jobs_updated)
 
 
 def incr_skipped(n: int = 1):
     """Increment skipped jobs counter."""
-    if n <= 0:
-        return
-    
-    if PROMETHEUS_AVAILABLE and jobs_skipped:
-        jobs_skipped.inc(n)
-    else:
-        data = _load_json_metrics()
-        data['skipped'] = data.get('skipped', 0) + n
-        _add_to_history(data, 'skipped', n)
-        _save_json_metrics(data)
+    _record_job_count('skipped', n, jobs_skipped)
 
 
 def incr_failed(n: int = 1):
     """Increment failed jobs counter."""
-    if n <= 0:
-        return
+    _record_job_count('failed', n, jobs_failed)
+
+
+def observe_crawl_stage(source_type: str, stage: str, seconds: float):
+    """Record one crawl stage duration."""
+    if PROMETHEUS_AVAILABLE and crawl_stage_seconds:
+        crawl_stage_seconds.labels(source_type=source_type, stage=stage).observe(seconds)
+    observe('crawl_stage_seconds', seconds, CRAWL_STAGE_BUCKETS, source_type=source_type, stage=stage)
+
+
+def observe_extraction_task(task: str, queue_wait: float, cpu_seconds: float):
+    """Record queue wait and CPU time of one offloaded extraction task."""
+    if PROMETHEUS_AVAILABLE and extraction_queue_wait_seconds and extraction_cpu_seconds:
+        extraction_queue_wait_seconds.labels(task=task).observe(queue_wait)
+        extraction_cpu_seconds.labels(task=task).observe(cpu_seconds)
+    observe('extraction_queue_wait_seconds', queue_wait, QUEUE_WAIT_BUCKETS, task=task)
+    observe('extraction_cpu_seconds', cpu_seconds, CPU_BUCKETS, task=task)
+
+
+def observe_domain_wait(host: str, seconds: float, scope: str = 'shared'):
+    """Record time spent waiting for a per-host rate limit slot (scope: shared or local)."""
+    if PROMETHEUS_AVAILABLE and domain_wait_seconds:
+        domain_wait_seconds.labels(host=host, scope=scope).observe(seconds)
+    observe('domain_wait_seconds', seconds, DOMAIN_WAIT_BUCKETS, host=host, scope=scope)
+
+
+def flush_metrics():
+    """Atomically write this process's snapshot to METRICS_DIR."""
+    try:
+        METRICS_DIR.mkdir(parents=True, exist_ok=True)
+        data = {**_store.snapshot(), 'pid': os.getpid(), 'updated_at': time.time()}
+        fd, tmp_name = tempfile.mkstemp(dir=METRICS_DIR, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_name, METRICS_DIR / _process_file())
+        except Exception:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+    except Exception as e:
+        logger.error(f"Error saving metrics file: {e}")
+
+
+def _remove_process_file():
+    try:
+        (METRICS_DIR / _process_file()).unlink()
+    except OSError:
+        pass
+
+
+def reset_metrics():
+    """Clear this process's metrics and its snapshot file (tests, manual resets)."""
+    _store.reset()
+    _remove_process_file()
+
+
+def _shutdown():
+    """At exit: stop flushing and remove this process's snapshot file."""
+    _store.stop()
+    _remove_process_file()
+
+
+def _histogram_summary(hist: dict) -> dict:
+    """Count, mean and bucket-upper-bound p50/p95/p99"""
+    count = hist['count']
+    summary = {
+        'count': count,
+        'sum': round(hist['sum'], 4),
+        'mean': round(hist['sum'] / count, 4) if count else 0.0,
+        'buckets': dict(zip([str(b) for b in hist['bounds']] + ['+Inf'], hist['counts'])),
+    }
+    for name, q in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99)):
+        target, seen = q * count, 0
+        summary[name] = None
+        for bound, n in zip(list(hist['bounds']) + [None], hist['counts']):
+            seen += n
+            if count and seen >= target:
+                summary[name] = bound
+                break
+    return summary
+
+
+def read_aggregate(window_minutes: Optional[int] = None) -> dict:
+    """
+    Merge every process's metrics.
+    
+    Other processes are read from their last flushed file; this process is
+    read live. Files not modified within the ring window belong to processes
+    that are gone and are deleted without being opened.
     
-    if PROMETHEUS_AVAILABLE and jobs_failed:
-        jobs_failed.inc(n)
-    else:
-        data = _load_json_metrics()
-        data['failed'] = data.get('failed', 0) + n
-        _add_to_history(data, 'failed', n)
-        _save_json_metrics(data)
+    Args:
+        window_minutes: Also total counters over the last N minutes
+    """
+    total = {'counters': {}, 'buckets': {}, 'histograms': {}}
+    processes = 1
+    cutoff = time.time() - METRICS_BUCKET_SECONDS * METRICS_RING_BUCKETS
+    own_file = _process_file()
+    if METRICS_DIR.exists():
+        for path in METRICS_DIR.glob('*.json'):
+            if path.name == own_file:
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    logger.debug(f"Removed stale metrics file {path}")
+                    continue
+                with open(path) as f:
+                    part = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.debug(f"Skipping metrics file {path}: {e}")
+                continue
+            if part.get('updated_at', 0) < cutoff:
+                continue
+            _merge_into(total, part)
+            processes += 1
+    _merge_into(total, _store.snapshot())
+    
+    buckets = {int(ts): b for ts, b in total['buckets'].items() if int(ts) > cutoff}
+    result = {
+        'processes': processes,
+        'bucket_seconds': METRICS_BUCKET_SECONDS,
+        'counters': total['counters'],
+        'histograms': {key: _histogram_summary(h) for key, h in total['histograms'].items()},
+        'series': [
+            {'timestamp': datetime.fromtimestamp(ts, timezone.utc).isoformat().replace('+00:00', 'Z'), 'counters': buckets[ts]}
+            for ts in sorted(buckets)
+        ],
+    }
+    if window_minutes:
+        since = time.time() - window_minutes * 60
+        window: Dict[str, float] = {}
+        for ts, bucket in buckets.items():
+            if ts + METRICS_BUCKET_SECONDS > since:
+                for key, value in bucket.items():
+                    window[key] = window.get(key, 0) + value
+        result['window'] = {'minutes': window_minutes, 'counters': window}
+    return result
 
 
 def get_metrics() -> dict:
-    """Get current metrics (for alerting script)."""
-    if PROMETHEUS_AVAILABLE:
-        # If Prometheus is available, we'd need to query it via HTTP
-        # For now, return a placeholder - alerting script will handle Prometheus queries
-        return {
-            'mode': 'prometheus',
-            'note': 'Query Prometheus endpoint directly for metrics'
-        }
-    else:
-        data = _load_json_metrics()
-        return {
-            'mode': 'json',
-            'inserted': data.get('inserted', 0),
-            'updated': data.get('updated', 0),
-            'skipped': data.get('skipped', 0),
-            'failed': data.get('failed', 0),
-            'history': data.get('history', [])
-        }
+    """Get current job counters and per-bucket history (for alerting script)."""
+    aggregate = read_aggregate()
+    counters = aggregate['counters']
+    
+    # One history entry per ring bucket and counter type
+    history = []
+    for point in aggregate['series']:
+        for metric_type in JOB_COUNTERS:
+            count = point['counters'].get(f"jobs_{metric_type}", 0)
+            if count:
+                history.append({'timestamp': point['timestamp'], 'type': metric_type, 'count': count})
+    
+    return {
+        # Prometheus mode: the alerting script queries Prometheus first
+        'mode': 'prometheus' if PROMETHEUS_AVAILABLE else 'json',
+        **{metric_type: counters.get(f"jobs_{metric_type}", 0) for metric_type in JOB_COUNTERS},
+        'history': history[-HISTORY_LIMIT:],
+    }
+
 
+atexit.register(_shutdown)
@@ -2,6 +2,7 @@
 Autonomous crawler orchestrator with adaptive scheduling
 """
 import os
+import json
 import logging
 import asyncio
 import random
@@ -11,9 +12,7 @@ from datetime import datetime, timedelta
 import psycopg2
 from psycopg2.extras import RealDictCursor
 
-from crawler_v2.simple_crawler import SimpleCrawler
-from crawler_v2.rss_crawler import SimpleRSSCrawler
-from crawler_v2.api_crawler import SimpleAPICrawler
+from app.crawl_rollups import record_crawl_rollup, archive_old_crawl_logs
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +28,7 @@ DEFAULT_FREQ_DAYS = {
 GLOBAL_MAX_CONCURRENCY = 3
 SCHEDULER_INTERVAL_SECONDS = 300  # 5 minutes
 MAX_SOURCES_PER_RUN = 20
+LINK_REVALIDATION_INTERVAL_HOURS = 6
 
 
 class CrawlerOrchestrator:
@@ -36,15 +36,36 @@ class CrawlerOrchestrator:
     
     def __init__(self, db_url: str):
         self.db_url = db_url
-        # Use enterprise-grade SimpleCrawler (has all Phase 1-4 features)
-        import os
-        use_ai = bool(os.getenv('OPENROUTER_API_KEY'))
-        self.html_crawler = SimpleCrawler(db_url, use_ai=use_ai)
-        self.rss_crawler = SimpleRSSCrawler(db_url)
-        self.api_crawler = SimpleAPICrawler(db_url)
+        # Crawlers are built on first use so starting the scheduler doesn't import the crawler stack
+        self._html_crawler = None
+        self._rss_crawler = None
+        self._api_crawler = None
         self.running = False
         self.semaphore = asyncio.Semaphore(GLOBAL_MAX_CONCURRENCY)
     
+    @property
+    def html_crawler(self):
+        """Enterprise-grade SimpleCrawler (has all Phase 1-4 features)"""
+        if self._html_crawler is None:
+            from crawler_v2.simple_crawler import SimpleCrawler
+            use_ai = bool(os.getenv('OPENROUTER_API_KEY'))
+            self._html_crawler = SimpleCrawler(self.db_url, use_ai=use_ai)
+        return self._html_crawler
+    
+    @property
+    def rss_crawler(self):
+        if self._rss_crawler is None:
+            from crawler_v2.rss_crawler import SimpleRSSCrawler
+            self._rss_crawler = SimpleRSSCrawler(self.db_url)
+        return self._rss_crawler
+    
+    @property
+    def api_crawler(self):
+        if self._api_crawler is None:
+            from crawler_v2.api_crawler import SimpleAPICrawler
+            self._api_crawler = SimpleAPICrawler(self.db_url)
+        return self._api_crawler
+    
     def _get_db_conn(self, retries=3, timeout=10):
         """Get database connection with retry logic and IPv4 preference"""
         import socket
@@ -486,8 +507,8 @@ class CrawlerOrchestrator:
                     cur.execute("""
                         INSERT INTO crawl_logs (
                             source_id, ran_at, duration_ms, found, inserted,
-                            updated, skipped, status, message
-                        ) VALUES (%s, NOW(), %s, %s, %s, %s, %s, %s, %s)
+                            updated, skipped, status, message, timings
+                        ) VALUES (%s, NOW(), %s, %s, %s, %s, %s, %s, %s, %s::jsonb)
                     """, (
                         source['id'],
                         duration_ms,
@@ -496,8 +517,19 @@ class CrawlerOrchestrator:
                         counts.get('updated', 0),
                         counts.get('skipped', 0),
                         result.get('status', 'unknown'),
-                        result.get('message', 'Crawl completed')
+                        result.get('message', 'Crawl completed'),
+                        json.dumps(result['timings']) if result.get('timings') else None
                     ))
+                    record_crawl_rollup(
+                        cur,
+                        source['id'],
+                        result.get('status', 'unknown'),
+                        duration_ms,
+                        found=counts.get('found', 0),
+                        inserted=counts.get('inserted', 0),
+                        updated=counts.get('updated', 0),
+                        skipped=counts.get('skipped', 0),
+                    )
                     logger.info(f"[orchestrator] Logged crawl to crawl_logs for {source.get('org_name')}")
                 except Exception as log_error:
                     logger.error(f"[orchestrator] Failed to insert crawl log: {log_error}", exc_info=True)
@@ -569,6 +601,8 @@ class CrawlerOrchestrator:
                 
                 if deleted_count > 0:
                     logger.info(f"[orchestrator] Cleaned up {deleted_count} expired job(s)")
+                    from app.http_cache import invalidate_all
+                    invalidate_all()
                 
                 return {
                     'deleted': deleted_count,
@@ -584,6 +618,53 @@ class CrawlerOrchestrator:
         finally:
             conn.close()
     
+    async def archive_crawl_logs(self) -> int:
+        """Move raw crawl logs past the retention window out of the hot table"""
+        conn = self._get_db_conn()
+        try:
+            return archive_old_crawl_logs(conn)
+        except Exception as e:
+            logger.error(f"[orchestrator] Error archiving crawl logs: {e}")
+            conn.rollback()
+            return 0
+        finally:
+            conn.close()
+    
+    async def cleanup_raw_html(self) -> Dict:
+        """Expire raw_pages rows, stored HTML, snapshots and cached PDF text past their retention windows"""
+        from core.blob_store import BLOB_RETENTION_DAYS
+        from core.html_storage import get_html_storage
+        from pipeline.pdf_extractor import get_pdf_text_cache
+        from pipeline.snapshot import SnapshotManager
+        
+        deleted_rows = 0
+        conn = self._get_db_conn()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    DELETE FROM raw_pages
+                    WHERE fetched_at < NOW() - make_interval(days => %s)
+                """, (BLOB_RETENTION_DAYS,))
+                deleted_rows = cur.rowcount
+                conn.commit()
+        except Exception as e:
+            logger.error(f"[orchestrator] Error expiring raw_pages: {e}")
+            conn.rollback()
+        finally:
+            conn.close()
+        
+        result = await asyncio.to_thread(get_html_storage().gc, BLOB_RETENTION_DAYS)
+        result['snapshots_removed'] = await asyncio.to_thread(SnapshotManager().prune, BLOB_RETENTION_DAYS)
+        result['pdf_text_cache'] = await asyncio.to_thread(get_pdf_text_cache().gc)
+        result['raw_pages_deleted'] = deleted_rows
+        logger.info(f"[orchestrator] Raw HTML retention: {result}")
+        return result
+    
+    async def revalidate_links(self) -> Dict:
+        """Revalidate stale apply links and flag jobs whose links are dead"""
+        from core.link_validator import get_link_validator
+        return await get_link_validator(self.db_url).revalidate_stale()
+    
     async def run_due_sources_once(self) -> Dict:
         """Run all due sources once (for manual trigger)"""
         sources = await self.get_due_sources()
@@ -608,6 +689,7 @@ class CrawlerOrchestrator:
         max_consecutive_errors = 5
         last_cleanup_time = None
         cleanup_interval_hours = 24  # Run cleanup once per day
+        last_revalidation_time = None
         
         while self.running:
             try:
@@ -625,10 +707,21 @@ class CrawlerOrchestrator:
                     try:
                         cleanup_result = await self.cleanup_expired_jobs()
                         logger.info(f"[orchestrator] Cleanup result: {cleanup_result['message']}")
+                        await self.archive_crawl_logs()
+                        await self.cleanup_raw_html()
                         last_cleanup_time = now
                     except Exception as cleanup_error:
                         logger.error(f"[orchestrator] Cleanup error: {cleanup_error}")
                 
+                # Revalidate stale apply links in bulk
+                if (last_revalidation_time is None or
+                        (now - last_revalidation_time).total_seconds() / 3600 >= LINK_REVALIDATION_INTERVAL_HOURS):
+                    try:
+                        await self.revalidate_links()
+                        last_revalidation_time = now
+                    except Exception as revalidation_error:
+                        logger.error(f"[orchestrator] Link revalidation error: {revalidation_error}")
+                
                 await self.run_due_sources_once()
                 consecutive_errors = 0  # Reset error counter on success
             except psycopg2.OperationalError as e:
@@ -2,31 +2,146 @@
 Job page classifier.
 
 Uses rule-based heuristics and optional ML model to classify pages as job listings.
+
+The ML model is a linear classifier over hashed page features (see
+page_features.py), stored as weights + bias in an .npz file by
+scripts/build_classifier.py. It is loaded once per process
+(get_classifier_model) and scored with a sparse dot product, so
+classify_batch scores many pages in one vectorized call.
 """
 
+import os
 import logging
-import re
-from typing import Tuple, Optional
+import threading
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
 from bs4 import BeautifulSoup
 
+from .page_features import (
+    N_FEATURES, NUMPY_AVAILABLE, PageFeatures, extract_page_features, vectorize,
+)
+
 logger = logging.getLogger(__name__)
 
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+DEFAULT_MODEL_PATH = Path(__file__).parent / 'classifier_model.npz'
+CLASSIFIER_MODEL_PATH = os.getenv('CLASSIFIER_MODEL_PATH', str(DEFAULT_MODEL_PATH))
+
+# Weight of the model score when combined with the rule-based score
+ML_WEIGHT = 0.7
+
+JOB_KEYWORDS = [
+    'job', 'position', 'vacancy', 'career', 'opportunity',
+    'recruitment', 'hiring', 'opening', 'posting', 'role'
+]
+JOB_URL_PATTERNS = ['/job', '/career', '/position', '/vacancy', '/opportunity']
+NEGATIVE_KEYWORDS = ['login', 'sign in', 'register', 'homepage', 'about us']
+
+Page = Tuple[str, Optional[BeautifulSoup], str]  # (html, soup, url)
+
+
+class ClassifierModel:
+    """Linear model over hashed page features"""
+    
+    def __init__(self, weights, bias: float, version: str = 'v2', n_features: int = N_FEATURES):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("numpy and scipy are required for the ML classifier")
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.bias = float(bias)
+        self.version = version
+        self.n_features = n_features
+        if self.weights.shape != (n_features,):
+            raise ValueError(f"Expected {n_features} weights, got {self.weights.shape}")
+    
+    def predict_proba(self, X) -> 'np.ndarray':
+        """Job probability for each row of a feature matrix"""
+        scores = X @ self.weights + self.bias
+        return 1.0 / (1.0 + np.exp(-scores))
+    
+    def score_pages(self, pages: Sequence[PageFeatures]) -> List[float]:
+        if not pages:
+            return []
+        return self.predict_proba(vectorize(pages, self.n_features)).tolist()
+    
+    def save(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            np.savez_compressed(
+                f, weights=self.weights, bias=np.float32(self.bias),
+                version=np.str_(self.version), n_features=np.int64(self.n_features)
+            )
+    
+    @classmethod
+    def load(cls, path: str) -> 'ClassifierModel':
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data['weights'], float(data['bias']),
+                version=str(data['version']), n_features=int(data['n_features'])
+            )
+
+
+def train_classifier_model(pages: Sequence[PageFeatures], labels: Sequence[int],
+                           version: str = 'v2', C: float = 10.0) -> ClassifierModel:
+    """
+    Fit a logistic regression on hashed features (training scripts only).
+    
+    Rows are L2-normalized, so weights need light regularization (C=10) for
+    probabilities that move away from 0.5 on small labeled sets.
+    """
+    from sklearn.linear_model import LogisticRegression
+    
+    classifier = LogisticRegression(C=C, max_iter=1000, class_weight='balanced', random_state=42)
+    classifier.fit(vectorize(pages), list(labels))
+    return ClassifierModel(classifier.coef_[0], classifier.intercept_[0], version=version)
+
+
+def load_classifier_model(model_path: Optional[str] = None) -> ClassifierModel:
+    """Load trained classifier model."""
+    path = model_path or CLASSIFIER_MODEL_PATH
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("numpy and scipy are required for the ML classifier")
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Classifier model not found: {path}")
+    model = ClassifierModel.load(path)
+    logger.info(f"[classifier] Loaded model {model.version} from {path}")
+    return model
+
+
+# Global instance (loaded once per process)
+_model: Optional[ClassifierModel] = None
+_model_loaded = False
+_model_lock = threading.Lock()
+
+
+def get_classifier_model() -> Optional[ClassifierModel]:
+    """Shared model, or None if no trained model is available"""
+    global _model, _model_loaded
+    if not _model_loaded:
+        with _model_lock:
+            if not _model_loaded:
+                try:
+                    _model = load_classifier_model()
+                except FileNotFoundError:
+                    logger.debug("[classifier] No trained model, using rule-based scores only")
+                except Exception as e:
+                    logger.warning(f"ML model not available: {e}")
+                _model_loaded = True
+    return _model
+
 
 class JobPageClassifier:
     """Classifies pages as job listings or not."""
     
-    def __init__(self, use_ml: bool = False):
-        self.use_ml = use_ml
-        self.ml_model = None
-        
-        if use_ml:
-            # TODO: Load ML model if available
-            try:
-                # self.ml_model = load_classifier_model()
-                pass
-            except Exception as e:
-                logger.warning(f"ML model not available: {e}")
-                self.use_ml = False
+    def __init__(self, use_ml: Optional[bool] = None, model: Optional[ClassifierModel] = None):
+        """use_ml=None uses the trained model when one is installed"""
+        self.ml_model = model
+        if self.ml_model is None and use_ml is not False:
+            self.ml_model = get_classifier_model()
+            if use_ml and self.ml_model is None:
+                logger.warning("ML model not available, using rule-based scores only")
+        self.use_ml = self.ml_model is not None
     
     def classify(self, html: str, soup: BeautifulSoup, url: str) -> Tuple[bool, float]:
         """
@@ -35,74 +150,61 @@ class JobPageClassifier:
         Returns:
             (is_job: bool, confidence: float)
         """
-        # Rule-based classification
-        rule_score = self._rule_based_classify(html, soup, url)
+        return self.classify_batch([(html, soup, url)])[0]
+    
+    def classify_batch(self, pages: Sequence[Page]) -> List[Tuple[bool, float]]:
+        """
+        Classify many pages; model scores come from one matrix product.
         
-        # ML classification if available
-        if self.use_ml and self.ml_model:
-            ml_score = self._ml_classify(html, soup)
-            # Combine scores (weighted average)
-            final_score = 0.7 * rule_score + 0.3 * ml_score
+        Args:
+            pages: (html, soup, url) tuples; soup may be None
+        
+        Returns:
+            (is_job, confidence) per page, in order
+        """
+        features = [extract_page_features(html, soup, url) for html, soup, url in pages]
+        rule_scores = [self._rule_score(page) for page in features]
+        
+        if self.use_ml:
+            ml_scores = self.ml_model.score_pages(features)
+            final_scores = [ML_WEIGHT * ml + (1 - ML_WEIGHT) * rule for ml, rule in zip(ml_scores, rule_scores)]
         else:
-            final_score = rule_score
+            final_scores = rule_scores
         
-        is_job = final_score >= 0.5
-        return is_job, final_score
+        return [(score >= 0.5, score) for score in final_scores]
     
     def _rule_based_classify(self, html: str, soup: BeautifulSoup, url: str) -> float:
         """Rule-based classification scoring."""
+        return self._rule_score(extract_page_features(html, soup, url))
+    
+    def _rule_score(self, page: PageFeatures) -> float:
         score = 0.0
-        text = soup.get_text().lower() if soup else html.lower()
+        text = page.text
         
         # Positive indicators
-        job_keywords = [
-            'job', 'position', 'vacancy', 'career', 'opportunity',
-            'recruitment', 'hiring', 'opening', 'posting', 'role'
-        ]
-        keyword_count = sum(1 for kw in job_keywords if kw in text)
+        keyword_count = sum(1 for kw in JOB_KEYWORDS if kw in text)
         score += min(keyword_count * 0.1, 0.4)  # Max 0.4 from keywords
         
         # URL patterns
-        url_lower = url.lower()
-        if any(kw in url_lower for kw in ['/job', '/career', '/position', '/vacancy', '/opportunity']):
+        url_lower = page.url.lower()
+        if any(kw in url_lower for kw in JOB_URL_PATTERNS):
             score += 0.3
         
-        # HTML structure indicators
-        if soup:
-            # Check for common job listing selectors
-            job_selectors = [
-                '.job-listing', '.job-item', '.position', '.vacancy',
-                '[class*="job"]', '[id*="job"]', '[class*="position"]'
-            ]
-            for selector in job_selectors:
-                if soup.select(selector):
-                    score += 0.1
-                    break
-            
-            # Check for application buttons/links
-            apply_indicators = soup.find_all(['a', 'button'], 
-                                          string=re.compile(r'apply|submit|candidate', re.I))
-            if apply_indicators:
-                score += 0.2
+        # HTML structure indicators: job listing selectors, application buttons/links
+        if page.has_job_selector:
+            score += 0.1
+        if page.has_apply_link:
+            score += 0.2
         
         # Negative indicators (reduce score)
-        negative_keywords = ['login', 'sign in', 'register', 'homepage', 'about us']
-        if any(kw in text[:500] for kw in negative_keywords):
+        if any(kw in text[:500] for kw in NEGATIVE_KEYWORDS):
             score -= 0.2
         
         # Normalize to 0-1
         return max(0.0, min(1.0, score))
     
-    def _ml_classify(self, html: str, soup: BeautifulSoup) -> float:
-        """ML-based classification (placeholder)."""
-        # TODO: Implement ML classification
-        # For now, return neutral score
-        return 0.5
-
-
-def load_classifier_model(model_path: Optional[str] = None):
-    """Load trained classifier model."""
-    # TODO: Implement model loading
-    # This would load a trained TF-IDF + classifier model
-    raise NotImplementedError("ML model loading not yet implemented")
-
+    def _ml_classify(self, html: str, soup: BeautifulSoup, url: str = '') -> float:
+        """ML-based classification."""
+        if not self.ml_model:
+            return 0.5
+        return self.ml_model.score_pages([extract_page_features(html, soup, url)])[0]
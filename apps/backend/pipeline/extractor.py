@@ -20,12 +20,6 @@ from urllib.parse import urlparse
 
 from bs4 import BeautifulSoup
 
-from .classifier import JobPageClassifier
-from .jsonld import JSONLDExtractor
-from .heuristics import HeuristicExtractor
-from .ai_fallback import AIFallbackExtractor
-from .snapshot import SnapshotManager
-
 logger = logging.getLogger(__name__)
 
 # Confidence scores by extraction method
@@ -185,6 +179,14 @@ class ExtractionResult:
         return sum(confidences) / len(confidences)
 
 
+# Stage modules import the result types above from this module
+from .classifier import JobPageClassifier
+from .jsonld import JSONLDExtractor
+from .heuristics import HeuristicExtractor
+from .ai_fallback import AIFallbackExtractor
+from .snapshot import SnapshotManager
+
+
 class Extractor:
     """Main extraction orchestrator."""
     
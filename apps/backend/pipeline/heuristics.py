@@ -7,9 +7,10 @@ Uses label-based heuristics and pattern matching to extract job fields.
 import re
 import logging
 from typing import Dict, Optional
-from datetime import datetime
 from bs4 import BeautifulSoup
 
+from core.date_parsing import parse_date_str
+
 from .extractor import FieldResult, CONFIDENCE_SCORES
 
 logger = logging.getLogger(__name__)
@@ -45,6 +46,44 @@ class HeuristicExtractor:
         
         return fields
     
+    def extract_text(self, text: str) -> Dict[str, FieldResult]:
+        """Extract fields from plain text (PDFs, feeds) using the regex heuristics."""
+        fields = {}
+        if not text:
+            return fields
+        
+        title = self._extract_title_from_text(text)
+        if title:
+            fields['title'] = title
+        
+        location = self._extract_location(None, text)
+        if location:
+            # The pattern's \s runs on into the following lines of plain text
+            location.value = location.value.splitlines()[0].strip()
+            fields['location'] = location
+
+        deadline = self._extract_deadline(None, text)
+        if deadline:
+            fields['deadline'] = deadline
+        
+        return fields
+    
+    def _extract_title_from_text(self, text: str) -> Optional[FieldResult]:
+        """First substantial line, unless it is a label such as 'Location: ...'."""
+        for line in text.splitlines()[:20]:
+            line = ' '.join(line.split())
+            if len(line) < 5:
+                continue
+            if len(line) > 150 or re.match(r'^[\w\s]{1,30}:', line):
+                return None
+            return FieldResult(
+                value=line,
+                source='heuristic',
+                confidence=CONFIDENCE_SCORES['regex'],
+                raw_snippet=line
+            )
+        return None
+    
     def _extract_location(self, soup: BeautifulSoup, text: str) -> Optional[FieldResult]:
         """Extract location using label heuristics."""
         # Look for labeled location fields
@@ -200,34 +239,15 @@ class HeuristicExtractor:
         return None
     
     def _parse_date(self, date_text: str, use_dateutil: bool = False) -> Optional[str]:
-        """Parse date string to YYYY-MM-DD format."""
+        """
+        Parse date string to YYYY-MM-DD format.
+        
+        Without use_dateutil only the compiled common formats are tried
+        (ambiguous numeric dates read month-first); with it, free-form text
+        falls back to dateparser.
+        """
         if not date_text:
             return None
         
-        try:
-            if use_dateutil:
-                from dateutil import parser as date_parser
-                dt = date_parser.parse(date_text, fuzzy=True)
-                return dt.strftime('%Y-%m-%d')
-            else:
-                # Basic parsing
-                # Try common formats
-                formats = [
-                    '%Y-%m-%d',
-                    '%m/%d/%Y',
-                    '%d/%m/%Y',
-                    '%d-%m-%Y',
-                    '%B %d, %Y',
-                    '%b %d, %Y',
-                ]
-                for fmt in formats:
-                    try:
-                        dt = datetime.strptime(date_text.strip(), fmt)
-                        return dt.strftime('%Y-%m-%d')
-                    except ValueError:
-                        continue
-        except Exception as e:
-            logger.debug(f"Failed to parse date '{date_text}': {e}")
-        
-        return None
+        return parse_date_str(date_text, day_first=False, fallback=use_dateutil)
 
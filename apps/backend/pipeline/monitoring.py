@@ -2,14 +2,21 @@
 Monitoring hooks for Prometheus/StatsD.
 
 Tracks extraction metrics for observability.
+
+Counters and histograms go to the shared in-memory metrics backend
+(metrics.incr / metrics.observe), so they are flushed and merged across
+processes with the job and crawl stage metrics.
 """
 
 import logging
 from typing import Dict, Optional
-from collections import defaultdict
+
+from metrics import incr, observe, read_aggregate
 
 logger = logging.getLogger(__name__)
 
+CONFIDENCE_BUCKETS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
 
 class MetricsCollector:
     """Collects extraction metrics."""
@@ -18,11 +25,6 @@ class MetricsCollector:
         self.enable_prometheus = enable_prometheus
         self.enable_statsd = enable_statsd
         
-        # In-memory counters (should use proper metrics backend in production)
-        self.counters = defaultdict(int)
-        self.gauges = defaultdict(float)
-        self.histograms = defaultdict(list)
-        
         # Initialize Prometheus if enabled
         if enable_prometheus:
             try:
@@ -60,8 +62,9 @@ class MetricsCollector:
         status = 'success' if success else 'failure'
         
         # In-memory counter
-        key = f"{field_name}:{source}:{status}"
-        self.counters[key] += 1
+        incr('extraction_fields', field=field_name, source=source, status=status)
+        if success:
+            observe('extraction_confidence', confidence, CONFIDENCE_BUCKETS, field=field_name)
         
         # Prometheus
         if self.enable_prometheus:
@@ -89,7 +92,7 @@ class MetricsCollector:
     
     def record_low_confidence(self, field_name: str, confidence: float):
         """Record low confidence extraction."""
-        self.counters['low_confidence'] += 1
+        incr('extraction_low_confidence', field=field_name)
         
         if self.enable_prometheus:
             try:
@@ -106,7 +109,7 @@ class MetricsCollector:
     def record_ai_call(self, success: bool = True):
         """Record AI extraction call."""
         status = 'success' if success else 'failure'
-        self.counters[f'ai_call:{status}'] += 1
+        incr('extraction_ai_calls', status=status)
         
         if self.enable_statsd:
             try:
@@ -116,7 +119,7 @@ class MetricsCollector:
     
     def record_playwright_failure(self, url: str):
         """Record Playwright/browser failure."""
-        self.counters['playwright_failure'] += 1
+        incr('extraction_playwright_failures')
         
         if self.enable_statsd:
             try:
@@ -125,11 +128,11 @@ class MetricsCollector:
                 pass
     
     def get_stats(self) -> Dict:
-        """Get current statistics."""
+        """Get current statistics (all processes)."""
+        aggregate = read_aggregate()
         return {
-            'counters': dict(self.counters),
-            'gauges': dict(self.gauges),
-            'histogram_counts': {k: len(v) for k, v in self.histograms.items()}
+            'counters': {k: v for k, v in aggregate['counters'].items() if k.startswith('extraction_')},
+            'histograms': {k: v for k, v in aggregate['histograms'].items() if k.startswith('extraction_confidence')}
         }
 
 
@@ -0,0 +1,154 @@
+"""
+Page features for the job page classifier.
+
+A single walk over the parsed tree collects everything the classifier
+needs: the signals used by the rule-based score (page text, job-like
+class/id attributes, apply links) and sparse token counts for the linear
+model (URL tokens, tag/class/id statistics, text unigrams and bigrams).
+
+Tokens are hashed into N_FEATURES buckets with crc32, which is stable
+across processes (unlike hash()), so a model trained offline scores the
+same features at crawl time. vectorize() turns many pages into one CSR
+matrix for batch scoring and training.
+"""
+
+import re
+import math
+import zlib
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Tuple
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.element import CData
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+    from scipy import sparse
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    sparse = None
+    NUMPY_AVAILABLE = False
+
+N_FEATURES = 2 ** 18
+# Text beyond this many words adds little signal and costs linear time
+MAX_WORDS = 3000
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+_WORD_RE = re.compile(r'[a-z]{2,}')
+_APPLY_RE = re.compile(r'apply|submit|candidate', re.I)
+_NON_TEXT_TAGS = frozenset(['script', 'style', 'noscript', 'template'])
+
+
+@dataclass
+class PageFeatures:
+    """What one tree walk learns about a page"""
+    url: str
+    text: str = ''  # All page strings (as soup.get_text()), lowercased
+    has_job_selector: bool = False
+    has_apply_link: bool = False
+    tokens: Counter = field(default_factory=Counter)
+
+
+def extract_page_features(html: str, soup: Optional[BeautifulSoup], url: str,
+                          max_words: int = MAX_WORDS) -> PageFeatures:
+    """Walk the tree once, collecting rule signals and model tokens"""
+    features = PageFeatures(url=url or '')
+    tokens = features.tokens
+    
+    for token in _TOKEN_RE.findall((url or '').lower()):
+        tokens['u:' + token] += 1
+    
+    if soup is None:
+        features.text = (html or '').lower()
+        visible = [features.text]
+    else:
+        strings: List[str] = []
+        visible = []
+        links = forms = 0
+        for node in soup.descendants:
+            if isinstance(node, Tag):
+                name = node.name
+                tokens['t:' + name] += 1
+                if name == 'a':
+                    links += 1
+                elif name == 'form':
+                    forms += 1
+                
+                classes = node.get('class')
+                if classes:
+                    if isinstance(classes, str):
+                        classes = classes.split()
+                    joined = ' '.join(classes)
+                    # Same as the (case-sensitive) selectors .vacancy, [class*="job"], [class*="position"]
+                    if 'job' in joined or 'position' in joined or 'vacancy' in classes:
+                        features.has_job_selector = True
+                    for token in _TOKEN_RE.findall(joined.lower()):
+                        tokens['c:' + token] += 1
+                node_id = node.get('id')
+                if node_id and isinstance(node_id, str):
+                    if 'job' in node_id:
+                        features.has_job_selector = True
+                    for token in _TOKEN_RE.findall(node_id.lower()):
+                        tokens['i:' + token] += 1
+                
+                # Same as find_all(['a', 'button'], string=<apply regex>)
+                if name in ('a', 'button') and not features.has_apply_link:
+                    string = node.string
+                    if string is not None and _APPLY_RE.search(string):
+                        features.has_apply_link = True
+            elif type(node) in (NavigableString, CData):
+                strings.append(node)
+                parent = node.parent
+                if parent is None or parent.name not in _NON_TEXT_TAGS:
+                    visible.append(node)
+        
+        features.text = ''.join(strings).lower()
+        tokens['s:links'] = math.log1p(links)
+        tokens['s:forms'] = math.log1p(forms)
+    
+    words = _WORD_RE.findall(' '.join(visible).lower())[:max_words]
+    for word in words:
+        tokens['w:' + word] += 1
+    for first, second in zip(words, words[1:]):
+        tokens['b:' + first + '_' + second] += 1
+    tokens['s:words'] = math.log1p(len(words))
+    tokens['s:job_selector'] = float(features.has_job_selector)
+    tokens['s:apply_link'] = float(features.has_apply_link)
+    return features
+
+
+def hash_tokens(tokens: Counter, n_features: int = N_FEATURES) -> Tuple[List[int], List[float]]:
+    """Bucket indices and L2-normalized log counts for one page"""
+    buckets: Counter = Counter()
+    mask = n_features - 1
+    for token, count in tokens.items():
+        if count:
+            value = count if token.startswith('s:') else math.log1p(count)
+            buckets[zlib.crc32(token.encode('utf-8')) & mask] += value
+    norm = math.sqrt(sum(v * v for v in buckets.values())) or 1.0
+    return list(buckets.keys()), [v / norm for v in buckets.values()]
+
+
+def vectorize(pages: Iterable[PageFeatures], n_features: int = N_FEATURES):
+    """One CSR matrix (pages x n_features) for batch scoring or training"""
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("numpy and scipy are required to vectorize page features")
+    if n_features & (n_features - 1):
+        raise ValueError("n_features must be a power of two")
+    indices: List[int] = []
+    values: List[float] = []
+    indptr = [0]
+    for page in pages:
+        idx, vals = hash_tokens(page.tokens, n_features)
+        indices.extend(idx)
+        values.extend(vals)
+        indptr.append(len(indices))
+    return sparse.csr_matrix(
+        (np.asarray(values, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(indptr) - 1, n_features),
+    )
@@ -2,41 +2,182 @@
 PDF extractor.
 
 Extracts text from PDF files using pdftotext, pdfminer, and OCR as fallback.
+
+- pdftotext, pdfinfo, pdftoppm and tesseract run as async subprocesses, so
+  a slow document never blocks the event loop.
+- pdfminer is pure Python and CPU-bound; it runs in the shared extraction
+  process pool (core/extraction_executor), or a thread when the pool is
+  disabled or saturated.
+- Scanned documents are OCR'd page by page in parallel (PDF_OCR_CONCURRENCY
+  pages at once), up to PDF_OCR_PAGE_BUDGET pages per document.
+- Extracted text is cached by the sha256 of the PDF bytes, so an unchanged
+  ToR or vacancy notice is never extracted (or OCR'd) twice. Entries not
+  read or written for PDF_TEXT_CACHE_RETENTION_DAYS are removed by gc(),
+  which runs with the raw HTML retention job.
+
+The full text becomes the description and is run through the heuristic
+field extractors (title, location, deadline).
 """
 
 import os
+import gzip
+import time
+import shutil
+import asyncio
+import hashlib
 import logging
-import subprocess
-from typing import Optional, Dict
+import tempfile
+import threading
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from core.extraction_executor import EXECUTOR_ERRORS, get_extraction_executor
 
 from .extractor import FieldResult, ExtractionResult, CONFIDENCE_SCORES
+from .heuristics import HeuristicExtractor
 
 logger = logging.getLogger(__name__)
 
+PDF_OCR_PAGE_BUDGET = int(os.getenv("PDF_OCR_PAGE_BUDGET", "10"))
+PDF_OCR_CONCURRENCY = int(os.getenv("PDF_OCR_CONCURRENCY", str(min(4, os.cpu_count() or 1))))
+PDF_OCR_DPI = int(os.getenv("PDF_OCR_DPI", "200"))
+PDF_TEXT_CACHE_PATH = os.getenv("PDF_TEXT_CACHE_PATH", "pdf-text-cache")
+PDF_TEXT_CACHE_RETENTION_DAYS = int(os.getenv("PDF_TEXT_CACHE_RETENTION_DAYS", "90"))
 
-class PDFExtractor:
-    """Extracts text from PDF files."""
+# Fewer non-whitespace characters than this means a scanned (image-only) PDF
+MIN_TEXT_CHARS = 20
+
+
+def _pdfminer_text(pdf_path: str) -> Optional[str]:
+    """Runs in a worker process"""
+    from pdfminer.high_level import extract_text
+    text = extract_text(pdf_path)
+    return text if text and text.strip() else None
+
+
+def _has_text(text: Optional[str]) -> bool:
+    return bool(text) and len(''.join(text.split())) >= MIN_TEXT_CHARS
+
+
+class PDFTextCache:
+    """Extracted text keyed by the sha256 of the PDF bytes (gzip files on disk)"""
+    
+    def __init__(self, base_path: str):
+        self.base_path = Path(base_path)
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "writes": 0, "gc_removed": 0}
     
-    def __init__(self):
-        self.has_pdftotext = self._check_pdftotext()
-        self.has_tesseract = self._check_tesseract()
+    def _path(self, key: str) -> Path:
+        return self.base_path / key[:2] / f"{key}.txt.gz"
     
-    def _check_pdftotext(self) -> bool:
-        """Check if pdftotext is available."""
+    def get(self, key: str) -> Optional[Tuple[str, str]]:
+        """(text, method) for a previously extracted PDF, or None"""
+        path = self._path(key)
         try:
-            subprocess.run(['pdftotext', '-v'], capture_output=True, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+            with open(path, "rb") as f:
+                method, _, text = gzip.decompress(f.read()).decode("utf-8").partition("\n")
+        except FileNotFoundError:
+            self._count(misses=1)
+            return None
+        try:
+            os.utime(path, None)  # Keep recently seen documents past gc()
+        except OSError:
+            pass
+        self._count(hits=1)
+        return text, method
     
-    def _check_tesseract(self) -> bool:
-        """Check if Tesseract OCR is available."""
+    def put(self, key: str, text: str, method: str):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so readers never observe a partial file
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
         try:
-            subprocess.run(['tesseract', '--version'], capture_output=True, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+            with os.fdopen(fd, "wb") as f:
+                f.write(gzip.compress(f"{method}\n{text}".encode("utf-8"), mtime=0))
+            os.replace(tmp_name, path)
+        except Exception:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+        self._count(writes=1)
+    
+    def gc(self, retention_days: int = PDF_TEXT_CACHE_RETENTION_DAYS) -> Dict[str, int]:
+        """Remove entries (and abandoned temp files) not read or written within the window"""
+        cutoff = time.time() - retention_days * 86400
+        removed = 0
+        freed = 0
+        kept = 0
+        if not self.base_path.exists():
+            return {"removed": 0, "freed_bytes": 0, "kept": 0}
+        for path in self.base_path.glob("*/*"):
+            try:
+                st = path.stat()
+                if st.st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+                    freed += st.st_size
+                else:
+                    kept += 1
+            except OSError:
+                continue
+        self._count(gc_removed=removed)
+        if removed:
+            logger.info(f"[pdf_extractor] Text cache GC removed {removed} file(s), freed {freed} bytes")
+        return {"removed": removed, "freed_bytes": freed, "kept": kept}
+    
+    def _count(self, **deltas: int):
+        with self._lock:
+            for name, delta in deltas.items():
+                self._counters[name] += delta
+    
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            c = dict(self._counters)
+        lookups = c["hits"] + c["misses"]
+        return {**c, "hit_ratio": round(c["hits"] / lookups, 4) if lookups else 0.0}
+
+
+# Global instance (lazy initialization)
+_pdf_text_cache: Optional[PDFTextCache] = None
+
+
+def get_pdf_text_cache() -> PDFTextCache:
+    global _pdf_text_cache
+    if _pdf_text_cache is None:
+        _pdf_text_cache = PDFTextCache(PDF_TEXT_CACHE_PATH)
+    return _pdf_text_cache
+
+
+async def _run(args: List[str], timeout: float) -> Tuple[int, bytes]:
+    """Run a command without blocking the loop; (returncode, stdout)"""
+    process = await asyncio.create_subprocess_exec(
+        *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise
+    return process.returncode, stdout
+
+
+class PDFExtractor:
+    """Extracts text from PDF files."""
+    
+    def __init__(self, cache: Optional[PDFTextCache] = None,
+                 ocr_page_budget: int = PDF_OCR_PAGE_BUDGET,
+                 ocr_concurrency: int = PDF_OCR_CONCURRENCY):
+        self.has_pdftotext = shutil.which('pdftotext') is not None
+        self.has_pdfinfo = shutil.which('pdfinfo') is not None
+        self.has_pdftoppm = shutil.which('pdftoppm') is not None
+        self.has_tesseract = shutil.which('tesseract') is not None
+        self.cache = cache if cache is not None else get_pdf_text_cache()
+        self.ocr_page_budget = ocr_page_budget
+        self.ocr_concurrency = max(1, ocr_concurrency)
+        self.heuristics = HeuristicExtractor()
     
     async def extract_from_pdf(self, pdf_path: str, url: str) -> ExtractionResult:
         """
@@ -51,93 +192,134 @@ class PDFExtractor:
         """
         result = ExtractionResult(url, pipeline_version="1.0.0")
         
-        # Try extraction methods in order
-        text = None
-        
-        # Method 1: pdftotext (fastest, most reliable)
-        if self.has_pdftotext:
-            text = self._extract_with_pdftotext(pdf_path)
-        
-        # Method 2: pdfminer.six (Python library)
-        if not text:
-            text = self._extract_with_pdfminer(pdf_path)
-        
-        # Method 3: OCR with Tesseract (last resort)
-        if not text and self.has_tesseract:
-            text = self._extract_with_ocr(pdf_path)
+        text, method = await self.extract_text(pdf_path)
         
         if text:
-            # Extract fields from text using heuristics
-            # This is a simplified version - in production, you'd use the full pipeline
             result.set_field('description', FieldResult(
-                value=text[:5000],  # Limit description size
+                value=text,
                 source='pdf',
                 confidence=CONFIDENCE_SCORES.get('heuristic', 0.6),
                 raw_snippet=text[:500]
             ))
+            for name, field in self.heuristics.extract_text(text).items():
+                result.set_field(name, field)
         
         result.is_job = True  # Assume PDFs are job postings
         result.classifier_score = 0.7
         
         return result
     
-    def _extract_with_pdftotext(self, pdf_path: str) -> Optional[str]:
+    async def extract_text(self, pdf_path: str) -> Tuple[Optional[str], Optional[str]]:
+        """(text, method) via the cache, pdftotext, pdfminer, then OCR"""
+        data = await asyncio.to_thread(Path(pdf_path).read_bytes)
+        key = hashlib.sha256(data).hexdigest()
+        
+        cached = await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            return cached
+        
+        text, method = None, None
+        
+        # Method 1: pdftotext (fastest, most reliable)
+        if self.has_pdftotext:
+            text, method = await self._extract_with_pdftotext(pdf_path), 'pdftotext'
+        
+        # Method 2: pdfminer.six (Python library)
+        if not _has_text(text):
+            text, method = await self._extract_with_pdfminer(pdf_path), 'pdfminer'
+        
+        # Method 3: OCR with Tesseract (last resort)
+        if not _has_text(text) and self.has_tesseract and self.has_pdftoppm:
+            text, method = await self._extract_with_ocr(pdf_path), 'ocr'
+        
+        if not _has_text(text):
+            return None, None
+        
+        # Cache only successes; a missing tool may be installed later
+        try:
+            await asyncio.to_thread(self.cache.put, key, text, method)
+        except OSError as e:
+            logger.warning(f"[pdf_extractor] Failed to cache text for {pdf_path}: {e}")
+        return text, method
+    
+    async def _extract_with_pdftotext(self, pdf_path: str) -> Optional[str]:
         """Extract text using pdftotext."""
         try:
-            result = subprocess.run(
-                ['pdftotext', pdf_path, '-'],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            if result.returncode == 0:
-                return result.stdout
+            returncode, stdout = await _run(['pdftotext', pdf_path, '-'], timeout=30)
+            if returncode == 0:
+                return stdout.decode('utf-8', errors='replace')
         except Exception as e:
             logger.debug(f"pdftotext failed: {e}")
         return None
     
-    def _extract_with_pdfminer(self, pdf_path: str) -> Optional[str]:
+    async def _extract_with_pdfminer(self, pdf_path: str) -> Optional[str]:
         """Extract text using pdfminer.six."""
+        executor = get_extraction_executor()
         try:
-            from pdfminer.high_level import extract_text
-            text = extract_text(pdf_path)
-            return text if text.strip() else None
+            if executor is not None:
+                try:
+                    return await executor.run('pdfminer', _pdfminer_text, pdf_path)
+                except EXECUTOR_ERRORS as e:
+                    logger.debug(f"pdfminer worker unavailable, extracting in-process: {e}")
+            return await asyncio.to_thread(_pdfminer_text, pdf_path)
         except ImportError:
             logger.debug("pdfminer.six not available")
         except Exception as e:
             logger.debug(f"pdfminer extraction failed: {e}")
         return None
     
-    def _extract_with_ocr(self, pdf_path: str) -> Optional[str]:
-        """Extract text using Tesseract OCR."""
+    async def _page_count(self, pdf_path: str) -> int:
+        if self.has_pdfinfo:
+            try:
+                returncode, stdout = await _run(['pdfinfo', pdf_path], timeout=15)
+                if returncode == 0:
+                    for line in stdout.decode('utf-8', errors='replace').splitlines():
+                        if line.startswith('Pages:'):
+                            return int(line.split(':', 1)[1])
+            except Exception as e:
+                logger.debug(f"pdfinfo failed: {e}")
+        # Unknown: try the whole budget, missing pages simply yield nothing
+        return self.ocr_page_budget
+    
+    async def _ocr_page(self, pdf_path: str, page: int, workdir: str) -> str:
+        """Rasterize one page and OCR it"""
+        prefix = os.path.join(workdir, f"page-{page}")
+        returncode, _ = await _run(
+            ['pdftoppm', '-f', str(page), '-l', str(page), '-r', str(PDF_OCR_DPI),
+             '-singlefile', '-png', pdf_path, prefix],
+            timeout=60
+        )
+        image = f"{prefix}.png"
+        if returncode != 0 or not os.path.exists(image):
+            return ''
         try:
-            # Convert PDF to image first (requires pdf2image)
-            from pdf2image import convert_from_path
-            images = convert_from_path(pdf_path, dpi=200)
-            
-            text_parts = []
-            for img in images:
-                # Save temp image
-                temp_img = f"/tmp/pdf_page_{hash(img)}.png"
-                img.save(temp_img)
-                
-                # Run OCR
-                result = subprocess.run(
-                    ['tesseract', temp_img, 'stdout'],
-                    capture_output=True,
-                    text=True,
-                    timeout=60
-                )
-                if result.returncode == 0:
-                    text_parts.append(result.stdout)
-                
-                # Cleanup
-                os.remove(temp_img)
+            returncode, stdout = await _run(['tesseract', image, 'stdout'], timeout=60)
+            return stdout.decode('utf-8', errors='replace') if returncode == 0 else ''
+        finally:
+            os.remove(image)
+    
+    async def _extract_with_ocr(self, pdf_path: str) -> Optional[str]:
+        """Extract text using Tesseract OCR, pages in parallel within the page budget."""
+        page_count = await self._page_count(pdf_path)
+        pages = min(page_count, self.ocr_page_budget)
+        if page_count > pages:
+            logger.info(f"[pdf_extractor] OCR limited to {pages} of {page_count} pages: {pdf_path}")
+        
+        semaphore = asyncio.Semaphore(self.ocr_concurrency)
+        started = time.perf_counter()
+        
+        # Per-document scratch directory instead of shared names in /tmp
+        with tempfile.TemporaryDirectory(prefix="pdf-ocr-") as workdir:
+            async def ocr(page: int) -> str:
+                async with semaphore:
+                    try:
+                        return await self._ocr_page(pdf_path, page, workdir)
+                    except Exception as e:
+                        logger.debug(f"OCR failed for page {page} of {pdf_path}: {e}")
+                        return ''
             
-            return '\n'.join(text_parts) if text_parts else None
-        except ImportError:
-            logger.debug("pdf2image or pytesseract not available")
-        except Exception as e:
-            logger.debug(f"OCR extraction failed: {e}")
-        return None
-
+            texts = await asyncio.gather(*(ocr(page) for page in range(1, pages + 1)))
+        
+        logger.debug(f"[pdf_extractor] OCR'd {pages} page(s) in {time.perf_counter() - started:.1f}s: {pdf_path}")
+        text = '\n'.join(t for t in texts if t.strip())
+        return text or None
@@ -2,25 +2,32 @@
 Snapshot manager.
 
 Saves raw HTML and extraction metadata for auditing and debugging.
+HTML goes to the shared content-addressed blob store; the per-URL metadata
+file references it by key.
 """
 
 import os
 import json
+import time
+import asyncio
 import hashlib
 import logging
 from pathlib import Path
 from typing import Dict, Optional
 from datetime import datetime
 
+from core.blob_store import BlobStore, get_blob_store, BLOB_RETENTION_DAYS
+
 logger = logging.getLogger(__name__)
 
 
 class SnapshotManager:
     """Manages snapshots of extracted pages."""
     
-    def __init__(self, base_path: Optional[str] = None):
+    def __init__(self, base_path: Optional[str] = None, blob_store: Optional[BlobStore] = None):
         self.base_path = Path(base_path or os.getenv('SNAPSHOT_PATH', 'snapshots'))
         self.base_path.mkdir(parents=True, exist_ok=True)
+        self.blob_store = blob_store or get_blob_store()
         
         logger.info(f"Snapshot manager initialized: {self.base_path}")
     
@@ -32,17 +39,11 @@ class SnapshotManager:
             parsed = urlparse(url)
             domain = parsed.netloc.replace('www.', '')
             
-            # Create domain directory
-            domain_dir = self.base_path / domain
-            domain_dir.mkdir(parents=True, exist_ok=True)
-            
             # Generate filename from URL hash
             url_hash = hashlib.sha256(url.encode()).hexdigest()
             
-            # Save HTML
-            html_path = domain_dir / f"{url_hash}.html"
-            with open(html_path, 'w', encoding='utf-8') as f:
-                f.write(html)
+            # Save HTML (deduplicated, compressed, off the event loop)
+            html_key, _ = await self.blob_store.put_async(html.encode('utf-8'))
             
             # Save metadata with per-field confidence and sources
             field_metadata = {}
@@ -59,6 +60,7 @@ class SnapshotManager:
                 "domain": domain,
                 "snapshot_at": datetime.utcnow().isoformat() + "Z",
                 "html_size": len(html),
+                "html_blob": html_key,
                 "extraction_result": extraction_result,
                 "pipeline_version": extraction_result.get('pipeline_version', '1.0.0'),
                 "field_metadata": field_metadata,
@@ -66,14 +68,21 @@ class SnapshotManager:
                 "validation_issues": extraction_result.get('validation_issues', [])
             }
             
-            meta_path = domain_dir / f"{url_hash}.meta.json"
-            with open(meta_path, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, indent=2, ensure_ascii=False)
+            meta_path = self.base_path / domain / f"{url_hash}.meta.json"
+            await asyncio.to_thread(self._write_metadata, meta_path, metadata)
             
-            logger.debug(f"Saved snapshot: {html_path}")
+            logger.debug(f"Saved snapshot: {meta_path} (html {html_key[:12]})")
         except Exception as e:
             logger.error(f"Failed to save snapshot: {e}")
     
+    @staticmethod
+    def _write_metadata(meta_path: Path, metadata: Dict):
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = meta_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, ensure_ascii=False, separators=(',', ':'), default=str)
+        os.replace(tmp_path, meta_path)
+    
     def retrieve_snapshot(self, url: str) -> Optional[Dict]:
         """Retrieve snapshot for a URL."""
         try:
@@ -90,4 +99,26 @@ class SnapshotManager:
             logger.error(f"Failed to retrieve snapshot: {e}")
         
         return None
-
+    
+    def retrieve_snapshot_html(self, url: str) -> Optional[str]:
+        """Retrieve the HTML saved with a URL's latest snapshot."""
+        metadata = self.retrieve_snapshot(url)
+        if not metadata or not metadata.get('html_blob'):
+            return None
+        data = self.blob_store.get(metadata['html_blob'])
+        return data.decode('utf-8') if data is not None else None
+    
+    def prune(self, retention_days: int = BLOB_RETENTION_DAYS) -> int:
+        """Delete snapshot metadata (and legacy .html copies) older than the window."""
+        cutoff = time.time() - retention_days * 86400
+        removed = 0
+        for path in self.base_path.rglob('*'):
+            if not path.is_file() or not path.name.endswith(('.meta.json', '.html')):
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        return removed
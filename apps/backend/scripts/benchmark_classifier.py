@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Accuracy/latency benchmark for the job page classifier.
+
+Runs stratified k-fold cross-validation over the labeled seed pages
+(tests/fixtures/classifier_seed) and reports accuracy, precision, recall
+and F1 for the rule-based score, the hashed-feature linear model and the
+combined score JobPageClassifier returns. Then times per-page classify()
+calls against one classify_batch() call over the same pages.
+
+Usage:
+    python scripts/benchmark_classifier.py
+    python scripts/benchmark_classifier.py --data-dir path/to/seed --folds 3 --repeat 20 --json
+"""
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Add backend to sys.path
+BACKEND_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from bs4 import BeautifulSoup
+from sklearn.model_selection import StratifiedKFold
+from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
+
+from pipeline.page_features import extract_page_features
+from pipeline.classifier import JobPageClassifier, train_classifier_model
+
+DEFAULT_DATA_DIR = BACKEND_DIR / "tests" / "fixtures" / "classifier_seed"
+
+
+def load_pages(data_dir: Path) -> Tuple[List[Tuple[str, BeautifulSoup, str]], List[int]]:
+    """(html, soup, url) per labeled page; no URL, seed file names would leak the label"""
+    pages, labels = [], []
+    for subdir, label in (('job_pages', 1), ('non_job_pages', 0)):
+        for html_file in sorted((data_dir / subdir).glob('*.html')):
+            html = html_file.read_text(encoding='utf-8')
+            pages.append((html, BeautifulSoup(html, 'html.parser'), ''))
+            labels.append(label)
+    return pages, labels
+
+
+def _metrics(y_true: List[int], y_pred: List[int]) -> Dict[str, float]:
+    return {
+        'accuracy': round(float(accuracy_score(y_true, y_pred)), 3),
+        'precision': round(float(precision_score(y_true, y_pred, zero_division=0)), 3),
+        'recall': round(float(recall_score(y_true, y_pred, zero_division=0)), 3),
+        'f1': round(float(f1_score(y_true, y_pred, zero_division=0)), 3),
+    }
+
+
+def cross_validate(pages, labels, folds: int) -> Dict[str, Dict[str, float]]:
+    """Out-of-fold predictions for each scoring mode"""
+    features = [extract_page_features(html, soup, url) for html, soup, url in pages]
+    rules = JobPageClassifier(use_ml=False)
+    predictions = {'rules': [0] * len(pages), 'model': [0] * len(pages), 'combined': [0] * len(pages)}
+
+    splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=42)
+    for train_idx, test_idx in splitter.split(features, labels):
+        model = train_classifier_model([features[i] for i in train_idx], [labels[i] for i in train_idx])
+        combined = JobPageClassifier(model=model)
+        test_pages = [pages[i] for i in test_idx]
+        model_scores = model.score_pages([features[i] for i in test_idx])
+        for i, rule, ml, (is_job, _) in zip(
+            test_idx,
+            rules.classify_batch(test_pages),
+            model_scores,
+            combined.classify_batch(test_pages),
+        ):
+            predictions['rules'][i] = int(rule[0])
+            predictions['model'][i] = int(ml >= 0.5)
+            predictions['combined'][i] = int(is_job)
+
+    return {mode: _metrics(labels, predicted) for mode, predicted in predictions.items()}
+
+
+def time_latency(pages, labels, repeat: int) -> Dict[str, float]:
+    """Per-page classify() loop vs one classify_batch() call, model enabled"""
+    features = [extract_page_features(html, soup, url) for html, soup, url in pages]
+    classifier = JobPageClassifier(model=train_classifier_model(features, labels))
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for html, soup, url in pages:
+            classifier.classify(html, soup, url)
+    loop_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        classifier.classify_batch(pages)
+    batch_s = time.perf_counter() - started
+
+    scored = len(pages) * repeat
+    return {
+        'pages': scored,
+        'loop_ms_per_page': round(loop_s * 1000 / scored, 3),
+        'batch_ms_per_page': round(batch_s * 1000 / scored, 3),
+        'speedup': round(loop_s / batch_s, 2) if batch_s else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark job page classifier accuracy and latency')
+    parser.add_argument('--data-dir', type=Path, default=DEFAULT_DATA_DIR, help='Directory with labeled examples')
+    parser.add_argument('--folds', type=int, default=3, help='Cross-validation folds')
+    parser.add_argument('--repeat', type=int, default=20, help='Latency passes over the labeled set')
+    parser.add_argument('--json', action='store_true', help='Print JSON instead of a table')
+    args = parser.parse_args()
+
+    pages, labels = load_pages(args.data_dir)
+    if min(labels.count(0), labels.count(1)) < args.folds:
+        print(f"❌ Need at least {args.folds} examples per class in {args.data_dir}")
+        sys.exit(1)
+
+    report = {
+        'examples': len(pages),
+        'folds': args.folds,
+        'accuracy': cross_validate(pages, labels, args.folds),
+        'latency': time_latency(pages, labels, args.repeat),
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Labeled pages: {report['examples']} ({sum(labels)} job), {args.folds}-fold CV\n")
+    print(f"{'mode':<10} {'accuracy':>9} {'precision':>10} {'recall':>7} {'f1':>6}")
+    for mode, m in report['accuracy'].items():
+        print(f"{mode:<10} {m['accuracy']:>9.3f} {m['precision']:>10.3f} {m['recall']:>7.3f} {m['f1']:>6.3f}")
+    latency = report['latency']
+    print(f"\nLatency over {latency['pages']} pages:")
+    print(f"  classify() loop:   {latency['loop_ms_per_page']:.3f} ms/page")
+    print(f"  classify_batch():  {latency['batch_ms_per_page']:.3f} ms/page ({latency['speedup']}x)")
+
+
+if __name__ == '__main__':
+    main()
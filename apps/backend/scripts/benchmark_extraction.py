@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Offline crawl-replay benchmark for the HTML extraction stages.
+
+Replays stored pages (raw-html/, tests/fixtures/ and optionally the blob
+store) through every extraction path the crawler uses, with the network and
+database stubbed out so runs are deterministic:
+
+    simple_crawler       SimpleCrawler.extract_jobs_from_html
+    strategy_analysis    StrategySelector.analyze_html_structure
+    strategy:<name>      each StrategySelector strategy on its own
+    plugins              PluginRegistry.extract
+    pipeline             pipeline.Extractor.extract_from_html
+
+Reports pages/sec, p50/p95 per-stage latency, peak RSS and jobs-found parity
+against a saved baseline.
+
+Usage:
+    python scripts/benchmark_extraction.py                     # run and print
+    python scripts/benchmark_extraction.py --save-baseline     # record baseline
+    python scripts/benchmark_extraction.py --check             # regression mode
+    python scripts/benchmark_extraction.py --check --threshold 0.1 --json
+
+In --check mode the script exits 1 when any stage's throughput drops more
+than --threshold (fraction, default 0.2) below the baseline, or when a
+page's jobs-found count differs from the baseline.
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import logging
+import resource
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+from unittest.mock import patch
+
+# Add backend to sys.path
+BACKEND_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+REPO_ROOT = BACKEND_DIR.parent.parent
+REPORT_DIR = BACKEND_DIR / "report"
+
+DEFAULT_CORPUS = [REPO_ROOT / "raw-html", BACKEND_DIR / "tests" / "fixtures"]
+DEFAULT_BASELINE = REPORT_DIR / "extraction_benchmark_baseline.json"
+DEFAULT_THRESHOLD = float(os.getenv("EXTRACTION_BENCH_THRESHOLD", "0.2"))
+
+STRATEGIES = {
+    'tables': '_extract_from_tables',
+    'divs': '_extract_from_divs_lists',
+    'links': '_extract_from_links',
+    'structured': '_extract_from_structured_data',
+    'generic': '_extract_generic_fallback',
+}
+
+logger = logging.getLogger("benchmark_extraction")
+
+
+class Page:
+    def __init__(self, page_id: str, url: str, html: str):
+        self.page_id = page_id
+        self.url = url
+        self.html = html
+
+
+def _url_for_path(path: Path) -> str:
+    """
+    Rebuild a base URL from an HTMLStorage path (domain/source/date/hash.html).
+
+    HTMLStorage encodes the host with dots replaced by underscores, so the
+    first directory that looks like an encoded host is used.
+    """
+    for part in path.parts:
+        if part.count('_') >= 1 and not part.endswith('.html') and '-' not in part:
+            host = part.replace('_', '.')
+            if '.' in host and host.split('.')[-1].isalpha():
+                return f"https://{host}/"
+    return f"https://example.org/{path.stem}"
+
+
+def load_corpus(dirs: List[Path], blob_store_path: Optional[str] = None) -> List[Page]:
+    """Load every stored page, ordered by id so runs are comparable"""
+    pages: Dict[str, Page] = {}
+
+    for base in dirs:
+        if not base.exists():
+            continue
+        for path in sorted(base.rglob("*.html")):
+            rel = path.relative_to(base)
+            page_id = f"{base.name}/{rel.as_posix()}"
+            html = path.read_text(encoding='utf-8', errors='replace')
+            pages[page_id] = Page(page_id, _url_for_path(rel), html)
+
+    if blob_store_path:
+        from core.blob_store import BlobStore
+        store = BlobStore(blob_store_path)
+        for key, _ in sorted(store.iter_keys()):
+            data = store.get(key)
+            if data is None:
+                continue
+            page_id = f"blob/{key[:12]}"
+            pages[page_id] = Page(page_id, f"https://example.org/{key[:12]}", data.decode('utf-8', errors='replace'))
+
+    return [pages[k] for k in sorted(pages)]
+
+
+def _no_network(*args, **kwargs):
+    raise RuntimeError("Network access is disabled during the extraction benchmark")
+
+
+def _offline():
+    """Patches that make any network or database access fail fast"""
+    return [
+        patch("httpx.Client.send", _no_network),
+        patch("httpx.AsyncClient.send", _no_network),
+        patch("psycopg2.connect", _no_network),
+    ]
+
+
+def build_stages(only: Optional[List[str]] = None) -> Tuple[Dict[str, Callable[[Page], int]], Dict[str, str]]:
+    """
+    Build stage callables returning the number of jobs found on a page.
+
+    Stages whose imports fail (e.g. a broken plugin module) are reported as
+    unavailable rather than aborting the whole run.
+    """
+    from bs4 import BeautifulSoup
+
+    stages: Dict[str, Callable[[Page], int]] = {}
+    unavailable: Dict[str, str] = {}
+
+    def want(name: str) -> bool:
+        return not only or any(name == o or name.startswith(o + ':') for o in only)
+
+    crawler = None
+    try:
+        from crawler_v2.simple_crawler import SimpleCrawler
+        crawler = SimpleCrawler("", use_ai=False)
+        # Extraction never needs the normalizer, which may call out to an LLM
+        crawler.ai_normalizer = None
+    except Exception as e:
+        unavailable['simple_crawler'] = str(e)
+
+    if crawler is not None:
+        if want('simple_crawler'):
+            stages['simple_crawler'] = lambda p: len(crawler.extract_jobs_from_html(p.html, p.url))
+
+        if want('strategy_analysis') and crawler.strategy_selector:
+            selector = crawler.strategy_selector
+            stages['strategy_analysis'] = lambda p: int(bool(selector.analyze_html_structure(p.html, p.url)))
+
+        for name, method in STRATEGIES.items():
+            stage = f"strategy:{name}"
+            if want(stage):
+                fn = getattr(crawler, method)
+                stages[stage] = (lambda f: lambda p: len(f(BeautifulSoup(p.html, 'html.parser'), p.url)))(fn)
+
+    if want('plugins'):
+        try:
+            from crawler.plugins import get_plugin_registry
+            registry = get_plugin_registry()
+            stages['plugins'] = lambda p: len(registry.extract(p.html, p.url).jobs)
+        except Exception as e:
+            unavailable['plugins'] = str(e)
+
+    if want('pipeline'):
+        try:
+            from pipeline.extractor import Extractor
+            extractor = Extractor(enable_ai=False, enable_snapshots=False, enable_storage=False)
+            loop = asyncio.new_event_loop()
+
+            def run_pipeline(p: Page) -> int:
+                result = loop.run_until_complete(extractor.extract_from_html(p.html, p.url))
+                title = result.get_field('title')
+                return int(bool(result.is_job and title and title.is_valid()))
+
+            stages['pipeline'] = run_pipeline
+        except Exception as e:
+            unavailable['pipeline'] = str(e)
+
+    return stages, unavailable
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def run_benchmark(pages: List[Page], stages: Dict[str, Callable[[Page], int]],
+                  iterations: int = 3, warmup: int = 1) -> Dict:
+    """Time every stage over every page; returns the report dict"""
+    report: Dict = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "pages": len(pages),
+        "iterations": iterations,
+        "stages": {},
+        "jobs_found": {},
+    }
+
+    for name, fn in stages.items():
+        samples: List[float] = []
+        found: Dict[str, int] = {}
+        errors = 0
+
+        for _ in range(warmup):
+            for page in pages:
+                try:
+                    fn(page)
+                except Exception:
+                    pass
+
+        for _ in range(iterations):
+            for page in pages:
+                start = time.perf_counter()
+                try:
+                    count = fn(page)
+                except Exception as e:
+                    count = -1
+                    errors += 1
+                    logger.debug(f"[benchmark] {name} failed on {page.page_id}: {e}")
+                samples.append(time.perf_counter() - start)
+                found[page.page_id] = count
+
+        total = sum(samples)
+        report["stages"][name] = {
+            "pages_per_sec": round(len(samples) / total, 2) if total else 0.0,
+            "p50_ms": round(_percentile(samples, 50) * 1000, 3),
+            "p95_ms": round(_percentile(samples, 95) * 1000, 3),
+            "total_s": round(total, 4),
+            "errors": errors,
+            "peak_rss_mb": _peak_rss_mb(),
+        }
+        report["jobs_found"][name] = found
+
+    total_time = sum(s["total_s"] for s in report["stages"].values())
+    report["pages_per_sec"] = round(len(pages) * iterations / total_time, 2) if total_time else 0.0
+    report["peak_rss_mb"] = _peak_rss_mb()
+    return report
+
+
+def compare_to_baseline(report: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    Return regressions: throughput drops beyond the threshold and jobs-found
+    mismatches. Stages or pages missing from either side are skipped.
+    """
+    problems: List[str] = []
+
+    for name, stats in report["stages"].items():
+        base = baseline.get("stages", {}).get(name)
+        if not base or not base.get("pages_per_sec"):
+            continue
+        drop = 1 - stats["pages_per_sec"] / base["pages_per_sec"]
+        stats["baseline_pages_per_sec"] = base["pages_per_sec"]
+        stats["throughput_change"] = round(-drop, 4)
+        if drop > threshold:
+            problems.append(
+                f"{name}: {stats['pages_per_sec']} pages/sec is {drop:.0%} below "
+                f"baseline {base['pages_per_sec']} (threshold {threshold:.0%})"
+            )
+
+    for name, found in report["jobs_found"].items():
+        base_found = baseline.get("jobs_found", {}).get(name, {})
+        for page_id, count in found.items():
+            if page_id in base_found and base_found[page_id] != count:
+                problems.append(f"{name}: {page_id} found {count} jobs, baseline {base_found[page_id]}")
+
+    return problems
+
+
+def print_report(report: Dict, unavailable: Dict[str, str], problems: List[str]):
+    print(f"\nExtraction benchmark: {report['pages']} page(s) x {report['iterations']} iteration(s)")
+    print(f"{'stage':<24}{'pages/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'jobs':>8}{'errors':>8}{'vs base':>10}")
+    for name, stats in report["stages"].items():
+        jobs = sum(c for c in report["jobs_found"][name].values() if c > 0)
+        change = stats.get("throughput_change")
+        change_str = f"{change:+.0%}" if change is not None else "-"
+        print(f"{name:<24}{stats['pages_per_sec']:>10}{stats['p50_ms']:>10}{stats['p95_ms']:>10}"
+              f"{jobs:>8}{stats['errors']:>8}{change_str:>10}")
+    print(f"\nOverall: {report['pages_per_sec']} pages/sec, peak RSS {report['peak_rss_mb']} MB")
+
+    for name, reason in unavailable.items():
+        print(f"  [skipped] {name}: {reason}")
+    if problems:
+        print(f"\n{len(problems)} regression(s):")
+        for problem in problems:
+            print(f"  - {problem}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline crawl-replay extraction benchmark")
+    parser.add_argument("--corpus", action="append", type=Path,
+                        help="Directory of stored .html pages (repeatable; default raw-html/ and tests/fixtures/)")
+    parser.add_argument("--blob-store", help="Also replay every blob in this blob store path")
+    parser.add_argument("--stage", action="append",
+                        help="Only run these stages (repeatable; 'strategy' selects all strategies)")
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Write this run as the new baseline")
+    parser.add_argument("--check", action="store_true", help="Exit 1 on throughput or parity regressions")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed fractional throughput drop in --check mode (default 0.2)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    # Per-page INFO logging from the extractors would dominate the timings
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.ERROR)
+
+    pages = load_corpus(args.corpus or DEFAULT_CORPUS, args.blob_store)
+    if not pages:
+        print("No pages found in corpus", file=sys.stderr)
+        return 2
+
+    patches = _offline()
+    for p in patches:
+        p.start()
+    try:
+        stages, unavailable = build_stages(args.stage)
+        report = run_benchmark(pages, stages, iterations=args.iterations, warmup=args.warmup)
+    finally:
+        for p in patches:
+            p.stop()
+    report["unavailable"] = unavailable
+
+    problems: List[str] = []
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text())
+        problems = compare_to_baseline(report, baseline, args.threshold)
+    elif args.check:
+        print(f"No baseline at {args.baseline}; run with --save-baseline first", file=sys.stderr)
+        return 2
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2, sort_keys=True))
+        print(f"Baseline written to {args.baseline}")
+
+    if args.json:
+        print(json.dumps({**report, "regressions": problems}, indent=2))
+    else:
+        print_report(report, unavailable, problems)
+
+    if args.check and problems:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
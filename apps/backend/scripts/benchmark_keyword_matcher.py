@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the compiled keyword matcher in link scoring.
+
+Builds a synthetic listing page with 5,000 anchors (job links, navigation,
+blocklisted phrases, mailto links) and compares the keyword phase of
+score_link before and after KeywordMatcher:
+
+    legacy     per-keyword substring loops (the previous implementation)
+    compiled   core.extraction_heuristics matchers
+
+Both phases must agree on every anchor; the script exits 1 if they differ.
+It also times filter_and_score_job_links end to end on the same page.
+
+Usage:
+    python scripts/benchmark_keyword_matcher.py
+    python scripts/benchmark_keyword_matcher.py --anchors 20000 --repeat 5
+"""
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+from typing import List, Tuple
+
+# Add backend to sys.path
+BACKEND_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from core import extraction_heuristics as heuristics  # noqa: E402
+
+TITLES = [
+    'Senior Program Officer - WASH', 'Country Director, Kenya', 'Finance Assistant',
+    'Monitoring and Evaluation Specialist', 'Consultancy: Baseline Survey',
+    'Logistics Coordinator (Emergency Response)', 'Data Analyst', 'Grants Manager',
+]
+NAV = ['Home', 'About us', 'Contact us', 'Privacy policy', 'Donate', 'News', 'Our work', 'Login']
+HREFS = ['/job/{n}', '/careers/view/{n}', '/vacancies?id={n}', '/tender/{n}', '/news/{n}', '/about/{n}']
+
+
+def build_page(anchors: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    parts = ['<html><body><div class="job-list">']
+    for n in range(anchors):
+        roll = rng.random()
+        if roll < 0.6:
+            text = f"{rng.choice(TITLES)} #{n}"
+        elif roll < 0.9:
+            text = rng.choice(NAV)
+        elif roll < 0.95:
+            text = rng.choice(heuristics.GLOBAL_BLOCKLIST).title()
+        else:
+            parts.append(f'<p><a href="mailto:hr{n}@example.org">Email HR</a></p>')
+            continue
+        href = rng.choice(HREFS).format(n=n)
+        parts.append(f'<p><a href="{href}">{text}</a></p>')
+    parts.append('</div></body></html>')
+    return ''.join(parts)
+
+
+def legacy_keywords(text: str, href: str) -> Tuple:
+    """Keyword phase of score_link as it was before KeywordMatcher"""
+    text_lower = text.lower().strip()
+    blocked = text_lower in [b.lower() for b in heuristics.GLOBAL_BLOCKLIST] or any(
+        text_lower.startswith(b.lower()) for b in heuristics.GLOBAL_BLOCKLIST
+    )
+    href_lower = href.lower()
+    url_kw = next((kw for kw in heuristics.JOB_KEYWORDS if kw in href_lower), None)
+    text_kw = next((kw for kw in heuristics.JOB_KEYWORDS if kw in text.lower()), None)
+    detail = any(p in href_lower for p in heuristics.DETAIL_PATTERNS)
+    return blocked, url_kw, text_kw, detail
+
+
+def compiled_keywords(text: str, href: str) -> Tuple:
+    href_lower = href.lower()
+    return (
+        heuristics.is_blocklisted(text, href),
+        heuristics._JOB_KEYWORD_MATCHER.first(href_lower),
+        heuristics._JOB_KEYWORD_MATCHER.first(text.lower()),
+        heuristics._DETAIL_MATCHER.search(href_lower),
+    )
+
+
+def time_phase(fn, pairs: List[Tuple[str, str]], repeat: int) -> Tuple[float, list]:
+    best = float('inf')
+    results = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [fn(text, href) for text, href in pairs]
+        best = min(best, time.perf_counter() - start)
+    return best, results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Keyword matcher micro-benchmark")
+    parser.add_argument("--anchors", type=int, default=5000, help="Anchors on the synthetic page")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    html = build_page(args.anchors)
+    soup = BeautifulSoup(html, 'html.parser')
+    pairs = [(a.get_text(), a.get('href', '')) for a in soup.find_all('a', href=True)]
+
+    legacy_s, legacy_results = time_phase(legacy_keywords, pairs, args.repeat)
+    compiled_s, compiled_results = time_phase(compiled_keywords, pairs, args.repeat)
+    mismatches = sum(1 for a, b in zip(legacy_results, compiled_results) if a != b)
+
+    start = time.perf_counter()
+    scored = heuristics.filter_and_score_job_links(soup, 'https://example.org', max_links=args.anchors)
+    end_to_end_s = time.perf_counter() - start
+
+    print(f"anchors:            {len(pairs)}")
+    print(f"legacy keywords:    {legacy_s * 1000:8.1f} ms")
+    print(f"compiled keywords:  {compiled_s * 1000:8.1f} ms  ({legacy_s / compiled_s:.1f}x)")
+    print(f"score all links:    {end_to_end_s * 1000:8.1f} ms  ({len(scored)} scored > 0)")
+    print(f"mismatches:         {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    import logging
+    logging.disable(logging.INFO)
+    sys.exit(main())
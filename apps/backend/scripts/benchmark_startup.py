@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Cold start benchmark for the API process.
+
+Runs `python -X importtime -c "import main"` in a fresh interpreter and
+reports the cumulative import cost of main and of its heaviest top-level
+imports. Then starts uvicorn and measures the time until /api/healthz
+answers 200. Exits non-zero if a budget is exceeded or if one of the heavy
+subsystems that should load lazily (crawler stack, dateparser, Playwright,
+scikit-learn, pdfminer, feedparser, meilisearch) is imported at startup.
+
+Usage:
+    python scripts/benchmark_startup.py
+    python scripts/benchmark_startup.py --import-budget-ms 1500 --healthz-budget-ms 4000 --runs 3 --json
+"""
+import os
+import re
+import sys
+import json
+import time
+import socket
+import argparse
+import subprocess
+import urllib.request
+from pathlib import Path
+from typing import Dict, List
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+# Must not be imported by `import main`; they load on first use
+LAZY_MODULES = (
+    'crawler_v2', 'orchestrator', 'dateparser', 'playwright', 'sklearn',
+    'pdfminer', 'feedparser', 'meilisearch', 'bs4',
+)
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def _env() -> Dict[str, str]:
+    # Keep the default lazy router behaviour regardless of the caller's shell
+    env = dict(os.environ)
+    env.pop('AIDJOBS_LAZY_ROUTERS', None)
+    return env
+
+
+def measure_imports(top: int) -> Dict:
+    """Cumulative import cost of main (microseconds) and its heaviest direct imports"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import main'],
+        cwd=BACKEND_DIR, env=_env(), capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import main failed:\n{result.stderr[-2000:]}")
+
+    modules: List[Dict] = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append({
+                'module': name,
+                'self_us': int(self_us),
+                'cumulative_us': int(cumulative_us),
+                'depth': (len(indent) - 1) // 2,
+            })
+
+    main_entry = next(m for m in modules if m['module'] == 'main' and m['depth'] == 0)
+    direct = sorted((m for m in modules if m['depth'] == 1), key=lambda m: -m['cumulative_us'])
+    imported = {m['module'].split('.')[0] for m in modules}
+    return {
+        'main_cumulative_ms': round(main_entry['cumulative_us'] / 1000, 1),
+        'top_imports': [
+            {'module': m['module'], 'cumulative_ms': round(m['cumulative_us'] / 1000, 1)}
+            for m in direct[:top]
+        ],
+        'eager_heavy_modules': sorted(imported & set(LAZY_MODULES)),
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def measure_healthz(timeout: float) -> float:
+    """Milliseconds from spawning uvicorn to the first 200 from /api/healthz"""
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/api/healthz"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--host', '127.0.0.1', '--port', str(port), '--log-level', 'warning'],
+        cwd=BACKEND_DIR, env=_env(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - started) * 1000
+            except OSError:
+                time.sleep(0.02)
+        raise RuntimeError(f"/api/healthz did not answer within {timeout:.0f}s")
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API cold start benchmark")
+    parser.add_argument('--runs', type=int, default=3, help='Runs per measurement (best is reported)')
+    parser.add_argument('--top', type=int, default=10, help='Heaviest direct imports of main to list')
+    parser.add_argument('--import-budget-ms', type=float, default=float(os.getenv('STARTUP_IMPORT_BUDGET_MS', 1500)))
+    parser.add_argument('--healthz-budget-ms', type=float, default=float(os.getenv('STARTUP_HEALTHZ_BUDGET_MS', 4000)))
+    parser.add_argument('--timeout', type=float, default=60.0, help='Seconds to wait for /api/healthz')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    runs = [measure_imports(args.top) for _ in range(args.runs)]
+    imports = min(runs, key=lambda r: r['main_cumulative_ms'])
+    healthz_ms = min(measure_healthz(args.timeout) for _ in range(args.runs))
+
+    failures = []
+    if imports['main_cumulative_ms'] > args.import_budget_ms:
+        failures.append(f"import main took {imports['main_cumulative_ms']:.0f}ms (budget {args.import_budget_ms:.0f}ms)")
+    if healthz_ms > args.healthz_budget_ms:
+        failures.append(f"first /api/healthz after {healthz_ms:.0f}ms (budget {args.healthz_budget_ms:.0f}ms)")
+    if imports['eager_heavy_modules']:
+        failures.append(f"imported at startup: {', '.join(imports['eager_heavy_modules'])}")
+
+    report = {**imports, 'time_to_first_healthz_ms': round(healthz_ms, 1), 'failures': failures}
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"import main (cumulative, -X importtime): {imports['main_cumulative_ms']:.1f} ms "
+              f"(budget {args.import_budget_ms:.0f} ms)")
+        print(f"time to first /api/healthz:              {healthz_ms:.1f} ms (budget {args.healthz_budget_ms:.0f} ms)")
+        print("\nHeaviest imports of main:")
+        for entry in imports['top_imports']:
+            print(f"  {entry['cumulative_ms']:>8.1f} ms  {entry['module']}")
+        for failure in failures:
+            print(f"❌ {failure}")
+        if not failures:
+            print("\n✅ Within startup budget")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
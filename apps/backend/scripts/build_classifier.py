@@ -2,13 +2,14 @@
 """
 Build and train job page classifier.
 
-Trains TF-IDF + logistic regression model and saves to models/job_classifier_v1.pkl
+Trains a logistic regression over hashed page features (pipeline/page_features.py)
+and saves the weights to pipeline/classifier_model.npz, where JobPageClassifier
+loads them at startup (override with CLASSIFIER_MODEL_PATH).
 """
 
 import os
 import sys
 import csv
-import pickle
 import json
 from pathlib import Path
 from collections import Counter
@@ -16,14 +17,17 @@ from collections import Counter
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 try:
-    from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.linear_model import LogisticRegression
     from sklearn.model_selection import train_test_split
     from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, classification_report
 except ImportError:
     print("❌ scikit-learn not installed. Install with: pip install scikit-learn")
     sys.exit(1)
 
+from bs4 import BeautifulSoup
+
+from pipeline.page_features import N_FEATURES, extract_page_features, vectorize
+from pipeline.classifier import DEFAULT_MODEL_PATH, train_classifier_model
+
 
 def load_training_data(training_path: Path):
     """Load training data from CSV."""
@@ -32,7 +36,7 @@ def load_training_data(training_path: Path):
         print("   Run scripts/convert_labels_for_training.py first")
         return None, None
     
-    texts = []
+    pages = []
     labels = []
     
     with open(training_path, 'r', encoding='utf-8') as f:
@@ -49,14 +53,15 @@ def load_training_data(training_path: Path):
             else:
                 continue  # Skip invalid labels
             
-            texts.append(html_snippet)
+            soup = BeautifulSoup(html_snippet, 'html.parser')
+            pages.append(extract_page_features(html_snippet, soup, row.get('url', '')))
             labels.append(label)
     
-    if not texts:
+    if not pages:
         print("❌ No training data found in CSV")
         return None, None
     
-    return texts, labels
+    return pages, labels
 
 
 def train_classifier(texts, labels, model_path: Path, min_examples: int = 20):
@@ -84,35 +89,14 @@ def train_classifier(texts, labels, model_path: Path, min_examples: int = 20):
     print(f"  Training: {len(X_train)} examples")
     print(f"  Testing: {len(X_test)} examples")
     
-    # Vectorize
-    print("\nVectorizing text...")
-    vectorizer = TfidfVectorizer(
-        max_features=5000,
-        stop_words='english',
-        ngram_range=(1, 2),  # Unigrams and bigrams
-        min_df=2,  # Minimum document frequency
-        max_df=0.95  # Maximum document frequency
-    )
-    
-    X_train_vec = vectorizer.fit_transform(X_train)
-    X_test_vec = vectorizer.transform(X_test)
-    
-    print(f"  Vocabulary size: {len(vectorizer.vocabulary_)}")
-    
-    # Train model
+    # Train model (features are hashed, so there is no vocabulary to fit)
     print("\nTraining classifier...")
-    classifier = LogisticRegression(
-        max_iter=1000,
-        random_state=42,
-        class_weight='balanced'  # Handle imbalanced data
-    )
-    
-    classifier.fit(X_train_vec, y_train)
+    model = train_classifier_model(X_train, y_train, version='v2')
     
     # Evaluate
     print("\nEvaluating...")
-    y_train_pred = classifier.predict(X_train_vec)
-    y_test_pred = classifier.predict(X_test_vec)
+    y_train_pred = (model.predict_proba(vectorize(X_train)) >= 0.5).astype(int)
+    y_test_pred = (model.predict_proba(vectorize(X_test)) >= 0.5).astype(int)
     
     train_accuracy = accuracy_score(y_train, y_train_pred)
     test_accuracy = accuracy_score(y_test, y_test_pred)
@@ -141,27 +125,18 @@ def train_classifier(texts, labels, model_path: Path, min_examples: int = 20):
     print(f"\nClassification Report:")
     print(classification_report(y_test, y_test_pred, target_names=['Not Job', 'Job']))
     
-    # Save model
-    model_data = {
-        'vectorizer': vectorizer,
-        'classifier': classifier,
-        'version': 'v1',
-        'training_size': len(texts),
-        'vocab_size': len(vectorizer.vocabulary_)
-    }
-    
-    model_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(model_path, 'wb') as f:
-        pickle.dump(model_data, f)
+    # Save model (refit on all examples)
+    model = train_classifier_model(texts, labels, version='v2')
+    model.save(str(model_path))
     
     print(f"\n✅ Model saved to: {model_path}")
     
     # Save metrics
     metrics = {
-        'model_version': 'v1',
+        'model_version': 'v2',
         'training_size': len(texts),
         'test_size': len(X_test),
-        'vocab_size': len(vectorizer.vocabulary_),
+        'n_features': N_FEATURES,
         'train_metrics': {
             'accuracy': float(train_accuracy),
             'precision': float(train_precision),
@@ -201,7 +176,7 @@ def main():
     """Main function."""
     base_dir = Path(__file__).parent.parent
     training_path = base_dir / 'tools' / 'labeling' / 'training_data.csv'
-    model_path = base_dir / 'models' / 'job_classifier_v1.pkl'
+    model_path = Path(os.getenv('CLASSIFIER_MODEL_PATH', str(DEFAULT_MODEL_PATH)))
     
     # Load training data
     texts, labels = load_training_data(training_path)
@@ -69,6 +69,7 @@ def main():
             SELECT id::text, title, org_name
             FROM jobs
             WHERE status = 'active'
+            AND duplicate_of IS NULL
             ORDER BY created_at DESC
         """)
         
@@ -2,7 +2,8 @@
 """
 Retrain the job page classifier using seed dataset.
 
-This script trains a TF-IDF + classifier model on labeled examples.
+This script trains a logistic regression over hashed page features on
+labeled examples and saves it where JobPageClassifier loads it.
 """
 
 import os
@@ -13,12 +14,12 @@ import argparse
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
+from bs4 import BeautifulSoup
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report
-import pickle
-import json
+
+from pipeline.page_features import extract_page_features, vectorize
+from pipeline.classifier import train_classifier_model
 
 
 def load_training_data(data_dir: Path):
@@ -26,24 +27,26 @@ def load_training_data(data_dir: Path):
     job_pages_dir = data_dir / 'job_pages'
     non_job_pages_dir = data_dir / 'non_job_pages'
     
-    texts = []
+    pages = []
     labels = []
     
-    # Load job pages (positive examples)
+    # Load job pages (positive examples); no URL, file names would leak the label
     if job_pages_dir.exists():
         for html_file in job_pages_dir.glob('*.html'):
             with open(html_file, 'r', encoding='utf-8') as f:
-                texts.append(f.read())
-                labels.append(1)
+                html = f.read()
+            pages.append(extract_page_features(html, BeautifulSoup(html, 'html.parser'), ''))
+            labels.append(1)
     
     # Load non-job pages (negative examples)
     if non_job_pages_dir.exists():
         for html_file in non_job_pages_dir.glob('*.html'):
             with open(html_file, 'r', encoding='utf-8') as f:
-                texts.append(f.read())
-                labels.append(0)
+                html = f.read()
+            pages.append(extract_page_features(html, BeautifulSoup(html, 'html.parser'), ''))
+            labels.append(0)
     
-    return texts, labels
+    return pages, labels
 
 
 def train_classifier(data_dir: Path, output_path: Path):
@@ -62,19 +65,12 @@ def train_classifier(data_dir: Path, output_path: Path):
         texts, labels, test_size=0.2, random_state=42
     )
     
-    # Vectorize
-    print("Vectorizing text...")
-    vectorizer = TfidfVectorizer(max_features=5000, stop_words='english')
-    X_train_vec = vectorizer.fit_transform(X_train)
-    X_test_vec = vectorizer.transform(X_test)
-    
     # Train model
     print("Training classifier...")
-    classifier = LogisticRegression(max_iter=1000)
-    classifier.fit(X_train_vec, y_train)
+    model = train_classifier_model(X_train, y_train)
     
     # Evaluate
-    y_pred = classifier.predict(X_test_vec)
+    y_pred = (model.predict_proba(vectorize(X_test)) >= 0.5).astype(int)
     accuracy = accuracy_score(y_test, y_pred)
     
     print(f"\n✅ Model trained successfully!")
@@ -82,14 +78,9 @@ def train_classifier(data_dir: Path, output_path: Path):
     print(f"\nClassification Report:")
     print(classification_report(y_test, y_pred, target_names=['Non-Job', 'Job']))
     
-    # Save model
-    model_data = {
-        'vectorizer': vectorizer,
-        'classifier': classifier
-    }
-    
-    with open(output_path, 'wb') as f:
-        pickle.dump(model_data, f)
+    # Save model (refit on all examples)
+    model = train_classifier_model(texts, labels)
+    model.save(str(output_path))
     
     print(f"\n✅ Model saved to {output_path}")
     
@@ -102,7 +93,7 @@ if __name__ == '__main__':
                        default='tests/fixtures/classifier_seed',
                        help='Directory with labeled examples')
     parser.add_argument('--output', type=str,
-                       default='pipeline/classifier_model.pkl',
+                       default='pipeline/classifier_model.npz',
                        help='Output model file')
     
     args = parser.parse_args()
@@ -0,0 +1,115 @@
+"""
+Unit tests for configured (v1 parser_hint) API crawling.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from crawler_v2.api_config import compile_api_config
+from crawler_v2.api_crawler import SimpleAPICrawler
+
+TOTAL = 25
+
+
+def _collect(config, handler):
+    crawler = SimpleAPICrawler("postgresql://unused")
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return [page async for page in crawler.iter_pages(config, client)]
+
+    return asyncio.run(main())
+
+
+def test_mapping_fans_out_through_lists_and_applies_transforms():
+    config = compile_api_config({
+        "v": 1,
+        "base_url": "https://api.example.org",
+        "path": "/v1/jobs",
+        "data_path": "data",
+        "map": {
+            "id": "id",
+            "title": "fields.title",
+            "apply_url": "fields.url",
+            "location_raw": "fields.country.name",
+            "country_iso": "fields.country.iso3",
+            "level_norm": "fields.level",
+        },
+        "transforms": {"location_raw": {"join": ", "}, "country_iso": {"first": True}},
+    })
+    page = {"data": [{"id": 7, "fields": {
+        "title": " Programme Officer ",
+        "url": "/jobs/7",
+        "country": [{"name": "Kenya", "iso3": "KEN"}, {"name": "Uganda", "iso3": "UGA"}],
+        "level": 0,
+    }}]}
+
+    [item] = config.items(page)
+    assert config.map_item(item, config.url) == {
+        "id": "7",
+        "title": "Programme Officer",
+        "apply_url": "https://api.example.org/jobs/7",
+        "location_raw": "Kenya, Uganda",
+        "country_iso": "KEN",
+        "level_norm": "0",
+    }
+    # The same hint compiles once
+    hint = {"v": 1, "base_url": "https://x", "map": {"title": "t"}}
+    assert compile_api_config(hint) is compile_api_config(dict(hint))
+
+
+def test_offset_pages_are_fetched_concurrently_and_yielded_in_order():
+    in_flight = peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        offset, limit = int(request.url.params["offset"]), int(request.url.params["limit"])
+        return httpx.Response(200, json={"jobs": [{"title": f"Job {i}"} for i in range(offset, min(offset + limit, TOTAL))]})
+
+    config = compile_api_config({
+        "v": 1,
+        "base_url": "https://api.example.org/jobs",
+        "pagination": {"type": "offset", "page_size": 5, "max_pages": 20, "concurrency": 3},
+        "map": {"title": "title"},
+    })
+    pages = _collect(config, handler)
+
+    titles = [item["title"] for page in pages for item in page]
+    assert titles == [f"Job {i}" for i in range(TOTAL)]
+    assert peak == 3
+
+
+def test_cursor_pagination_follows_the_response_cursor():
+    seen = []
+
+    def handler(request):
+        cursor = request.url.params.get("after")
+        seen.append(cursor)
+        index = int(cursor or 0)
+        return httpx.Response(200, json={
+            "results": [{"name": f"Job {index}"}],
+            "meta": {"next": str(index + 1) if index < 2 else None},
+        })
+
+    config = compile_api_config({
+        "v": 1,
+        "base_url": "https://api.example.org/jobs",
+        "pagination": {"type": "cursor", "cursor_param": "after", "cursor_path": "meta.next"},
+        "data_path": "results",
+        "map": {"title": "name"},
+    })
+
+    assert [page[0]["name"] for page in _collect(config, handler)] == ["Job 0", "Job 1", "Job 2"]
+    assert seen == [None, "1", "2"]
+
+
+def test_invalid_config_is_rejected():
+    with pytest.raises(ValueError):
+        compile_api_config({"v": 1, "base_url": "https://x", "pagination": {"type": "scroll"}, "map": {"title": "t"}})
+    assert compile_api_config("not json") is None
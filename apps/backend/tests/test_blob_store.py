@@ -0,0 +1,71 @@
+"""
+Unit tests for the content-addressed HTML blob store.
+"""
+
+import asyncio
+import os
+import time
+
+from core.blob_store import BlobStore
+from core.html_storage import HTMLStorage
+from pipeline.snapshot import SnapshotManager
+
+PAGE = "<html><body>" + "<li>Programme Officer</li>" * 200 + "</body></html>"
+
+
+def test_put_dedupes_and_compresses(tmp_path):
+    store = BlobStore(str(tmp_path), codec="gzip")
+
+    key, created = store.put(PAGE.encode())
+    again, created_again = store.put(PAGE.encode())
+
+    assert created and not created_again
+    assert key == again
+    assert store.get(key) == PAGE.encode()
+    stats = store.stats()
+    assert stats["dedupe_hits"] == 1
+    assert stats["dedupe_ratio"] == 0.5
+    assert stats["compression_ratio"] > 5
+
+
+def test_gc_removes_only_untouched_blobs(tmp_path):
+    store = BlobStore(str(tmp_path), codec="gzip")
+    old_key, _ = store.put(b"old page")
+    fresh_key, _ = store.put(b"fresh page")
+    stale = time.time() - 40 * 86400
+    os.utime(store._path(old_key), (stale, stale))
+    os.utime(store._path(fresh_key), (stale, stale))
+
+    # Re-seeing content refreshes it
+    store.put(b"fresh page")
+
+    assert store.gc(retention_days=30)["removed"] == 1
+    assert store.get(old_key) is None
+    assert store.get(fresh_key) == b"fresh page"
+
+
+def test_html_storage_returns_blob_refs_and_reads_legacy_paths(tmp_path):
+    store = BlobStore(str(tmp_path / "blobs"), codec="gzip")
+    storage = HTMLStorage(storage_path=str(tmp_path / "raw-html"), blob_store=store)
+
+    ref = asyncio.run(storage.store_async("https://example.org/jobs", PAGE, "src"))
+    assert ref.startswith("sha256:")
+    assert storage.store("https://example.org/jobs", PAGE, "src") == ref
+    assert storage.retrieve(ref) == PAGE
+
+    legacy = tmp_path / "raw-html" / "example_org" / "old.html"
+    legacy.parent.mkdir(parents=True)
+    legacy.write_text("<html>legacy</html>")
+    assert storage.retrieve("example_org/old.html") == "<html>legacy</html>"
+
+
+def test_snapshot_manager_stores_html_in_blob_store(tmp_path):
+    store = BlobStore(str(tmp_path / "blobs"), codec="gzip")
+    manager = SnapshotManager(base_path=str(tmp_path / "snapshots"), blob_store=store)
+
+    asyncio.run(manager.save_snapshot("https://www.example.org/job/1", PAGE, {"fields": {}}))
+
+    meta = manager.retrieve_snapshot("https://www.example.org/job/1")
+    assert meta["html_blob"]
+    assert manager.retrieve_snapshot_html("https://www.example.org/job/1") == PAGE
+    assert not list((tmp_path / "snapshots").rglob("*.html"))
@@ -0,0 +1,49 @@
+"""
+Unit tests for incremental crawl rollups.
+"""
+
+from unittest.mock import MagicMock
+
+from app.crawl_rollups import archive_old_crawl_logs, record_crawl_rollup
+
+
+def test_record_crawl_rollup_upserts_todays_bucket():
+    cur = MagicMock()
+
+    record_crawl_rollup(cur, "src-1", "ok", 1200, found=10, inserted=2, updated=1, skipped=7)
+
+    sql, params = cur.execute.call_args_list[1][0]
+    assert "ON CONFLICT (source_id, bucket_date)" in sql
+    # ok/fail/warn flags, duration sum/count, then counts
+    assert params == ("src-1", 1, 0, 0, 1200, 1, 10, 2, 1, 7)
+    assert cur.execute.call_args_list[-1][0][0] == "RELEASE SAVEPOINT crawl_rollup"
+
+
+def test_record_crawl_rollup_missing_duration_not_averaged():
+    cur = MagicMock()
+
+    record_crawl_rollup(cur, "src-1", "fail", None)
+
+    _, params = cur.execute.call_args_list[1][0]
+    assert params[1:6] == (0, 1, 0, 0, 0)
+
+
+def test_record_crawl_rollup_failure_does_not_abort_transaction():
+    cur = MagicMock()
+    cur.execute.side_effect = [None, Exception("relation does not exist"), None]
+
+    record_crawl_rollup(cur, "src-1", "ok", 10)
+
+    assert cur.execute.call_args_list[-1][0][0] == "ROLLBACK TO SAVEPOINT crawl_rollup"
+
+
+def test_archive_old_crawl_logs_batches_until_drained():
+    cur = MagicMock()
+    type(cur).rowcount = property(lambda self: rowcounts.pop(0))
+    rowcounts = [5000, 12]
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cur
+
+    assert archive_old_crawl_logs(conn, retention_days=30) == 5012
+    assert cur.execute.call_count == 2
+    assert conn.commit.call_count == 2
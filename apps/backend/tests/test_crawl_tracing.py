@@ -0,0 +1,41 @@
+"""
+Unit tests for per-stage crawl tracing.
+"""
+
+from unittest.mock import patch
+
+from core import crawl_tracing
+from core.crawl_tracing import CrawlTrace
+
+
+def test_span_accumulates_repeated_stages_and_observes_histogram():
+    trace = CrawlTrace("html")
+    with patch.object(crawl_tracing, "observe_crawl_stage") as observe:
+        trace.add("parse", 0.25)
+        trace.add("parse", 0.5)
+        trace.add("fetch", 1.0)
+
+    assert trace.stages == {"parse": 0.75, "fetch": 1.0}
+    assert observe.call_args_list[0][0] == ("html", "parse", 0.25)
+
+
+def test_span_records_time_when_stage_raises():
+    trace = CrawlTrace("rss")
+    try:
+        with trace.span("fetch"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    assert "fetch" in trace.stages
+
+
+def test_breakdown_is_in_pipeline_order_with_other_and_total():
+    trace = CrawlTrace(None)
+    trace.stages = {"save": 0.2, "fetch": 1.0, "custom": 0.05}
+    with patch.object(trace, "elapsed", return_value=1.5):
+        breakdown = trace.breakdown()
+
+    assert list(breakdown) == ["fetch", "save", "custom", "other", "total"]
+    assert breakdown["fetch"] == 1000 and breakdown["other"] == 250 and breakdown["total"] == 1500
+    assert trace.source_type == "unknown"
@@ -0,0 +1,41 @@
+"""
+Unit tests for the shared deadline/date parser.
+"""
+
+from datetime import date
+from unittest.mock import patch
+
+from core import date_parsing
+from core.date_parsing import normalize_dates, parse_date, parse_date_str
+
+
+def test_common_formats_parse_without_fallback():
+    cases = {
+        "2025-12-31T23:59:59Z": "2025-12-31",
+        "12-DEC-2025": "2025-12-12",
+        "10 Dec 2025": "2025-12-10",
+        "December 10, 2025": "2025-12-10",
+        "Closing date: Friday, 12th December 2025": "2025-12-12",
+        "10/12/2025": "2025-12-10",
+        "13/04/25": "2025-04-13",
+    }
+    with patch.object(date_parsing, "_parse_fallback", side_effect=AssertionError("fallback used")):
+        for raw, expected in cases.items():
+            assert parse_date_str(raw) == expected, raw
+
+
+def test_ambiguous_numeric_dates_follow_day_first():
+    assert parse_date("03/04/2025") == date(2025, 4, 3)
+    assert parse_date("03/04/2025", day_first=False) == date(2025, 3, 4)
+    # Only one reading is valid, so the preference does not matter
+    assert parse_date("04/13/2025") == date(2025, 4, 13)
+
+
+def test_bulk_normalization_parses_each_distinct_string_once():
+    values = ["10 Dec 2025", "n/a", None, "10 Dec 2025", "not a date at all"]
+    with patch.object(date_parsing, "_parse_fast", wraps=date_parsing._parse_fast) as fast:
+        date_parsing._parse_cached.cache_clear()
+        result = normalize_dates(values, fallback=False)
+
+    assert result == ["2025-12-10", None, None, "2025-12-10", None]
+    assert fast.call_count == 2
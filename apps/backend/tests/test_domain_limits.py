@@ -0,0 +1,111 @@
+"""
+Unit tests for shared (cross-process) domain rate limiting.
+"""
+
+import asyncio
+import threading
+from unittest.mock import patch
+
+from core.domain_limits import DomainLimiter, SharedBucketStore, SharedTokenBucket, acquire_token
+from core.host_cache import policy_cache
+
+
+class FakeStore(SharedBucketStore):
+    """In-memory stand-in for domain_rate_limits: one bucket per host, no refill"""
+
+    def __init__(self, tokens):
+        super().__init__("postgresql://unused")
+        self.tokens = tokens
+        self.calls = 0
+        self.down = False
+        self.threads = set()
+
+    def lease(self, host, capacity, refill_rate, want):
+        self.calls += 1
+        self.threads.add(threading.get_ident())
+        if self.down:
+            raise RuntimeError("connection refused")
+        granted = min(int(self.tokens), want)
+        self.tokens -= granted
+        return (granted, 0.0) if granted else (0, 1.0 / refill_rate)
+
+
+def test_local_lease_is_fast_path():
+    store = FakeStore(tokens=4)
+    bucket = SharedTokenBucket(store, "careers.un.org", tokens=4, refill_rate=1.0, lease_tokens=2)
+
+    for _ in range(4):
+        assert asyncio.run(bucket.wait_time()) == 0 and bucket.consume()
+
+    assert store.calls == 2  # One round trip per leased pair
+    assert asyncio.run(bucket.wait_time()) == 1.0 and not bucket.consume()  # Shared bucket empty
+    assert threading.get_ident() not in store.threads  # Leases never run on the event loop
+
+
+def test_processes_share_one_budget():
+    store = FakeStore(tokens=1)
+    worker_a = SharedTokenBucket(store, "careers.un.org", tokens=1, refill_rate=0.5)
+    worker_b = SharedTokenBucket(store, "careers.un.org", tokens=1, refill_rate=0.5)
+
+    assert asyncio.run(worker_a.wait_time()) == 0 and worker_a.consume()
+    assert asyncio.run(worker_b.wait_time()) == 2.0  # Other process took the only token
+
+
+def test_store_errors_fall_back_to_local_buckets():
+    store = FakeStore(tokens=10)
+    store.down = True
+    bucket = SharedTokenBucket(store, "jobs.example.org", tokens=1, refill_rate=1.0)
+    other_host = SharedTokenBucket(store, "careers.un.org", tokens=1, refill_rate=1.0)
+
+    assert asyncio.run(bucket.wait_time()) == 0 and bucket.consume()
+    assert not bucket.shared and not other_host.shared
+    assert asyncio.run(bucket.wait_time()) > 0  # Local bucket still enforces the rate
+    assert asyncio.run(other_host.wait_time()) == 0 and other_host.consume()
+    assert store.calls == 1  # Store not retried during the back-off, for any host
+
+
+def test_wait_is_recorded_per_host():
+    store = FakeStore(tokens=0)
+    bucket = SharedTokenBucket(store, "reliefweb.int", tokens=1, refill_rate=100.0)
+    slept = []
+
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+        store.tokens = 1  # Refilled while we waited
+
+    with patch("core.domain_limits.asyncio.sleep", new=fake_sleep), \
+            patch("metrics.observe_domain_wait") as observe:
+        waited = asyncio.run(acquire_token(bucket, "reliefweb.int"))
+
+    assert slept == [0.01] and waited == 0.01
+    observe.assert_called_once_with("reliefweb.int", 0.01, "shared")
+
+
+def test_limiters_sharing_a_store_throttle_the_same_host():
+    host = "careers.unicef.org"
+    policy = {'max_concurrency': 1, 'min_request_interval_ms': 500, 'max_pages': 10,
+              'max_kb_per_page': 1024, 'allow_js': False}
+    store = FakeStore(tokens=1)
+    scheduler, api_process = DomainLimiter("postgresql://unused"), DomainLimiter("postgresql://unused")
+    for limiter in (scheduler, api_process):
+        limiter.store = store
+        limiter._read_policy = lambda _host: policy
+    policy_cache.invalidate(host)
+    slept = []
+
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+        store.tokens = 1
+
+    async def main():
+        await scheduler.wait_for_slot(host)
+        assert slept == []
+        await api_process.wait_for_slot(host)  # Its own first request to the host
+
+    with patch("core.domain_limits.asyncio.sleep", new=fake_sleep), \
+            patch("metrics.observe_domain_wait") as observe:
+        asyncio.run(main())
+    policy_cache.invalidate(host)
+
+    assert slept == [0.5]  # Waited for the shared bucket to refill
+    assert observe.call_args_list[-1].args == (host, 0.5, "shared")
@@ -0,0 +1,70 @@
+"""
+Unit tests for enrichment consistency similarity lookup.
+"""
+
+from unittest.mock import MagicMock, patch
+
+from app import enrichment_consistency
+from app.enrichment_consistency import find_similar_jobs, normalize_title
+
+
+def _candidate(job_id, title, title_sim, desc_sim):
+    return {
+        "id": job_id,
+        "title": title,
+        "org_name": "UNDP",
+        "impact_domain": ["health"],
+        "functional_role": ["programme"],
+        "experience_level": "mid",
+        "confidence_overall": 0.9,
+        "title_similarity": title_sim,
+        "description_similarity": desc_sim,
+    }
+
+
+def _mock_connect(candidates):
+    cursor = MagicMock()
+    cursor.fetchall.return_value = candidates
+    conn = MagicMock()
+    conn.cursor.return_value = cursor
+    return MagicMock(return_value=conn), cursor
+
+
+def test_normalize_title():
+    assert normalize_title("  Programme   Officer\tHealth ") == "programme officer health"
+    assert normalize_title(None) == ""
+
+
+def test_find_similar_jobs_uses_trigram_query_and_threshold():
+    candidates = [
+        _candidate("a", "Programme Officer", 0.95, 0.9),
+        _candidate("b", "Programme Assistant", 0.80, 0.2),
+        _candidate("c", "Programme Officer (Health)", 0.90, 0.85),
+    ]
+    connect, cursor = _mock_connect(candidates)
+
+    with patch.object(enrichment_consistency.db_config, "get_connection_params",
+                      return_value={"host": "x"}), \
+         patch.object(enrichment_consistency.psycopg2, "connect", connect):
+        results = find_similar_jobs("job-1", "Programme  Officer", "desc", similarity_threshold=0.85)
+
+    # One query to set the threshold, one indexed trigram lookup
+    assert cursor.execute.call_count == 2
+    sql, params = cursor.execute.call_args_list[1][0]
+    assert "lower(title) %% %(title)s" in sql
+    assert params["title"] == "programme officer"
+
+    assert [r["job_id"] for r in results] == ["a", "c"]
+    assert results[0]["similarity"] >= results[1]["similarity"]
+
+
+def test_find_similar_jobs_respects_top_k():
+    candidates = [_candidate(str(i), "Programme Officer", 1.0, 1.0) for i in range(20)]
+    connect, _ = _mock_connect(candidates)
+
+    with patch.object(enrichment_consistency.db_config, "get_connection_params",
+                      return_value={"host": "x"}), \
+         patch.object(enrichment_consistency.psycopg2, "connect", connect):
+        results = find_similar_jobs("job-1", "Programme Officer", top_k=3)
+
+    assert len(results) == 3
@@ -0,0 +1,73 @@
+"""
+Unit tests for the extraction process pool.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from core.extraction_executor import ExtractionExecutor, ExtractionQueueFull, ExtractionTimeout
+
+
+def _square(x):
+    return {"value": x * x}
+
+
+def _sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def test_run_returns_worker_result_and_records_metrics():
+    executor = ExtractionExecutor(max_workers=1, max_queue=4, task_timeout=60, max_tasks_per_worker=2)
+
+    async def main():
+        return await asyncio.gather(*(executor.run("test", _square, i) for i in range(3)))
+
+    try:
+        results = asyncio.run(main())
+    finally:
+        executor.shutdown()
+
+    assert results == [{"value": 0}, {"value": 1}, {"value": 4}]
+    stats = executor.stats()
+    assert stats["tasks"] == 3
+    assert stats["running"] == 0 and stats["queued"] == 0
+
+
+def test_full_queue_rejects_instead_of_waiting():
+    executor = ExtractionExecutor(max_workers=1, max_queue=0, task_timeout=60)
+
+    async def main():
+        busy = asyncio.create_task(executor.run("test", _sleep, 0.5))
+        await asyncio.sleep(0)
+        with pytest.raises(ExtractionQueueFull):
+            await executor.run("test", _square, 2)
+        return await busy
+
+    try:
+        assert asyncio.run(main()) == 0.5
+    finally:
+        executor.shutdown()
+    assert executor.stats()["rejected"] == 1
+
+
+def test_timeout_replaces_the_pool():
+    executor = ExtractionExecutor(max_workers=1, max_queue=0, task_timeout=3)
+
+    async def main():
+        await executor.run("test", _square, 1)  # worker started before timing
+        executor.task_timeout = 0.2
+        with pytest.raises(ExtractionTimeout):
+            await executor.run("test", _sleep, 30)
+        executor.task_timeout = 30
+        return await executor.run("test", _square, 3)
+
+    try:
+        assert asyncio.run(main()) == {"value": 9}
+    finally:
+        executor.shutdown()
+    stats = executor.stats()
+    assert stats["timeouts"] == 1
+    assert stats["pool_restarts"] == 1
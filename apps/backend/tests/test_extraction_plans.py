@@ -0,0 +1,67 @@
+"""
+Unit tests for learned per-source extraction plans.
+"""
+
+from core.extraction_plans import ExtractionPlanStore
+from core.strategy_selector import StrategySelector
+
+
+def _jobs(n):
+    return [
+        {"title": f"Programme Officer {i}", "apply_url": f"https://example.org/jobs/{i}"}
+        for i in range(n)
+    ]
+
+
+def test_execute_plan_runs_only_the_planned_strategy():
+    calls = []
+    strategies = {
+        "tables": lambda h, b: calls.append("tables") or _jobs(4),
+        "links": lambda h, b: calls.append("links") or _jobs(1),
+    }
+    plan = {"strategy": "tables", "expected_jobs": 4, "validation_rate": 1.0}
+
+    jobs, metadata = StrategySelector().execute_plan("<html></html>", "https://example.org", strategies, plan)
+
+    assert len(jobs) == 4
+    assert metadata["plan_hit"] is True
+    assert calls == ["tables"]
+
+
+def test_execute_plan_misses_when_job_count_deviates():
+    strategies = {"divs": lambda h, b: _jobs(2)}
+    plan = {"strategy": "divs", "expected_jobs": 20, "validation_rate": 1.0}
+
+    jobs, metadata = StrategySelector().execute_plan("<html></html>", "https://example.org", strategies, plan)
+
+    assert jobs is None
+    assert "expected 20" in metadata["plan_miss_reason"]
+
+
+def test_select_and_validate_describes_winning_plan():
+    html = "<table><tr><th>Position</th><th>Duty Station</th></tr><tr><td>x</td><td>y</td></tr></table>"
+    strategies = {"tables": lambda h, b: _jobs(3)}
+
+    _, metadata = StrategySelector().select_and_validate(html, "https://example.org", strategies)
+
+    assert metadata["plan"] == {
+        "strategy": "tables",
+        "container_selector": None,
+        "column_map": {"0": "title", "1": "location"},
+        "expected_jobs": 3,
+        "validation_rate": 1.0,
+    }
+
+
+def test_plan_store_caches_learned_plans_and_counts_hits():
+    store = ExtractionPlanStore(None)
+    assert store.get("src-1") is None
+
+    store.learn("src-1", {"strategy": "links", "expected_jobs": 5, "full_ms": 900})
+    store.record_hit("src-1", 700)
+    store.record_miss("src-1", "job count 0 vs expected 5")
+
+    assert store.get("src-1")["strategy"] == "links"
+    stats = store.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["hit_rate"] == 0.5
+    assert stats["avg_time_saved_ms"] == 700
@@ -0,0 +1,74 @@
+"""
+Unit tests for the host-keyed robots/domain policy cache.
+"""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+from core.domain_limits import DomainLimiter
+from core.host_cache import HostTTLCache, invalidate_host, policy_cache, robots_cache
+from core.robots import RobotsChecker, RobotsRules
+
+
+def test_robots_rules_compile_prefixes_and_wildcards():
+    rules = RobotsRules(["/private", "/*.pdf$", "/search*q="])
+
+    assert rules.allows("/jobs/123")
+    assert not rules.allows("/private/page")
+    assert not rules.allows("/docs/tor.pdf")
+    assert rules.allows("/docs/tor.pdf.html")
+    assert not rules.allows("/search/?q=nurse")
+
+
+def test_robots_fetch_is_single_flight_and_cached():
+    robots_cache.clear()
+    checker = RobotsChecker.__new__(RobotsChecker)
+    checker._read_cached = MagicMock(return_value=None)
+    fetches = []
+
+    async def fetch(url, max_size_kb=100):
+        fetches.append(url)
+        await asyncio.sleep(0.01)
+        return 200, {}, b"User-agent: *\nDisallow: /admin\nCrawl-delay: 2", 40
+
+    checker.http_client = MagicMock(fetch=fetch)
+
+    async def run():
+        urls = [f"https://jobs.example.org/vacancy/{i}" for i in range(10)] + ["https://jobs.example.org/admin/x"]
+        return await asyncio.gather(*(checker.get_robots_info(u) for u in urls))
+
+    with patch.object(RobotsChecker, "_get_db_conn"):
+        results = asyncio.run(run())
+        again = asyncio.run(checker.get_robots_info("https://jobs.example.org/vacancy/11"))
+
+    assert fetches == ["https://jobs.example.org/robots.txt"]
+    assert [r["allowed"] for r in results] == [True] * 10 + [False]
+    assert results[0]["crawl_delay_ms"] == 2000 and again["cached"]
+    robots_cache.clear()
+
+
+def test_missing_policy_is_cached_until_invalidated():
+    policy_cache.clear()
+    limiter = DomainLimiter("postgres://test")
+    limiter._read_policy = MagicMock(return_value=None)
+
+    for _ in range(3):
+        policy = asyncio.run(limiter.get_policy("ngo.example.org"))
+    assert policy["min_request_interval_ms"] == 3000
+    assert limiter._read_policy.call_count == 1  # Negative result cached
+
+    limiter._read_policy.return_value = {"max_concurrency": 2, "min_request_interval_ms": 500,
+                                         "max_pages": 50, "max_kb_per_page": 2048, "allow_js": True}
+    invalidate_host("ngo.example.org")
+    assert asyncio.run(limiter.get_policy("ngo.example.org"))["min_request_interval_ms"] == 500
+    assert limiter._read_policy.call_count == 2
+    policy_cache.clear()
+
+
+def test_entries_expire_after_ttl():
+    cache = HostTTLCache("test", ttl_seconds=60, negative_ttl_seconds=0)
+    cache.put("a.example.org", {"x": 1})
+    cache.put("b.example.org", None)
+
+    assert cache.get("A.example.org") == (True, {"x": 1})
+    assert cache.get("b.example.org") == (False, None)  # Negative TTL elapsed
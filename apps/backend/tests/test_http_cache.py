@@ -0,0 +1,79 @@
+"""
+Tests for ETag/Cache-Control handling and the job detail/facets response caches.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import http_cache
+from main import app
+
+client = TestClient(app)
+
+JOB_ID = "0b6f8a1e-3c2d-4f5a-9b7c-1d2e3f4a5b6c"
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    http_cache.invalidate_all()
+    yield
+    http_cache.invalidate_all()
+
+
+def _job(title="Programme Officer"):
+    return {"status": "ok", "data": {"id": JOB_ID, "title": title}, "source": "db"}
+
+
+def test_job_detail_etag_304_and_invalidation():
+    loader = AsyncMock(side_effect=[_job(), _job("Senior Programme Officer")])
+    with patch("main.search_service.get_job_by_id", loader):
+        first = client.get(f"/api/jobs/{JOB_ID}")
+        assert first.status_code == 200
+        assert first.json()["data"]["title"] == "Programme Officer"
+        etag = first.headers["etag"]
+        assert etag.startswith('"') and first.headers["cache-control"] == http_cache.JOB_DETAIL_POLICY.header()
+
+        not_modified = client.get(f"/api/jobs/{JOB_ID}", headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304 and not_modified.content == b""
+        assert not_modified.headers["etag"] == etag
+        assert loader.await_count == 1
+
+        http_cache.invalidate_job(JOB_ID)
+        changed = client.get(f"/api/jobs/{JOB_ID}", headers={"If-None-Match": etag})
+        assert changed.status_code == 200 and changed.headers["etag"] != etag
+        assert changed.json()["data"]["title"] == "Senior Programme Officer"
+        assert loader.await_count == 2
+
+
+def test_missing_job_is_404_and_cached_briefly():
+    loader = AsyncMock(return_value=None)
+    with patch("main.search_service.get_job_by_id", loader):
+        assert client.get(f"/api/jobs/{JOB_ID}").status_code == 404
+        assert client.get(f"/api/jobs/{JOB_ID}").status_code == 404
+    assert loader.await_count == 1
+
+
+def test_degraded_facets_are_not_cached():
+    degraded = {"enabled": False, "facets": {}, "error": "connection refused"}
+    healthy = {"enabled": True, "facets": {"country": {"KE": 3}}}
+    loader = AsyncMock(side_effect=[degraded, healthy, healthy])
+    with patch("main.search_service.get_facets", loader):
+        first = client.get("/api/search/facets")
+        assert first.json() == degraded and first.headers["cache-control"] == "no-store"
+
+        second = client.get("/api/search/facets")
+        third = client.get("/api/search/facets")
+        assert second.json() == healthy == third.json()
+        assert third.headers["cache-control"] == http_cache.FACETS_POLICY.header()
+    assert loader.await_count == 2
+
+
+def test_etag_matching():
+    etag = http_cache.make_etag(b"{}")
+    assert http_cache.etag_matches(etag, etag)
+    assert http_cache.etag_matches(f'"other", W/{etag}', etag)
+    assert http_cache.etag_matches("*", etag)
+    assert not http_cache.etag_matches('"other"', etag)
+    assert not http_cache.etag_matches(None, etag)
@@ -0,0 +1,126 @@
+"""
+Unit tests for chunked bulk job operations.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+from app import job_bulk_ops
+from app.job_bulk_ops import (
+    BulkJobOperation,
+    BulkJobOperationRunner,
+    build_filter,
+    normalize_job_ids,
+)
+
+ID_A = "00000000-0000-0000-0000-00000000000a"
+ID_B = "00000000-0000-0000-0000-00000000000b"
+
+
+def test_normalize_job_ids_drops_malformed_and_duplicates():
+    valid, invalid = normalize_job_ids([ID_B, " " + ID_A.upper(), ID_B, "nope"])
+    assert valid == [ID_A, ID_B]
+    assert invalid == ["nope"]
+
+
+def test_build_filter_uses_typed_arrays_and_state_per_kind():
+    clauses, values = build_filter("soft_delete", {"job_ids": [ID_A]})
+    assert clauses == ["id = ANY(%s::uuid[])", "deleted_at IS NULL"]
+    assert values == [[ID_A]]
+
+    clauses, _ = build_filter("restore", {"source_id": ID_A})
+    assert clauses == ["source_id = %s::uuid", "deleted_at IS NOT NULL"]
+
+    clauses, _ = build_filter("hard_delete", {"org_name": "UNDP"})
+    assert clauses == ["org_name ILIKE %s"]
+
+
+def _mock_conn(select_ids, returned_rows):
+    cursor = MagicMock()
+    cursor.fetchall.side_effect = [
+        [{"id": i} for i in select_ids],
+        returned_rows,
+    ]
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+    return conn, cursor
+
+
+def test_run_chunk_applies_audits_and_checkpoints_in_one_transaction():
+    runner = BulkJobOperationRunner()
+    op = BulkJobOperation("soft_delete", {"org_name": "UNDP", "deletion_reason": "cleanup"}, chunk_size=2)
+    conn, cursor = _mock_conn(
+        [ID_A, ID_B],
+        [{"id": ID_A, "source_id": "s1"}, {"id": ID_B, "source_id": "s1"}],
+    )
+
+    with patch.object(job_bulk_ops, "_get_db_conn", return_value=conn), \
+         patch.object(job_bulk_ops, "execute_values") as bulk_insert, \
+         patch.object(job_bulk_ops, "remove_from_search") as remove:
+        assert runner.run_chunk(op) is True
+
+    update_sql, update_params = cursor.execute.call_args_list[1][0]
+    assert "id = ANY(%s::uuid[])" in update_sql
+    assert update_params == ("cleanup", [ID_A, ID_B])
+
+    # One audit row for the single source in the chunk
+    audit_rows = bulk_insert.call_args[0][2]
+    assert len(audit_rows) == 1 and audit_rows[0][3] == 2
+
+    assert op.last_id == ID_B and op.affected == 2 and op.chunks == 1
+    assert any("UPDATE job_bulk_operations" in c[0][0] for c in cursor.execute.call_args_list)
+    conn.commit.assert_called_once()
+    remove.assert_called_once_with([ID_A, ID_B])
+
+
+def test_resumed_operation_continues_after_last_id():
+    runner = BulkJobOperationRunner()
+    op = BulkJobOperation("restore", {"job_ids": [ID_A, ID_B]})
+    op.last_id = ID_A
+    conn, cursor = _mock_conn([], [])
+
+    with patch.object(job_bulk_ops, "_get_db_conn", return_value=conn):
+        assert runner.run_chunk(op) is False
+
+    select_sql, select_params = cursor.execute.call_args_list[0][0]
+    assert "id > %s::uuid" in select_sql
+    assert select_params[-2] == ID_A
+
+
+def _persisted(status, processed, age_seconds):
+    op = BulkJobOperation("soft_delete", {"job_ids": [ID_A, ID_B]}, operation_id=ID_A)
+    op.status, op.total, op.processed = status, 2, processed
+    op.updated_at = datetime.now(timezone.utc) - timedelta(seconds=age_seconds)
+    return op
+
+
+def _progress_lines(runner):
+    from app.job_management import stream_bulk_operation_progress
+
+    async def collect():
+        with patch("app.job_management.get_bulk_runner", return_value=runner):
+            response = await stream_bulk_operation_progress(ID_A, interval=0.2, admin=None)
+            return [json.loads(line) async for line in response.body_iterator]
+
+    return asyncio.run(collect())
+
+
+def test_progress_stream_rereads_operations_owned_elsewhere():
+    runner = BulkJobOperationRunner()
+    states = [_persisted("running", 0, 1), _persisted("running", 1, 1), _persisted("completed", 2, 0)]
+    with patch.object(runner, "_load", side_effect=lambda _id: states.pop(0)):
+        lines = _progress_lines(runner)
+
+    assert [(line["status"], line["processed"]) for line in lines] == [
+        ("running", 1), ("completed", 2),
+    ]
+
+
+def test_progress_stream_ends_when_no_runner_owns_the_operation():
+    runner = BulkJobOperationRunner()
+    with patch.object(runner, "_load", return_value=_persisted("running", 1, 3600)):
+        lines = _progress_lines(runner)
+
+    assert len(lines) == 1 and lines[0]["status"] == "interrupted" and lines[0]["processed"] == 1
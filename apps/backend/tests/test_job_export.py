@@ -0,0 +1,130 @@
+"""
+Unit tests for streaming job export.
+"""
+
+import asyncio
+import gzip
+import json
+from datetime import date, datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import HTTPException
+
+from app.job_management import (
+    EXPORT_COLUMNS,
+    ExportRequest,
+    _build_export_query,
+    _encode_csv,
+    _encode_ndjson,
+    _gzip_stream,
+    _iter_export_rows,
+    _stream_export,
+    _validate_export_request,
+)
+
+
+def _row(i):
+    return {
+        "id": f"00000000-0000-0000-0000-00000000000{i}",
+        "title": f"Job {i}",
+        "org_name": "UNICEF",
+        "location_raw": "Geneva",
+        "country_iso": "CH",
+        "level_norm": None,
+        "deadline": date(2025, 12, 1),
+        "apply_url": "https://example.org",
+        "description_snippet": "a, \"quoted\" snippet",
+        "status": "active",
+        "source_id": None,
+        "created_at": datetime(2025, 1, i, tzinfo=timezone.utc),
+        "fetched_at": None,
+    }
+
+
+def _collect(body):
+    async def run():
+        return b"".join([chunk async for chunk in body])
+    return asyncio.run(run())
+
+
+def test_build_export_query_keyset_resume():
+    request = ExportRequest(format="csv", job_ids=["a", "b"],
+                            after_created_at="2025-01-02T00:00:00Z", after_id="x")
+    sql, params = _build_export_query(request, streaming=True)
+
+    assert "id = ANY(%s::uuid[])" in sql
+    assert "(created_at, id) < (%s::timestamptz, %s::uuid)" in sql
+    assert "ORDER BY created_at DESC, id DESC" in sql
+    assert "LIMIT" not in sql
+    assert params == [["a", "b"], "2025-01-02T00:00:00Z", "x"]
+
+
+def test_export_request_is_validated_before_streaming():
+    request = _validate_export_request(ExportRequest(
+        format="csv", job_ids=[_row(2)["id"].upper(), _row(1)["id"]],
+        after_created_at="2025-01-02T00:00:00Z", after_id=_row(2)["id"]))
+    assert request.job_ids == [_row(1)["id"], _row(2)["id"]]
+    assert request.after_created_at == "2025-01-02T00:00:00+00:00"
+
+    for bad in (
+        {"job_ids": [_row(1)["id"], "not-a-uuid"]},
+        {"after_created_at": "yesterday", "after_id": _row(1)["id"]},
+        {"after_created_at": "2025-01-02T00:00:00Z", "after_id": "x"},
+        {"after_id": _row(1)["id"]},
+    ):
+        with pytest.raises(HTTPException) as exc:
+            _validate_export_request(ExportRequest(format="csv", **bad))
+        assert exc.value.status_code == 400
+
+
+def test_json_export_stays_capped():
+    sql, params = _build_export_query(ExportRequest(limit=50000), streaming=False)
+    assert sql.rstrip().endswith("LIMIT %s")
+    assert params == [10000]
+
+
+def test_csv_and_ndjson_encoders_stream_per_chunk():
+    chunks = [[_row(1), _row(2)], [_row(3)]]
+
+    csv_parts = list(_encode_csv(iter(chunks)))
+    assert len(csv_parts) == 2
+    lines = b"".join(csv_parts).decode().splitlines()
+    assert lines[0] == ",".join(EXPORT_COLUMNS)
+    assert len(lines) == 4
+    assert '"a, ""quoted"" snippet"' in lines[1]
+
+    ndjson = b"".join(_encode_ndjson(iter(chunks))).decode().splitlines()
+    assert [json.loads(line)["title"] for line in ndjson] == ["Job 1", "Job 2", "Job 3"]
+    assert json.loads(ndjson[0])["deadline"] == "2025-12-01"
+
+
+def test_gzip_stream_round_trips():
+    data = b"".join(_gzip_stream(iter([b"hello ", b"world"])))
+    assert gzip.decompress(data) == b"hello world"
+
+
+def test_iter_export_rows_uses_named_cursor_and_closes_connection():
+    cursor = MagicMock()
+    cursor.fetchmany.side_effect = [[_row(1)], []]
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+
+    assert list(_iter_export_rows(conn, "SELECT 1", [])) == [[_row(1)]]
+    assert conn.cursor.call_args.kwargs["name"] == "jobs_export"
+    conn.close.assert_called_once()
+
+
+def test_stream_export_gzip_ndjson_response():
+    cursor = MagicMock()
+    cursor.fetchmany.side_effect = [[_row(1), _row(2)], []]
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+
+    response = _stream_export(conn, ExportRequest(format="ndjson", gzip=True))
+
+    assert response.media_type == "application/gzip"
+    assert ".ndjson.gz" in response.headers["content-disposition"]
+    lines = gzip.decompress(_collect(response.body_iterator)).decode().splitlines()
+    assert len(lines) == 2
+    conn.close.assert_called_once()
@@ -0,0 +1,40 @@
+"""
+Unit tests for the compiled keyword matcher.
+"""
+
+import random
+
+from core.keyword_matcher import KeywordMatcher
+
+
+def test_substring_mode_matches_plain_in_checks():
+    vocabulary = ['job', 'jobs', '/job/', 'vacanc', 'apply', 'application', 'officer']
+    matcher = KeywordMatcher(vocabulary)
+    rng = random.Random(3)
+    fragments = ['/job/12', 'Jobs', 'vacancies', 'apply now', 'applications', 'officer', 'home', '-']
+
+    for _ in range(500):
+        text = ''.join(rng.choice(fragments) for _ in range(rng.randint(1, 4))).lower()
+        expected = {kw for kw in vocabulary if kw in text}
+        assert matcher.matched(text) == expected
+        first = next((kw for kw in vocabulary if kw in text), None)
+        assert matcher.first(text) == first
+
+
+def test_word_and_auto_boundaries():
+    word = KeywordMatcher(['head', 'senior', 'entry-level'], boundary='word')
+    assert word.matched('Head of Office') == {'head'}
+    assert word.matched('Headquarters liaison') == set()
+    assert word.matched('Entry-level Senior') == {'entry-level', 'senior'}
+
+    auto = KeywordMatcher(['it', 'pm', 'program', '10+'], boundary='auto')
+    assert auto.matched('with three development programmes') == {'program'}
+    assert auto.matched('IT support, 10+ years') == {'it', '10+'}
+
+
+def test_match_prefix_covers_exact_and_startswith():
+    matcher = KeywordMatcher(['home', 'about us', 'life at'])
+    assert matcher.match_prefix('home') == 'home'
+    assert matcher.match_prefix('Life at UNICEF') == 'life at'
+    assert matcher.match_prefix('homepage') == 'home'
+    assert matcher.match_prefix('project home') is None
@@ -0,0 +1,90 @@
+"""
+Unit tests for bulk link validation and the in-memory cache tier.
+"""
+
+import asyncio
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from core.link_validator import LinkValidator, ValidationLRU, is_dead_link
+
+
+def _result(valid, status_code=200, error=None):
+    return {
+        'valid': valid,
+        'status_code': status_code,
+        'final_url': None,
+        'redirect_count': 0,
+        'error': error,
+        'cached': False,
+        'validated_at': datetime.utcnow(),
+    }
+
+
+def test_lru_evicts_oldest_and_expires():
+    lru = ValidationLRU(maxsize=2, ttl_seconds=60)
+    lru.put("a", {"valid": True})
+    lru.put("b", {"valid": True})
+    lru.get("a")
+    lru.put("c", {"valid": True})
+
+    assert lru.get("b") is None
+    assert lru.get("a") is not None
+
+    expired = ValidationLRU(maxsize=2, ttl_seconds=-1)
+    expired.put("a", {"valid": True})
+    assert expired.get("a") is None
+
+
+def test_is_dead_link_ignores_transient_failures():
+    assert is_dead_link(_result(True)) is False
+    assert is_dead_link(_result(False, 404)) is True
+    assert is_dead_link(_result(False, 503)) is None
+    assert is_dead_link(_result(False, None, 'Validation error: timeout')) is None
+
+
+def test_validate_batch_uses_bulk_cache_io():
+    validator = LinkValidator("postgresql://test")
+    validator.memory_cache.put("https://a.org/1", _result(True))
+
+    checked = []
+
+    async def fake_perform(url, follow_redirects=True):
+        checked.append(url)
+        return _result(True)
+
+    with patch.object(validator, "_get_cached_validations",
+                      return_value={"https://b.org/2": _result(True)}) as bulk_get, \
+         patch.object(validator, "_cache_validations") as bulk_put, \
+         patch.object(validator, "_perform_validation", side_effect=fake_perform):
+        results = asyncio.run(validator.validate_batch([
+            "https://a.org/1", "https://b.org/2", "https://c.org/3", "https://c.org/3",
+        ]))
+
+    # Memory hit is not re-queried; remaining URLs are fetched in one lookup
+    bulk_get.assert_called_once_with(["https://b.org/2", "https://c.org/3"])
+    assert checked == ["https://c.org/3"]
+    bulk_put.assert_called_once()
+    assert list(bulk_put.call_args[0][0]) == ["https://c.org/3"]
+    assert set(results) == {"https://a.org/1", "https://b.org/2", "https://c.org/3"}
+
+
+def test_mark_jobs_flags_only_definitive_results():
+    validator = LinkValidator("postgresql://test")
+    cursor = MagicMock()
+    cursor.rowcount = 1
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+
+    with patch.object(validator, "_get_db_conn", return_value=conn):
+        counts = validator._mark_jobs({
+            "https://dead": _result(False, 404),
+            "https://flaky": _result(False, 503),
+            "https://ok": _result(True),
+        })
+
+    assert counts == {'marked_dead': 1, 'marked_alive': 1}
+    dead_sql, dead_params = cursor.execute.call_args_list[0][0]
+    assert "apply_url_valid = FALSE" in dead_sql
+    assert dead_params == (["https://dead"],)
+    conn.commit.assert_called_once()
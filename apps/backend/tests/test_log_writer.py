@@ -0,0 +1,166 @@
+"""
+Unit tests for the buffered crawl log writer.
+"""
+
+import asyncio
+import time
+import uuid
+from unittest.mock import MagicMock, patch
+
+import psycopg2
+
+from core.extraction_logger import ExtractionLogger
+from core.log_writer import LogWriter
+
+
+class FakeDB:
+    """Records execute_values calls per commit; can be made unavailable"""
+
+    def __init__(self):
+        self.commits = []
+        self.down = False
+        self._pending = []
+
+    def connect(self, db_url):
+        if self.down:
+            raise RuntimeError("connection refused")
+        conn = MagicMock()
+        conn.commit.side_effect = lambda: self.commits.append(list(self._pending)) or self._pending.clear()
+        conn.rollback.side_effect = self._pending.clear
+        return conn
+
+    def execute_values(self, cur, sql, rows, template=None, page_size=None):
+        rows = list(rows)
+        if any("bad-source" in row for row in rows):
+            raise psycopg2.IntegrityError("violates foreign key constraint")
+        self._pending.append((sql.split()[2], rows))
+
+
+def _patched(db):
+    return (
+        patch("core.log_writer.psycopg2.connect", side_effect=db.connect),
+        patch("core.log_writer.execute_values", side_effect=db.execute_values),
+    )
+
+
+def test_ids_are_available_before_batched_parent_first_write():
+    db = FakeDB()
+    connect, values = _patched(db)
+    with connect, values:
+        writer = LogWriter("postgres://test", batch_size=100, flush_interval_ms=60_000)
+        log = ExtractionLogger("postgres://test", writer=writer)
+
+        raw_page_id = log.log_raw_page("https://example.org/jobs", 200, "ab/cd.html.gz", 1234, "src-1")
+        log_id = log.log_extraction("https://example.org/jobs", "EMPTY", "src-1", raw_page_id, reason="No jobs found")
+        failed_id = log.log_failed_insert("https://example.org/jobs/1", "bad deadline", "src-1",
+                                          payload={"title": "x" * 600})
+        assert uuid.UUID(raw_page_id) and uuid.UUID(log_id) and uuid.UUID(failed_id)
+        assert db.commits == []  # Nothing written yet
+
+        assert writer.flush()
+        writer.close()
+
+    assert len(db.commits) == 1
+    tables = [table for table, _ in db.commits[0]]
+    assert tables == ["raw_pages", "extraction_logs", "failed_inserts"]
+    (_, [raw_row]), (_, [log_row]), (_, [failed_row]) = db.commits[0]
+    assert raw_row[0] == raw_page_id
+    assert log_row[:3] == (log_id, "https://example.org/jobs", raw_page_id)
+    assert failed_row[0] == failed_id and len(failed_row[3]) < 600
+    assert writer.stats()["rows_written"] == 3
+
+
+def test_background_flush_on_batch_size_and_close():
+    db = FakeDB()
+    connect, values = _patched(db)
+    with connect, values:
+        writer = LogWriter("postgres://test", batch_size=5, flush_interval_ms=60_000)
+        for i in range(12):
+            writer.add("extraction_logs", url=f"https://example.org/{i}", status="OK")
+
+        deadline = time.time() + 2
+        while writer.stats()["rows_written"] < 10 and time.time() < deadline:
+            time.sleep(0.01)
+        assert writer.stats()["rows_written"] >= 10
+
+        writer.close()
+
+    assert sum(len(rows) for commit in db.commits for _, rows in commit) == 12
+    assert all(len(commit) == 1 for commit in db.commits)  # Multi-row inserts, one table
+
+
+def test_slow_database_samples_and_applies_backpressure():
+    db = FakeDB()
+    db.down = True
+    connect, values = _patched(db)
+    with connect, values:
+        writer = LogWriter("postgres://test", batch_size=4, flush_interval_ms=60_000,
+                           max_buffered=8, sample_every=2, backpressure_timeout=0.05)
+        writer._ensure_thread = lambda: None  # Flush only when the test says so
+        for i in range(4):
+            writer.add("failed_inserts", source_url=f"https://example.org/{i}", error="boom")
+        assert not writer.flush()  # Rows are kept for the next attempt
+
+        ok_ids = [writer.add("extraction_logs", sampleable=True, url="u", status="OK") for _ in range(4)]
+        assert ok_ids.count(None) == 2  # Half full: 1 in sample_every kept
+
+        for _ in range(2):
+            writer.add("extraction_logs", url="u", status="EMPTY")
+        started = time.time()
+        dropped_page = writer.add("raw_pages", url="u", status=200)
+        assert dropped_page is None and time.time() - started >= 0.05  # Blocked, then dropped
+
+        stats = writer.stats()
+        assert stats["buffered"] == 8 and stats["sampled_out"] == 2 and stats["dropped"] == 1
+
+        # Once the database is back the kept rows are written
+        db.down = False
+        assert writer.flush()
+        writer.close()
+
+    written = [row for commit in db.commits for _, rows in commit for row in rows]
+    assert len(written) == 8
+    assert [table for table, _ in db.commits[0]] == ["extraction_logs", "failed_inserts"]
+
+
+def test_rows_violating_constraints_are_dropped_not_retried():
+    db = FakeDB()
+    connect, values = _patched(db)
+    with connect, values:
+        writer = LogWriter("postgres://test", batch_size=100, flush_interval_ms=60_000)
+        writer._ensure_thread = lambda: None
+        bad_page = writer.add("raw_pages", url="https://example.org/gone", status=200, source_id="bad-source")
+        writer.add("extraction_logs", url="https://example.org/gone", status="OK", raw_page_id=bad_page)
+        writer.add("extraction_logs", url="https://example.org/ok", status="OK", source_id="src-1")
+        writer.add("failed_inserts", source_url="https://example.org/x", error="boom", source_id="bad-source")
+
+        assert writer.flush()
+        assert writer.flush()  # Nothing left to retry
+
+    written = {table: rows for table, rows in db.commits[0]}
+    assert set(written) == {"extraction_logs"} and len(db.commits) == 1
+    assert [row[2] for row in written["extraction_logs"]] == [None, None]  # Unlinked from the dropped page
+    stats = writer.stats()
+    assert stats["rejected"] == 2 and stats["rows_written"] == 2 and stats["buffered"] == 0
+
+
+def test_full_buffer_never_blocks_an_event_loop():
+    db = FakeDB()
+    db.down = True
+    connect, values = _patched(db)
+    with connect, values:
+        writer = LogWriter("postgres://test", batch_size=2, flush_interval_ms=60_000,
+                           max_buffered=2, backpressure_timeout=5.0)
+        writer._ensure_thread = lambda: None
+        for _ in range(2):
+            writer.add("extraction_logs", url="u", status="EMPTY")
+
+        async def log_from_crawl():
+            started = time.monotonic()
+            row_id = writer.add("raw_pages", url="u", status=200)
+            return row_id, time.monotonic() - started
+
+        row_id, elapsed = asyncio.run(log_from_crawl())
+
+    assert row_id is None and elapsed < 0.5
+    assert writer.stats()["dropped"] == 1
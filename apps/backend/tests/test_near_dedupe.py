@@ -0,0 +1,147 @@
+"""
+Unit tests for cross-source near-duplicate detection.
+"""
+
+from unittest.mock import MagicMock
+
+from core.near_dedupe import (
+    NearDuplicateDetector,
+    NearDuplicateIndex,
+    build_fingerprint,
+    choose_canonical,
+    estimate_jaccard,
+)
+
+
+def _job(title, org="UNDP", location="Nairobi, Kenya", deadline="2025-12-10"):
+    return {"title": title, "org_name": org, "location_raw": location, "deadline": deadline}
+
+
+class TestFingerprint:
+    def test_identical_titles_have_identical_signatures(self):
+        a = build_fingerprint(_job("Programme Analyst (Health)"))
+        b = build_fingerprint(_job("programme analyst - health"))
+        assert estimate_jaccard(a["signature"], b["signature"]) == 1.0
+
+    def test_unrelated_titles_have_low_similarity(self):
+        a = build_fingerprint(_job("Programme Analyst (Health)"))
+        b = build_fingerprint(_job("Driver"))
+        assert estimate_jaccard(a["signature"], b["signature"]) < 0.3
+
+    def test_non_iso_deadline_is_ignored(self):
+        fp = build_fingerprint(_job("Driver", deadline="10/12/2025"))
+        assert fp["deadline"] is None
+
+
+class TestNearDuplicateIndex:
+    def test_query_finds_cross_source_duplicate(self):
+        index = NearDuplicateIndex(threshold=0.7)
+        index.add("org-job", build_fingerprint(_job("Programme Analyst, Health Systems")), source_id="undp")
+        fp = build_fingerprint(_job("Programme Analyst - Health Systems",
+                                    org="United Nations Development Programme"))
+
+        matches = index.query(fp, exclude_source="reliefweb")
+
+        assert [m[0] for m in matches] == ["org-job"]
+
+    def test_query_ignores_same_source(self):
+        index = NearDuplicateIndex(threshold=0.7)
+        index.add("a", build_fingerprint(_job("Finance Associate")), source_id="undp")
+
+        assert index.query(build_fingerprint(_job("Finance Associate")), exclude_source="undp") == []
+
+    def test_conflicting_location_or_deadline_vetoes_match(self):
+        index = NearDuplicateIndex(threshold=0.7)
+        index.add("a", build_fingerprint(_job("Finance Associate")), source_id="undp")
+
+        other_city = build_fingerprint(_job("Finance Associate", location="Kabul, Afghanistan"))
+        other_deadline = build_fingerprint(_job("Finance Associate", deadline="2026-01-05"))
+
+        assert index.query(other_city, exclude_source="rss") == []
+        assert index.query(other_deadline, exclude_source="rss") == []
+
+    def test_remove(self):
+        index = NearDuplicateIndex()
+        fp = build_fingerprint(_job("Finance Associate"))
+        index.add("a", fp, source_id="undp")
+        index.remove("a")
+
+        assert "a" not in index
+        assert index.query(fp) == []
+
+
+def test_choose_canonical_prefers_quality_then_current():
+    assert choose_canonical([
+        {"id": "a", "quality_score": 0.6, "is_current": True},
+        {"id": "b", "quality_score": 0.9},
+    ]) == "b"
+    assert choose_canonical([
+        {"id": "a", "quality_score": 0.8, "is_current": True},
+        {"id": "b", "quality_score": 0.8},
+    ]) == "a"
+
+
+def test_detector_links_duplicate_to_existing_canonical():
+    cursor = MagicMock()
+    cursor.fetchall.return_value = [
+        ("canon", "undp", "Finance Associate", "UNDP", "Nairobi, Kenya", None, 0.9, None),
+    ]
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+
+    detector = NearDuplicateDetector(threshold=0.8)
+    result = detector.process_saved_jobs(conn, [{
+        "id": "copy", "source_id": "reliefweb", "title": "Finance Associate",
+        "org_name": "UNDP", "location_raw": "Nairobi", "deadline": None, "quality_score": 0.5,
+    }])
+
+    assert result == {"duplicate_ids": ["copy"], "demoted_ids": []}
+    assert detector.index.get("copy")["canonical_id"] == "canon"
+    sql, params = cursor.execute.call_args[0]
+    assert "duplicate_of" in sql
+    assert params[0] == "canon" and params[2] == "copy"
+    conn.commit.assert_called_once()
+
+
+def _detector_with(rows, threshold=0.8):
+    cursor = MagicMock()
+    cursor.fetchall.return_value = rows
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value = cursor
+    return NearDuplicateDetector(threshold=threshold), conn, cursor
+
+
+def test_edited_duplicate_leaves_its_cluster():
+    detector, conn, cursor = _detector_with([
+        ("canon", "undp", "Finance Associate", "UNDP", "Nairobi, Kenya", None, 0.9, None),
+        ("copy", "reliefweb", "Finance Associate", "UNDP", "Nairobi, Kenya", None, 0.5, "canon"),
+    ])
+
+    result = detector.process_saved_jobs(conn, [{
+        "id": "copy", "source_id": "reliefweb", "title": "Senior Logistics Officer",
+        "org_name": "UNDP", "location_raw": "Nairobi", "deadline": None, "quality_score": 0.5,
+    }])
+
+    assert result == {"duplicate_ids": [], "demoted_ids": []}
+    assert detector.index.get("copy")["canonical_id"] == "copy"
+    sql, params = cursor.execute.call_args[0]
+    assert "duplicate_of = NULL" in sql and params == ("copy",)
+
+
+def test_cluster_takeover_records_each_members_similarity():
+    detector, conn, cursor = _detector_with([
+        ("canon", "undp", "Finance Associate Nairobi Office", "UNDP", "Nairobi, Kenya", None, 0.4, None),
+        ("member", "unjobs", "Finance Associate Nairobi Office Budget", "UNDP", "Nairobi, Kenya", None, 0.3, "canon"),
+    ], threshold=0.5)
+
+    result = detector.process_saved_jobs(conn, [{
+        "id": "best", "source_id": "reliefweb", "title": "Finance Associate Nairobi Office",
+        "org_name": "UNDP", "location_raw": "Nairobi", "deadline": None, "quality_score": 0.9,
+    }])
+
+    assert result["demoted_ids"] == ["canon"]
+    repoint = next(c[0] for c in cursor.execute.call_args_list if "unnest" in c[0][0])
+    canonical, members, similarities = repoint[1]
+    assert canonical == "best" and sorted(members) == ["canon", "member"]
+    by_member = dict(zip(members, similarities))
+    assert by_member["canon"] == 1.0 and by_member["member"] < 1.0
@@ -0,0 +1,80 @@
+"""
+Unit tests for the hashed-feature job page classifier.
+"""
+
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from pipeline.page_features import extract_page_features, vectorize
+from pipeline.classifier import (
+    ClassifierModel, JobPageClassifier, load_classifier_model, train_classifier_model,
+)
+
+SEED_DIR = Path(__file__).parent / "fixtures" / "classifier_seed"
+
+JOB_HTML = """
+<html><body>
+  <div class="job-listing"><h1>Programme Officer</h1>
+  <p>We are hiring for this position. Deadline: 1 March 2026.</p>
+  <a href="/apply">Apply now</a></div>
+</body></html>
+"""
+ABOUT_HTML = "<html><body><h1>About us</h1><p>Our mission and history.</p><a href='/login'>Login</a></body></html>"
+
+
+def _seed_pages():
+    pages, labels = [], []
+    for subdir, label in (("job_pages", 1), ("non_job_pages", 0)):
+        for path in sorted((SEED_DIR / subdir).glob("*.html")):
+            html = path.read_text(encoding="utf-8")
+            pages.append((html, BeautifulSoup(html, "html.parser"), ""))
+            labels.append(label)
+    return pages, labels
+
+
+def test_rule_signals_come_from_one_walk():
+    soup = BeautifulSoup(JOB_HTML, "html.parser")
+    features = extract_page_features(JOB_HTML, soup, "https://example.org/jobs/1")
+
+    assert features.text == soup.get_text().lower()
+    assert features.has_job_selector and features.has_apply_link
+    assert features.tokens["u:jobs"] == 1 and features.tokens["c:listing"] == 1
+
+    classifier = JobPageClassifier(use_ml=False)
+    is_job, score = classifier.classify(JOB_HTML, soup, "https://example.org/jobs/1")
+    # keywords (position, hiring) 0.2 + URL 0.3 + selector 0.1 + apply link 0.2
+    assert is_job and score == pytest.approx(0.8)
+    assert classifier.classify(ABOUT_HTML, BeautifulSoup(ABOUT_HTML, "html.parser"), "https://example.org/about") == (False, 0.0)
+
+
+def test_model_round_trips_through_npz(tmp_path):
+    pages, labels = _seed_pages()
+    features = [extract_page_features(html, soup, url) for html, soup, url in pages]
+    model = train_classifier_model(features, labels)
+
+    path = tmp_path / "classifier_model.npz"
+    model.save(str(path))
+    loaded = load_classifier_model(str(path))
+
+    assert isinstance(loaded, ClassifierModel) and loaded.version == "v2"
+    assert loaded.score_pages(features) == pytest.approx(model.score_pages(features))
+    assert [int(p >= 0.5) for p in loaded.predict_proba(vectorize(features))] == labels
+
+    with pytest.raises(FileNotFoundError):
+        load_classifier_model(str(tmp_path / "missing.npz"))
+
+
+def test_classify_batch_matches_per_page_classify():
+    pages, labels = _seed_pages()
+    features = [extract_page_features(html, soup, url) for html, soup, url in pages]
+    classifier = JobPageClassifier(model=train_classifier_model(features, labels))
+    assert classifier.use_ml
+
+    batch = classifier.classify_batch(pages)
+    single = [classifier.classify(html, soup, url) for html, soup, url in pages]
+
+    assert [is_job for is_job, _ in batch] == [is_job for is_job, _ in single]
+    assert [score for _, score in batch] == pytest.approx([score for _, score in single])
+    assert classifier.classify_batch([]) == []
@@ -0,0 +1,96 @@
+"""
+Unit tests for the PDF extraction stage (text cache, OCR budget, fields).
+"""
+
+import asyncio
+import os
+import time
+from unittest.mock import AsyncMock
+
+from pipeline.pdf_extractor import PDFExtractor, PDFTextCache
+
+TEXT = (
+    "Programme Officer (Education)\n"
+    "Location: Nairobi, Kenya\n"
+    "Deadline: 15 January 2026\n"
+) + "Responsibilities include coordinating partners. " * 200
+
+
+def _extractor(tmp_path, **kwargs):
+    extractor = PDFExtractor(cache=PDFTextCache(str(tmp_path / "cache")), **kwargs)
+    extractor.has_pdftotext = False
+    extractor.has_tesseract = extractor.has_pdftoppm = False
+    return extractor
+
+
+def _pdf(tmp_path, content=b"%PDF-1.4 test"):
+    path = tmp_path / "vacancy.pdf"
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_text_is_cached_by_content_hash(tmp_path):
+    extractor = _extractor(tmp_path)
+    extractor._extract_with_pdfminer = AsyncMock(return_value=TEXT)
+    pdf = _pdf(tmp_path)
+
+    assert asyncio.run(extractor.extract_text(pdf)) == (TEXT, "pdfminer")
+    assert asyncio.run(extractor.extract_text(pdf)) == (TEXT, "pdfminer")
+    assert extractor._extract_with_pdfminer.await_count == 1
+
+    # Different bytes are a different document
+    asyncio.run(extractor.extract_text(_pdf(tmp_path, b"%PDF-1.4 changed")))
+    assert extractor._extract_with_pdfminer.await_count == 2
+    assert extractor.cache.stats()["hits"] == 1
+
+
+def test_scanned_pdf_is_ocrd_in_parallel_within_page_budget(tmp_path):
+    extractor = _extractor(tmp_path, ocr_page_budget=3, ocr_concurrency=2)
+    extractor.has_tesseract = extractor.has_pdftoppm = True
+    extractor._extract_with_pdfminer = AsyncMock(return_value="\f\f")
+    extractor._page_count = AsyncMock(return_value=30)
+
+    running = peak = 0
+
+    async def ocr_page(pdf_path, page, workdir):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return f"Page {page} text of the scanned vacancy notice"
+
+    extractor._ocr_page = ocr_page
+    text, method = asyncio.run(extractor.extract_text(_pdf(tmp_path)))
+
+    assert method == "ocr"
+    assert [line.split()[1] for line in text.splitlines()] == ["1", "2", "3"]
+    assert peak == 2
+
+
+def test_full_text_feeds_heuristic_fields(tmp_path):
+    extractor = _extractor(tmp_path)
+    extractor._extract_with_pdfminer = AsyncMock(return_value=TEXT)
+
+    result = asyncio.run(extractor.extract_from_pdf(_pdf(tmp_path), "https://example.org/vacancy.pdf"))
+
+    assert result.fields["description"].value == TEXT
+    assert result.fields["title"].value == "Programme Officer (Education)"
+    assert result.fields["location"].value == "Nairobi, Kenya"
+    assert result.fields["deadline"].value == "2026-01-15"
+
+
+def test_cache_gc_removes_entries_not_seen_within_retention(tmp_path):
+    cache = PDFTextCache(str(tmp_path / "cache"))
+    cache.put("aa" * 32, TEXT, "pdfminer")
+    cache.put("bb" * 32, TEXT, "ocr")
+    old = time.time() - 10 * 86400
+    os.utime(cache._path("aa" * 32), (old, old))
+    os.utime(cache._path("bb" * 32), (old, old))
+    assert cache.get("bb" * 32) == (TEXT, "ocr")  # A hit keeps the entry
+
+    result = cache.gc(retention_days=7)
+
+    assert result["removed"] == 1 and result["kept"] == 1
+    assert cache.get("aa" * 32) is None
+    assert cache.stats()["gc_removed"] == 1
@@ -0,0 +1,64 @@
+"""
+Unit tests for batched pre-upsert validation.
+"""
+
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from core.pre_upsert_validator import ExistenceMap, PreUpsertValidator
+
+SOURCE_ID = "5b1f0a52-6d3e-4a8e-9a43-1c3f7f0e2d10"
+
+
+def _connection(rows):
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchall.return_value = rows
+    return conn, cur
+
+
+def test_validate_batch_prefetches_existing_jobs_in_one_query():
+    conn, cur = _connection([
+        ("id-1", SOURCE_ID, "https://example.org/jobs/1", "hash-1", "active", None),
+        ("id-2", SOURCE_ID, "https://example.org/jobs/2", "hash-2", "active", datetime(2026, 1, 1)),
+    ])
+    jobs = [
+        {"title": f"Programme Officer {i}", "apply_url": f"https://example.org/jobs/{i}", "canonical_hash": f"hash-{i}"}
+        for i in range(1, 4)
+    ] + [{"title": "Bad", "apply_url": "javascript:void(0)"}]
+
+    result = PreUpsertValidator(db_connection=conn).validate_batch(jobs, SOURCE_ID)
+
+    assert cur.execute.call_count == 1
+    sql, params = cur.execute.call_args[0]
+    assert "= ANY(%s)" in sql and "::text" not in sql
+    assert params == [["hash-1", "hash-2", "hash-3"], SOURCE_ID,
+                      ["https://example.org/jobs/1", "https://example.org/jobs/2",
+                       "https://example.org/jobs/3", "javascript:void(0)"]]
+
+    assert result["stats"]["valid"] == 3 and result["stats"]["existing"] == 2
+    existing = result["existing"]
+    assert [existing.classify(f"hash-{i}") for i in range(1, 4)] == ["update", "restore", "insert"]
+    assert existing.get_by_url("https://example.org/jobs/1", SOURCE_ID)["id"] == "id-1"
+    assert existing.get_by_url("https://example.org/jobs/1", "other-source") is None
+
+
+def test_prefetch_failure_does_not_block_validation():
+    conn, cur = _connection([])
+    cur.execute.side_effect = RuntimeError("connection lost")
+    validator = PreUpsertValidator(db_connection=conn)
+
+    result = validator.validate_batch([{"title": "Field Coordinator", "apply_url": "https://example.org/a"}], SOURCE_ID)
+
+    assert result["existing"] is None and result["stats"]["valid"] == 1
+    conn.rollback.assert_called_once()
+
+
+def test_existence_map_tracks_rows_added_during_upsert():
+    existing = ExistenceMap()
+    assert existing.classify("hash-9") == "insert"
+
+    existing.add({"id": "id-9", "source_id": SOURCE_ID, "apply_url": "https://example.org/9",
+                  "canonical_hash": "hash-9", "status": "active", "deleted_at": None})
+
+    assert existing.classify("hash-9") == "update" and len(existing) == 1
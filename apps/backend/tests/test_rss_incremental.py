@@ -0,0 +1,74 @@
+"""
+Unit tests for incremental RSS crawling (conditional GET + seen entries).
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import feedparser
+
+from crawler_v2.rss_crawler import SimpleRSSCrawler, entry_content_hash, entry_key
+
+FEED = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Jobs</title>
+<item><guid>job-1</guid><title>Programme Officer</title><link>https://example.org/jobs/1</link>
+<description>Location: Nairobi, Kenya</description></item>
+<item><title>Finance Assistant</title><link>https://example.org/jobs/2</link></item>
+</channel></rss>"""
+
+SOURCE = {'id': '00000000-0000-0000-0000-000000000001', 'org_name': 'Example', 'careers_url': 'https://example.org/feed'}
+
+
+def _crawler(fetch_result, seen=None):
+    crawler = SimpleRSSCrawler("postgresql://unused")
+    crawler._fetch = AsyncMock(return_value=fetch_result)
+    crawler._load_feed_state = MagicMock(return_value={'etag': '"v1"', 'last_modified': None, 'seen': seen or {}})
+    crawler._record_feed = MagicMock(return_value=2)
+    crawler.save_jobs = MagicMock(side_effect=lambda jobs, *a, **kw: {
+        'inserted': len(jobs), 'updated': 0, 'skipped': 0, 'duplicates': 0
+    })
+    return crawler
+
+
+def test_entry_key_prefers_guid_then_link_and_hash_tracks_content():
+    first, second = feedparser.parse(FEED).entries
+    assert entry_key(first) == 'job-1'
+    assert entry_key(second) == 'https://example.org/jobs/2'
+
+    changed = feedparser.parse(FEED.replace(b'Nairobi', b'Kampala')).entries[0]
+    assert entry_content_hash(first) == entry_content_hash(feedparser.parse(FEED).entries[0])
+    assert entry_content_hash(first) != entry_content_hash(changed)
+
+
+def test_only_new_or_changed_entries_are_saved():
+    first = feedparser.parse(FEED).entries[0]
+    crawler = _crawler((200, FEED, {'etag': '"v2"', 'last_modified': None}),
+                       seen={'job-1': entry_content_hash(first)})
+
+    with patch.object(SimpleRSSCrawler, '_get_extractor', return_value=None):
+        result = asyncio.run(crawler.crawl_source(SOURCE))
+
+    saved = crawler.save_jobs.call_args[0][0]
+    assert [job['title'] for job in saved] == ['Finance Assistant']
+    assert saved[0]['_entry_key'] == 'https://example.org/jobs/2'
+    crawler._record_feed.assert_called_once_with(
+        SOURCE['id'], {'etag': '"v2"', 'last_modified': None},
+        ['job-1', 'https://example.org/jobs/2'], ['job-1']
+    )
+    assert result['counts']['found'] == 2
+    assert result['counts']['inserted'] == 1
+    assert result['counts']['unchanged'] == 1
+
+
+def test_not_modified_feed_skips_parsing_and_touches_seen_entries():
+    crawler = _crawler((304, None, {}))
+
+    with patch.object(SimpleRSSCrawler, '_parse', side_effect=AssertionError("parsed")):
+        result = asyncio.run(crawler.crawl_source(SOURCE))
+
+    assert crawler._fetch.call_args[0][1:] == ('"v1"', None)
+    crawler._record_feed.assert_called_once_with(SOURCE['id'], None, None, None)
+    crawler.save_jobs.assert_not_called()
+    assert result['status'] == 'ok'
+    assert result['counts']['not_modified'] is True
+    assert result['counts']['unchanged'] == 2
@@ -0,0 +1,95 @@
+"""
+Tests for fields= projection on search results and compressed JSON responses.
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import responses
+from app.search import COMPACT_FIELDS, SearchService, parse_fields
+from main import app
+
+client = TestClient(app)
+
+
+def test_parse_fields():
+    assert parse_fields(None) is None and parse_fields(" ") is None
+    assert parse_fields("compact") == list(COMPACT_FIELDS)
+    assert parse_fields("title, org_name,title,reasons") == ["id", "title", "org_name"]
+    with pytest.raises(ValueError, match="raw_metadata"):
+        parse_fields("title,raw_metadata")
+
+
+def test_database_search_selects_only_projected_columns():
+    cursor = MagicMock()
+    cursor.fetchone.return_value = {"total": 1}
+    cursor.fetchall.return_value = [{
+        "id": "job-1", "title": "WASH Officer", "mission_tags": ["wash"], "level_norm": "mid",
+        "international_eligible": True, "org_type": "ngo",
+    }]
+    psycopg2 = MagicMock()
+    psycopg2.connect.return_value.cursor.return_value = cursor
+    service = SearchService()
+
+    with patch("app.search.psycopg2", psycopg2), \
+            patch("app.search.db_config.get_connection_params", return_value={"host": "db"}):
+        result = asyncio.run(service._search_database(
+            None, 1, 20, {"level_norm": "mid"}, fields=["id", "title"]))
+
+    select_sql = cursor.execute.call_args_list[-1][0][0]
+    assert "SELECT id, title, mission_tags, level_norm, international_eligible, org_type" in select_sql
+    assert result["items"] == [{"id": "job-1", "title": "WASH Officer", "reasons": ["Level: Mid"]}]
+
+
+def test_meilisearch_search_pushes_projection_down():
+    index = MagicMock()
+    index.search.return_value = {"hits": [{"id": "job-1", "title": "WASH Officer", "level_norm": "mid"}]}
+    service = SearchService()
+    service.meili_client = MagicMock()
+    service.meili_client.index.return_value = index
+    service._last_health_check = time.time()
+
+    with patch("app.search.psycopg2", None):
+        result = asyncio.run(service._search_meilisearch(
+            "wash", 1, 20, {"level_norm": "mid"}, fields=["id", "title"]))
+
+    params = index.search.call_args[0][1]
+    assert params["attributesToRetrieve"] == ["id", "title", "mission_tags", "level_norm",
+                                              "international_eligible", "org_type"]
+    assert result["items"] == [{"id": "job-1", "title": "WASH Officer", "reasons": ["Level: Mid"]}]
+
+
+def test_search_route_rejects_unknown_fields():
+    response = client.get("/api/search/query", params={"fields": "title,password"})
+    assert response.status_code == 400
+    assert "password" in response.json()["detail"]
+
+
+def test_search_route_compresses_large_responses():
+    items = [{"id": f"job-{i}", "title": "Programme Officer " * 5} for i in range(50)]
+    result = {"status": "ok", "data": {"items": items, "total": 50}, "error": None}
+    search = AsyncMock(return_value=result)
+
+    with patch("main.search_service.search_query", search):
+        compressed = client.get("/api/search/query", params={"fields": "compact"},
+                                headers={"Accept-Encoding": "gzip"})
+        plain = client.get("/api/search/query", headers={"Accept-Encoding": "identity"})
+
+    assert search.await_args_list[0].kwargs["fields"] == list(COMPACT_FIELDS)
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["vary"] == "Accept-Encoding"
+    assert compressed.json() == result == plain.json()
+    assert "content-encoding" not in plain.headers
+    assert int(compressed.headers["content-length"]) < len(plain.content) // 5
+
+
+def test_choose_encoding():
+    assert responses.choose_encoding("gzip, deflate") == "gzip"
+    assert responses.choose_encoding("gzip;q=0, identity") is None
+    assert responses.choose_encoding(None) is None
+    with patch("app.responses.BROTLI_AVAILABLE", True):
+        assert responses.choose_encoding("gzip, br") == "br"
@@ -0,0 +1,84 @@
+"""
+Startup import tests: heavy subsystems load lazily, routers mount on demand.
+
+Each check runs in a fresh interpreter so modules imported by other tests
+don't hide an eager import.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+LAZY_MODULES = ["crawler_v2", "orchestrator", "dateparser", "playwright", "sklearn",
+                "pdfminer", "feedparser", "meilisearch", "bs4"]
+
+
+def _run(code: str) -> dict:
+    env = {k: v for k, v in os.environ.items() if k != "AIDJOBS_LAZY_ROUTERS"}
+    result = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=env,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr[-2000:]
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_main_does_not_load_heavy_subsystems():
+    loaded = _run(
+        "import sys, json, main\n"
+        f"print(json.dumps({{'loaded': [m for m in {LAZY_MODULES!r} if m in sys.modules]}}))"
+    )["loaded"]
+    assert loaded == []
+
+
+def test_router_groups_mount_on_first_request_and_keep_precedence():
+    result = _run(
+        "import sys, json, main\n"
+        "from fastapi.testclient import TestClient\n"
+        "client = TestClient(main.app)\n"
+        "before = client.get('/api/admin/domain_policies/example.org').status_code\n"
+        "mounted = sorted(main._mounted_router_groups)\n"
+        "reindex = [r.endpoint.__name__ for r in main.app.routes if getattr(r, 'path', '') == '/admin/normalize/reindex']\n"
+        "print(json.dumps({'status': before, 'mounted': mounted, 'reindex': reindex}))"
+    )
+    assert result["status"] != 404  # Auth rejects it, but the route exists
+    assert result["mounted"] == ["crawler"]
+    assert result["reindex"] == ["admin_normalize_reindex"]  # Admin group not mounted yet
+
+    result = _run(
+        "import json, main\n"
+        "main.mount_all_router_groups()\n"
+        "reindex = [r.endpoint.__name__ for r in main.app.routes if getattr(r, 'path', '') == '/admin/normalize/reindex']\n"
+        "print(json.dumps({'reindex': reindex}))"
+    )
+    # The admin router's handler is matched first, as when routers were included at import
+    assert result["reindex"] == ["normalize_and_reindex", "admin_normalize_reindex"]
+
+
+def test_failed_router_group_mount_is_retried_without_losing_precedence():
+    result = _run(
+        "import json, main\n"
+        "from fastapi import APIRouter\n"
+        "router = APIRouter()\n"
+        "router.add_api_route('/api/lazy-probe', lambda: {'ok': True})\n"
+        "attempts = []\n"
+        "def mount():\n"
+        "    main.app.include_router(router)\n"
+        "    attempts.append(1)\n"
+        "    if len(attempts) == 1:\n"
+        "        raise ImportError('optional dependency missing')\n"
+        "main.ROUTER_GROUPS['probe'] = (('/api/lazy-probe',), mount)\n"
+        "try:\n"
+        "    main.mount_router_group('probe')\n"
+        "except ImportError:\n"
+        "    pass\n"
+        "failed = 'probe' in main._mounted_router_groups\n"
+        "main.mount_router_group('probe')\n"
+        "paths = [getattr(r, 'path', '') for r in main.app.router.routes]\n"
+        "print(json.dumps({'failed_marked': failed, 'mounted': 'probe' in main._mounted_router_groups,\n"
+        "                  'copies': paths.count('/api/lazy-probe'),\n"
+        "                  'before_healthz': paths.index('/api/lazy-probe') < paths.index('/api/healthz')}))"
+    )
+    assert result == {"failed_marked": False, "mounted": True, "copies": 1, "before_healthz": True}
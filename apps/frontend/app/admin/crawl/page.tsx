@@ -29,6 +29,7 @@ type CrawlLog = {
   status: string;
   message: string | null;
   ran_at: string;
+  timings?: Record<string, number> | null; // Per-stage ms breakdown
   actual_job_count?: number; // Real count from jobs table
 };
 
@@ -235,6 +236,14 @@ export default function AdminCrawlPage() {
     return `${(ms / 1000).toFixed(1)}s`;
   };
 
+  const formatStageLabel = (stage: string) => stage.replace(/_/g, ' ');
+
+  // Slowest stages first; `total` is already shown as the duration
+  const sortedStages = (timings: Record<string, number>) =>
+    Object.entries(timings)
+      .filter(([stage, ms]) => stage !== 'total' && ms > 0)
+      .sort((a, b) => b[1] - a[1]);
+
   return (
     <div className="h-full overflow-y-auto p-4">
       <div className="max-w-7xl mx-auto">
@@ -420,6 +429,17 @@ export default function AdminCrawlPage() {
                         )}
                       </div>
 
+                      {log.timings && sortedStages(log.timings).length > 0 && (
+                        <div className="flex flex-wrap items-center gap-x-3 gap-y-1 mt-2">
+                          {sortedStages(log.timings).map(([stage, ms]) => (
+                            <span key={stage} className="text-caption-sm text-[#86868B]">
+                              {formatStageLabel(stage)}{' '}
+                              <span className="font-semibold text-[#1D1D1F]">{formatDuration(ms)}</span>
+                            </span>
+                          ))}
+                        </div>
+                      )}
+
                       {log.message && (
                         <div className="mt-2 pt-2 border-t border-[#D2D2D7]">
                           <p className="text-caption-sm text-[#86868B] line-clamp-2">{log.message}</p>
@@ -0,0 +1,16 @@
+-- Apply link status on jobs
+-- Written by core/link_validator.revalidate_stale from the background
+-- revalidation pass. apply_url_valid is NULL until a definitive check
+-- (2xx/3xx, or 404/410) has been recorded.
+-- Idempotent - safe to run multiple times
+
+ALTER TABLE jobs
+    ADD COLUMN IF NOT EXISTS apply_url_valid BOOLEAN,
+    ADD COLUMN IF NOT EXISTS apply_url_checked_at TIMESTAMPTZ;
+
+-- Bulk marking matches jobs by apply_url = ANY(...)
+CREATE INDEX IF NOT EXISTS idx_jobs_apply_url ON jobs(apply_url) WHERE apply_url IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_jobs_apply_url_dead ON jobs(apply_url_checked_at) WHERE apply_url_valid = FALSE;
+
+COMMENT ON COLUMN jobs.apply_url_valid IS 'Result of the last definitive apply link check (NULL = unknown)';
+COMMENT ON COLUMN jobs.apply_url_checked_at IS 'When apply_url_valid was last updated';
@@ -0,0 +1,82 @@
+-- Daily per-source crawl rollups and crawl_logs retention
+-- crawl_log_rollups is maintained incrementally by app/crawl_rollups.record_crawl_rollup
+-- alongside every crawl_logs insert and serves the admin analytics dashboard.
+-- Raw crawl_logs older than CRAWL_LOG_RETENTION_DAYS are moved to crawl_logs_archive.
+-- Idempotent - safe to run multiple times
+
+CREATE TABLE IF NOT EXISTS crawl_log_rollups (
+    source_id UUID NOT NULL REFERENCES sources(id) ON DELETE CASCADE,
+    bucket_date DATE NOT NULL,  -- UTC day
+    crawl_count INT NOT NULL DEFAULT 0,
+    ok_count INT NOT NULL DEFAULT 0,
+    fail_count INT NOT NULL DEFAULT 0,
+    warn_count INT NOT NULL DEFAULT 0,
+    duration_ms_sum BIGINT NOT NULL DEFAULT 0,
+    duration_count INT NOT NULL DEFAULT 0,  -- crawls with a recorded duration
+    found BIGINT NOT NULL DEFAULT 0,
+    inserted BIGINT NOT NULL DEFAULT 0,
+    updated BIGINT NOT NULL DEFAULT 0,
+    skipped BIGINT NOT NULL DEFAULT 0,
+    first_ran_at TIMESTAMPTZ,
+    last_ran_at TIMESTAMPTZ,
+    PRIMARY KEY (source_id, bucket_date)
+);
+
+CREATE INDEX IF NOT EXISTS idx_crawl_log_rollups_bucket_date ON crawl_log_rollups(bucket_date);
+
+-- Cold storage for raw logs past the retention window
+CREATE TABLE IF NOT EXISTS crawl_logs_archive (
+    id UUID PRIMARY KEY,
+    source_id UUID,
+    ran_at TIMESTAMPTZ,
+    duration_ms INT,
+    found INT,
+    inserted INT,
+    updated INT,
+    skipped INT,
+    status TEXT,
+    message TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_crawl_logs_archive_source_id ON crawl_logs_archive(source_id, ran_at DESC);
+
+-- Retention sweeps select by age
+CREATE INDEX IF NOT EXISTS idx_crawl_logs_ran_at ON crawl_logs(ran_at);
+
+-- Backfill rollups from existing raw logs (recomputes buckets still fully in crawl_logs)
+INSERT INTO crawl_log_rollups (
+    source_id, bucket_date, crawl_count, ok_count, fail_count, warn_count,
+    duration_ms_sum, duration_count, found, inserted, updated, skipped,
+    first_ran_at, last_ran_at
+)
+SELECT
+    source_id,
+    (ran_at AT TIME ZONE 'UTC')::date,
+    COUNT(*),
+    COUNT(*) FILTER (WHERE status = 'ok'),
+    COUNT(*) FILTER (WHERE status = 'fail'),
+    COUNT(*) FILTER (WHERE status = 'warn'),
+    COALESCE(SUM(duration_ms), 0),
+    COUNT(duration_ms),
+    COALESCE(SUM(found), 0),
+    COALESCE(SUM(inserted), 0),
+    COALESCE(SUM(updated), 0),
+    COALESCE(SUM(skipped), 0),
+    MIN(ran_at),
+    MAX(ran_at)
+FROM crawl_logs
+WHERE source_id IS NOT NULL
+GROUP BY source_id, (ran_at AT TIME ZONE 'UTC')::date
+ON CONFLICT (source_id, bucket_date) DO UPDATE SET
+    crawl_count = EXCLUDED.crawl_count,
+    ok_count = EXCLUDED.ok_count,
+    fail_count = EXCLUDED.fail_count,
+    warn_count = EXCLUDED.warn_count,
+    duration_ms_sum = EXCLUDED.duration_ms_sum,
+    duration_count = EXCLUDED.duration_count,
+    found = EXCLUDED.found,
+    inserted = EXCLUDED.inserted,
+    updated = EXCLUDED.updated,
+    skipped = EXCLUDED.skipped,
+    first_ran_at = EXCLUDED.first_ran_at,
+    last_ran_at = EXCLUDED.last_ran_at;
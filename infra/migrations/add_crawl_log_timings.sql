@@ -0,0 +1,9 @@
+-- Per-stage crawl timing breakdown
+-- Written by the crawl orchestrators from the `timings` map produced by
+-- core/crawl_tracing.CrawlTrace: stage name -> milliseconds, plus `other` and `total`.
+-- Idempotent - safe to run multiple times
+
+ALTER TABLE crawl_logs ADD COLUMN IF NOT EXISTS timings JSONB;
+
+-- Keep the breakdown when old logs are archived
+ALTER TABLE IF EXISTS crawl_logs_archive ADD COLUMN IF NOT EXISTS timings JSONB;
@@ -0,0 +1,13 @@
+-- Cluster-wide per-host token buckets
+-- Used by core/domain_limits.SharedTokenBucket so the API process, the
+-- scheduler and manual crawl runs share one politeness budget per host.
+-- Each row is refilled and drawn from atomically (row lock) in one statement.
+-- Idempotent - safe to run multiple times
+
+CREATE TABLE IF NOT EXISTS domain_rate_limits (
+    host TEXT PRIMARY KEY,
+    tokens DOUBLE PRECISION NOT NULL,
+    capacity DOUBLE PRECISION NOT NULL,
+    refill_rate DOUBLE PRECISION NOT NULL,  -- tokens per second
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp()
+);
@@ -0,0 +1,22 @@
+-- Learned per-source extraction plans
+-- Written by core/extraction_plans.ExtractionPlanStore after a crawl whose full
+-- StrategySelector analysis found jobs; later crawls run the plan directly.
+-- Idempotent - safe to run multiple times
+
+CREATE TABLE IF NOT EXISTS extraction_plans (
+    source_id UUID PRIMARY KEY REFERENCES sources(id) ON DELETE CASCADE,
+    strategy TEXT NOT NULL,  -- tables, divs, links, structured, generic or plugin
+    plugin_name TEXT,
+    container_selector TEXT,
+    column_map JSONB,  -- table column index -> job field
+    expected_jobs INT,
+    validation_rate REAL,
+    full_ms INT,  -- cost of the full analysis path when the plan was learned
+    hits INT NOT NULL DEFAULT 0,
+    misses INT NOT NULL DEFAULT 0,
+    time_saved_ms BIGINT NOT NULL DEFAULT 0,
+    last_miss_reason TEXT,
+    learned_at TIMESTAMPTZ DEFAULT NOW(),
+    last_hit_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
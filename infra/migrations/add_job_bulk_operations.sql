@@ -0,0 +1,22 @@
+-- Resumable bulk job operations (soft delete, hard delete, restore)
+-- Written by app/job_bulk_ops. Each processed chunk updates this row in the
+-- same transaction as the job changes, so last_id is the resume point.
+-- Idempotent - safe to run multiple times
+
+CREATE TABLE IF NOT EXISTS job_bulk_operations (
+    id UUID PRIMARY KEY,
+    kind TEXT NOT NULL CHECK (kind IN ('soft_delete', 'hard_delete', 'restore')),
+    params JSONB NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'running', 'completed', 'failed')),
+    total INT DEFAULT 0,
+    processed INT DEFAULT 0,
+    affected INT DEFAULT 0,
+    chunks INT DEFAULT 0,
+    last_id UUID,
+    error TEXT,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    finished_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_bulk_operations_status ON job_bulk_operations(status, created_at DESC);
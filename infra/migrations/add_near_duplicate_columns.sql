@@ -0,0 +1,15 @@
+-- Cross-source near-duplicate linkage
+-- Written by core/near_dedupe at ingest time. A row with duplicate_of set is a
+-- non-canonical copy of the referenced job and is skipped by enrichment and
+-- Meilisearch indexing.
+-- Idempotent - safe to run multiple times
+
+-- duplicate_of already exists on databases created from infra/supabase.sql
+ALTER TABLE jobs
+    ADD COLUMN IF NOT EXISTS duplicate_of UUID,
+    ADD COLUMN IF NOT EXISTS dedupe_similarity REAL;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_duplicate_of ON jobs(duplicate_of) WHERE duplicate_of IS NOT NULL;
+
+COMMENT ON COLUMN jobs.duplicate_of IS 'Canonical job this row is a near-duplicate of (NULL = canonical)';
+COMMENT ON COLUMN jobs.dedupe_similarity IS 'Estimated title similarity to the canonical job (MinHash Jaccard)';
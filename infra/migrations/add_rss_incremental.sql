@@ -0,0 +1,23 @@
+-- Incremental RSS ingestion
+-- Written by crawler_v2/rss_crawler.SimpleRSSCrawler: feed validators for
+-- conditional GET, and per-source seen entries so unchanged feed items are
+-- only touched (last_seen_at) instead of re-extracted and re-upserted.
+-- Idempotent - safe to run multiple times
+
+ALTER TABLE sources
+    ADD COLUMN IF NOT EXISTS feed_etag TEXT,
+    ADD COLUMN IF NOT EXISTS feed_last_modified TEXT;
+
+CREATE TABLE IF NOT EXISTS rss_seen_entries (
+    source_id UUID NOT NULL REFERENCES sources(id) ON DELETE CASCADE,
+    entry_key TEXT NOT NULL,  -- entry GUID, else link, else title hash
+    content_hash TEXT NOT NULL,  -- sha256 of title, link, summary and updated date
+    job_id UUID REFERENCES jobs(id) ON DELETE SET NULL,
+    in_feed BOOLEAN NOT NULL DEFAULT TRUE,  -- present in the last full fetch (touched on 304)
+    first_seen_at TIMESTAMPTZ DEFAULT NOW(),
+    last_seen_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (source_id, entry_key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_rss_seen_entries_in_feed
+    ON rss_seen_entries(source_id) WHERE in_feed;
@@ -0,0 +1,9 @@
+-- Trigram index for near-neighbour title lookups
+-- Used by app/enrichment_consistency.find_similar_jobs (similarity() / % operator)
+-- Idempotent - safe to run multiple times
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_title_trgm
+    ON jobs USING GIN (lower(title) gin_trgm_ops)
+    WHERE status = 'active';
@@ -212,7 +212,9 @@ ALTER TABLE sources
     ADD COLUMN IF NOT EXISTS consecutive_failures INT DEFAULT 0,
     ADD COLUMN IF NOT EXISTS consecutive_nochange INT DEFAULT 0,
     ADD COLUMN IF NOT EXISTS time_window TEXT,
-    ADD COLUMN IF NOT EXISTS notes TEXT;
+    ADD COLUMN IF NOT EXISTS notes TEXT,
+    ADD COLUMN IF NOT EXISTS feed_etag TEXT,
+    ADD COLUMN IF NOT EXISTS feed_last_modified TEXT;
 
 -- Create indexes for sources table
 CREATE INDEX IF NOT EXISTS idx_sources_status ON sources(status);
@@ -237,6 +239,9 @@ CREATE TABLE IF NOT EXISTS crawl_logs (
 -- Add duration_ms column if missing (idempotent)
 ALTER TABLE crawl_logs ADD COLUMN IF NOT EXISTS duration_ms INT;
 
+-- Per-stage timing breakdown in ms (see core/crawl_tracing.py)
+ALTER TABLE crawl_logs ADD COLUMN IF NOT EXISTS timings JSONB;
+
 -- Create index for crawl_logs table
 CREATE INDEX IF NOT EXISTS idx_crawl_logs_source_id ON crawl_logs(source_id, ran_at DESC);
 
@@ -267,6 +272,15 @@ CREATE TABLE IF NOT EXISTS robots_cache (
     disallow JSONB
 );
 
+-- Domain rate limits: per-host token buckets shared by all crawler processes
+CREATE TABLE IF NOT EXISTS domain_rate_limits (
+    host TEXT PRIMARY KEY,
+    tokens DOUBLE PRECISION NOT NULL,
+    capacity DOUBLE PRECISION NOT NULL,
+    refill_rate DOUBLE PRECISION NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp()
+);
+
 -- Takedowns table: domains/URLs to exclude from crawling
 CREATE TABLE IF NOT EXISTS takedowns (
     domain_or_url TEXT PRIMARY KEY,
@@ -374,6 +388,20 @@ ALTER TABLE jobs
     ADD COLUMN IF NOT EXISTS deleted_by TEXT,
     ADD COLUMN IF NOT EXISTS deletion_reason TEXT;
 
+-- Near-duplicate linkage (idempotent)
+-- duplicate_of (taxonomy columns above) points at the canonical row of a
+-- cross-source duplicate cluster
+ALTER TABLE jobs
+    ADD COLUMN IF NOT EXISTS dedupe_similarity REAL;
+
+-- Apply link status written by background link revalidation (idempotent)
+ALTER TABLE jobs
+    ADD COLUMN IF NOT EXISTS apply_url_valid BOOLEAN,
+    ADD COLUMN IF NOT EXISTS apply_url_checked_at TIMESTAMPTZ;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_apply_url ON jobs(apply_url) WHERE apply_url IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_jobs_apply_url_dead ON jobs(apply_url_checked_at) WHERE apply_url_valid = FALSE;
+
 -- Add data quality columns to jobs table (idempotent)
 ALTER TABLE jobs
     ADD COLUMN IF NOT EXISTS data_quality_score INTEGER,
@@ -395,6 +423,8 @@ CREATE INDEX IF NOT EXISTS idx_jobs_quality_score ON jobs(data_quality_score) WH
 
 -- Indexes for jobs table
 CREATE INDEX IF NOT EXISTS idx_jobs_search_tsv ON jobs USING GIN(search_tsv);
+CREATE INDEX IF NOT EXISTS idx_jobs_duplicate_of ON jobs(duplicate_of) WHERE duplicate_of IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_jobs_title_trgm ON jobs USING GIN(lower(title) gin_trgm_ops) WHERE status = 'active';
 CREATE INDEX IF NOT EXISTS idx_jobs_status_deadline ON jobs(status, deadline);
 CREATE INDEX IF NOT EXISTS idx_jobs_country ON jobs(country);
 CREATE INDEX IF NOT EXISTS idx_jobs_level_norm ON jobs(level_norm);
@@ -1,5 +1,5 @@
 """
-Unit tests for metrics module (fallback JSON mode).
+Unit tests for metrics module (in-memory backend).
 """
 import os
 import json
@@ -14,37 +14,37 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "apps" / "backend"))
 
 from metrics import (
     incr_inserted, incr_updated, incr_skipped, incr_failed,
-    get_metrics, _load_json_metrics, _save_json_metrics
+    get_metrics, observe_crawl_stage, flush_metrics, read_aggregate, reset_metrics
 )
 
 
 class TestMetricsFallback(unittest.TestCase):
-    """Test metrics fallback JSON mode."""
+    """Test in-memory metrics backend (no Prometheus)."""
     
     def setUp(self):
-        """Set up test with temporary metrics file."""
-        # Create temporary file
-        self.temp_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.json')
-        self.temp_file.close()
-        self.metrics_file = Path(self.temp_file.name)
-        
-        # Patch METRICS_FILE to use temp file
-        self.patcher = patch('metrics.METRICS_FILE', self.metrics_file)
-        self.patcher.start()
-        
-        # Ensure file doesn't exist initially
-        if self.metrics_file.exists():
-            self.metrics_file.unlink()
+        """Set up test with temporary metrics directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.metrics_dir = Path(self.temp_dir.name)
+        
+        # Patch METRICS_DIR to use temp directory, without Prometheus
+        self.patchers = [
+            patch('metrics.METRICS_DIR', self.metrics_dir),
+            patch('metrics.PROMETHEUS_AVAILABLE', False),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        reset_metrics()
     
     def tearDown(self):
-        """Clean up temporary file."""
-        self.patcher.stop()
-        if self.metrics_file.exists():
-            self.metrics_file.unlink()
+        """Clean up temporary directory."""
+        reset_metrics()
+        for patcher in self.patchers:
+            patcher.stop()
+        self.temp_dir.cleanup()
     
     def test_initial_state(self):
         """Test initial metrics state."""
-        data = _load_json_metrics()
+        data = get_metrics()
         self.assertEqual(data['inserted'], 0)
         self.assertEqual(data['updated'], 0)
         self.assertEqual(data['skipped'], 0)
@@ -55,7 +55,7 @@ class TestMetricsFallback(unittest.TestCase):
         """Test incrementing inserted counter."""
         incr_inserted(5)
         
-        data = _load_json_metrics()
+        data = get_metrics()
         self.assertEqual(data['inserted'], 5)
         self.assertEqual(len(data['history']), 1)
         self.assertEqual(data['history'][0]['type'], 'inserted')
@@ -68,7 +68,7 @@ class TestMetricsFallback(unittest.TestCase):
         incr_skipped(3)
         incr_failed(2)
         
-        data = _load_json_metrics()
+        data = get_metrics()
         self.assertEqual(data['inserted'], 10)
         self.assertEqual(data['updated'], 5)
         self.assertEqual(data['skipped'], 3)
@@ -80,7 +80,7 @@ class TestMetricsFallback(unittest.TestCase):
         incr_inserted(0)
         incr_inserted(5)
         
-        data = _load_json_metrics()
+        data = get_metrics()
         self.assertEqual(data['inserted'], 5)
         self.assertEqual(len(data['history']), 1)  # Only one entry
     
@@ -89,7 +89,7 @@ class TestMetricsFallback(unittest.TestCase):
         incr_inserted(10)
         incr_inserted(-5)  # Should be ignored
         
-        data = _load_json_metrics()
+        data = get_metrics()
         self.assertEqual(data['inserted'], 10)
     
     def test_get_metrics(self):
@@ -103,15 +103,62 @@ class TestMetricsFallback(unittest.TestCase):
         self.assertEqual(metrics['updated'], 5)
         self.assertIn('history', metrics)
     
-    def test_history_limit(self):
-        """Test that history is limited to 1000 entries."""
-        # Add 1500 entries
+    def test_history_is_time_bucketed(self):
+        """Test that increments in the same time bucket share one history entry."""
         for i in range(1500):
             incr_inserted(1)
         
-        data = _load_json_metrics()
-        self.assertEqual(len(data['history']), 1000)
-        self.assertEqual(data['inserted'], 1500)  # Total count still correct
+        data = get_metrics()
+        self.assertLessEqual(len(data['history']), 2)  # May straddle a bucket boundary
+        self.assertEqual(sum(e['count'] for e in data['history']), 1500)
+        self.assertEqual(data['inserted'], 1500)
+        self.assertFalse(any(self.metrics_dir.iterdir()))  # No file I/O per increment
+    
+    def test_flush_and_merge_across_processes(self):
+        """Test atomic flush and merging of other processes' snapshot files."""
+        incr_inserted(3)
+        observe_crawl_stage('html', 'fetch', 0.3)
+        flush_metrics()
+        
+        files = list(self.metrics_dir.glob('*.json'))
+        self.assertEqual(len(files), 1)
+        with open(files[0]) as f:
+            snapshot = json.load(f)
+        self.assertEqual(snapshot['counters']['jobs_inserted'], 3)
+        
+        # Another worker's flushed snapshot
+        other = dict(snapshot, pid=0)
+        with open(self.metrics_dir / 'otherhost-1.json', 'w') as f:
+            json.dump(other, f)
+        
+        aggregate = read_aggregate(window_minutes=60)
+        self.assertEqual(aggregate['processes'], 2)
+        self.assertEqual(aggregate['counters']['jobs_inserted'], 6)
+        self.assertEqual(aggregate['window']['counters']['jobs_inserted'], 6)
+        stage = aggregate['histograms']['crawl_stage_seconds{source_type=html,stage=fetch}']
+        self.assertEqual(stage['count'], 2)
+        self.assertEqual(stage['p50'], 0.5)
+    
+    def test_stale_and_exited_process_files_are_removed(self):
+        """Test pruning of files older than the ring window and cleanup at exit."""
+        from metrics import _shutdown, METRICS_BUCKET_SECONDS, METRICS_RING_BUCKETS
+        
+        stale = self.metrics_dir / 'deadhost-1.json'
+        stale.write_text('{"counters": {"jobs_inserted": 7}}')
+        old = os.path.getmtime(stale) - METRICS_BUCKET_SECONDS * METRICS_RING_BUCKETS - 60
+        os.utime(stale, (old, old))
+        
+        incr_inserted(2)
+        flush_metrics()
+        aggregate = read_aggregate()
+        self.assertEqual(aggregate['processes'], 1)
+        self.assertEqual(aggregate['counters']['jobs_inserted'], 2)
+        self.assertFalse(stale.exists())
+        
+        with patch('metrics._store.stop') as stop:
+            _shutdown()
+        stop.assert_called_once()
+        self.assertEqual(list(self.metrics_dir.glob('*.json')), [])
 
 
 class TestMetricsWithPrometheus(unittest.TestCase):